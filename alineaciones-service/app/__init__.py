@@ -1,15 +1,19 @@
 from flask import Flask
 from app.extensions import db, jwt, cors
 from app.config import Config
+from app.read_replica import register_read_replicas
+from app.json_provider import register_json_provider
 
 def create_app():
     app = Flask(__name__)
     app.config.from_object(Config)
+    register_json_provider(app)
     
     # Inicializar extensiones
     db.init_app(app)
     jwt.init_app(app)
-    cors.init_app(app)
+    cors.init_app(app, expose_headers=['X-DB-Sticky'])
+    register_read_replicas(app)
     
     # Registrar blueprints
     from app.routes.alineacion_routes import alineacion_bp
@@ -22,5 +22,5 @@ class Alineacion(db.Model):
             'titular': self.titular,
             'minuto_entrada': self.minuto_entrada,
             'minuto_salida': self.minuto_salida,
-            'fecha_creacion': self.fecha_creacion.isoformat() if self.fecha_creacion else None
+            'fecha_creacion': self.fecha_creacion
         }
\ No newline at end of file
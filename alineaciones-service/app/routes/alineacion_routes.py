@@ -2,27 +2,20 @@ from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required
 from app.extensions import db
 from app.models.alineacion import Alineacion
+from app.schemas import (
+    AlineacionBatchSchema, AlineacionCreateSchema, AutoGenerarSchema, CambioSchema, DefinirAlineacionSchema
+)
+from app.validation import validate_json
 from app.services.backend_api_client import BackendAPIClient
 
 alineacion_bp = Blueprint('alineaciones', __name__)
 
 @alineacion_bp.route('', methods=['POST'])
 @jwt_required()
-def crear_alineacion():
+@validate_json(AlineacionCreateSchema)
+def crear_alineacion(data):
     """Crea una alineación usando NOMBRE del jugador"""
     try:
-        data = request.get_json()
-        
-        # Validaciones básicas
-        if not data.get('id_partido'):
-            return jsonify({'error': 'El partido es requerido'}), 400
-        
-        if not data.get('id_equipo'):
-            return jsonify({'error': 'El equipo es requerido'}), 400
-        
-        if not data.get('nombre_jugador'):
-            return jsonify({'error': 'El nombre del jugador es requerido'}), 400
-        
         # Cliente para consultar backend principal
         api_client = BackendAPIClient()
         
@@ -68,6 +61,10 @@ def crear_alineacion():
         except Exception as e:
             return jsonify({'error': f'Error al buscar jugador: {str(e)}'}), 500
         
+        # Validar que el jugador no esté suspendido
+        if id_jugador in api_client.get_suspendidos(data['id_partido'], [id_jugador]):
+            return jsonify({'error': f'{nombre_jugador} está suspendido para este partido'}), 400
+        
         # Validar que el jugador no esté ya en la alineación
         alineacion_existente = Alineacion.query.filter_by(
             id_partido=data['id_partido'],
@@ -182,21 +179,10 @@ def eliminar_alineacion(id_alineacion):
 # ============================================
 @alineacion_bp.route('/definir-alineacion', methods=['POST'])
 @jwt_required()
-def definir_alineacion():
+@validate_json(DefinirAlineacionSchema)
+def definir_alineacion(data):
 
     try:
-        data = request.get_json()
-        
-        # Validaciones
-        if not data.get('id_partido'):
-            return jsonify({'error': 'El partido es requerido'}), 400
-        
-        if not data.get('id_equipo'):
-            return jsonify({'error': 'El equipo es requerido'}), 400
-        
-        if not data.get('titulares') or len(data['titulares']) < 5:
-            return jsonify({'error': 'Debes definir al menos 5 titulares'}), 400
-        
         api_client = BackendAPIClient()
         
         # Validar partido
@@ -224,6 +210,11 @@ def definir_alineacion():
         
         jugadores_equipo = response.json().get('jugadores', [])
         
+        # Suspensiones de todo el plantel en una sola consulta
+        suspendidos = api_client.get_suspendidos(
+            data['id_partido'], [j['id_jugador'] for j in jugadores_equipo]
+        )
+        
         # Limpiar alineaciones previas de este equipo en este partido
         Alineacion.query.filter_by(
             id_partido=data['id_partido'],
@@ -253,6 +244,10 @@ def definir_alineacion():
                 errores.append(f"Titular '{nombre_titular}' no encontrado")
                 continue
             
+            if jugador['id_jugador'] in suspendidos:
+                errores.append(f"Titular '{nombre_titular}' está suspendido")
+                continue
+            
             nueva_alineacion = Alineacion(
                 id_partido=data['id_partido'],
                 id_equipo=data['id_equipo'],
@@ -288,6 +283,10 @@ def definir_alineacion():
                 errores.append(f"Suplente '{nombre_suplente}' no encontrado")
                 continue
             
+            if jugador['id_jugador'] in suspendidos:
+                errores.append(f"Suplente '{nombre_suplente}' está suspendido")
+                continue
+            
             nueva_alineacion = Alineacion(
                 id_partido=data['id_partido'],
                 id_equipo=data['id_equipo'],
@@ -322,7 +321,8 @@ def definir_alineacion():
 # ============================================
 @alineacion_bp.route('/cambio', methods=['POST'])
 @jwt_required()
-def hacer_cambio():
+@validate_json(CambioSchema)
+def hacer_cambio(data):
     """
     Hace un cambio durante el partido: saca un titular, entra un suplente
     
@@ -336,14 +336,6 @@ def hacer_cambio():
     }
     """
     try:
-        data = request.get_json()
-        
-        # Validaciones
-        required = ['id_partido', 'id_equipo', 'sale', 'entra', 'minuto']
-        for field in required:
-            if not data.get(field):
-                return jsonify({'error': f'El campo {field} es requerido'}), 400
-        
         api_client = BackendAPIClient()
         
         # Validar partido
@@ -425,20 +417,31 @@ def hacer_cambio():
         
         db.session.commit()
         
+        cambio = {
+            'sale': {
+                'id_jugador': jugador_sale['id_jugador'],
+                'nombre': f"{jugador_sale['nombre']} {jugador_sale['apellido']}",
+                'dorsal': jugador_sale['dorsal'],
+                'minuto_salida': data['minuto']
+            },
+            'entra': {
+                'id_jugador': jugador_entra['id_jugador'],
+                'nombre': f"{jugador_entra['nombre']} {jugador_entra['apellido']}",
+                'dorsal': jugador_entra['dorsal'],
+                'minuto_entrada': data['minuto']
+            }
+        }
+        
+        # Avisar al feed en vivo del backend (si falla, el cambio ya quedó registrado)
+        api_client.publicar_evento_en_vivo(
+            data['id_partido'],
+            dict(cambio, tipo='cambio', id_equipo=data['id_equipo'], minuto=data['minuto']),
+            request.headers.get('Authorization')
+        )
+        
         return jsonify({
             'mensaje': 'Cambio realizado exitosamente',
-            'cambio': {
-                'sale': {
-                    'nombre': f"{jugador_sale['nombre']} {jugador_sale['apellido']}",
-                    'dorsal': jugador_sale['dorsal'],
-                    'minuto_salida': data['minuto']
-                },
-                'entra': {
-                    'nombre': f"{jugador_entra['nombre']} {jugador_entra['apellido']}",
-                    'dorsal': jugador_entra['dorsal'],
-                    'minuto_entrada': data['minuto']
-                }
-            }
+            'cambio': cambio
         }), 200
         
     except Exception as e:
@@ -451,7 +454,8 @@ def hacer_cambio():
 # ============================================
 @alineacion_bp.route('/auto-generar', methods=['POST'])
 @jwt_required()
-def auto_generar_alineaciones():
+@validate_json(AutoGenerarSchema)
+def auto_generar_alineaciones(data):
     """
     Genera automáticamente alineaciones para todos los partidos de un campeonato
     SOLO PARA PRUEBAS - En producción el líder debe definir manualmente
@@ -463,10 +467,6 @@ def auto_generar_alineaciones():
     """
     try:
         import requests
-        data = request.get_json()
-        
-        if not data.get('id_campeonato'):
-            return jsonify({'error': 'El campeonato es requerido'}), 400
         
         id_campeonato = data['id_campeonato']
         api_client = BackendAPIClient()
@@ -580,22 +580,12 @@ def auto_generar_alineaciones():
 # ============================================
 @alineacion_bp.route('/batch', methods=['POST'])
 @jwt_required()
-def crear_alineacion_batch():
+@validate_json(AlineacionBatchSchema)
+def crear_alineacion_batch(data):
     """
     Crea múltiples alineaciones de golpe (DEPRECADO - Usar /definir-alineacion)
     """
     try:
-        data = request.get_json()
-        
-        if not data.get('id_partido'):
-            return jsonify({'error': 'El partido es requerido'}), 400
-        
-        if not data.get('id_equipo'):
-            return jsonify({'error': 'El equipo es requerido'}), 400
-        
-        if not data.get('titulares'):
-            return jsonify({'error': 'Debes especificar al menos 1 titular'}), 400
-        
         api_client = BackendAPIClient()
         
         # Validar partido
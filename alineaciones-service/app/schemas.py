@@ -0,0 +1,56 @@
+from marshmallow import fields, validate
+
+from app.validation import BaseSchema, Texto, requerido, texto
+
+
+class PartidoEquipoSchema(BaseSchema):
+    """Campos comunes: partido y equipo de la alineación"""
+
+    id_partido = fields.Integer(**requerido('id_partido', 'El partido es requerido'))
+    id_equipo = fields.Integer(**requerido('id_equipo', 'El equipo es requerido'))
+
+
+class AlineacionCreateSchema(PartidoEquipoSchema):
+    """POST /api/alineaciones"""
+
+    nombre_jugador = texto('nombre_jugador', 200, 'El nombre del jugador es requerido')
+    titular = fields.Boolean(load_default=True)
+    minuto_entrada = fields.Integer(load_default=0, validate=validate.Range(min=0, error='Debe ser mayor o igual a 0'))
+    minuto_salida = fields.Integer(load_default=None, allow_none=True,
+                                   validate=validate.Range(min=0, error='Debe ser mayor o igual a 0'))
+
+
+class DefinirAlineacionSchema(PartidoEquipoSchema):
+    """
+    POST /api/alineaciones/definir-alineacion
+
+    Titulares y suplentes son objetos {"nombre": ...}; un titular sin
+    nombre o no encontrado se informa en 'errores' sin cortar la petición
+    """
+
+    titulares = fields.List(fields.Dict(), **requerido('titulares', 'Debes definir al menos 5 titulares'),
+                            validate=validate.Length(min=5, error='Debes definir al menos 5 titulares'))
+    suplentes = fields.List(fields.Dict(), load_default=list)
+
+
+class CambioSchema(PartidoEquipoSchema):
+    """POST /api/alineaciones/cambio"""
+
+    sale = texto('sale', 200)
+    entra = texto('entra', 200)
+    minuto = fields.Integer(**requerido('minuto'),
+                            validate=validate.Range(min=1, max=120, error='El minuto debe estar entre 1 y 120'))
+
+
+class AutoGenerarSchema(BaseSchema):
+    """POST /api/alineaciones/auto-generar"""
+
+    id_campeonato = fields.Integer(**requerido('id_campeonato', 'El campeonato es requerido'))
+
+
+class AlineacionBatchSchema(PartidoEquipoSchema):
+    """POST /api/alineaciones/batch (deprecado)"""
+
+    titulares = fields.List(Texto(), **requerido('titulares', 'Debes especificar al menos 1 titular'),
+                            validate=validate.Length(min=1, error='Debes especificar al menos 1 titular'))
+    suplentes = fields.List(Texto(), load_default=list)
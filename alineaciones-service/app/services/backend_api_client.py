@@ -52,4 +52,41 @@ class BackendAPIClient:
         partido = self.get_partido(id_partido)
         if partido:
             return id_equipo in [partido.get('id_equipo_local'), partido.get('id_equipo_visitante')]
-        return False
\ No newline at end of file
+        return False
+    
+    def get_suspendidos(self, id_partido, ids_jugadores):
+        """
+        Consulta en una sola petición qué jugadores están suspendidos para el partido
+        
+        Returns:
+            set: ids de los jugadores suspendidos (vacío si el backend no responde)
+        """
+        ids = sorted(set(ids_jugadores))
+        if not ids:
+            return set()
+        try:
+            response = requests.get(
+                f"{self.base_url}/tarjetas/elegibilidad",
+                params={'id_partido': id_partido, 'jugadores': ','.join(map(str, ids))},
+                timeout=5
+            )
+            if response.status_code == 200:
+                return set(response.json().get('suspendidos', []))
+            return set()
+        except Exception as e:
+            print(f"❌ Error consultando suspensiones: {e}")
+            return set()
+    
+    def publicar_evento_en_vivo(self, id_partido, evento, authorization=None):
+        """Publica un evento (ej: cambio) en el feed en vivo del partido"""
+        try:
+            response = requests.post(
+                f"{self.base_url}/partido/{id_partido}/live/eventos",
+                json=evento,
+                headers={'Authorization': authorization} if authorization else None,
+                timeout=2
+            )
+            return response.status_code == 202
+        except Exception as e:
+            print(f"❌ Error publicando evento en vivo: {e}")
+            return False
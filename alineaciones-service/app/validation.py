@@ -0,0 +1,108 @@
+"""
+Validación declarativa de los cuerpos JSON (misma convención que el
+backend: app/schemas/base.py + app/middlewares/validation_middleware.py)
+"""
+from functools import wraps
+
+from flask import request, jsonify
+from marshmallow import EXCLUDE, Schema, ValidationError, fields, validate
+
+# Mensajes genéricos en español (los de marshmallow vienen en inglés)
+MENSAJES = {
+    'required': 'El campo es requerido',
+    'null': 'El campo no puede ser nulo',
+}
+MENSAJES_INVALIDO = (
+    (fields.Boolean, 'Debe ser verdadero o falso'),
+    (fields.Integer, 'Debe ser un número entero'),
+    (fields.Number, 'Debe ser un número'),
+    (fields.String, 'Debe ser un texto'),
+    (fields.List, 'Debe ser una lista'),
+    (fields.Dict, 'Debe ser un objeto'),
+)
+
+
+class Texto(fields.String):
+    """String sin espacios al inicio ni al final"""
+
+    def _deserialize(self, value, attr, data, **kwargs):
+        return super()._deserialize(value, attr, data, **kwargs).strip()
+
+
+def requerido(campo, mensaje=None, **kwargs):
+    """Campo obligatorio: sin él o nulo responde `mensaje`"""
+    mensaje = mensaje or f'El campo {campo} es requerido'
+    kwargs['required'] = True
+    kwargs['error_messages'] = {'required': mensaje, 'null': mensaje, **kwargs.get('error_messages', {})}
+    return kwargs
+
+
+def texto(campo, largo, mensaje=None, **kwargs):
+    """String obligatorio recortado, no vacío y de hasta `largo` caracteres"""
+    mensaje = mensaje or f'El campo {campo} es requerido'
+    return Texto(validate=[
+        validate.Length(min=1, error=mensaje),
+        validate.Length(max=largo, error=f'No puede superar {largo} caracteres'),
+    ], **requerido(campo, mensaje, **kwargs))
+
+
+class BaseSchema(Schema):
+    """Base de los schemas de entrada: ignora campos desconocidos y traduce los mensajes"""
+
+    class Meta:
+        unknown = EXCLUDE
+
+    def on_bind_field(self, field_name, field_obj):
+        self._traducir(field_obj)
+        if isinstance(field_obj, fields.List):
+            self._traducir(field_obj.inner)
+
+    @staticmethod
+    def _traducir(field_obj):
+        por_defecto = {}
+        for clase in reversed(type(field_obj).__mro__):
+            por_defecto.update(getattr(clase, 'default_error_messages', {}))
+
+        traducidos = dict(MENSAJES)
+        for clase, mensaje in MENSAJES_INVALIDO:
+            if isinstance(field_obj, clase):
+                traducidos['invalid'] = mensaje
+                break
+        for clave, mensaje in traducidos.items():
+            # Solo si el campo conserva el mensaje en inglés de marshmallow
+            if clave in field_obj.error_messages and field_obj.error_messages[clave] == por_defecto.get(clave):
+                field_obj.error_messages[clave] = mensaje
+
+
+def primer_error(mensajes):
+    """Primer mensaje de un dict/lista de errores de marshmallow (para el campo 'error')"""
+    while isinstance(mensajes, (dict, list)) and mensajes:
+        mensajes = next(iter(mensajes.values())) if isinstance(mensajes, dict) else mensajes[0]
+    return mensajes
+
+
+def validate_json(schema):
+    """
+    Valida y convierte el body JSON con un schema de marshmallow
+
+    El schema se instancia una sola vez, al decorar la ruta; los datos
+    validados llegan a la vista en el argumento `data`. Si hay errores
+    responde 400 con todos: {'error': 'primer mensaje', 'errores': {...}}
+    """
+    validador = schema() if isinstance(schema, type) else schema
+
+    def decorator(f):
+        @wraps(f)
+        def wrapper(*args, **kwargs):
+            cuerpo = request.get_json(silent=True)
+            if not isinstance(cuerpo, dict):
+                return jsonify({'error': 'El cuerpo debe ser un objeto JSON'}), 400
+
+            try:
+                kwargs['data'] = validador.load(cuerpo)
+            except ValidationError as e:
+                return jsonify({'error': primer_error(e.messages), 'errores': e.messages}), 400
+
+            return f(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -2,12 +2,25 @@ from flask import Flask, jsonify
 from app.config import config_by_name
 from app.extensions import db, migrate, jwt, cors, mail
 from app.utils.error_handlers import register_error_handlers
+from app.utils.query_monitor import register_query_monitor
+from app.utils.db_pool import DbPool, register_db_pool
+from app.utils.read_replica import register_read_replicas
+from app.utils.read_only import register_read_only
+from app.utils.json_provider import register_json_provider
+from app.utils.live_feed import LiveFeed
+from app.utils.email_queue import EmailQueue
+from app.utils.logo_storage import LogoStorage
+from app.utils.document_storage import DocumentStorage
+from app.utils.maintenance import MaintenanceRunner
+from app.security.token_manager import TokenManager
+from app.cli import register_cli
 import os
 from datetime import timedelta
 
 def create_app(config_name='development'):
     app = Flask(__name__)
     app.config.from_object(config_by_name[config_name])
+    register_json_provider(app)
     
     
     #app.config['JWT_SECRET_KEY'] = os.getenv('JWT_SECRET_KEY', 'dev-secret-cambiar-en-produccion')
@@ -21,7 +34,7 @@ def create_app(config_name='development'):
     app.config['MAX_LOGIN_ATTEMPTS'] = 5
     app.config['LOCKOUT_DURATION_MINUTES'] = 10
     app.config['UNLOCK_CODE_EXPIRES_MINUTES'] = 15
-    app.config['RATE_LIMIT_ENABLED'] = True
+    app.config['RATE_LIMIT_ENABLED'] = os.getenv('RATE_LIMIT_ENABLED', 'True') == 'True'
     app.config['RATE_LIMIT_REQUESTS'] = 100
     app.config['RATE_LIMIT_WINDOW_MINUTES'] = 15
     app.config['RATE_LIMIT_BAN_DURATION_MINUTES'] = 30
@@ -33,6 +46,7 @@ def create_app(config_name='development'):
     os.makedirs(os.path.join(app.config['UPLOAD_FOLDER'], 'logos'), exist_ok=True)
     
     
+    register_db_pool(app, db)
     db.init_app(app)
     migrate.init_app(app, db)
     jwt.init_app(app)
@@ -40,7 +54,8 @@ def create_app(config_name='development'):
         r"/api/*": {
             "origins": ["http://localhost:4200", "http://localhost:3000"],
             "methods": ["GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"],
-            "allow_headers": ["Content-Type", "Authorization"],
+            "allow_headers": ["Content-Type", "Authorization", "X-DB-Sticky"],
+            "expose_headers": ["X-DB-Sticky"],
             "supports_credentials": True,
             "max_age": 3600
         }
@@ -56,14 +71,18 @@ def create_app(config_name='development'):
     
     
     register_error_handlers(app)
+    register_query_monitor(app, db)
+    register_read_replicas(app)
+    register_read_only(app, db)
+    register_cli(app)
+    if app.config.get('MAINTENANCE_SCHEDULER_ENABLED'):
+        MaintenanceRunner.start_scheduler(app)
     
 
     
     @jwt.token_in_blocklist_loader
     def check_if_token_revoked(jwt_header, jwt_payload):
-        from app.security.token_manager import TokenManager
-        jti = jwt_payload['jti']
-        return TokenManager.is_token_revoked(jti)
+        return TokenManager.is_payload_revoked(jwt_payload)
     
     @jwt.expired_token_loader
     def expired_token_callback(jwt_header, jwt_payload):
@@ -134,7 +153,15 @@ def create_app(config_name='development'):
                 'rate_limiting': app.config['RATE_LIMIT_ENABLED'],
                 'cors_enabled': True,
                 'email_notifications': app.config['SEND_LOCKOUT_EMAIL']
-            }
+            },
+            'database': {
+                'pool': DbPool.status(db.engine)
+            },
+            'live': LiveFeed.status(),
+            'email_queue': EmailQueue.status(),
+            'token_cache': TokenManager.cache_status(),
+            'logos': LogoStorage.status(),
+            'documentos': DocumentStorage.status()
         }), 200
     
     return app
\ No newline at end of file
@@ -0,0 +1,108 @@
+import click
+
+from app.extensions import db
+
+
+def register_cli(app):
+    """
+    Comandos de mantenimiento de la app
+
+    - flask reparar-contadores: recalcula los contadores desnormalizados (partidos,
+      notificaciones no leídas y sesiones activas) y los nombres normalizados
+    - flask recalcular-sanciones: reconstruye el estado disciplinario desde las tarjetas
+    - flask mantenimiento: limpia tokens, rate limits, intentos de login, logs viejos y documentos sin uso
+    - flask particiones: crea las particiones futuras de las tablas particionadas (MySQL)
+    """
+
+    @app.cli.command('reparar-contadores')
+    @click.option('--id-campeonato', type=int, default=None, help='Solo los partidos de un campeonato')
+    @click.option('--dry-run', is_flag=True, help='Solo mostrar los partidos con contadores incorrectos')
+    def reparar_contadores(id_campeonato, dry_run):
+        """Recalcula los contadores de partidos, notificaciones no leídas, sesiones activas y nombres normalizados"""
+        from app.models.notificacion import Notificacion
+        from app.models.partido import Partido
+        from app.models.usuario import Usuario
+        from app.security.token_manager import TokenManager
+
+        ids = Partido.recalcular_contadores(id_campeonato=id_campeonato, dry_run=dry_run)
+        if not ids:
+            click.echo('✅ Todos los contadores de partidos están correctos')
+        else:
+            accion = 'con contadores incorrectos' if dry_run else 'corregidos'
+            click.echo(f'🔧 {len(ids)} partidos {accion}: {", ".join(map(str, ids[:50]))}'
+                       f'{" ..." if len(ids) > 50 else ""}')
+
+        if id_campeonato is None and not dry_run:
+            usuarios = Notificacion.recalcular_no_leidas()
+            click.echo(f'🔔 Contador de no leídas corregido en {usuarios} usuarios')
+            usuarios = TokenManager.recalcular_sesiones()
+            click.echo(f'🔑 Contador de sesiones activas corregido en {usuarios} usuarios')
+            usuarios = Usuario.recalcular_nombres_normalizados()
+            click.echo(f'🔤 Nombre normalizado corregido en {usuarios} usuarios')
+
+    @app.cli.command('recalcular-sanciones')
+    @click.option('--id-campeonato', type=int, default=None, help='Solo un campeonato (por defecto todos)')
+    def recalcular_sanciones(id_campeonato):
+        """Reconstruye las suspensiones acumuladas de cada jugador"""
+        from app.models.campeonato import Campeonato
+        from app.models.sancion_jugador import SancionJugador
+
+        ids = [id_campeonato] if id_campeonato else db.session.execute(
+            db.select(Campeonato.id_campeonato)
+        ).scalars().all()
+
+        for id_camp in ids:
+            jugadores = SancionJugador.recalcular(id_camp)
+            suspendidos = len(SancionJugador.suspendidos(id_camp))
+            click.echo(f'⚖️  Campeonato {id_camp}: {jugadores} jugadores con tarjetas, {suspendidos} suspendidos')
+
+    @app.cli.command('mantenimiento')
+    @click.option('--tarea', 'tareas', multiple=True, help='Tarea a ejecutar (repetible, por defecto todas)')
+    @click.option('--batch-size', type=int, default=None, help='Filas por DELETE (MAINTENANCE_BATCH_SIZE)')
+    @click.option('--pausa', type=float, default=None, help='Segundos entre lotes (MAINTENANCE_BATCH_PAUSE_SECONDS)')
+    @click.option('--historial', is_flag=True, help='Solo mostrar las últimas ejecuciones')
+    def mantenimiento(tareas, batch_size, pausa, historial):
+        """Elimina en lotes los registros vencidos de las tablas de seguridad y los documentos sin uso"""
+        from app.models.maintenance_run import MaintenanceRun
+        from app.utils.maintenance import MaintenanceRunner
+
+        desconocidas = set(tareas) - set(MaintenanceRunner.JOBS)
+        if desconocidas:
+            raise click.BadParameter(
+                f'{", ".join(sorted(desconocidas))} (disponibles: {", ".join(MaintenanceRunner.JOBS)})',
+                param_hint='--tarea'
+            )
+
+        if historial:
+            query = MaintenanceRun.query
+            if tareas:
+                query = query.filter(MaintenanceRun.job.in_(tareas))
+            for run in query.order_by(MaintenanceRun.started_at.desc()).limit(30):
+                click.echo(f'{run.started_at:%Y-%m-%d %H:%M:%S}  {run.job:<17} {run.status:<7} '
+                           f'{run.rows_deleted:>8} filas  {run.duration_ms:>7} ms')
+            return
+
+        for run in MaintenanceRunner.run_all(tareas or None, batch_size, pausa):
+            if run.status == 'locked':
+                click.echo(f'🔒 {run.job}: otro worker la está ejecutando, se omite')
+            elif run.status == 'error':
+                click.echo(f'❌ {run.job}: {run.error}')
+            else:
+                click.echo(f'🗑️  {run.job}: {run.rows_deleted} filas en {run.batches} lotes ({run.duration_ms} ms)')
+
+    @app.cli.command('particiones')
+    def particiones():
+        """Crea las particiones por adelantado y muestra las de cada tabla"""
+        from app.utils.partitions import PartitionManager
+
+        for tabla in PartitionManager.TABLES:
+            if not PartitionManager.is_partitioned(tabla):
+                click.echo(f'➖ {tabla}: sin particionar (retención con DELETE por lotes)')
+                continue
+
+            creadas = PartitionManager.ensure_future(tabla)
+            if creadas:
+                click.echo(f'🧱 {tabla}: {len(creadas)} particiones nuevas ({", ".join(creadas)})')
+            for particion in PartitionManager.partitions(tabla):
+                limite = f"{particion['limite']:%Y-%m-%d}" if particion['limite'] else 'MAXVALUE'
+                click.echo(f"   {particion['nombre']:<10} < {limite:<10} ~{particion['filas']} filas")
@@ -0,0 +1,44 @@
+from functools import wraps
+from flask import request, jsonify
+from marshmallow import ValidationError
+
+
+def primer_error(mensajes):
+    """Primer mensaje de un dict/lista de errores de marshmallow (para el campo 'error')"""
+    while isinstance(mensajes, (dict, list)) and mensajes:
+        mensajes = next(iter(mensajes.values())) if isinstance(mensajes, dict) else mensajes[0]
+    return mensajes
+
+
+def validate_json(schema):
+    """
+    Valida y convierte el body JSON con un schema de marshmallow
+    
+    El schema se instancia una sola vez, al decorar la ruta. Los datos ya
+    validados (fechas como date/datetime, números como int) llegan a la
+    vista en el argumento `data`. Si hay errores responde 400 con todos:
+        {'error': 'primer mensaje', 'errores': {'campo': ['mensaje', ...]}}
+    
+    Uso:
+        @jwt_required()
+        @role_required(['admin'])
+        @validate_json(PartidoCreateSchema)
+        def crear_partido(data):
+    """
+    validador = schema() if isinstance(schema, type) else schema
+    
+    def decorator(f):
+        @wraps(f)
+        def wrapper(*args, **kwargs):
+            cuerpo = request.get_json(silent=True)
+            if not isinstance(cuerpo, dict):
+                return jsonify({'error': 'El cuerpo debe ser un objeto JSON'}), 400
+            
+            try:
+                kwargs['data'] = validador.load(cuerpo)
+            except ValidationError as e:
+                return jsonify({'error': primer_error(e.messages), 'errores': e.messages}), 400
+            
+            return f(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -5,6 +5,7 @@ from app.models.campeonato import Campeonato
 from app.models.partido import Partido
 from app.models.gol import Gol
 from app.models.tarjeta import Tarjeta
+from app.models.sancion_jugador import SancionJugador
 from app.models.solicitud_equipo import SolicitudEquipo
 from app.models.notificacion import Notificacion
 
@@ -15,6 +16,7 @@ from app.models.login_attempt import LoginAttempt
 from app.models.account_lockout import AccountLockout
 from app.models.security_log import SecurityLog
 from app.models.rate_limit import RateLimit
+from app.models.maintenance_run import MaintenanceRun
 
 __all__ = [
     # Modelos principales
@@ -25,6 +27,7 @@ __all__ = [
     'Partido',
     'Gol',
     'Tarjeta',
+    'SancionJugador',
     'SolicitudEquipo',
     'Notificacion',
     # Modelos de seguridad
@@ -33,5 +36,6 @@ __all__ = [
     'LoginAttempt',
     'AccountLockout',
     'SecurityLog',
-    'RateLimit'
+    'RateLimit',
+    'MaintenanceRun'
 ]
\ No newline at end of file
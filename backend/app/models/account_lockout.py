@@ -148,11 +148,11 @@ class AccountLockout(db.Model):
         return {
             'id': self.id,
             'user_id': self.user_id,
-            'locked_at': self.locked_at.isoformat(),
-            'locked_until': self.locked_until.isoformat(),
+            'locked_at': self.locked_at,
+            'locked_until': self.locked_until,
             'reason': self.reason,
             'is_active': self.is_active,
             'is_locked': self.is_locked(),
-            'unlocked_at': self.unlocked_at.isoformat() if self.unlocked_at else None
+            'unlocked_at': self.unlocked_at
         }
 
@@ -26,16 +26,44 @@ class Campeonato(db.Model):
     def __repr__(self):
         return f'<Campeonato {self.nombre}>'
 
+    def query_lideres(self):
+        """
+        Líderes (activos) de los equipos aprobados que participan, en una sola consulta
+
+        - Con partidos generados: equipos que aparecen en sus partidos
+        - Sin partidos todavía: todos los equipos aprobados (los que
+          usará generar-partidos)
+
+        Returns:
+            Select: filas (id_usuario, nombre, email)
+        """
+        from app.models.equipo import Equipo
+        from app.models.partido import Partido
+        from app.models.usuario import Usuario
+
+        query = (
+            db.select(Usuario.id_usuario, Usuario.nombre, Usuario.email)
+            .join(Equipo, Equipo.id_lider == Usuario.id_usuario)
+            .where(Equipo.estado == 'aprobado', Usuario.activo == db.true())
+        )
+        if self.partidos_generados:
+            equipos = db.union(
+                db.select(Partido.id_equipo_local).where(Partido.id_campeonato == self.id_campeonato),
+                db.select(Partido.id_equipo_visitante).where(Partido.id_campeonato == self.id_campeonato),
+            )
+            query = query.where(Equipo.id_equipo.in_(equipos))
+        return query.distinct()
+
     def to_dict(self):
         return {
             'id_campeonato': self.id_campeonato,
             'nombre': self.nombre,
             'descripcion': self.descripcion,
-            'fecha_inicio': self.fecha_inicio.isoformat() if self.fecha_inicio else None,
-            'fecha_fin': self.fecha_fin.isoformat() if self.fecha_fin else None,
+            'fecha_inicio': self.fecha_inicio,
+            'fecha_fin': self.fecha_fin,
             'estado': self.estado,
             'creado_por': self.creado_por,
             'nombre_creador': self.creador.nombre if self.creador else None,
-            'fecha_creacion': self.fecha_creacion.isoformat() if self.fecha_creacion else None,
+            'fecha_creacion': self.fecha_creacion,
             'total_partidos': self.partidos.count()
         }
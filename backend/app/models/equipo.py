@@ -1,4 +1,5 @@
 from app.extensions import db
+from app.utils.logo_storage import LogoStorage
 from datetime import datetime
 
 class Equipo(db.Model):
@@ -7,6 +8,8 @@ class Equipo(db.Model):
     id_equipo = db.Column(db.Integer, primary_key=True, autoincrement=True)
     nombre = db.Column(db.String(100), nullable=False, unique=True)
     logo_url = db.Column(db.String(255), nullable=True)
+    # SHA-256 del logo subido (LogoStorage); None si logo_url es externo
+    logo_hash = db.Column(db.String(64), nullable=True)
     id_lider = db.Column(db.Integer, db.ForeignKey('usuarios.id_usuario', ondelete='CASCADE'), nullable=False, index=True)
     fecha_registro = db.Column(db.DateTime, default=datetime.utcnow)
     fecha_aprobacion = db.Column(db.DateTime, nullable=True)
@@ -28,10 +31,11 @@ class Equipo(db.Model):
             'id_equipo': self.id_equipo,
             'nombre': self.nombre,
             'logo_url': self.logo_url,
+            'logo_miniatura': LogoStorage.miniatura_url(self.logo_hash, self.logo_url),
             'id_lider': self.id_lider,
             'nombre_lider': self.lider.nombre if self.lider else None,
-            'fecha_registro': self.fecha_registro.isoformat() if self.fecha_registro else None,
-            'fecha_aprobacion': self.fecha_aprobacion.isoformat() if self.fecha_aprobacion else None,
+            'fecha_registro': self.fecha_registro,
+            'fecha_aprobacion': self.fecha_aprobacion,
             'estado': self.estado,
             'observaciones': self.observaciones,
             'total_jugadores': self.jugadores.count(),
@@ -42,3 +46,72 @@ class Equipo(db.Model):
             data['jugadores'] = [j.to_dict() for j in self.jugadores.all()]
         
         return data
+    
+    @staticmethod
+    def cambiar_estado_masivo(ids_equipos, estado, id_admin, observaciones=None, notificar=False, chunk_size=1000) -> dict:
+        """
+        Aprueba, rechaza o devuelve a pendiente varios equipos (sin commit)
+        
+        - Un SELECT para saber qué equipos existen (y a qué líder avisar)
+        - Un UPDATE de equipos y otro de sus solicitudes pendientes
+          (aprobado -> 'aprobada', rechazado -> 'rechazada')
+        - Si notificar=True, un INSERT de varias filas de notificaciones
+        
+        Returns:
+            dict: {'actualizados': [ids], 'no_encontrados': [ids], 'solicitudes': revisadas, 'notificaciones': creadas}
+        """
+        from app.models.notificacion import Notificacion
+        from app.models.solicitud_equipo import SolicitudEquipo
+        
+        ids = list(dict.fromkeys(ids_equipos))
+        existentes = db.session.execute(
+            db.select(Equipo.id_equipo, Equipo.nombre, Equipo.id_lider).where(Equipo.id_equipo.in_(ids))
+        ).all()
+        encontrados = [e.id_equipo for e in existentes]
+        resultado = {
+            'actualizados': encontrados,
+            'no_encontrados': sorted(set(ids) - set(encontrados)),
+            'solicitudes': 0,
+            'notificaciones': 0,
+        }
+        if not encontrados:
+            return resultado
+        
+        ahora = datetime.utcnow()
+        valores = {'estado': estado, 'aprobado_por': id_admin, 'fecha_aprobacion': ahora}
+        if observaciones is not None:
+            valores['observaciones'] = observaciones
+        db.session.execute(
+            db.update(Equipo)
+            .where(Equipo.id_equipo.in_(encontrados))
+            .values(**valores)
+            .execution_options(synchronize_session=False)
+        )
+        
+        estado_solicitud = {'aprobado': 'aprobada', 'rechazado': 'rechazada'}.get(estado)
+        if estado_solicitud:
+            valores = {'estado': estado_solicitud, 'revisado_por': id_admin, 'fecha_revision': ahora}
+            if observaciones is not None:
+                valores['observaciones'] = observaciones
+            resultado['solicitudes'] = db.session.execute(
+                db.update(SolicitudEquipo)
+                .where(SolicitudEquipo.id_equipo.in_(encontrados), SolicitudEquipo.estado == 'pendiente')
+                .values(**valores)
+                .execution_options(synchronize_session=False)
+            ).rowcount
+        
+        if notificar:
+            titulos = {
+                'aprobado': ('Equipo aprobado', 'success', 'fue aprobado: ya puedes registrar jugadores'),
+                'rechazado': ('Equipo rechazado', 'warning', 'fue rechazado'),
+                'pendiente': ('Equipo en revisión', 'info', 'volvió a quedar pendiente de aprobación'),
+            }
+            titulo, tipo, detalle = titulos[estado]
+            resultado['notificaciones'] = Notificacion.crear_varias([{
+                'id_usuario': e.id_lider,
+                'titulo': titulo,
+                'tipo': tipo,
+                'mensaje': f'Tu equipo {e.nombre} {detalle}' + (f'. {observaciones}' if observaciones else ''),
+            } for e in existentes], chunk_size=chunk_size)
+        
+        return resultado
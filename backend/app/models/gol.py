@@ -6,8 +6,8 @@ class Gol(db.Model):
     __tablename__ = 'goles'
     
     id_gol = db.Column(db.Integer, primary_key=True, autoincrement=True)
-    id_partido = db.Column(db.Integer, db.ForeignKey('partidos.id_partido'), nullable=False, index=True)
-    id_jugador = db.Column(db.Integer, db.ForeignKey('jugadores.id_jugador'), nullable=False, index=True)
+    id_partido = db.Column(db.Integer, db.ForeignKey('partidos.id_partido'), nullable=False)
+    id_jugador = db.Column(db.Integer, db.ForeignKey('jugadores.id_jugador'), nullable=False)
     minuto = db.Column(db.Integer, nullable=False)
     tipo = db.Column(
         db.Enum(TipoGol),
@@ -15,6 +15,13 @@ class Gol(db.Model):
         index=True
     )
     fecha_registro = db.Column(db.DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        # Goleadores: GROUP BY id_jugador + JOIN a partidos, sin leer la tabla
+        db.Index('idx_goles_jugador_partido_tipo', 'id_jugador', 'id_partido', 'tipo'),
+        # Goles de un partido por jugador (marcador, eliminación de partido)
+        db.Index('idx_goles_partido_jugador', 'id_partido', 'id_jugador'),
+    )
     
     jugador = db.relationship('Jugador', backref='goles_marcados', lazy='joined')
     
@@ -28,6 +35,6 @@ class Gol(db.Model):
             'id_jugador': self.id_jugador,
             'jugador': self.jugador.nombre if self.jugador else None,
             'minuto': self.minuto,
-            'tipo': self.tipo.value if self.tipo else None,
-            'fecha_registro': self.fecha_registro.isoformat() if self.fecha_registro else None
+            'tipo': self.tipo,
+            'fecha_registro': self.fecha_registro
         }
\ No newline at end of file
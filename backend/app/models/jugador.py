@@ -33,8 +33,9 @@ class Jugador(db.Model):
             'documento': self.documento,
             'dorsal': self.dorsal,
             'documento_pdf': self.documento_pdf,
+            'documento_url': f'/api/jugadores/{self.id_jugador}/documento' if self.documento_pdf else None,
             'posicion': self.posicion,
-            'fecha_nacimiento': self.fecha_nacimiento.isoformat() if self.fecha_nacimiento else None,
+            'fecha_nacimiento': self.fecha_nacimiento,
             'activo': self.activo,
             'equipo': self.equipo.nombre if self.equipo else None
         }
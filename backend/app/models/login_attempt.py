@@ -10,13 +10,16 @@ class LoginAttempt(db.Model):
     - Bloquear cuentas tras X intentos fallidos
     - Auditoría: saber desde dónde intentaron acceder
     - Detectar patrones sospechosos
+    
+    En MySQL puede estar particionada por mes sobre attempted_at
+    (migración 006): las consultas siempre filtran un rango de attempted_at.
     """
     __tablename__ = 'login_attempts'
     
     id = db.Column(db.Integer, primary_key=True)
     
     # Email que intentó hacer login
-    email = db.Column(db.String(100), nullable=False, index=True)
+    email = db.Column(db.String(100), nullable=False)
     
     # Desde qué IP
     ip_address = db.Column(db.String(45), nullable=False, index=True)
@@ -32,6 +35,11 @@ class LoginAttempt(db.Model):
     
     # Razón de fallo: 'credenciales_invalidas', 'cuenta_bloqueada', 'cuenta_inactiva'
     failure_reason = db.Column(db.String(100))
+
+    # Intentos fallidos recientes de un email (count_recent_failures, LoginTracker)
+    __table_args__ = (
+        db.Index('idx_login_attempts_email_success_fecha', 'email', 'success', 'attempted_at'),
+    )
     
     def __repr__(self):
         return f'<LoginAttempt {self.email} - {"✓" if self.success else "✗"}>'
@@ -75,6 +83,6 @@ class LoginAttempt(db.Model):
             'email': self.email,
             'ip_address': self.ip_address,
             'success': self.success,
-            'attempted_at': self.attempted_at.isoformat(),
+            'attempted_at': self.attempted_at,
             'failure_reason': self.failure_reason
         }
\ No newline at end of file
@@ -0,0 +1,50 @@
+from app.extensions import db
+from datetime import datetime
+
+
+class MaintenanceRun(db.Model):
+    """
+    Registro de cada ejecución de una tarea de mantenimiento
+
+    Sirve para saber cuándo corrió cada limpieza, cuánto tardó y cuántas
+    filas eliminó (flask mantenimiento --historial).
+
+    status:
+    - 'ok': terminó
+    - 'error': falló (ver error); las filas ya eliminadas quedan eliminadas
+    - 'locked': otro worker tenía el lock de la tarea, no se ejecutó
+    """
+    __tablename__ = 'maintenance_runs'
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    job = db.Column(db.String(50), nullable=False)
+    status = db.Column(db.Enum('ok', 'error', 'locked', name='maintenance_status_enum'), nullable=False)
+    started_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    finished_at = db.Column(db.DateTime, nullable=True)
+    duration_ms = db.Column(db.Integer, nullable=False, default=0)
+    rows_deleted = db.Column(db.Integer, nullable=False, default=0)
+    batches = db.Column(db.Integer, nullable=False, default=0)
+    worker = db.Column(db.String(100))
+    error = db.Column(db.Text)
+
+    __table_args__ = (
+        # Historial de una tarea, más reciente primero
+        db.Index('idx_maintenance_runs_job_started', 'job', 'started_at'),
+    )
+
+    def __repr__(self):
+        return f'<MaintenanceRun {self.job} {self.status} filas={self.rows_deleted}>'
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'job': self.job,
+            'status': self.status,
+            'started_at': self.started_at,
+            'finished_at': self.finished_at,
+            'duration_ms': self.duration_ms,
+            'rows_deleted': self.rows_deleted,
+            'batches': self.batches,
+            'worker': self.worker,
+            'error': self.error
+        }
@@ -2,30 +2,283 @@ from app.extensions import db
 from datetime import datetime
 
 class Notificacion(db.Model):
+    """
+    Notificaciones de un usuario (bandeja de entrada)
+
+    - usuarios.notificaciones_no_leidas guarda cuántas tiene sin leer:
+      se actualiza al crear, marcar como leída y eliminar, así el contador
+      se consulta sin leer filas de esta tabla
+    - La bandeja se pagina con cursor (fecha_envio, id_notificacion) sobre
+      los índices (id_usuario, leida, fecha_envio) y (id_usuario, fecha_envio)
+    """
     __tablename__ = 'notificaciones'
-    
+
     id_notificacion = db.Column(db.Integer, primary_key=True, autoincrement=True)
-    id_usuario = db.Column(db.Integer, db.ForeignKey('usuarios.id_usuario', ondelete='CASCADE'), nullable=False, index=True)
+    id_usuario = db.Column(db.Integer, db.ForeignKey('usuarios.id_usuario', ondelete='CASCADE'), nullable=False)
     titulo = db.Column(db.String(150), nullable=False)
     mensaje = db.Column(db.Text, nullable=False)
     tipo = db.Column(db.Enum('info', 'warning', 'success', 'error', name='tipo_notificacion_enum'), default='info')
-    leida = db.Column(db.Boolean, default=False, index=True)
+    leida = db.Column(db.Boolean, default=False)
     fecha_envio = db.Column(db.DateTime, default=datetime.utcnow, index=True)
-    
+
+    __table_args__ = (
+        # Bandeja filtrada por leída/no leída, más reciente primero
+        db.Index('idx_notificaciones_usuario_leida_fecha', 'id_usuario', 'leida', 'fecha_envio'),
+        # Bandeja completa, más reciente primero
+        db.Index('idx_notificaciones_usuario_fecha', 'id_usuario', 'fecha_envio'),
+    )
+
     # RELACIONES
-    usuario = db.relationship('Usuario', backref='notificaciones', lazy='joined')
-    
+    usuario = db.relationship('Usuario', backref='notificaciones')
+
     def __repr__(self):
         return f'<Notificacion {self.titulo}>'
-    
-    def to_dict(self):
+
+    @staticmethod
+    def _ajustar_no_leidas(id_usuario, delta):
+        """Suma/resta al contador del usuario con un UPDATE atómico (nunca baja de 0)"""
+        from app.models.usuario import Usuario
+
+        if not delta:
+            return
+        columna = Usuario.notificaciones_no_leidas
+        valor = columna + delta if delta > 0 else db.case((columna + delta >= 0, columna + delta), else_=0)
+        db.session.execute(
+            db.update(Usuario)
+            .where(Usuario.id_usuario == id_usuario)
+            # Sin tocar fecha_actualizacion (onupdate): no es un cambio de perfil
+            .values(notificaciones_no_leidas=valor, fecha_actualizacion=Usuario.fecha_actualizacion)
+            .execution_options(synchronize_session=False)
+        )
+
+    @staticmethod
+    def crear(id_usuario, titulo, mensaje, tipo='info'):
+        """Agrega una notificación no leída y suma 1 al contador (sin commit)"""
+        notificacion = Notificacion(id_usuario=id_usuario, titulo=titulo, mensaje=mensaje, tipo=tipo, leida=False)
+        db.session.add(notificacion)
+        Notificacion._ajustar_no_leidas(id_usuario, 1)
+        return notificacion
+
+    @staticmethod
+    def crear_masivas(ids_usuarios, titulo, mensaje, tipo='info', chunk_size=1000) -> int:
+        """
+        Crea la misma notificación para muchos usuarios (sin commit)
+
+        Por cada bloque de chunk_size usuarios: un INSERT de varias filas y un
+        UPDATE de los contadores de no leídas (en vez de un INSERT y un
+        commit por usuario).
+
+        Returns:
+            int: Notificaciones creadas
+        """
+        from app.models.usuario import Usuario
+
+        ahora = datetime.utcnow()
+        ids = list(dict.fromkeys(ids_usuarios))
+
+        for i in range(0, len(ids), chunk_size):
+            bloque = ids[i:i + chunk_size]
+            db.session.execute(db.insert(Notificacion.__table__), [{
+                'id_usuario': id_usuario,
+                'titulo': titulo,
+                'mensaje': mensaje,
+                'tipo': tipo,
+                'leida': False,
+                'fecha_envio': ahora,
+            } for id_usuario in bloque])
+            db.session.execute(
+                db.update(Usuario)
+                .where(Usuario.id_usuario.in_(bloque))
+                .values(
+                    notificaciones_no_leidas=Usuario.notificaciones_no_leidas + 1,
+                    fecha_actualizacion=Usuario.fecha_actualizacion
+                )
+                .execution_options(synchronize_session=False)
+            )
+        return len(ids)
+
+    @staticmethod
+    def crear_varias(notificaciones, chunk_size=1000) -> int:
+        """
+        Crea notificaciones distintas por usuario (sin commit)
+
+        Args:
+            notificaciones: dicts con id_usuario, titulo, mensaje y tipo (opcional)
+
+        Un INSERT de varias filas por bloque y un UPDATE de los contadores
+        por cada cantidad distinta de notificaciones por usuario
+        (normalmente uno solo).
+
+        Returns:
+            int: Notificaciones creadas
+        """
+        from app.models.usuario import Usuario
+
+        ahora = datetime.utcnow()
+        filas = [{
+            'id_usuario': n['id_usuario'],
+            'titulo': n['titulo'],
+            'mensaje': n['mensaje'],
+            'tipo': n.get('tipo', 'info'),
+            'leida': False,
+            'fecha_envio': ahora,
+        } for n in notificaciones]
+
+        for i in range(0, len(filas), chunk_size):
+            db.session.execute(db.insert(Notificacion.__table__), filas[i:i + chunk_size])
+
+        por_usuario = {}
+        for fila in filas:
+            por_usuario[fila['id_usuario']] = por_usuario.get(fila['id_usuario'], 0) + 1
+        por_cantidad = {}
+        for id_usuario, cantidad in por_usuario.items():
+            por_cantidad.setdefault(cantidad, []).append(id_usuario)
+
+        for cantidad, ids in por_cantidad.items():
+            for i in range(0, len(ids), chunk_size):
+                db.session.execute(
+                    db.update(Usuario)
+                    .where(Usuario.id_usuario.in_(ids[i:i + chunk_size]))
+                    .values(
+                        notificaciones_no_leidas=Usuario.notificaciones_no_leidas + cantidad,
+                        fecha_actualizacion=Usuario.fecha_actualizacion
+                    )
+                    .execution_options(synchronize_session=False)
+                )
+        return len(filas)
+
+    @staticmethod
+    def marcar_leida(id_notificacion, id_usuario) -> bool:
+        """
+        Marca una notificación como leída (sin commit)
+
+        El UPDATE solo afecta filas no leídas: si dos peticiones la marcan
+        a la vez, el contador se descuenta una sola vez.
+
+        Returns:
+            bool: True si estaba sin leer
+        """
+        resultado = db.session.execute(
+            db.update(Notificacion)
+            .where(
+                Notificacion.id_notificacion == id_notificacion,
+                Notificacion.id_usuario == id_usuario,
+                Notificacion.leida == db.false()
+            )
+            .values(leida=True)
+            .execution_options(synchronize_session=False)
+        )
+        if resultado.rowcount:
+            Notificacion._ajustar_no_leidas(id_usuario, -1)
+        return bool(resultado.rowcount)
+
+    @staticmethod
+    def marcar_todas_leidas(id_usuario) -> int:
+        """
+        Marca todas las notificaciones del usuario con un solo UPDATE (sin commit)
+
+        Returns:
+            int: Notificaciones que estaban sin leer
+        """
+        resultado = db.session.execute(
+            db.update(Notificacion)
+            .where(Notificacion.id_usuario == id_usuario, Notificacion.leida == db.false())
+            .values(leida=True)
+            .execution_options(synchronize_session=False)
+        )
+        # Se resta lo marcado (no se pone en 0): una notificación creada
+        # en paralelo sigue contando como no leída
+        Notificacion._ajustar_no_leidas(id_usuario, -resultado.rowcount)
+        return resultado.rowcount
+
+    @staticmethod
+    def eliminar(notificacion):
+        """Elimina la notificación y descuenta el contador si no estaba leída (sin commit)"""
+        if not notificacion.leida:
+            Notificacion._ajustar_no_leidas(notificacion.id_usuario, -1)
+        db.session.delete(notificacion)
+
+    @staticmethod
+    def no_leidas(id_usuario) -> int:
+        """Contador de no leídas (lee una sola columna de usuarios)"""
+        from app.models.usuario import Usuario
+
+        return db.session.execute(
+            db.select(Usuario.notificaciones_no_leidas).where(Usuario.id_usuario == id_usuario)
+        ).scalar() or 0
+
+    @staticmethod
+    def bandeja(id_usuario, limite=20, cursor=None, leida=None) -> list:
+        """
+        Página de la bandeja, más reciente primero
+
+        Args:
+            cursor: (fecha_envio, id_notificacion) de la última fila de la página anterior
+            leida: True/False para filtrar, None para todas
+
+        Returns:
+            list: Hasta limite + 1 notificaciones (la extra indica que hay más)
+        """
+        return Notificacion.query_bandeja(id_usuario, limite, cursor, leida).all()
+
+    @staticmethod
+    def query_bandeja(id_usuario, limite=20, cursor=None, leida=None):
+        query = Notificacion.query.filter(Notificacion.id_usuario == id_usuario)
+
+        if leida is not None:
+            query = query.filter(Notificacion.leida == leida)
+
+        if cursor:
+            fecha, id_notificacion = cursor
+            query = query.filter(db.or_(
+                Notificacion.fecha_envio < fecha,
+                db.and_(Notificacion.fecha_envio == fecha, Notificacion.id_notificacion < id_notificacion)
+            ))
+
+        return query.order_by(
+            Notificacion.fecha_envio.desc(),
+            Notificacion.id_notificacion.desc()
+        ).limit(limite + 1)
+
+    @staticmethod
+    def recalcular_no_leidas() -> int:
+        """
+        Recalcula el contador de todos los usuarios cuyo valor no coincide
+
+        Returns:
+            int: Usuarios corregidos
+        """
+        from app.models.usuario import Usuario
+
+        reales = db.select(db.func.count()).where(
+            Notificacion.id_usuario == Usuario.id_usuario,
+            Notificacion.leida == db.false()
+        ).scalar_subquery()
+
+        resultado = db.session.execute(
+            db.update(Usuario)
+            .where(Usuario.notificaciones_no_leidas != reales)
+            .values(notificaciones_no_leidas=reales, fecha_actualizacion=Usuario.fecha_actualizacion)
+            .execution_options(synchronize_session=False)
+        )
+        db.session.commit()
+        return resultado.rowcount
+
+    def to_dict(self, nombre_usuario=None):
+        """
+        Args:
+            nombre_usuario: Nombre del destinatario si ya se conoce (la bandeja
+                            del usuario actual lo pasa para no cargar la relación)
+        """
+        if nombre_usuario is None and self.usuario:
+            nombre_usuario = self.usuario.nombre
         return {
             'id_notificacion': self.id_notificacion,
             'id_usuario': self.id_usuario,
-            'usuario': self.usuario.nombre if self.usuario else None,
+            'usuario': nombre_usuario,
             'titulo': self.titulo,
             'mensaje': self.mensaje,
             'tipo': self.tipo,
             'leida': self.leida,
-            'fecha_envio': self.fecha_envio.isoformat() if self.fecha_envio else None
+            'fecha_envio': self.fecha_envio
         }
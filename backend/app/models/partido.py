@@ -14,6 +14,12 @@ class Partido(db.Model):
     goles_local = db.Column(db.Integer, default=0)
     goles_visitante = db.Column(db.Integer, default=0)
 
+    # Contadores desnormalizados (se mantienen al registrar/eliminar goles y tarjetas)
+    total_goles = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    total_tarjetas = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    amarillas = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    rojas = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+
     estado = db.Column(
         db.String(50),
         default='programado',
@@ -27,6 +33,11 @@ class Partido(db.Model):
     __table_args__ = (
         db.CheckConstraint('id_equipo_local != id_equipo_visitante',
                           name='check_equipos_diferentes'),
+        # Listado por campeonato/estado/jornada ordenado por fecha
+        db.Index('idx_partidos_campeonato_estado_jornada', 'id_campeonato', 'estado', 'jornada', 'fecha_partido'),
+        # Partidos de un equipo: UNION de dos búsquedas (local y visitante)
+        db.Index('idx_partidos_local_fecha', 'id_equipo_local', 'fecha_partido'),
+        db.Index('idx_partidos_visitante_fecha', 'id_equipo_visitante', 'fecha_partido'),
     )
     
     equipo_local = db.relationship('Equipo', foreign_keys=[id_equipo_local])
@@ -37,6 +48,79 @@ class Partido(db.Model):
     
     def __repr__(self):
         return f'<Partido {self.equipo_local.nombre} vs {self.equipo_visitante.nombre}>'
+
+    def marcador(self) -> dict:
+        return {'goles_local': self.goles_local, 'goles_visitante': self.goles_visitante}
+
+    CONTADORES = ('goles_local', 'goles_visitante', 'total_goles', 'total_tarjetas', 'amarillas', 'rojas')
+
+    @staticmethod
+    def ajustar_contadores(id_partido, **deltas):
+        """
+        Suma (o resta) a los contadores del partido con un UPDATE atómico
+
+        Se ejecuta en la transacción actual: se confirma junto con el
+        gol/tarjeta en el mismo commit. Al restar nunca baja de 0.
+
+        Ejemplo:
+            Partido.ajustar_contadores(5, goles_local=1, total_goles=1)
+        """
+        valores = {}
+        for nombre, delta in deltas.items():
+            if nombre not in Partido.CONTADORES:
+                raise ValueError(f'Contador desconocido: {nombre}')
+            if not delta:
+                continue
+            columna = getattr(Partido, nombre)
+            if delta > 0:
+                valores[columna] = columna + delta
+            else:
+                valores[columna] = db.case((columna + delta >= 0, columna + delta), else_=0)
+
+        if valores:
+            Partido.query.filter_by(id_partido=id_partido).update(valores, synchronize_session=False)
+
+    @staticmethod
+    def recalcular_contadores(id_campeonato=None, dry_run=False):
+        """
+        Recalcula total_goles, total_tarjetas, amarillas y rojas desde las tablas hijas
+
+        Solo actualiza los partidos cuyos contadores no coinciden.
+
+        Returns:
+            list: ids de los partidos corregidos (o a corregir con dry_run)
+        """
+        from app.models.gol import Gol
+        from app.models.tarjeta import Tarjeta
+
+        def contar(modelo, *filtros):
+            return db.select(db.func.count()).where(
+                modelo.id_partido == Partido.id_partido, *filtros
+            ).scalar_subquery()
+
+        reales = {
+            'total_goles': contar(Gol),
+            'total_tarjetas': contar(Tarjeta),
+            'amarillas': contar(Tarjeta, Tarjeta.tipo == 'amarilla'),
+            'rojas': contar(Tarjeta, Tarjeta.tipo == 'roja'),
+        }
+
+        query = db.select(Partido.id_partido).where(
+            db.or_(*[getattr(Partido, nombre) != subquery for nombre, subquery in reales.items()])
+        )
+        if id_campeonato:
+            query = query.where(Partido.id_campeonato == id_campeonato)
+
+        ids = db.session.execute(query).scalars().all()
+        if ids and not dry_run:
+            db.session.execute(
+                db.update(Partido)
+                .where(Partido.id_partido.in_(ids))
+                .values(**reales)
+                .execution_options(synchronize_session=False)
+            )
+            db.session.commit()
+        return ids
     
     def to_dict(self):
         return {
@@ -47,14 +131,16 @@ class Partido(db.Model):
             'equipo_local': self.equipo_local.nombre if self.equipo_local else None,
             'id_equipo_visitante': self.id_equipo_visitante,
             'equipo_visitante': self.equipo_visitante.nombre if self.equipo_visitante else None,
-            'fecha_partido': self.fecha_partido.isoformat() if self.fecha_partido else None,
+            'fecha_partido': self.fecha_partido,
             'lugar': self.lugar,
             'jornada': self.jornada,
             'goles_local': self.goles_local,
             'goles_visitante': self.goles_visitante,
             'estado': self.estado, 
             'observaciones': self.observaciones,
-            'fecha_creacion': self.fecha_creacion.isoformat() if self.fecha_creacion else None,
-            'total_goles': self.goles.count(),
-            'total_tarjetas': self.tarjetas.count()
+            'fecha_creacion': self.fecha_creacion,
+            'total_goles': self.total_goles,
+            'total_tarjetas': self.total_tarjetas,
+            'amarillas': self.amarillas,
+            'rojas': self.rojas
         }
\ No newline at end of file
@@ -6,6 +6,9 @@ class RateLimit(db.Model):
     Modelo para control de tasa de peticiones
     
     Tabla: rate_limits
+    
+    En MySQL puede estar particionada por día sobre window_start
+    (migración 006): las búsquedas de la ventana actual filtran window_start.
     """
     __tablename__ = 'rate_limits'
     
@@ -33,7 +36,7 @@ class RateLimit(db.Model):
             'identifier': self.identifier,
             'endpoint': self.endpoint,
             'requests_count': self.requests_count,
-            'window_start': self.window_start.isoformat() if self.window_start else None,
-            'window_end': self.window_end.isoformat() if self.window_end else None,
-            'blocked_until': self.blocked_until.isoformat() if self.blocked_until else None
+            'window_start': self.window_start,
+            'window_end': self.window_end,
+            'blocked_until': self.blocked_until
         }
\ No newline at end of file
@@ -1,88 +1,150 @@
 from app.extensions import db
 from datetime import datetime, timedelta
+import hashlib
+import hmac
 import secrets
 
 class RefreshToken(db.Model):
     """
     Modelo para Refresh Tokens
-    
+
     ¿Qué es un refresh token?
     - Access token expira rápido (15-30 min)
     - Refresh token expira lento (7-30 días)
     - Cuando el access token expira, usas el refresh token para obtener uno nuevo
     - Así el usuario no tiene que hacer login cada 15 minutos
-    
+
     ¿Por qué es más seguro?
     - Access token viaja en cada petición (más exposición)
     - Refresh token solo se usa una vez para renovar
     - Si roban el access token, expira rápido
     - Si roban el refresh token, podemos revocarlo
+
+    ¿Cómo se guarda? (selector + verificador)
+    - El token que recibe el cliente es <selector><verificador>
+    - selector: 16 caracteres fijos, se guarda tal cual con índice UNIQUE
+      (búsqueda por un índice pequeño de ancho fijo)
+    - verificador: solo se guarda su SHA-256 (BINARY(32)); se compara en
+      tiempo constante. Con una copia de la BD no se pueden usar los tokens
     """
     __tablename__ = 'refresh_tokens'
-    
+
+    SELECTOR_LENGTH = 16
+
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('usuarios.id_usuario'), nullable=False)
-    
-    # Token largo y seguro (generado con secrets)
-    token = db.Column(db.String(500), unique=True, nullable=False, index=True)
-    
+
+    # Parte pública del token (búsqueda) y hash de la parte secreta
+    selector = db.Column(db.String(SELECTOR_LENGTH), unique=True, nullable=False)
+    token_hash = db.Column(db.BINARY(32), nullable=False)
+
     # Cuándo expira (ej: 30 días desde creación)
     expires_at = db.Column(db.DateTime, nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    
+
     # Info del dispositivo (para seguridad)
     ip_address = db.Column(db.String(45))
     user_agent = db.Column(db.Text)
-    
-    # ¿Fue revocado? (logout, cambio password, etc)
+
+    # ¿Fue revocado? (logout, cambio password, rotación, etc)
     is_revoked = db.Column(db.Boolean, default=False)
-    
+
+    __table_args__ = (
+        # Limpieza de tokens expirados (flask mantenimiento)
+        db.Index('idx_refresh_tokens_expires', 'expires_at'),
+        # Sesiones activas de un usuario (revoke_all_user_tokens)
+        db.Index('idx_refresh_tokens_user_revoked', 'user_id', 'is_revoked'),
+    )
+
     # Relación con usuario
     usuario = db.relationship('Usuario', backref='refresh_tokens')
-    
+
     def __repr__(self):
         return f'<RefreshToken user_id={self.user_id}>'
-    
+
     @staticmethod
     def generate_token():
-        """Genera un token seguro de 64 caracteres"""
-        return secrets.token_urlsafe(64)
-    
+        """Genera un token seguro: selector (16) + verificador (43 caracteres)"""
+        selector = secrets.token_urlsafe(12)
+        return selector + secrets.token_urlsafe(32)
+
+    @staticmethod
+    def split_token(token_str):
+        """
+        Separa el token en (selector, sha256 del verificador)
+
+        Returns:
+            tuple o None: None si el token no tiene el formato esperado
+        """
+        if not token_str or len(token_str) <= RefreshToken.SELECTOR_LENGTH:
+            return None
+        selector = token_str[:RefreshToken.SELECTOR_LENGTH]
+        verificador = token_str[RefreshToken.SELECTOR_LENGTH:]
+        return selector, hashlib.sha256(verificador.encode('utf-8')).digest()
+
     @staticmethod
     def create_refresh_token(user_id, ip_address=None, user_agent=None, days=30):
         """
         Crea un nuevo refresh token para el usuario
-        
+
         Args:
             user_id: ID del usuario
             ip_address: IP desde donde se creó
             user_agent: Navegador/dispositivo
             days: Días de validez (default 30)
+
+        Returns:
+            tuple: (RefreshToken sin guardar, token en texto para el cliente)
         """
+        token_str = RefreshToken.generate_token()
+        selector, token_hash = RefreshToken.split_token(token_str)
         token = RefreshToken(
             user_id=user_id,
-            token=RefreshToken.generate_token(),
+            selector=selector,
+            token_hash=token_hash,
             expires_at=datetime.utcnow() + timedelta(days=days),
             ip_address=ip_address,
-            user_agent=user_agent
+            user_agent=user_agent,
+            is_revoked=False
         )
-        return token
-    
+        return token, token_str
+
+    @staticmethod
+    def find_by_token(token_str, user_id=None):
+        """
+        Busca un refresh token por el texto que envía el cliente
+
+        Una búsqueda por el índice UNIQUE de selector; el hash del
+        verificador se compara en tiempo constante.
+        """
+        partes = RefreshToken.split_token(token_str)
+        if not partes:
+            return None
+        selector, token_hash = partes
+
+        query = RefreshToken.query.filter_by(selector=selector)
+        if user_id is not None:
+            query = query.filter_by(user_id=user_id)
+        refresh_token = query.first()
+
+        if not refresh_token or not hmac.compare_digest(bytes(refresh_token.token_hash), token_hash):
+            return None
+        return refresh_token
+
     def is_expired(self):
         """Verifica si el token ya expiró"""
         return datetime.utcnow() > self.expires_at
-    
+
     def is_valid(self):
         """Verifica si el token es válido (no revocado y no expirado)"""
         return not self.is_revoked and not self.is_expired()
-    
+
     def to_dict(self):
         return {
             'id': self.id,
             'user_id': self.user_id,
-            'expires_at': self.expires_at.isoformat(),
-            'created_at': self.created_at.isoformat(),
+            'expires_at': self.expires_at,
+            'created_at': self.created_at,
             'is_revoked': self.is_revoked,
             'is_expired': self.is_expired()
         }
-    
\ No newline at end of file
@@ -0,0 +1,339 @@
+from app.extensions import db
+from datetime import datetime
+from flask import current_app
+from sqlalchemy.exc import IntegrityError
+
+
+class SancionJugador(db.Model):
+    """
+    Estado disciplinario acumulado de un jugador en un campeonato
+
+    ¿Cómo funciona?
+    1. Cada tarjeta registrada/eliminada actualiza la fila del jugador
+       (amarillas y rojas acumuladas en el campeonato)
+    2. Partidos de sanción = rojas * DISCIPLINA_PARTIDOS_POR_ROJA
+                           + amarillas // DISCIPLINA_AMARILLAS_POR_SUSPENSION
+    3. Cuando su equipo termina un partido posterior a la tarjeta, se
+       cumple un partido (partidos_cumplidos + 1)
+    4. partidos_pendientes = sanción - cumplidos: si es > 0 está suspendido
+
+    Así "¿quién está suspendido?" es una búsqueda por índice
+    (id_campeonato, partidos_pendientes) sin recorrer las tarjetas.
+    """
+    __tablename__ = 'sanciones_jugadores'
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    id_campeonato = db.Column(db.Integer, db.ForeignKey('campeonatos.id_campeonato', ondelete='CASCADE'), nullable=False)
+    id_jugador = db.Column(db.Integer, db.ForeignKey('jugadores.id_jugador', ondelete='CASCADE'), nullable=False, index=True)
+
+    amarillas = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    rojas = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    partidos_cumplidos = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    partidos_pendientes = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+
+    # Fecha del partido de la última tarjeta que generó sanción: solo
+    # cuentan como cumplidos los partidos del equipo posteriores a esta fecha
+    fecha_partido_sancion = db.Column(db.DateTime, nullable=True)
+    fecha_actualizacion = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    __table_args__ = (
+        db.UniqueConstraint('id_campeonato', 'id_jugador', name='unique_sancion_campeonato_jugador'),
+        # Suspendidos de un campeonato: WHERE id_campeonato = ? AND partidos_pendientes > 0
+        db.Index('idx_sanciones_campeonato_pendientes', 'id_campeonato', 'partidos_pendientes'),
+    )
+
+    jugador = db.relationship('Jugador')
+
+    def __repr__(self):
+        return f'<SancionJugador jugador={self.id_jugador} pendientes={self.partidos_pendientes}>'
+
+    @staticmethod
+    def reglas() -> tuple:
+        """(partidos por roja, amarillas que suman un partido de suspensión)"""
+        return (
+            current_app.config.get('DISCIPLINA_PARTIDOS_POR_ROJA', 1),
+            max(1, current_app.config.get('DISCIPLINA_AMARILLAS_POR_SUSPENSION', 3)),
+        )
+
+    def partidos_sancion(self, reglas=None) -> int:
+        por_roja, amarillas_por_partido = reglas or SancionJugador.reglas()
+        return self.rojas * por_roja + self.amarillas // amarillas_por_partido
+
+    def _actualizar_pendientes(self, reglas=None):
+        self.partidos_pendientes = max(0, self.partidos_sancion(reglas) - self.partidos_cumplidos)
+
+    @staticmethod
+    def _crear(id_campeonato, id_jugador):
+        """
+        Crea la fila del jugador o, si otra transacción la acaba de crear, la bloquea
+
+        Cuando la fila no existe, SELECT ... FOR UPDATE no bloquea nada: dos
+        primeras tarjetas simultáneas del mismo jugador intentarían insertarla.
+        El INSERT se hace en un SAVEPOINT; si choca con
+        unique_sancion_campeonato_jugador se deshace solo el SAVEPOINT y se
+        lee (FOR UPDATE) la fila que insertó la otra transacción.
+        """
+        db.session.flush()  # el SAVEPOINT solo debe contener el INSERT de la sanción
+        sancion = SancionJugador(
+            id_campeonato=id_campeonato, id_jugador=id_jugador,
+            amarillas=0, rojas=0, partidos_cumplidos=0, partidos_pendientes=0
+        )
+        try:
+            with db.session.begin_nested():
+                db.session.add(sancion)
+            return sancion
+        except IntegrityError:
+            return SancionJugador.query.filter_by(
+                id_campeonato=id_campeonato, id_jugador=id_jugador
+            ).with_for_update().one()
+
+    @staticmethod
+    def registrar_tarjeta(tarjeta, partido, signo=1):
+        """
+        Aplica una tarjeta (signo=1) o su eliminación (signo=-1) al estado del jugador
+
+        Se ejecuta en la transacción actual, junto con el alta/baja de la tarjeta.
+        La fila se bloquea (SELECT ... FOR UPDATE) para no perder
+        actualizaciones concurrentes; si no existe se crea con _crear.
+        """
+        sancion = SancionJugador.query.filter_by(
+            id_campeonato=partido.id_campeonato,
+            id_jugador=tarjeta.id_jugador
+        ).with_for_update().first()
+
+        if not sancion:
+            if signo < 0:
+                return None
+            sancion = SancionJugador._crear(partido.id_campeonato, tarjeta.id_jugador)
+
+        reglas = SancionJugador.reglas()
+        antes = sancion.partidos_sancion(reglas)
+
+        if tarjeta.tipo == 'roja':
+            sancion.rojas = max(0, sancion.rojas + signo)
+        else:
+            sancion.amarillas = max(0, sancion.amarillas + signo)
+
+        if sancion.partidos_sancion(reglas) > antes:
+            sancion.fecha_partido_sancion = partido.fecha_partido
+        sancion._actualizar_pendientes(reglas)
+        return sancion
+
+    @staticmethod
+    def registrar_tarjetas(tarjetas, partido) -> list:
+        """
+        Aplica varias tarjetas de un partido de una vez (carga posterior al partido)
+
+        Un SELECT ... FOR UPDATE de las filas de todos los jugadores
+        involucrados (los que no tienen fila se crean con _crear); las
+        reglas se aplican en memoria y los cambios se escriben en el mismo
+        flush. Se ejecuta en la transacción actual.
+
+        Args:
+            tarjetas: dicts con id_jugador y tipo ('amarilla' o 'roja')
+
+        Returns:
+            list: Estados disciplinarios actualizados
+        """
+        ids = {t['id_jugador'] for t in tarjetas}
+        if not ids:
+            return []
+
+        sanciones = {s.id_jugador: s for s in SancionJugador.query.filter(
+            SancionJugador.id_campeonato == partido.id_campeonato,
+            SancionJugador.id_jugador.in_(ids)
+        ).with_for_update().all()}
+
+        for id_jugador in sorted(ids - set(sanciones)):
+            sanciones[id_jugador] = SancionJugador._crear(partido.id_campeonato, id_jugador)
+
+        reglas = SancionJugador.reglas()
+        for tarjeta in tarjetas:
+            sancion = sanciones[tarjeta['id_jugador']]
+            antes = sancion.partidos_sancion(reglas)
+            if tarjeta['tipo'] == 'roja':
+                sancion.rojas += 1
+            else:
+                sancion.amarillas += 1
+            if sancion.partidos_sancion(reglas) > antes:
+                sancion.fecha_partido_sancion = partido.fecha_partido
+            sancion._actualizar_pendientes(reglas)
+
+        return list(sanciones.values())
+
+    @staticmethod
+    def cumplir_partido(partido):
+        """
+        Descuenta un partido de sanción a los jugadores suspendidos de ambos equipos
+
+        Llamar una sola vez, cuando el partido pasa a 'finalizado', con la
+        fila del partido bloqueada (las rutas no permiten salir de
+        'finalizado'). Solo cuenta para sanciones generadas en partidos
+        anteriores.
+
+        Returns:
+            int: Jugadores que cumplieron un partido
+        """
+        from app.models.jugador import Jugador
+
+        jugadores = db.select(Jugador.id_jugador).where(
+            Jugador.id_equipo.in_([partido.id_equipo_local, partido.id_equipo_visitante])
+        )
+        resultado = db.session.execute(
+            db.update(SancionJugador)
+            .where(
+                SancionJugador.id_campeonato == partido.id_campeonato,
+                SancionJugador.partidos_pendientes > 0,
+                SancionJugador.fecha_partido_sancion < partido.fecha_partido,
+                SancionJugador.id_jugador.in_(jugadores)
+            )
+            .values(
+                partidos_cumplidos=SancionJugador.partidos_cumplidos + 1,
+                partidos_pendientes=SancionJugador.partidos_pendientes - 1
+            )
+            .execution_options(synchronize_session=False)
+        )
+        return resultado.rowcount
+
+    @staticmethod
+    def suspendidos(id_campeonato) -> list:
+        """
+        Jugadores con partidos de suspensión pendientes
+
+        Una sola consulta por índice: el costo depende de cuántos
+        suspendidos hay, no de cuántas tarjetas tiene el campeonato.
+        """
+        from app.models.equipo import Equipo
+        from app.models.jugador import Jugador
+
+        filas = db.session.execute(
+            db.select(
+                SancionJugador.id_jugador,
+                SancionJugador.amarillas,
+                SancionJugador.rojas,
+                SancionJugador.partidos_cumplidos,
+                SancionJugador.partidos_pendientes,
+                Jugador.nombre,
+                Jugador.apellido,
+                Jugador.dorsal,
+                Equipo.id_equipo,
+                Equipo.nombre.label('equipo')
+            )
+            .join(Jugador, Jugador.id_jugador == SancionJugador.id_jugador)
+            .join(Equipo, Equipo.id_equipo == Jugador.id_equipo)
+            .where(
+                SancionJugador.id_campeonato == id_campeonato,
+                SancionJugador.partidos_pendientes > 0
+            )
+            .order_by(SancionJugador.partidos_pendientes.desc(), Jugador.apellido.asc())
+        ).all()
+
+        return [{
+            'id_jugador': fila.id_jugador,
+            'nombre_completo': f'{fila.nombre} {fila.apellido}',
+            'dorsal': fila.dorsal,
+            'id_equipo': fila.id_equipo,
+            'equipo': fila.equipo,
+            'amarillas': fila.amarillas,
+            'rojas': fila.rojas,
+            'partidos_cumplidos': fila.partidos_cumplidos,
+            'partidos_pendientes': fila.partidos_pendientes,
+        } for fila in filas]
+
+    @staticmethod
+    def elegibilidad(id_campeonato, ids_jugadores) -> dict:
+        """
+        Elegibilidad de varios jugadores en una sola consulta
+
+        Returns:
+            dict: id_jugador -> partidos pendientes (0 = puede jugar)
+        """
+        ids = set(ids_jugadores)
+        pendientes = dict.fromkeys(ids, 0)
+        if not ids:
+            return pendientes
+
+        filas = db.session.execute(
+            db.select(SancionJugador.id_jugador, SancionJugador.partidos_pendientes).where(
+                SancionJugador.id_campeonato == id_campeonato,
+                SancionJugador.id_jugador.in_(ids),
+                SancionJugador.partidos_pendientes > 0
+            )
+        ).all()
+        pendientes.update((fila.id_jugador, fila.partidos_pendientes) for fila in filas)
+        return pendientes
+
+    @staticmethod
+    def recalcular(id_campeonato):
+        """
+        Reconstruye el estado disciplinario de un campeonato desde las tarjetas
+
+        Recorre los partidos en orden cronológico y aplica las mismas reglas
+        que las actualizaciones incrementales. Sirve para reparar el estado
+        o para cargarlo la primera vez.
+
+        Returns:
+            int: Jugadores con estado disciplinario
+        """
+        from app.models.jugador import Jugador
+        from app.models.partido import Partido
+        from app.models.tarjeta import Tarjeta
+
+        reglas = SancionJugador.reglas()
+        partidos = Partido.query.filter_by(id_campeonato=id_campeonato).order_by(
+            Partido.fecha_partido.asc(), Partido.id_partido.asc()
+        ).all()
+
+        tarjetas = {}
+        for tarjeta in db.session.execute(
+            db.select(Tarjeta.id_partido, Tarjeta.id_jugador, Tarjeta.tipo)
+            .join(Partido, Partido.id_partido == Tarjeta.id_partido)
+            .where(Partido.id_campeonato == id_campeonato)
+        ).all():
+            tarjetas.setdefault(tarjeta.id_partido, []).append(tarjeta)
+
+        ids_con_tarjetas = {t.id_jugador for lista in tarjetas.values() for t in lista}
+        equipo_de = dict(db.session.execute(
+            db.select(Jugador.id_jugador, Jugador.id_equipo).where(Jugador.id_jugador.in_(ids_con_tarjetas))
+        ).all()) if ids_con_tarjetas else {}
+
+        estados = {}
+        for partido in partidos:
+            if partido.estado == 'finalizado':
+                equipos = (partido.id_equipo_local, partido.id_equipo_visitante)
+                for id_jugador, sancion in estados.items():
+                    if (sancion.partidos_pendientes > 0 and equipo_de.get(id_jugador) in equipos
+                            and sancion.fecha_partido_sancion < partido.fecha_partido):
+                        sancion.partidos_cumplidos += 1
+                        sancion.partidos_pendientes -= 1
+
+            for tarjeta in tarjetas.get(partido.id_partido, []):
+                sancion = estados.setdefault(tarjeta.id_jugador, SancionJugador(
+                    id_campeonato=id_campeonato, id_jugador=tarjeta.id_jugador,
+                    amarillas=0, rojas=0, partidos_cumplidos=0, partidos_pendientes=0
+                ))
+                antes = sancion.partidos_sancion(reglas)
+                if tarjeta.tipo == 'roja':
+                    sancion.rojas += 1
+                else:
+                    sancion.amarillas += 1
+                if sancion.partidos_sancion(reglas) > antes:
+                    sancion.fecha_partido_sancion = partido.fecha_partido
+                sancion._actualizar_pendientes(reglas)
+
+        SancionJugador.query.filter_by(id_campeonato=id_campeonato).delete(synchronize_session=False)
+        db.session.add_all(estados.values())
+        db.session.commit()
+        return len(estados)
+
+    def to_dict(self):
+        return {
+            'id_campeonato': self.id_campeonato,
+            'id_jugador': self.id_jugador,
+            'amarillas': self.amarillas,
+            'rojas': self.rojas,
+            'partidos_cumplidos': self.partidos_cumplidos,
+            'partidos_pendientes': self.partidos_pendientes,
+            'suspendido': self.partidos_pendientes > 0,
+            'fecha_actualizacion': self.fecha_actualizacion
+        }
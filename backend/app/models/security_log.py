@@ -18,6 +18,10 @@ class SecurityLog(db.Model):
     - Bloqueos/desbloqueos de cuenta
     - Actividad sospechosa
     - Revocación de tokens
+    
+    En MySQL puede estar particionada por mes sobre created_at
+    (migración 006, sin la FK a usuarios: las tablas particionadas no
+    admiten claves foráneas).
     """
     __tablename__ = 'security_logs'
     
@@ -128,5 +132,5 @@ class SecurityLog(db.Model):
             'email': self.email,
             'ip_address': self.ip_address,
             'details': self.details,
-            'created_at': self.created_at.isoformat()
+            'created_at': self.created_at
         }
\ No newline at end of file
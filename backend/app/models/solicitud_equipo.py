@@ -13,6 +13,11 @@ class SolicitudEquipo(db.Model):
     revisado_por = db.Column(db.Integer, db.ForeignKey('usuarios.id_usuario', ondelete='SET NULL'), nullable=True)
     fecha_revision = db.Column(db.DateTime, nullable=True)
     
+    __table_args__ = (
+        # Solicitudes pendientes de un conjunto de equipos (aprobación masiva)
+        db.Index('idx_solicitudes_equipo_estado', 'id_equipo', 'estado'),
+    )
+    
     # RELACIONES
     equipo = db.relationship('Equipo', foreign_keys=[id_equipo], backref='solicitudes', lazy='joined')
     lider = db.relationship('Usuario', foreign_keys=[id_lider], backref='solicitudes_hechas')
@@ -28,10 +33,10 @@ class SolicitudEquipo(db.Model):
             'equipo': self.equipo.nombre if self.equipo else None,
             'id_lider': self.id_lider,
             'lider': self.lider.nombre if self.lider else None,
-            'fecha_solicitud': self.fecha_solicitud.isoformat() if self.fecha_solicitud else None,
+            'fecha_solicitud': self.fecha_solicitud,
             'estado': self.estado,
             'observaciones': self.observaciones,
             'revisado_por': self.revisado_por,
             'revisor': self.revisor.nombre if self.revisor else None,
-            'fecha_revision': self.fecha_revision.isoformat() if self.fecha_revision else None
+            'fecha_revision': self.fecha_revision
         }
\ No newline at end of file
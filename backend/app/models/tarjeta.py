@@ -27,5 +27,5 @@ class Tarjeta(db.Model):
             'tipo': self.tipo,
             'minuto': self.minuto,
             'motivo': self.motivo,
-            'fecha_registro': self.fecha_registro.isoformat() if self.fecha_registro else None
+            'fecha_registro': self.fecha_registro
         }
\ No newline at end of file
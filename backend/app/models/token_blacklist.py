@@ -32,6 +32,11 @@ class TokenBlacklist(db.Model):
     # Razón de revocación: 'logout', 'password_change', 'suspicious_activity'
     reason = db.Column(db.String(100))
     
+    __table_args__ = (
+        # Última revocación de un usuario (TokenManager.user_token_state)
+        db.Index('idx_token_blacklist_user_revoked', 'user_id', 'revoked_at'),
+    )
+    
     def __repr__(self):
         return f'<TokenBlacklist {self.jti}>'
     
@@ -41,7 +46,7 @@ class TokenBlacklist(db.Model):
             'jti': self.jti,
             'token_type': self.token_type,
             'user_id': self.user_id,
-            'revoked_at': self.revoked_at.isoformat() if self.revoked_at else None,
-            'expires_at': self.expires_at.isoformat() if self.expires_at else None,
+            'revoked_at': self.revoked_at,
+            'expires_at': self.expires_at,
             'reason': self.reason
         }
\ No newline at end of file
@@ -1,7 +1,14 @@
 from app.extensions import db
 from datetime import datetime
+from sqlalchemy.orm import validates
+from app.utils.validators import normalizar_nombre
 import bcrypt
 
+
+def _nombre_normalizado_por_defecto(context):
+    # INSERT sin el campo (ej: inserción en bloque con Core): se calcula del nombre
+    return Usuario.normalizar_nombre(context.get_current_parameters().get('nombre'))
+
 class Usuario(db.Model):
     __tablename__ = 'usuarios'
     
@@ -20,10 +27,55 @@ class Usuario(db.Model):
     fecha_actualizacion = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     last_login_at = db.Column(db.DateTime, nullable=True)
     last_login_ip = db.Column(db.String(45), nullable=True)
+    # Contador desnormalizado: lo mantienen las operaciones de Notificacion
+    notificaciones_no_leidas = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    # Refresh tokens no revocados: lo mantiene TokenManager
+    sesiones_activas = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    # Versión de los access tokens (claim 'tv'): al subirla se revocan todos
+    token_version = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    # Nombre en minúsculas, sin tildes ni espacios repetidos: búsqueda exacta por índice
+    nombre_normalizado = db.Column(db.String(100), nullable=True, index=True, default=_nombre_normalizado_por_defecto)
     
     def __repr__(self):
         return f'<Usuario {self.email}>'
     
+    @staticmethod
+    def normalizar_nombre(nombre):
+        """'  José  PÉREZ ' -> 'jose perez' (None si queda vacío)"""
+        normalizado = normalizar_nombre(nombre)
+        return normalizado[:100] if normalizado else None
+    
+    @staticmethod
+    def recalcular_nombres_normalizados() -> int:
+        """
+        Recalcula nombre_normalizado donde no coincide (ej: filas de la migración 009)
+        
+        Returns:
+            int: Usuarios corregidos
+        """
+        filas = db.session.execute(
+            db.select(Usuario.id_usuario, Usuario.nombre, Usuario.nombre_normalizado)
+        ).all()
+        cambios = [
+            {'b_id': fila.id_usuario, 'b_nombre': Usuario.normalizar_nombre(fila.nombre)}
+            for fila in filas if Usuario.normalizar_nombre(fila.nombre) != fila.nombre_normalizado
+        ]
+        if cambios:
+            db.session.execute(
+                db.update(Usuario.__table__)
+                .where(Usuario.__table__.c.id_usuario == db.bindparam('b_id'))
+                .values(nombre_normalizado=db.bindparam('b_nombre'),
+                        fecha_actualizacion=Usuario.__table__.c.fecha_actualizacion),
+                cambios
+            )
+        db.session.commit()
+        return len(cambios)
+    
+    @validates('nombre')
+    def _actualizar_nombre_normalizado(self, key, nombre):
+        self.nombre_normalizado = Usuario.normalizar_nombre(nombre)
+        return nombre
+    
     def set_password(self, password):
         self.contrasena = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
     
@@ -39,7 +91,7 @@ class Usuario(db.Model):
             'rol': self.rol,
             'activo': self.activo,
             'failed_login_attempts': self.failed_login_attempts,  # ⭐ NUEVO
-            'last_login_at': self.last_login_at.isoformat() if self.last_login_at else None,  # ⭐ NUEVO
+            'last_login_at': self.last_login_at,  # ⭐ NUEVO
             'last_login_ip': self.last_login_ip,  # ⭐ NUEVO
-            'fecha_registro': self.fecha_registro.isoformat() if self.fecha_registro else None
+            'fecha_registro': self.fecha_registro
         }
\ No newline at end of file
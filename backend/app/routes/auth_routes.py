@@ -469,7 +469,8 @@ def login():
             nombre=usuario.nombre,
             rol=usuario.rol,
             ip_address=ip_address,
-            user_agent=user_agent
+            user_agent=user_agent,
+            token_version=usuario.token_version
         )
         
         return jsonify({
@@ -501,7 +502,7 @@ def refresh_token():
         }
     
     Returns:
-        200: Nuevo access token
+        200: Nuevo access token y nuevo refresh token (el enviado deja de servir)
         401: Refresh token inválido/expirado
     """
     try:
@@ -522,7 +523,9 @@ def refresh_token():
         return jsonify({
             'mensaje': 'Token renovado',
             'access_token': result['access_token'],
-            'expires_in': result['expires_in']
+            'refresh_token': result['refresh_token'],
+            'expires_in': result['expires_in'],
+            'refresh_expires_in': result['refresh_expires_in']
         }), 200
         
     except Exception as e:
@@ -564,15 +567,7 @@ def logout():
         
         data = request.get_json() or {}
         if data.get('refresh_token'):
-            from app.models.refresh_token import RefreshToken
-            refresh_token = RefreshToken.query.filter_by(
-                token=data['refresh_token'],
-                user_id=current_user_id
-            ).first()
-            
-            if refresh_token:
-                refresh_token.is_revoked = True
-                db.session.commit()
+            TokenManager.revoke_refresh_token(data['refresh_token'], current_user_id)
         
         SecurityLog.log_event(
             event_type='logout',
@@ -589,6 +584,40 @@ def logout():
         return jsonify({'error': str(e)}), 500
 
 
+# ============================================
+# 🚪 CERRAR TODAS LAS SESIONES
+# ============================================
+
+@auth_bp.route('/logout-all', methods=['POST'])
+@jwt_required()
+def logout_all():
+    """
+    Cierra la sesión en todos los dispositivos
+    
+    Sube usuarios.token_version (revoca todos los access tokens emitidos)
+    y revoca todos los refresh tokens del usuario.
+    
+    Headers:
+        Authorization: Bearer <access_token>
+    
+    Returns:
+        200: Sesiones cerradas
+    """
+    try:
+        current_user_id = int(get_jwt_identity())
+        
+        revoked = TokenManager.revoke_all_user_tokens(current_user_id, reason='logout_all')
+        
+        return jsonify({
+            'mensaje': 'Sesiones cerradas en todos los dispositivos',
+            'sesiones_revocadas': revoked
+        }), 200
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+
 # ============================================
 # 👤 OBTENER USUARIO ACTUAL
 # ============================================
@@ -1,11 +1,15 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.middlewares.auth_middleware import role_required
+from app.middlewares.validation_middleware import validate_json
 from app.extensions import db
 from app.models.campeonato import Campeonato
 from app.models.usuario import Usuario
 from app.models.equipo import Equipo      # ← AGREGAR
 from app.models.partido import Partido 
+from app.schemas import (
+    CampeonatoCreateSchema, CampeonatoEstadoSchema, CampeonatoUpdateSchema, GenerarPartidosSchema
+)
 from itertools import combinations
 from datetime import datetime, timedelta
 
@@ -52,14 +56,9 @@ def crear_campeonato():
 @campeonato_bp.route('', methods=['POST'])
 @jwt_required()
 @role_required(['admin'])
-def crear_campeonato(): 
+@validate_json(CampeonatoCreateSchema)
+def crear_campeonato(data): 
     try: 
-        data = request.get_json()
-        if not data.get('nombre'):
-            return jsonify({'error':'El nombre es obligatorio'}),400
-        if not data.get('fecha_inicio'):
-            return jsonify({'error':'la fecha de inicio es obligatoria'}), 400
-
         campeonato_existente = Campeonato.query.filter_by(nombre=data['nombre']).first()
         if campeonato_existente:
             return jsonify({'error': 'Ya existe un campeonato con este nombre'}), 400
@@ -70,8 +69,8 @@ def crear_campeonato():
         nuevo_campeonato = Campeonato(
             nombre=data['nombre'],
             descripcion=data.get('descripcion'),
-            fecha_inicio=datetime.fromisoformat(data['fecha_inicio']).date(),
-            fecha_fin=datetime.fromisoformat(data['fecha_fin']).date() if data.get('fecha_fin') else None,
+            fecha_inicio=data['fecha_inicio'],
+            fecha_fin=data.get('fecha_fin'),
             creado_por=int(current_user_id),
             estado='planificacion'
         )
@@ -83,8 +82,6 @@ def crear_campeonato():
             'campeonato': nuevo_campeonato.to_dict()
         }), 201
 
-    except ValueError:
-        return jsonify({'error': 'Formato de fecha invalido. Usa YYYY-MM-DD'}), 400
     except Exception as e:
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
@@ -124,14 +121,13 @@ def obtener_campeonato_por_id(id_campeonato):
 @campeonato_bp.route('/<int:id_campeonato>', methods=['PUT'])
 @jwt_required()
 @role_required(['admin'])
-def actualizar_campeonato(id_campeonato):
+@validate_json(CampeonatoUpdateSchema)
+def actualizar_campeonato(id_campeonato, data):
     try:
         campeonato = Campeonato.query.get(id_campeonato)
         if not campeonato:
             return jsonify({'error': 'Campeonato no encontrado'}), 404
         
-        data = request.get_json()
-        
         if 'nombre' in data:
             existe = Campeonato.query.filter_by(nombre=data['nombre']).first()
             if existe and existe.id_campeonato != id_campeonato:
@@ -142,17 +138,13 @@ def actualizar_campeonato(id_campeonato):
             campeonato.descripcion = data['descripcion']
         
         if 'fecha_inicio' in data:
-            campeonato.fecha_inicio = datetime.fromisoformat(data['fecha_inicio']).date()
+            campeonato.fecha_inicio = data['fecha_inicio']
         
         if 'fecha_fin' in data:
-            campeonato.fecha_fin = datetime.fromisoformat(data['fecha_fin']).date() if data['fecha_fin'] else None
+            campeonato.fecha_fin = data['fecha_fin']
         
-        # ✅ AGREGAR ESTO:
         if 'max_equipos' in data:
-            max_equipos = int(data['max_equipos'])
-            if max_equipos < 2:
-                return jsonify({'error': 'El campeonato debe tener al menos 2 equipos'}), 400
-            campeonato.max_equipos = max_equipos
+            campeonato.max_equipos = data['max_equipos']
         
         db.session.commit()
         return jsonify({
@@ -160,8 +152,6 @@ def actualizar_campeonato(id_campeonato):
             'campeonato': campeonato.to_dict()
         }), 200
         
-    except ValueError:
-        return jsonify({'error': 'Formato de fecha inválido, Usa YYYY-MM-DD'}), 400
     except Exception as e:
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
@@ -169,20 +159,12 @@ def actualizar_campeonato(id_campeonato):
 @campeonato_bp.route('/<int:id_campeonato>/estado', methods=['PATCH'])
 @jwt_required()
 @role_required(['admin'])
-def cambiar_estado_campeonato(id_campeonato):
+@validate_json(CampeonatoEstadoSchema)
+def cambiar_estado_campeonato(id_campeonato, data):
     try:
         campeonato = Campeonato.query.get(id_campeonato)
         if not campeonato:
             return jsonify({'error': 'Campeonato no encontrado'}), 404
-        data = request.get_json()
-        if 'estado' not in data:
-            return jsonify({'error': 'El campo estado es requerido'}), 400
-        estados_validos = ['planificacion', 'en_curso','finalizado']
-        if data['estado'] not in estados_validos:
-            return jsonify({
-                'error': f'Estado no valido. Debe ser uno de:{",".join(estados_validos)}'
-
-            }), 400
         campeonato.estado = data['estado']
         db.session.commit()
 
@@ -239,7 +221,8 @@ def obtener_partidos_campeonato(id_campeonato):
 @campeonato_bp.route('/<int:id_campeonato>/generar-partidos', methods=['POST'])
 @jwt_required()
 @role_required(['admin'])
-def generar_partidos(id_campeonato):
+@validate_json(GenerarPartidosSchema)
+def generar_partidos(id_campeonato, data):
     """
     Genera automáticamente todos los partidos del campeonato
     
@@ -268,17 +251,11 @@ def generar_partidos(id_campeonato):
                 'mensaje': 'Si deseas regenerarlos, primero elimina los partidos existentes'
             }), 400
         
-        data = request.get_json()
-        
-        # Validaciones
-        if not data.get('fecha_inicio'):
-            return jsonify({'error': 'La fecha de inicio es obligatoria'}), 400
-        
-        fecha_inicio = datetime.strptime(data['fecha_inicio'], '%Y-%m-%d').date()
-        dias_entre_jornadas = data.get('dias_entre_jornadas', 7)
-        hora_inicio = data.get('hora_inicio', '15:00')
-        hora_segundo = data.get('hora_segundo_partido', '17:00')
-        incluir_vuelta = data.get('incluir_vuelta', True)
+        fecha_inicio = data['fecha_inicio']
+        dias_entre_jornadas = data['dias_entre_jornadas']
+        hora_inicio = data['hora_inicio']
+        hora_segundo = data['hora_segundo_partido']
+        incluir_vuelta = data['incluir_vuelta']
         
         # Obtener equipos aprobados
         equipos = Equipo.query.filter_by(estado='aprobado').all()
@@ -302,7 +279,7 @@ def generar_partidos(id_campeonato):
             
             for idx, (equipo_local, equipo_visitante) in enumerate(partidos_jornada):
                 hora = hora_inicio if idx % 2 == 0 else hora_segundo
-                fecha_hora = datetime.combine(fecha_actual, datetime.strptime(hora, '%H:%M').time())
+                fecha_hora = datetime.combine(fecha_actual, hora)
                 
                 nuevo_partido = Partido(
                     id_campeonato=id_campeonato,
@@ -327,7 +304,7 @@ def generar_partidos(id_campeonato):
                 
                 for idx, (equipo_visitante, equipo_local) in enumerate(partidos_jornada):
                     hora = hora_inicio if idx % 2 == 0 else hora_segundo
-                    fecha_hora = datetime.combine(fecha_actual, datetime.strptime(hora, '%H:%M').time())
+                    fecha_hora = datetime.combine(fecha_actual, hora)
                     
                     nuevo_partido = Partido(
                         id_campeonato=id_campeonato,
@@ -1,9 +1,17 @@
-from flask import Blueprint, request, jsonify
+import time
+from flask import Blueprint, request, jsonify, current_app, send_file
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.middlewares.auth_middleware import role_required
+from app.middlewares.validation_middleware import validate_json
 from app.extensions import db
 from app.models.equipo import Equipo
 from app.models.usuario import Usuario
+from app.schemas import EquipoCreateSchema, EquipoEstadoSchema, EquiposEstadoSchema, EquipoUpdateSchema
+from app.serializers import equipo_serializer
+from app.utils.read_only import ReadOnlyQuery
+from app.utils.bulk_import import BulkReader
+from app.utils.logo_storage import LogoStorage
+from app.utils.team_import import TeamImporter
 from datetime import datetime
 from werkzeug.utils import secure_filename
 import os
@@ -13,7 +21,8 @@ equipo_bp = Blueprint('equipos', __name__)
 @equipo_bp.route('', methods=['POST'])
 @jwt_required()
 @role_required(['admin', 'lider'])
-def crear_equipo():
+@validate_json(EquipoCreateSchema)
+def crear_equipo(data):
     """
     Crear equipo usando NOMBRE del líder en vez de ID
     
@@ -26,18 +35,6 @@ def crear_equipo():
         }
     """
     try:
-        data = request.get_json()
-        
-        # Validaciones básicas
-        if not data.get('nombre'):
-            return jsonify({'error': 'El nombre del equipo es obligatorio'}), 400
-        
-        if not data.get('nombre_lider'):
-            return jsonify({'error': 'El nombre del líder es obligatorio'}), 400
-        
-        if not data.get('estadio'):
-            return jsonify({'error': 'El estadio es obligatorio'}), 400
-        
         # Buscar líder por nombre
         lider = Usuario.query.filter(
             Usuario.nombre.ilike(f"%{data['nombre_lider']}%")
@@ -81,21 +78,73 @@ def crear_equipo():
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
 
+@equipo_bp.route('/import', methods=['POST'])
+@jwt_required()
+@role_required(['admin', 'lider'])
+def importar_equipos():
+    """
+    Registro masivo de equipos desde un CSV o un array JSON
+    
+    Content-Type: text/csv, application/json o multipart/form-data (archivo 'archivo')
+    Query: ?notificar=true (avisa a cada líder que su equipo quedó pendiente)
+    
+    CSV:
+        nombre,email_lider,estadio,logo_url
+        Barcelona FC,juan@gmail.com,Camp Nou,
+    
+    JSON:
+        [{"nombre": "Barcelona FC", "nombre_lider": "Juan Pérez", "estadio": "Camp Nou"}, ...]
+    
+    El líder se indica con id_lider, email_lider o nombre_lider (sin
+    distinguir mayúsculas ni tildes). Cada equipo queda 'pendiente' con su
+    solicitud; se aprueban con PATCH /api/equipos/estado.
+    """
+    importador = None
+    try:
+        inicio = time.perf_counter()
+        
+        importador = TeamImporter(
+            notificar=request.args.get('notificar', 'false').lower() == 'true',
+            chunk_size=current_app.config.get('EQUIPOS_IMPORT_CHUNK_SIZE', 1000),
+            max_errores=current_app.config.get('EQUIPOS_IMPORT_MAX_ERRORES', 1000)
+        )
+        resultado = importador.run(BulkReader.records(request))
+        
+        if not resultado['total']:
+            return jsonify({'error': 'El archivo no contiene equipos'}), 400
+        
+        resultado['duracion_ms'] = round((time.perf_counter() - inicio) * 1000, 1)
+        resultado['mensaje'] = (f"{resultado['insertados']} equipos registrados, "
+                                f"{resultado['rechazados']} filas con errores")
+        return jsonify(resultado), 201 if resultado['insertados'] else 400
+        
+    except ValueError as e:
+        # Archivo mal formado: los bloques anteriores al error ya quedaron guardados
+        db.session.rollback()
+        return jsonify({
+            'error': str(e),
+            'insertados': importador.insertados if importador else 0
+        }), 400
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
 @equipo_bp.route('', methods=['GET'])
 def obtener_equipos():
     try:
         estado = request.args.get('estado')
         id_lider = request.args.get('id_lider')
         
-        query = Equipo.query
+        # Una consulta: nombre del líder por JOIN y total de jugadores por subconsulta
+        query = equipo_serializer.select()
         if estado:
-            query = query.filter_by(estado=estado)
+            query = query.where(Equipo.estado == estado)
         if id_lider:
-            query = query.filter_by(id_lider=int(id_lider))
+            query = query.where(Equipo.id_lider == int(id_lider))
         
-        equipos = query.order_by(Equipo.fecha_registro.desc()).all()
+        equipos = ReadOnlyQuery.dump_all(equipo_serializer, query.order_by(Equipo.fecha_registro.desc()))
         return jsonify({
-            'equipos': [equipo.to_dict() for equipo in equipos]
+            'equipos': equipos
         }), 200
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -115,14 +164,13 @@ def obtener_equipo_por_id(id_equipo):
 @equipo_bp.route('/<int:id_equipo>', methods=['PUT'])
 @jwt_required()
 @role_required(['admin', 'lider'])
-def actualizar_equipo(id_equipo):
+@validate_json(EquipoUpdateSchema)
+def actualizar_equipo(id_equipo, data):
     try:
         equipo = Equipo.query.get(id_equipo)
         if not equipo:
             return jsonify({'error': 'Equipo no encontrado'}), 404
         
-        data = request.get_json()
-        
         if 'nombre' in data:
             existe = Equipo.query.filter_by(nombre=data['nombre']).first()
             if existe and existe.id_equipo != id_equipo:
@@ -131,6 +179,8 @@ def actualizar_equipo(id_equipo):
         
         if 'logo_url' in data:
             equipo.logo_url = data['logo_url']
+            # Un logo externo no tiene miniaturas: sin esto se seguiría mostrando la del logo subido antes
+            equipo.logo_hash = LogoStorage.hash_de_url(data['logo_url'])
         
         if 'estadio' in data:
             equipo.estadio = data['estadio']
@@ -149,23 +199,13 @@ def actualizar_equipo(id_equipo):
 @equipo_bp.route('/<int:id_equipo>/estado', methods=['PATCH'])
 @jwt_required()
 @role_required(['admin'])
-def cambiar_estado_equipo(id_equipo):
+@validate_json(EquipoEstadoSchema)
+def cambiar_estado_equipo(id_equipo, data):
     try:
         equipo = Equipo.query.get(id_equipo)
         if not equipo:
             return jsonify({'error': 'Equipo no encontrado'}), 404
         
-        data = request.get_json()
-        
-        if 'estado' not in data:
-            return jsonify({'error': 'El campo estado es requerido'}), 400
-        
-        estados_validos = ['pendiente', 'aprobado', 'rechazado']
-        if data['estado'] not in estados_validos:
-            return jsonify({
-                'error': f'Estado no válido. Debe ser uno de: {", ".join(estados_validos)}'
-            }), 400
-        
         current_user_id = get_jwt_identity()
         
         equipo.estado = data['estado']
@@ -187,6 +227,139 @@ def cambiar_estado_equipo(id_equipo):
         return jsonify({'error': str(e)}), 500
 
 
+@equipo_bp.route('/estado', methods=['PATCH'])
+@jwt_required()
+@role_required(['admin'])
+@validate_json(EquiposEstadoSchema)
+def cambiar_estado_equipos(data):
+    """
+    Aprueba o rechaza varios equipos en una sola operación
+    
+    Body:
+        {
+            "ids": [3, 4, 7],
+            "estado": "aprobado",
+            "observaciones": "Documentación completa",
+            "notificar": true
+        }
+    """
+    try:
+        ids = data['ids']
+        maximo = current_app.config.get('EQUIPOS_ESTADO_MAX_IDS', 5000)
+        if len(ids) > maximo:
+            return jsonify({'error': f'Máximo {maximo} equipos por petición'}), 400
+        
+        resultado = Equipo.cambiar_estado_masivo(
+            ids,
+            estado=data['estado'],
+            id_admin=int(get_jwt_identity()),
+            observaciones=data.get('observaciones'),
+            notificar=data['notificar'],
+            chunk_size=current_app.config.get('EQUIPOS_IMPORT_CHUNK_SIZE', 1000)
+        )
+        db.session.commit()
+        
+        if not resultado['actualizados']:
+            return jsonify({'error': 'Equipos no encontrados', **resultado}), 404
+        
+        return jsonify({
+            'mensaje': f'{len(resultado["actualizados"])} equipos {data["estado"]}s',
+            **resultado
+        }), 200
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+
+@equipo_bp.route('/<int:id_equipo>/logo', methods=['POST'])
+@jwt_required()
+@role_required(['admin', 'lider'])
+def subir_logo(id_equipo):
+    """
+    Sube el logo del equipo (PNG, JPG, GIF o WEBP)
+    
+    multipart/form-data con el archivo 'logo', o la imagen como cuerpo
+    (Content-Type: image/png, ...). Las miniaturas se generan en segundo plano.
+    """
+    try:
+        equipo = db.session.get(Equipo, id_equipo)
+        if not equipo:
+            return jsonify({'error': 'Equipo no encontrado'}), 404
+        
+        archivo = request.files.get('logo')
+        if archivo:
+            stream = archivo.stream
+        elif (request.mimetype or '').startswith('image/'):
+            stream = request.stream
+        else:
+            return jsonify({'error': "Envíe la imagen en el campo 'logo' o como cuerpo image/*"}), 400
+        
+        # Un logo repetido no se vuelve a escribir; el trabajo solo crea las miniaturas que falten
+        logo_hash, extension, _ = LogoStorage.guardar(stream)
+        LogoStorage.programar_miniaturas(logo_hash)
+        
+        equipo.logo_hash = logo_hash
+        equipo.logo_url = LogoStorage.url(f'{logo_hash}.{extension}')
+        db.session.commit()
+        
+        return jsonify({
+            'mensaje': 'Logo actualizado',
+            'logo_url': equipo.logo_url,
+            'logo_miniatura': LogoStorage.miniatura_url(logo_hash),
+            'miniaturas': {
+                str(px): LogoStorage.url(LogoStorage.nombre_miniatura(logo_hash, px))
+                for px in current_app.config.get('LOGO_THUMBNAIL_SIZES', (32, 64, 128))
+            }
+        }), 200
+        
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+
+@equipo_bp.route('/logos/<string:nombre>', methods=['GET'])
+def servir_logo(nombre):
+    """
+    Sirve un logo o una miniatura por su nombre (<sha256>.<ext> o <sha256>_<px>.png)
+    
+    El contenido de una URL nunca cambia: Cache-Control immutable, ETag =
+    nombre, y soporte de Range / If-None-Match (send_file conditional).
+    Si la miniatura no se pudo generar se sirve el original con su propio
+    nombre como ETag: al revalidar, ya con la miniatura, no responde 304.
+    """
+    try:
+        partes = LogoStorage.NOMBRE.match(nombre)
+        if not partes:
+            return jsonify({'error': 'Logo no encontrado'}), 404
+        
+        ruta = LogoStorage.ruta(nombre)
+        inmutable = True
+        if not os.path.exists(ruta) and partes.group('px'):
+            # Miniatura aún no generada: se genera ahora (o se sirve el original)
+            tamanos = current_app.config.get('LOGO_THUMBNAIL_SIZES', (32, 64, 128))
+            if int(partes.group('px')) not in tamanos:
+                return jsonify({'error': 'Logo no encontrado'}), 404
+            LogoStorage.generar_miniaturas(partes.group('hash'), LogoStorage.carpeta(), tamanos)
+            if not os.path.exists(ruta):
+                ruta = LogoStorage.original(partes.group('hash'))
+                inmutable = False
+        if not ruta or not os.path.exists(ruta):
+            return jsonify({'error': 'Logo no encontrado'}), 404
+        
+        response = send_file(ruta, conditional=True, etag=os.path.basename(ruta), max_age=60)
+        if inmutable:
+            response.headers['Cache-Control'] = (
+                f"public, max-age={current_app.config.get('LOGO_CACHE_MAX_AGE', 31536000)}, immutable"
+            )
+        return response
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
 @equipo_bp.route('/<int:id_equipo>', methods=['DELETE'])
 @jwt_required()
 @role_required(['admin'])
@@ -1,5 +1,6 @@
 from flask import Blueprint, request, jsonify
 from app.extensions import db
+from app.utils.logo_storage import LogoStorage
 from sqlalchemy import text
 
 estadisticas_bp = Blueprint('estadisticas', __name__)
@@ -22,7 +23,8 @@ def tabla_posiciones():
         query = """
             SELECT 
                 vtp.*,
-                e.logo_url
+                e.logo_url,
+                e.logo_hash
             FROM vista_tabla_posiciones vtp
             LEFT JOIN equipos e ON vtp.id_equipo = e.id_equipo
         """
@@ -34,6 +36,7 @@ def tabla_posiciones():
                     e.id_equipo,
                     e.nombre AS equipo,
                     e.logo_url,
+                    e.logo_hash,
                     COUNT(DISTINCT p.id_partido) AS partidos_jugados,
                     SUM(CASE 
                         WHEN (p.id_equipo_local = e.id_equipo AND p.goles_local > p.goles_visitante) OR
@@ -74,7 +77,7 @@ def tabla_posiciones():
                     AND p.estado = 'finalizado'
                     AND p.id_campeonato = :id_campeonato
                 WHERE e.estado = 'aprobado'
-                GROUP BY e.id_equipo, e.nombre, e.logo_url
+                GROUP BY e.id_equipo, e.nombre, e.logo_url, e.logo_hash
                 ORDER BY puntos DESC, diferencia_goles DESC, goles_favor DESC
             """
             result = db.session.execute(text(query), {'id_campeonato': int(id_campeonato)})
@@ -85,9 +88,10 @@ def tabla_posiciones():
         columns = result.keys()
         tabla = [dict(zip(columns, row)) for row in result.fetchall()]
         
-        # Agregar posición
+        # Agregar posición; el logo apunta a la miniatura (LOGO_LIST_SIZE)
         for idx, equipo in enumerate(tabla, start=1):
             equipo['posicion'] = idx
+            equipo['logo_url'] = LogoStorage.miniatura_url(equipo.pop('logo_hash', None), equipo.get('logo_url'))
         
         return jsonify({
             'tabla_posiciones': tabla,
@@ -123,6 +127,7 @@ def obtener_goleadores():
                     j.dorsal,
                     e.nombre AS equipo,
                     e.logo_url AS equipo_logo,
+                    e.logo_hash AS equipo_logo_hash,
                     COUNT(g.id_gol) AS total_goles,
                     SUM(CASE WHEN g.tipo = 'penal' THEN 1 ELSE 0 END) AS penales,
                     SUM(CASE WHEN g.tipo = 'tiro_libre' THEN 1 ELSE 0 END) AS tiros_libres
@@ -131,7 +136,7 @@ def obtener_goleadores():
                 LEFT JOIN goles g ON j.id_jugador = g.id_jugador AND g.tipo != 'autogol'
                 LEFT JOIN partidos p ON g.id_partido = p.id_partido
                 WHERE p.id_campeonato = :id_campeonato AND p.estado = 'finalizado'
-                GROUP BY j.id_jugador, j.nombre, j.apellido, j.dorsal, e.nombre, e.logo_url
+                GROUP BY j.id_jugador, j.nombre, j.apellido, j.dorsal, e.nombre, e.logo_url, e.logo_hash
                 HAVING total_goles > 0
                 ORDER BY total_goles DESC, j.apellido
                 LIMIT :limit
@@ -149,13 +154,14 @@ def obtener_goleadores():
                     j.dorsal,
                     e.nombre AS equipo,
                     e.logo_url AS equipo_logo,
+                    e.logo_hash AS equipo_logo_hash,
                     COUNT(g.id_gol) AS total_goles,
                     SUM(CASE WHEN g.tipo = 'penal' THEN 1 ELSE 0 END) AS penales,
                     SUM(CASE WHEN g.tipo = 'tiro_libre' THEN 1 ELSE 0 END) AS tiros_libres
                 FROM jugadores j
                 INNER JOIN equipos e ON j.id_equipo = e.id_equipo
                 LEFT JOIN goles g ON j.id_jugador = g.id_jugador AND g.tipo != 'autogol'
-                GROUP BY j.id_jugador, j.nombre, j.apellido, j.dorsal, e.nombre, e.logo_url
+                GROUP BY j.id_jugador, j.nombre, j.apellido, j.dorsal, e.nombre, e.logo_url, e.logo_hash
                 HAVING total_goles > 0
                 ORDER BY total_goles DESC, j.apellido
                 LIMIT :limit
@@ -165,9 +171,12 @@ def obtener_goleadores():
         columns = result.keys()
         goleadores = [dict(zip(columns, row)) for row in result.fetchall()]
         
-        # Agregar posición
+        # Agregar posición; el logo apunta a la miniatura (LOGO_LIST_SIZE)
         for idx, goleador in enumerate(goleadores, start=1):
             goleador['posicion'] = idx
+            goleador['equipo_logo'] = LogoStorage.miniatura_url(
+                goleador.pop('equipo_logo_hash', None), goleador.get('equipo_logo')
+            )
         
         return jsonify({
             'goleadores': goleadores,
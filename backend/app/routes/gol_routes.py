@@ -2,11 +2,16 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.middlewares.auth_middleware import role_required
+from app.middlewares.validation_middleware import validate_json
 from app.extensions import db
 from app.models.gol import Gol
 from app.models.partido import Partido
 from app.models.jugador import Jugador
 from app.enums.gol_enum import TipoGol
+from app.schemas import GolCreateSchema
+from app.serializers import gol_serializer
+from app.utils.read_only import ReadOnlyQuery
+from app.utils.live_feed import LiveFeed
 from datetime import datetime
 
 
@@ -16,26 +21,16 @@ gol_bp = Blueprint('goles', __name__)
 @gol_bp.route('', methods=['POST'])
 @jwt_required()
 @role_required(['admin', 'lider'])
-def crear_gol():
+@validate_json(GolCreateSchema)
+def crear_gol(data):
     try:
-        data = request.get_json()
-
-        if not data.get('id_partido'):
-            return jsonify({'error': 'El partido es requerido'}), 400
-        
-        if not data.get('nombre_jugador'):
-            return jsonify({'error': 'El nombre del jugador es requerido'}), 400
-        
-        if not data.get('minuto'):
-            return jsonify({'error': 'El minuto es requerido'}), 400
-        
         # Buscar partido
         partido = Partido.query.get(data['id_partido'])
         if not partido:
             return jsonify({'error': 'Partido no encontrado'}), 404
         
         # Buscar jugador por nombre
-        nombre_completo = data['nombre_jugador'].strip()
+        nombre_completo = data['nombre_jugador']
         partes = nombre_completo.split()
         jugador = None
         
@@ -67,12 +62,10 @@ def crear_gol():
                 'partido': f"{partido.equipo_local.nombre} vs {partido.equipo_visitante.nombre}"
             }), 400
 
-        minuto = int(data['minuto'])
-        if minuto < 1 or minuto > 120:
-            return jsonify({'error': 'El minuto debe estar entre 1 y 120'}), 400
+        minuto = data['minuto']
 
-        # Mapear string a Enum
-        tipo_str = data.get('tipo', 'normal').lower()
+        # Mapear string a Enum (el schema ya validó el tipo)
+        tipo_str = data['tipo']
         
         tipo_map = {
             'normal': TipoGol.NORMAL,
@@ -81,11 +74,6 @@ def crear_gol():
             'tiro_libre': TipoGol.TIRO_LIBRE
         }
         
-        if tipo_str not in tipo_map:
-            return jsonify({
-                'error': f'Tipo no válido. Debe ser uno de: normal, penal, autogol, tiro_libre'
-            }), 400
-        
         tipo_enum = tipo_map[tipo_str]
 
         # Crear gol con ENUM
@@ -98,21 +86,29 @@ def crear_gol():
         
         db.session.add(nuevo_gol)
         
-        # Actualizar marcador automáticamente
-        if tipo_enum != TipoGol.AUTOGOL:
-            if jugador.id_equipo == partido.id_equipo_local:
-                partido.goles_local += 1
-            else:
-                partido.goles_visitante += 1
-        else:
-            # Autogol suma al equipo contrario
-            if jugador.id_equipo == partido.id_equipo_local:
-                partido.goles_visitante += 1
-            else:
-                partido.goles_local += 1
+        # Actualizar marcador y contadores en la misma transacción
+        # (autogol suma al equipo contrario)
+        es_local = jugador.id_equipo == partido.id_equipo_local
+        if tipo_enum == TipoGol.AUTOGOL:
+            es_local = not es_local
+        Partido.ajustar_contadores(
+            partido.id_partido,
+            total_goles=1,
+            **{'goles_local' if es_local else 'goles_visitante': 1}
+        )
         
         db.session.commit()
         
+        LiveFeed.publish(partido.id_partido, 'gol', dict(
+            partido.marcador(),
+            id_gol=nuevo_gol.id_gol,
+            id_jugador=jugador.id_jugador,
+            jugador=f"{jugador.nombre} {jugador.apellido}",
+            id_equipo=jugador.id_equipo,
+            minuto=minuto,
+            tipo=tipo_str
+        ))
+        
         return jsonify({
             'mensaje': 'Gol registrado exitosamente',
             'gol': nuevo_gol.to_dict(),
@@ -121,8 +117,6 @@ def crear_gol():
             'marcador_actual': f"{partido.equipo_local.nombre} {partido.goles_local} - {partido.goles_visitante} {partido.equipo_visitante.nombre}"
         }), 201
         
-    except ValueError:
-        return jsonify({'error': 'El minuto debe ser un número válido'}), 400
     except Exception as e:
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
@@ -137,22 +131,22 @@ def obtener_goles():
         tipo = request.args.get('tipo')
         
 
-        query = Gol.query
+        query = gol_serializer.select()
         
         if id_partido:
-            query = query.filter_by(id_partido=int(id_partido))
+            query = query.where(Gol.id_partido == int(id_partido))
         
         if id_jugador:
-            query = query.filter_by(id_jugador=int(id_jugador))
+            query = query.where(Gol.id_jugador == int(id_jugador))
         
         if tipo:
-            query = query.filter_by(tipo=tipo)
+            query = query.where(Gol.tipo == tipo)
         
 
-        goles = query.order_by(Gol.minuto.asc()).all()
+        goles = ReadOnlyQuery.dump_all(gol_serializer, query.order_by(Gol.minuto.asc()))
         
         return jsonify({
-            'goles': [g.to_dict() for g in goles]
+            'goles': goles
         }), 200
         
     except Exception as e:
@@ -192,20 +186,20 @@ def eliminar_gol(id_gol):
         partido = Partido.query.get(gol.id_partido)
         jugador = Jugador.query.get(gol.id_jugador)
 
-        if gol.tipo != 'autogol':
-            if jugador.id_equipo == partido.id_equipo_local:
-                partido.goles_local = max(0, partido.goles_local - 1)
-            else:
-                partido.goles_visitante = max(0, partido.goles_visitante - 1)
-        else:
-            if jugador.id_equipo == partido.id_equipo_local:
-                partido.goles_visitante = max(0, partido.goles_visitante - 1)
-            else:
-                partido.goles_local = max(0, partido.goles_local - 1)
+        es_local = jugador.id_equipo == partido.id_equipo_local
+        if gol.tipo == TipoGol.AUTOGOL:
+            es_local = not es_local
+        Partido.ajustar_contadores(
+            partido.id_partido,
+            total_goles=-1,
+            **{'goles_local' if es_local else 'goles_visitante': -1}
+        )
         
         db.session.delete(gol)
         db.session.commit()
         
+        LiveFeed.publish(partido.id_partido, 'gol_eliminado', dict(partido.marcador(), id_gol=id_gol))
+        
         return jsonify({
             'mensaje': 'Gol eliminado exitosamente'
         }), 200
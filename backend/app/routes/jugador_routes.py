@@ -1,17 +1,26 @@
-from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required
+import os
+import time
+from flask import Blueprint, request, jsonify, current_app, send_file
+from flask_jwt_extended import jwt_required, get_jwt, get_jwt_identity
 from app.middlewares.auth_middleware import role_required
+from app.middlewares.validation_middleware import validate_json
 from app.extensions import db
 from app.models.jugador import Jugador
 from app.models.equipo import Equipo
-from datetime import datetime
+from app.schemas import JugadorActivoSchema, JugadorCreateSchema, JugadorUpdateSchema
+from app.serializers import jugador_serializer
+from app.utils.read_only import ReadOnlyQuery
+from app.utils.bulk_import import BulkReader
+from app.utils.document_storage import DocumentStorage
+from app.utils.roster_import import RosterImporter
 
 jugador_bp = Blueprint('jugadores', __name__)
 
 @jugador_bp.route('', methods=['POST'])
 @jwt_required()
 @role_required(['admin', 'lider'])
-def crear_jugador():
+@validate_json(JugadorCreateSchema)
+def crear_jugador(data):
     """
     Crear jugador usando NOMBRE del equipo en vez de ID
     
@@ -24,24 +33,6 @@ def crear_jugador():
         }
     """
     try:
-        data = request.get_json()
-        
-        # Validaciones básicas
-        if not data.get('nombre_equipo'):
-            return jsonify({'error': 'El nombre del equipo es obligatorio'}), 400
-        
-        if not data.get('nombre'):
-            return jsonify({'error': 'El nombre es obligatorio'}), 400
-        
-        if not data.get('apellido'):
-            return jsonify({'error': 'El apellido es obligatorio'}), 400
-        
-        if not data.get('documento'):
-            return jsonify({'error': 'El documento es obligatorio'}), 400
-        
-        if not data.get('dorsal'):
-            return jsonify({'error': 'El dorsal es obligatorio'}), 400
-        
         # Buscar equipo por nombre
         equipo = Equipo.query.filter(
             Equipo.nombre.ilike(f"%{data['nombre_equipo']}%")
@@ -76,9 +67,9 @@ def crear_jugador():
             nombre=data['nombre'],
             apellido=data['apellido'],
             documento=data['documento'],
-            dorsal=int(data['dorsal']),
-            posicion=data.get('posicion', 'delantero'),
-            fecha_nacimiento=datetime.fromisoformat(data['fecha_nacimiento']).date() if data.get('fecha_nacimiento') else None
+            dorsal=data['dorsal'],
+            posicion=data['posicion'],
+            fecha_nacimiento=data.get('fecha_nacimiento')
         )
         
         db.session.add(nuevo_jugador)
@@ -90,8 +81,62 @@ def crear_jugador():
             'equipo': equipo.nombre
         }), 201
         
-    except ValueError:
-        return jsonify({'error': 'Formato de fecha inválido. Use YYYY-MM-DD'}), 400
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+
+@jugador_bp.route('/import', methods=['POST'])
+@jwt_required()
+@role_required(['admin', 'lider'])
+def importar_jugadores():
+    """
+    Registro masivo de jugadores desde un CSV o un array JSON
+    
+    Content-Type: text/csv, application/json o multipart/form-data (archivo 'archivo')
+    Query: ?id_equipo=5 (equipo de las filas que no indican id_equipo ni nombre_equipo)
+    
+    CSV:
+        nombre_equipo,nombre,apellido,documento,dorsal,posicion,fecha_nacimiento
+        Barcelona FC,Lionel,Messi,1234567890,10,delantero,1987-06-24
+    
+    JSON:
+        [{"nombre_equipo": "Barcelona FC", "nombre": "Lionel", "apellido": "Messi",
+          "documento": "1234567890", "dorsal": 10}, ...]
+    
+    Las filas válidas se insertan aunque otras tengan errores; el reporte
+    indica la fila (línea del CSV o posición en el array) y sus errores.
+    """
+    importador = None
+    try:
+        inicio = time.perf_counter()
+        
+        id_equipo = request.args.get('id_equipo', type=int)
+        if request.args.get('id_equipo') and id_equipo is None:
+            return jsonify({'error': 'id_equipo debe ser un número'}), 400
+        
+        importador = RosterImporter(
+            id_equipo_defecto=id_equipo,
+            chunk_size=current_app.config.get('JUGADORES_IMPORT_CHUNK_SIZE', 1000),
+            max_errores=current_app.config.get('JUGADORES_IMPORT_MAX_ERRORES', 1000)
+        )
+        resultado = importador.run(BulkReader.records(request))
+        
+        if not resultado['total']:
+            return jsonify({'error': 'El archivo no contiene jugadores'}), 400
+        
+        resultado['duracion_ms'] = round((time.perf_counter() - inicio) * 1000, 1)
+        resultado['mensaje'] = (f"{resultado['insertados']} jugadores importados, "
+                                f"{resultado['rechazados']} filas con errores")
+        return jsonify(resultado), 201 if resultado['insertados'] else 400
+        
+    except ValueError as e:
+        # Archivo mal formado: los bloques anteriores al error ya quedaron guardados
+        db.session.rollback()
+        return jsonify({
+            'error': str(e),
+            'insertados': importador.insertados if importador else 0
+        }), 400
     except Exception as e:
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
@@ -104,19 +149,20 @@ def obtener_jugadores():
         posicion = request.args.get('posicion')
         activo = request.args.get('activo')
         
-        query = Jugador.query
+        # Solo las columnas del listado (con el nombre del equipo por JOIN)
+        query = jugador_serializer.select()
         
         if id_equipo:
-            query = query.filter_by(id_equipo=int(id_equipo))
+            query = query.where(Jugador.id_equipo == int(id_equipo))
         if posicion:
-            query = query.filter_by(posicion=posicion)
+            query = query.where(Jugador.posicion == posicion)
         if activo is not None:
-            query = query.filter_by(activo=activo.lower() == 'true')
+            query = query.where(Jugador.activo == (activo.lower() == 'true'))
         
-        jugadores = query.order_by(Jugador.apellido, Jugador.nombre).all()
+        jugadores = ReadOnlyQuery.dump_all(jugador_serializer, query.order_by(Jugador.apellido, Jugador.nombre))
         
         return jsonify({
-            'jugadores': [jugador.to_dict() for jugador in jugadores]
+            'jugadores': jugadores
         }), 200
         
     except Exception as e:
@@ -137,14 +183,13 @@ def obtener_jugador_por_id(id_jugador):
 @jugador_bp.route('/<int:id_jugador>', methods=['PUT'])
 @jwt_required()
 @role_required(['admin', 'lider'])
-def actualizar_jugador(id_jugador):
+@validate_json(JugadorUpdateSchema)
+def actualizar_jugador(id_jugador, data):
     try:
         jugador = Jugador.query.get(id_jugador)
         if not jugador:
             return jsonify({'error': 'Jugador no encontrado'}), 404
         
-        data = request.get_json()
-        
         if 'nombre' in data:
             jugador.nombre = data['nombre']
         
@@ -159,18 +204,13 @@ def actualizar_jugador(id_jugador):
             ).first()
             if dorsal_ocupado and dorsal_ocupado.id_jugador != id_jugador:
                 return jsonify({'error': f'El dorsal {data["dorsal"]} ya está ocupado en este equipo'}), 400
-            jugador.dorsal = int(data['dorsal'])
+            jugador.dorsal = data['dorsal']
         
         if 'posicion' in data:
-            posiciones_validas = ['portero', 'defensa', 'mediocampista', 'delantero']
-            if data['posicion'] not in posiciones_validas:
-                return jsonify({
-                    'error': f'Posición no válida. Debe ser una de: {", ".join(posiciones_validas)}'
-                }), 400
             jugador.posicion = data['posicion']
         
         if 'fecha_nacimiento' in data:
-            jugador.fecha_nacimiento = datetime.fromisoformat(data['fecha_nacimiento']).date()
+            jugador.fecha_nacimiento = data['fecha_nacimiento']
         
         if 'activo' in data:
             jugador.activo = data['activo']
@@ -182,8 +222,6 @@ def actualizar_jugador(id_jugador):
             'jugador': jugador.to_dict()
         }), 200
         
-    except ValueError:
-        return jsonify({'error': 'Formato de fecha inválido. Use YYYY-MM-DD'}), 400
     except Exception as e:
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
@@ -192,17 +230,13 @@ def actualizar_jugador(id_jugador):
 @jugador_bp.route('/<int:id_jugador>/activar', methods=['PATCH'])
 @jwt_required()
 @role_required(['admin', 'lider'])
-def cambiar_estado_jugador(id_jugador):
+@validate_json(JugadorActivoSchema)
+def cambiar_estado_jugador(id_jugador, data):
     try:
         jugador = Jugador.query.get(id_jugador)
         if not jugador:
             return jsonify({'error': 'Jugador no encontrado'}), 404
         
-        data = request.get_json()
-        
-        if 'activo' not in data:
-            return jsonify({'error': 'El campo activo es requerido'}), 400
-        
         jugador.activo = data['activo']
         db.session.commit()
         
@@ -270,4 +304,233 @@ def obtener_jugadores_por_posicion(id_equipo, posicion):
         }), 200
         
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
\ No newline at end of file
+        return jsonify({'error': str(e)}), 500
+
+
+def _jugador_con_permiso(id_jugador):
+    """(jugador, None) si el usuario es admin o líder de su equipo; (None, respuesta) si no"""
+    jugador = db.session.get(Jugador, id_jugador)
+    if not jugador:
+        return None, (jsonify({'error': 'Jugador no encontrado'}), 404)
+    if get_jwt().get('rol') != 'admin' and (not jugador.equipo or jugador.equipo.id_lider != int(get_jwt_identity())):
+        return None, (jsonify({'error': 'Solo el líder del equipo o un admin puede gestionar sus documentos'}), 403)
+    return jugador, None
+
+
+def _asignar_documento(jugador, relativa):
+    """
+    Guarda la nueva ruta del documento
+    
+    El PDF anterior no se borra aquí: otra subida del mismo contenido puede
+    estar reutilizándolo sin haber confirmado todavía. Los que quedan sin
+    uso los borra el mantenimiento (tarea documentos) pasado un margen.
+    """
+    jugador.documento_pdf = relativa
+    db.session.commit()
+
+
+@jugador_bp.route('/<int:id_jugador>/documento', methods=['PUT'])
+@jwt_required()
+@role_required(['admin', 'lider'])
+def subir_documento(id_jugador):
+    """
+    Sube el documento PDF del jugador en una sola petición
+    
+    El PDF va como cuerpo (Content-Type: application/pdf) y se escribe a
+    disco por partes mientras se calcula su SHA-256; también se acepta
+    multipart/form-data con el archivo 'documento'. Para archivos grandes
+    o conexiones inestables usar las subidas por partes (/documento/subidas).
+    """
+    try:
+        jugador, error = _jugador_con_permiso(id_jugador)
+        if error:
+            return error
+        
+        archivo = request.files.get('documento')
+        if archivo:
+            stream = archivo.stream
+        elif request.mimetype in ('application/pdf', 'application/octet-stream'):
+            stream = request.stream
+        else:
+            return jsonify({'error': "Envíe el PDF como cuerpo application/pdf o en el campo 'documento'"}), 400
+        
+        documento_hash, relativa, _ = DocumentStorage.guardar(stream)
+        _asignar_documento(jugador, relativa)
+        
+        return jsonify({
+            'mensaje': 'Documento actualizado',
+            'sha256': documento_hash,
+            'jugador': jugador.to_dict()
+        }), 200
+        
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+
+@jugador_bp.route('/<int:id_jugador>/documento/subidas', methods=['POST'])
+@jwt_required()
+@role_required(['admin', 'lider'])
+def crear_subida_documento(id_jugador):
+    """
+    Abre una subida reanudable del documento PDF
+    
+    Body:
+        {
+            "tamano": 5242880,
+            "sha256": "..."  (opcional: se verifica al completar)
+        }
+    
+    Después:
+        PUT  /documento/subidas/<id_subida>/<indice>   cuerpo = bytes de la parte
+             (cabecera opcional X-Chunk-SHA256 para verificar la parte)
+        GET  /documento/subidas/<id_subida>            partes que faltan (reanudar)
+        POST /documento/subidas/<id_subida>/completar
+    """
+    try:
+        jugador, error = _jugador_con_permiso(id_jugador)
+        if error:
+            return error
+        
+        data = request.get_json(silent=True) or {}
+        subida = DocumentStorage.crear_subida(
+            jugador.id_jugador, int(get_jwt_identity()), data.get('tamano'), data.get('sha256')
+        )
+        return jsonify({
+            'mensaje': 'Subida creada',
+            **DocumentStorage.estado_subida(subida)
+        }), 201
+        
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+def _subida_del_jugador(id_jugador, id_subida):
+    jugador, error = _jugador_con_permiso(id_jugador)
+    if error:
+        return None, None, error
+    subida = DocumentStorage.obtener_subida(id_subida)
+    if not subida or subida['id_jugador'] != jugador.id_jugador:
+        return None, None, (jsonify({'error': 'Subida no encontrada o expirada'}), 404)
+    return jugador, subida, None
+
+
+@jugador_bp.route('/<int:id_jugador>/documento/subidas/<string:id_subida>', methods=['GET'])
+@jwt_required()
+@role_required(['admin', 'lider'])
+def estado_subida_documento(id_jugador, id_subida):
+    try:
+        _, subida, error = _subida_del_jugador(id_jugador, id_subida)
+        if error:
+            return error
+        return jsonify(DocumentStorage.estado_subida(subida)), 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@jugador_bp.route('/<int:id_jugador>/documento/subidas/<string:id_subida>/<int:indice>', methods=['PUT'])
+@jwt_required()
+@role_required(['admin', 'lider'])
+def subir_parte_documento(id_jugador, id_subida, indice):
+    """Escribe una parte de la subida en su posición (se puede reenviar)"""
+    try:
+        _, subida, error = _subida_del_jugador(id_jugador, id_subida)
+        if error:
+            return error
+        
+        parte_hash = DocumentStorage.escribir_parte(
+            subida, indice, request.stream, request.headers.get('X-Chunk-SHA256')
+        )
+        return jsonify({'indice': indice, 'sha256': parte_hash}), 200
+        
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@jugador_bp.route('/<int:id_jugador>/documento/subidas/<string:id_subida>/completar', methods=['POST'])
+@jwt_required()
+@role_required(['admin', 'lider'])
+def completar_subida_documento(id_jugador, id_subida):
+    try:
+        jugador, subida, error = _subida_del_jugador(id_jugador, id_subida)
+        if error:
+            return error
+        
+        documento_hash, relativa, _ = DocumentStorage.completar_subida(subida)
+        _asignar_documento(jugador, relativa)
+        
+        return jsonify({
+            'mensaje': 'Documento actualizado',
+            'sha256': documento_hash,
+            'jugador': jugador.to_dict()
+        }), 200
+        
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+
+@jugador_bp.route('/<int:id_jugador>/documento/subidas/<string:id_subida>', methods=['DELETE'])
+@jwt_required()
+@role_required(['admin', 'lider'])
+def cancelar_subida_documento(id_jugador, id_subida):
+    try:
+        _, subida, error = _subida_del_jugador(id_jugador, id_subida)
+        if error:
+            return error
+        DocumentStorage.cancelar_subida(subida['id_subida'])
+        return jsonify({'mensaje': 'Subida cancelada'}), 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@jugador_bp.route('/<int:id_jugador>/documento', methods=['GET'])
+@jwt_required()
+@role_required(['admin', 'lider'])
+def descargar_documento(id_jugador):
+    """
+    Descarga el documento PDF del jugador
+    
+    send_file entrega el archivo abierto al servidor WSGI (wsgi.file_wrapper:
+    gunicorn lo envía con sendfile, sin copiarlo por Python) y responde a
+    Range / If-None-Match. Detrás de nginx, DOCUMENTOS_X_ACCEL_REDIRECT hace
+    que lo sirva nginx directamente; con Apache, USE_X_SENDFILE=True.
+    """
+    try:
+        jugador, error = _jugador_con_permiso(id_jugador)
+        if error:
+            return error
+        
+        ruta = DocumentStorage.ruta(jugador.documento_pdf)
+        if not ruta or not os.path.isfile(ruta):
+            return jsonify({'error': 'El jugador no tiene documento'}), 404
+        
+        nombre = f'documento_{jugador.documento}.pdf'
+        prefijo = current_app.config.get('DOCUMENTOS_X_ACCEL_REDIRECT')
+        if prefijo:
+            response = current_app.response_class(mimetype='application/pdf')
+            response.headers['X-Accel-Redirect'] = f"{prefijo.rstrip('/')}/{jugador.documento_pdf}"
+            response.headers['Content-Disposition'] = f'attachment; filename="{nombre}"'
+        else:
+            response = send_file(
+                ruta,
+                mimetype='application/pdf',
+                as_attachment=True,
+                download_name=nombre,
+                conditional=True,
+                etag=DocumentStorage.etag(jugador.documento_pdf) or True,
+                max_age=0
+            )
+        response.headers['Cache-Control'] = 'private, no-cache'
+        return response
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
@@ -1,9 +1,15 @@
-from flask import Blueprint, request, jsonify
+import time
+
+from flask import Blueprint, current_app, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.middlewares.auth_middleware import role_required
 from app.extensions import db
 from app.models.notificacion import Notificacion
 from app.models.usuario import Usuario
+from app.models.campeonato import Campeonato
+from app.serializers import notificacion_serializer
+from app.utils.email_queue import EmailQueue
+from app.utils.pagination import decode_cursor, encode_cursor, page_limit
 
 notificacion_bp = Blueprint('notificaciones', __name__)
 
@@ -32,19 +38,88 @@ def crear_notificacion():
         if tipo not in tipos_validos:
             return jsonify({'error': f'Tipo no válido. Debe ser: {", ".join(tipos_validos)}'}), 400
         
-        nueva_notificacion = Notificacion(
+        nueva_notificacion = Notificacion.crear(
             id_usuario=data['id_usuario'],
             titulo=data['titulo'],
             mensaje=data['mensaje'],
             tipo=tipo
         )
-        
-        db.session.add(nueva_notificacion)
         db.session.commit()
         
         return jsonify({
             'mensaje': 'Notificación creada exitosamente',
-            'notificacion': nueva_notificacion.to_dict()
+            'notificacion': nueva_notificacion.to_dict(nombre_usuario=usuario.nombre)
+        }), 201
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+@notificacion_bp.route('/broadcast', methods=['POST'])
+@jwt_required()
+@role_required(['admin'])
+def notificar_campeonato():
+    """
+    Envía una notificación a los líderes de todos los equipos de un campeonato
+    
+    Body:
+    {
+        "id_campeonato": 2,
+        "titulo": "Fixture publicado",
+        "mensaje": "Ya puedes ver los partidos de la primera jornada",
+        "tipo": "info",
+        "enviar_email": false
+    }
+    """
+    try:
+        inicio = time.perf_counter()
+        data = request.get_json() or {}
+        
+        if not data.get('id_campeonato'):
+            return jsonify({'error': 'El campeonato es requerido'}), 400
+        
+        if not data.get('titulo'):
+            return jsonify({'error': 'El título es requerido'}), 400
+        
+        if not data.get('mensaje'):
+            return jsonify({'error': 'El mensaje es requerido'}), 400
+        
+        tipos_validos = ['info', 'warning', 'success', 'error']
+        tipo = data.get('tipo', 'info')
+        if tipo not in tipos_validos:
+            return jsonify({'error': f'Tipo no válido. Debe ser: {", ".join(tipos_validos)}'}), 400
+        
+        campeonato = db.session.get(Campeonato, data['id_campeonato'])
+        if not campeonato:
+            return jsonify({'error': 'Campeonato no encontrado'}), 404
+        
+        # Audiencia en una sola consulta
+        destinatarios = db.session.execute(campeonato.query_lideres()).all()
+        if not destinatarios:
+            return jsonify({'error': 'El campeonato no tiene equipos aprobados con líder activo'}), 400
+        
+        creadas = Notificacion.crear_masivas(
+            [d.id_usuario for d in destinatarios],
+            titulo=data['titulo'],
+            mensaje=data['mensaje'],
+            tipo=tipo,
+            chunk_size=current_app.config.get('BROADCAST_CHUNK_SIZE', 1000)
+        )
+        db.session.commit()
+        
+        emails_encolados = 0
+        if data.get('enviar_email'):
+            correos = [(d.email, d.nombre) for d in destinatarios]
+            if EmailQueue.enqueue(current_app._get_current_object(), correos, data['titulo'], data['mensaje']):
+                emails_encolados = len(correos)
+            else:
+                print(f"⚠️ Cola de emails llena: no se encolaron {len(correos)} avisos del campeonato {campeonato.id_campeonato}")
+        
+        return jsonify({
+            'mensaje': f'Notificación enviada a {creadas} usuarios',
+            'destinatarios': creadas,
+            'emails_encolados': emails_encolados,
+            'duracion_ms': round((time.perf_counter() - inicio) * 1000, 1)
         }), 201
         
     except Exception as e:
@@ -54,36 +129,98 @@ def crear_notificacion():
 @notificacion_bp.route('/mis-notificaciones', methods=['GET'])
 @jwt_required()
 def obtener_mis_notificaciones():
+    """
+    Bandeja del usuario actual, paginada con cursor
+    
+    Query: ?leida=true|false&limit=20&cursor=<siguiente_cursor de la página anterior>
+    """
     try:
         # ✅ CORREGIDO: get_jwt_identity() devuelve un STRING
         current_user_id = int(get_jwt_identity())
         leida = request.args.get('leida')
+        limite = page_limit(request.args.get('limit'))
+        
+        cursor = None
+        if request.args.get('cursor'):
+            try:
+                cursor = decode_cursor(request.args['cursor'])
+            except ValueError:
+                return jsonify({'error': 'Cursor inválido'}), 400
+        
+        usuario = db.session.execute(
+            db.select(Usuario.nombre, Usuario.notificaciones_no_leidas)
+            .where(Usuario.id_usuario == current_user_id)
+        ).first()
+        if not usuario:
+            return jsonify({'error': 'Usuario no encontrado'}), 404
+        
+        notificaciones = Notificacion.bandeja(
+            current_user_id,
+            limite=limite,
+            cursor=cursor,
+            leida=None if leida is None else leida.lower() == 'true'
+        )
+        
+        hay_mas = len(notificaciones) > limite
+        notificaciones = notificaciones[:limite]
+        ultima = notificaciones[-1] if notificaciones else None
+        
+        return jsonify({
+            'notificaciones': [n.to_dict(nombre_usuario=usuario.nombre) for n in notificaciones],
+            'no_leidas': usuario.notificaciones_no_leidas,
+            'siguiente_cursor': encode_cursor(ultima.fecha_envio, ultima.id_notificacion) if hay_mas else None
+        }), 200
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@notificacion_bp.route('/unread-count', methods=['GET'])
+@jwt_required()
+def contar_no_leidas():
+    """Cantidad de notificaciones sin leer (pensado para polling: no lee notificaciones)"""
+    try:
+        current_user_id = int(get_jwt_identity())
         
-        query = Notificacion.query.filter_by(id_usuario=current_user_id)
+        response = jsonify({'no_leidas': Notificacion.no_leidas(current_user_id)})
+        response.headers['Cache-Control'] = 'no-store'
+        return response, 200
         
-        if leida is not None:
-            query = query.filter_by(leida=leida.lower() == 'true')
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@notificacion_bp.route('/marcar-todas-leidas', methods=['PATCH'])
+@jwt_required()
+def marcar_todas_leidas():
+    try:
+        current_user_id = int(get_jwt_identity())
         
-        notificaciones = query.order_by(Notificacion.fecha_envio.desc()).all()
+        marcadas = Notificacion.marcar_todas_leidas(current_user_id)
+        db.session.commit()
         
         return jsonify({
-            'notificaciones': [n.to_dict() for n in notificaciones]
+            'mensaje': f'{marcadas} notificaciones marcadas como leídas',
+            'marcadas': marcadas,
+            'no_leidas': Notificacion.no_leidas(current_user_id)
         }), 200
         
     except Exception as e:
+        db.session.rollback()
         return jsonify({'error': str(e)}), 500
 
 @notificacion_bp.route('/<int:id_notificacion>', methods=['GET'])
 @jwt_required()
 def obtener_notificacion_por_id(id_notificacion):
     try:
-        notificacion = Notificacion.query.get(id_notificacion)
+        # Con el nombre del destinatario por JOIN (sin lazy load de la relación)
+        fila = db.session.execute(
+            notificacion_serializer.select().where(Notificacion.id_notificacion == id_notificacion)
+        ).first()
         
-        if not notificacion:
+        if not fila:
             return jsonify({'error': 'Notificación no encontrada'}), 404
         
         return jsonify({
-            'notificacion': notificacion.to_dict()
+            'notificacion': notificacion_serializer.dump(fila)
         }), 200
         
     except Exception as e:
@@ -103,12 +240,13 @@ def marcar_como_leida(id_notificacion):
         if notificacion.id_usuario != current_user_id:
             return jsonify({'error': 'No tienes permiso para marcar esta notificación'}), 403
         
-        notificacion.leida = True
+        Notificacion.marcar_leida(id_notificacion, current_user_id)
         db.session.commit()
         
         return jsonify({
             'mensaje': 'Notificación marcada como leída',
-            'notificacion': notificacion.to_dict()
+            'notificacion': notificacion.to_dict(),
+            'no_leidas': Notificacion.no_leidas(current_user_id)
         }), 200
         
     except Exception as e:
@@ -125,7 +263,7 @@ def eliminar_notificacion(id_notificacion):
         if not notificacion:
             return jsonify({'error': 'Notificación no encontrada'}), 404
         
-        db.session.delete(notificacion)
+        Notificacion.eliminar(notificacion)
         db.session.commit()
         
         return jsonify({
@@ -1,11 +1,21 @@
-from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask import Blueprint, Response, current_app, request, jsonify
+from flask_jwt_extended import jwt_required, get_jwt, get_jwt_identity
 from app.middlewares.auth_middleware import role_required
+from app.middlewares.validation_middleware import primer_error, validate_json
 from app.extensions import db
 from app.models.partido import Partido
 from app.models.campeonato import Campeonato
 from app.models.equipo import Equipo
-from datetime import datetime
+from app.models.jugador import Jugador
+from app.models.sancion_jugador import SancionJugador
+from app.schemas import (
+    EventoEnVivoSchema, EventosPartidoSchema, PartidoCreateSchema, PartidoEstadoSchema, PartidoUpdateSchema,
+    ResultadoSchema
+)
+from app.serializers import partido_serializer
+from app.utils.live_feed import LiveFeed
+from app.utils.match_events import MatchEvents
+from app.utils.read_only import ReadOnlyQuery
 
 
 partidos_bp = Blueprint('partidos', __name__)
@@ -13,21 +23,9 @@ partidos_bp = Blueprint('partidos', __name__)
 @partidos_bp.route('', methods=['POST'])
 @jwt_required()
 @role_required(['admin'])
-def crear_partido():
+@validate_json(PartidoCreateSchema)
+def crear_partido(data):
     try: 
-        data = request.get_json()
-        
-        if not data.get('id_campeonato'):
-            return jsonify({'error': 'El campeonato es obligatorio'}), 400
-        if not data.get('id_equipo_local'):
-            return jsonify({'error': 'El equipo local es obligatorio'}), 400
-        if not data.get('id_equipo_visitante'):
-            return jsonify({'error': 'El equipo visitante es obligatorio'}), 400
-        if not data.get('fecha_partido'):
-            return jsonify({'error': 'La fecha del partido es obligatoria'}), 400
-        if data['id_equipo_local'] == data['id_equipo_visitante']:
-            return jsonify({'error': 'Los equipos deben ser diferentes'}), 400
-
         campeonato = Campeonato.query.get(data['id_campeonato'])
         if not campeonato:
             return jsonify({'error': 'Campeonato no encontrado'}), 404
@@ -50,9 +48,9 @@ def crear_partido():
             id_campeonato=data['id_campeonato'],
             id_equipo_local=data['id_equipo_local'],
             id_equipo_visitante=data['id_equipo_visitante'],
-            fecha_partido=datetime.fromisoformat(data['fecha_partido']),
+            fecha_partido=data['fecha_partido'],
             lugar=data.get('lugar'),
-            jornada=data.get('jornada', 1),
+            jornada=data['jornada'],
             estado='programado'
         )
         
@@ -64,43 +62,55 @@ def crear_partido():
             'partido': nuevo_partido.to_dict()
         }), 201
         
-    except ValueError:
-        return jsonify({
-            'error': 'Formato de fecha invalido. Use formato ISO: YYYY-MM-DDTHH:MM:SS'
-        }), 400
     except Exception as e:
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
 
 
+def query_partidos(id_campeonato=None, estado=None, jornada=None, id_equipo=None):
+    """
+    Consulta de partidos con los filtros del listado
+
+    El filtro por equipo se arma como UNION ALL de dos búsquedas
+    (id_equipo_local / id_equipo_visitante), cada una con su índice;
+    con OR el motor suele terminar recorriendo toda la tabla.
+    Un equipo no puede ser local y visitante a la vez, así que no hay duplicados.
+
+    Devuelve un SELECT de las columnas de partido_serializer (con los
+    nombres de campeonato y equipos por JOIN), no objetos ORM.
+    """
+    query = partido_serializer.select()
+
+    if id_campeonato:
+        query = query.where(Partido.id_campeonato == int(id_campeonato))
+    if estado:
+        query = query.where(Partido.estado == estado)
+    if jornada:
+        query = query.where(Partido.jornada == int(jornada))
+
+    if id_equipo:
+        equipo_id = int(id_equipo)
+        query = db.union_all(
+            query.where(Partido.id_equipo_local == equipo_id),
+            query.where(Partido.id_equipo_visitante == equipo_id)
+        )
+        return query.order_by(query.selected_columns.fecha_partido.desc())
+
+    return query.order_by(Partido.fecha_partido.desc())
+
+
 @partidos_bp.route('', methods=['GET'])
 def obtener_partidos(): 
     try:
-        id_campeonato = request.args.get('id_campeonato')
-        estado = request.args.get('estado')
-        jornada = request.args.get('jornada')
-        id_equipo = request.args.get('id_equipo')
-
-        query = Partido.query
-
-        if id_campeonato:
-            query = query.filter_by(id_campeonato=int(id_campeonato))
-        if estado:
-            query = query.filter_by(estado=estado)
-        if jornada:
-            query = query.filter_by(jornada=int(jornada))
-        
-        if id_equipo:
-            equipo_id = int(id_equipo)
-            query = query.filter(
-                (Partido.id_equipo_local == equipo_id) |
-                (Partido.id_equipo_visitante == equipo_id)
-            )
-        
-        partidos = query.order_by(Partido.fecha_partido.desc()).all()
+        partidos = ReadOnlyQuery.dump_all(partido_serializer, query_partidos(
+            id_campeonato=request.args.get('id_campeonato'),
+            estado=request.args.get('estado'),
+            jornada=request.args.get('jornada'),
+            id_equipo=request.args.get('id_equipo')
+        ))
 
         return jsonify({
-            'partidos': [p.to_dict() for p in partidos]
+            'partidos': partidos
         }), 200
         
     except Exception as e:
@@ -126,23 +136,22 @@ def obtener_partido_por_id(id_partido):
 @partidos_bp.route('/<int:id_partido>', methods=['PUT'])
 @jwt_required()
 @role_required(['admin'])
-def actualizar_partido(id_partido):
+@validate_json(PartidoUpdateSchema)
+def actualizar_partido(id_partido, data):
     try:
         partido = Partido.query.get(id_partido)
         
         if not partido:
             return jsonify({'error': 'Partido no encontrado'}), 404
         
-        data = request.get_json()
-        
         if 'fecha_partido' in data:
-            partido.fecha_partido = datetime.fromisoformat(data['fecha_partido'])
+            partido.fecha_partido = data['fecha_partido']
         
         if 'lugar' in data:
             partido.lugar = data['lugar']
         
         if 'jornada' in data:
-            partido.jornada = int(data['jornada'])
+            partido.jornada = data['jornada']
         
         if 'observaciones' in data:
             partido.observaciones = data['observaciones']
@@ -154,8 +163,6 @@ def actualizar_partido(id_partido):
             'partido': partido.to_dict()
         }), 200
         
-    except ValueError:
-        return jsonify({'error': 'Formato de fecha inválido. Use formato ISO: YYYY-MM-DDTHH:MM:SS'}), 400
     except Exception as e:
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
@@ -164,27 +171,31 @@ def actualizar_partido(id_partido):
 @partidos_bp.route('/<int:id_partido>/estado', methods=['PATCH'])
 @jwt_required()
 @role_required(['admin'])
-def cambiar_estado_partido(id_partido):
+@validate_json(PartidoEstadoSchema)
+def cambiar_estado_partido(id_partido, data):
     try:
-        partido = Partido.query.get(id_partido)
+        # Bloquea el partido: dos finalizaciones simultáneas no pueden cumplir sanciones dos veces
+        partido = db.session.get(Partido, id_partido, with_for_update=True)
         
         if not partido:
             return jsonify({'error': 'Partido no encontrado'}), 404
         
-        data = request.get_json()
-        
-        if 'estado' not in data:
-            return jsonify({'error': 'El campo estado es requerido'}), 400
-        
-        estados_validos = ['programado', 'en_juego', 'finalizado', 'cancelado']
-        if data['estado'] not in estados_validos:
+        # Las sanciones se cumplen al finalizar: reabrir el partido las volvería a descontar
+        if partido.estado == 'finalizado' and data['estado'] != 'finalizado':
+            db.session.rollback()
             return jsonify({
-                'error': f'Estado no válido. Debe ser uno de: {", ".join(estados_validos)}'
-            }), 400
+                'error': 'El partido ya está finalizado',
+                'mensaje': 'Para corregirlo use los endpoints de resultado, goles y tarjetas'
+            }), 409
         
+        finaliza = data['estado'] == 'finalizado' and partido.estado != 'finalizado'
         partido.estado = data['estado']
+        if finaliza:
+            SancionJugador.cumplir_partido(partido)
         db.session.commit()
         
+        LiveFeed.publish(id_partido, 'estado', dict(partido.marcador(), estado=partido.estado))
+        
         return jsonify({
             'mensaje': f'Partido cambió a estado: {data["estado"]}',
             'partido': partido.to_dict()
@@ -205,7 +216,7 @@ def eliminar_partido(id_partido):
         if not partido:
             return jsonify({'error': 'Partido no encontrado'}), 404
         
-        if partido.goles.count() > 0:
+        if partido.total_goles > 0:
             return jsonify({
                 'error': 'No se puede eliminar un partido que tiene goles registrados'
             }), 400
@@ -225,24 +236,24 @@ def eliminar_partido(id_partido):
 @partidos_bp.route('/<int:id_partido>/resultado', methods=['PATCH'])
 @jwt_required()
 @role_required(['admin'])
-def registrar_resultado(id_partido):
+@validate_json(ResultadoSchema)
+def registrar_resultado(id_partido, data):
     try:
-        partido = Partido.query.get(id_partido)
+        partido = db.session.get(Partido, id_partido, with_for_update=True)
         
         if not partido:
             return jsonify({'error': 'Partido no encontrado'}), 404
         
-        data = request.get_json()
-        
-        if 'goles_local' not in data or 'goles_visitante' not in data:
-            return jsonify({'error': 'Se requieren goles_local y goles_visitante'}), 400
-        
-        partido.goles_local = int(data['goles_local'])
-        partido.goles_visitante = int(data['goles_visitante'])
-        partido.estado = 'finalizado'
+        partido.goles_local = data['goles_local']
+        partido.goles_visitante = data['goles_visitante']
+        if partido.estado != 'finalizado':
+            partido.estado = 'finalizado'
+            SancionJugador.cumplir_partido(partido)
         
         db.session.commit()
         
+        LiveFeed.publish(id_partido, 'estado', dict(partido.marcador(), estado=partido.estado))
+        
         return jsonify({
             'mensaje': 'Resultado registrado exitosamente',
             'partido': partido.to_dict()
@@ -250,4 +261,210 @@ def registrar_resultado(id_partido):
         
     except Exception as e:
         db.session.rollback()
-        return jsonify({'error': str(e)}), 500
\ No newline at end of file
+        return jsonify({'error': str(e)}), 500
+
+
+@partidos_bp.route('/<int:id_partido>/eventos', methods=['POST'])
+@jwt_required()
+@role_required(['admin'])
+@validate_json(EventosPartidoSchema)
+def registrar_eventos(id_partido, data):
+    """
+    Carga de goles, tarjetas y estado final de un partido en una sola petición
+    
+    Body:
+    {
+        "goles": [
+            {"dorsal": 10, "equipo": "local", "minuto": 23, "tipo": "normal"},
+            {"jugador": "Lionel Messi", "minuto": 67, "tipo": "penal"}
+        ],
+        "tarjetas": [
+            {"id_jugador": 42, "minuto": 55, "tipo": "amarilla", "motivo": "Falta"}
+        ],
+        "estado": "finalizado",
+        "goles_local": 2,
+        "goles_visitante": 0
+    }
+    
+    El jugador se indica con id_jugador, dorsal + equipo ("local",
+    "visitante" o id) o nombre completo. goles_local/goles_visitante son
+    opcionales: si se envían deben coincidir con el marcador resultante.
+    Todo o nada: si un evento tiene errores no se guarda ninguno. La forma
+    del body (EventosPartidoSchema, hasta PARTIDO_EVENTOS_MAX eventos) se
+    valida antes de tocar la BD; después se resuelven los jugadores.
+    """
+    try:
+        estado = data['estado']
+        
+        # Bloquea el partido: dos cargas simultáneas no pueden duplicar eventos
+        partido = db.session.get(Partido, id_partido, with_for_update=True)
+        if not partido:
+            return jsonify({'error': 'Partido no encontrado'}), 404
+        
+        if partido.estado in ('finalizado', 'cancelado'):
+            db.session.rollback()
+            return jsonify({
+                'error': f'El partido ya está {partido.estado}',
+                'mensaje': 'Para corregirlo use los endpoints de goles y tarjetas'
+            }), 409
+        
+        goles, tarjetas, errores = MatchEvents.validar(partido, data)
+        
+        deltas = MatchEvents.marcador(partido, goles)
+        marcador = {
+            'goles_local': (partido.goles_local or 0) + deltas['goles_local'],
+            'goles_visitante': (partido.goles_visitante or 0) + deltas['goles_visitante'],
+        }
+        if not errores:
+            for lado in ('goles_local', 'goles_visitante'):
+                if lado in data and data[lado] != marcador[lado]:
+                    errores.append({'evento': lado, 'errores': [
+                        f'{lado} enviado ({data[lado]}) no coincide con los goles cargados ({marcador[lado]})'
+                    ]})
+        
+        if errores:
+            db.session.rollback()
+            return jsonify({'error': 'Hay eventos con errores; no se guardó ninguno', 'errores': errores}), 400
+        
+        resultado = MatchEvents.registrar(partido, goles, tarjetas, estado)
+        db.session.commit()
+        
+        LiveFeed.publish(id_partido, 'estado', dict(
+            marcador, estado=estado, goles_cargados=len(goles), tarjetas_cargadas=len(tarjetas)
+        ))
+        
+        return jsonify({
+            'mensaje': f'{len(goles)} goles y {len(tarjetas)} tarjetas registrados',
+            'goles': len(goles),
+            'tarjetas': len(tarjetas),
+            'sanciones_cumplidas': resultado['sanciones_cumplidas'],
+            'partido': db.session.get(Partido, id_partido).to_dict()
+        }), 201
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+
+@partidos_bp.route('/<int:id_partido>/live', methods=['GET'])
+def partido_en_vivo(id_partido):
+    """
+    Sigue un partido en vivo con Server-Sent Events
+    
+    - Primer mensaje: snapshot del partido (o los eventos perdidos si el
+      cliente se reconecta con el header Last-Event-ID)
+    - Después: un evento por gol, tarjeta, cambio o cambio de estado
+    - Comentario ": heartbeat" cada LIVE_FEED_HEARTBEAT_SECONDS sin eventos
+    """
+    try:
+        # Cursor antes de leer el snapshot: no se pierde lo que llegue mientras tanto
+        # (ultimo_id solo lee: un id inexistente no crea un canal)
+        snapshot_id = LiveFeed.ultimo_id(id_partido)
+        partido = db.session.get(Partido, id_partido)
+        
+        if not partido:
+            return jsonify({'error': 'Partido no encontrado'}), 404
+        
+        snapshot = partido.to_dict()
+        terminado = partido.estado in ('finalizado', 'cancelado')
+        last_event_id = request.headers.get('Last-Event-ID') or request.args.get('last_event_id')
+        
+        # La conexión queda abierta: se libera la sesión de BD antes de transmitir
+        db.session.remove()
+        
+        config = current_app.config
+        if not LiveFeed.connect(id_partido, config.get('LIVE_FEED_MAX_CONEXIONES')):
+            return jsonify({'error': 'Demasiadas conexiones en vivo, intenta más tarde'}), 503
+        
+        response = Response(
+            LiveFeed.stream(
+                id_partido, snapshot, snapshot_id,
+                last_event_id=last_event_id,
+                heartbeat=config.get('LIVE_FEED_HEARTBEAT_SECONDS', 15),
+                duracion_max=0 if terminado else config.get('LIVE_FEED_MAX_DURACION_SECONDS')
+            ),
+            mimetype='text/event-stream'
+        )
+        response.headers['Cache-Control'] = 'no-cache'
+        response.headers['X-Accel-Buffering'] = 'no'  # nginx: no acumular la respuesta
+        response.call_on_close(lambda: LiveFeed.disconnect(id_partido))
+        return response
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@partidos_bp.route('/<int:id_partido>/live/eventos', methods=['POST'])
+@jwt_required()
+@role_required(['admin', 'lider'])
+@validate_json(EventoEnVivoSchema)
+def publicar_evento_en_vivo(id_partido, data):
+    """
+    Publica un evento externo en el feed en vivo (cambios del servicio de alineaciones)
+    
+    Body:
+    {
+        "tipo": "cambio",
+        "id_equipo": 5,
+        "minuto": 65,
+        "sale": {"id_jugador": 10},
+        "entra": {"id_jugador": 23}
+    }
+    
+    El partido debe estar en juego, el equipo jugarlo (un líder solo
+    publica los de su equipo) y los dos jugadores ser de ese equipo.
+    Nombre y dorsal se toman de la BD, no del body.
+    """
+    try:
+        partido = db.session.get(Partido, id_partido)
+        if not partido:
+            return jsonify({'error': 'Partido no encontrado'}), 404
+        
+        if partido.estado != 'en_juego':
+            return jsonify({'error': 'Solo se pueden publicar cambios de partidos en juego'}), 409
+        
+        if data['id_equipo'] not in (partido.id_equipo_local, partido.id_equipo_visitante):
+            return jsonify({'error': 'El equipo no juega este partido'}), 400
+        
+        if get_jwt().get('rol') != 'admin':
+            id_lider = db.session.execute(
+                db.select(Equipo.id_lider).where(Equipo.id_equipo == data['id_equipo'])
+            ).scalar()
+            if id_lider != int(get_jwt_identity()):
+                return jsonify({'error': 'No tienes permisos'}), 403
+        
+        ids = (data['sale']['id_jugador'], data['entra']['id_jugador'])
+        jugadores = {fila.id_jugador: fila for fila in db.session.execute(
+            db.select(Jugador.id_jugador, Jugador.nombre, Jugador.apellido, Jugador.dorsal)
+            .where(Jugador.id_jugador.in_(ids), Jugador.id_equipo == data['id_equipo'])
+        )}
+        errores = {
+            lado: {'id_jugador': ['El jugador no pertenece al equipo']}
+            for lado in ('sale', 'entra') if data[lado]['id_jugador'] not in jugadores
+        }
+        if errores:
+            return jsonify({'error': primer_error(errores), 'errores': errores}), 400
+        
+        def jugador(lado, minuto):
+            fila = jugadores[data[lado]['id_jugador']]
+            return {
+                'id_jugador': fila.id_jugador,
+                'nombre': f'{fila.nombre} {fila.apellido}',
+                'dorsal': fila.dorsal,
+                minuto: data['minuto']
+            }
+        
+        evento = LiveFeed.publish(id_partido, data['tipo'], {
+            'id_equipo': data['id_equipo'],
+            'minuto': data['minuto'],
+            'sale': jugador('sale', 'minuto_salida'),
+            'entra': jugador('entra', 'minuto_entrada'),
+        })
+        
+        return jsonify({
+            'mensaje': 'Evento publicado',
+            'id_evento': evento['id']
+        }), 202
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
@@ -1,32 +1,25 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required
 from app.middlewares.auth_middleware import role_required
+from app.middlewares.validation_middleware import validate_json
 from app.extensions import db
 from app.models.tarjeta import Tarjeta
 from app.models.partido import Partido
 from app.models.jugador import Jugador
+from app.models.sancion_jugador import SancionJugador
+from app.schemas import TarjetaCreateSchema
+from app.serializers import tarjeta_serializer
+from app.utils.read_only import ReadOnlyQuery
+from app.utils.live_feed import LiveFeed
 
 tarjeta_bp = Blueprint('tarjetas', __name__)
 
 @tarjeta_bp.route('', methods=['POST'])
 @jwt_required()
 @role_required(['admin'])
-def crear_tarjeta():
+@validate_json(TarjetaCreateSchema)
+def crear_tarjeta(data):
     try:
-        data = request.get_json()
-        
-        if not data.get('id_partido'):
-            return jsonify({'error': 'El partido es requerido'}), 400
-        
-        if not data.get('id_jugador'):
-            return jsonify({'error': 'El jugador es requerido'}), 400
-        
-        if not data.get('minuto'):
-            return jsonify({'error': 'El minuto es requerido'}), 400
-        
-        if not data.get('tipo'):
-            return jsonify({'error': 'El tipo es requerido'}), 400
-        
         partido = Partido.query.get(data['id_partido'])
         if not partido:
             return jsonify({'error': 'Partido no encontrado'}), 404
@@ -38,13 +31,7 @@ def crear_tarjeta():
         if jugador.id_equipo not in [partido.id_equipo_local, partido.id_equipo_visitante]:
             return jsonify({'error': 'El jugador no pertenece a ninguno de los equipos del partido'}), 400
         
-        minuto = int(data['minuto'])
-        if minuto < 1 or minuto > 120:
-            return jsonify({'error': 'El minuto debe estar entre 1 y 120'}), 400
-        
-        tipos_validos = ['amarilla', 'roja']
-        if data['tipo'] not in tipos_validos:
-            return jsonify({'error': f'Tipo no válido. Debe ser: {", ".join(tipos_validos)}'}), 400
+        minuto = data['minuto']
         
         nueva_tarjeta = Tarjeta(
             id_partido=data['id_partido'],
@@ -55,15 +42,27 @@ def crear_tarjeta():
         )
         
         db.session.add(nueva_tarjeta)
+        Partido.ajustar_contadores(partido.id_partido, total_tarjetas=1, **{
+            'amarillas' if data['tipo'] == 'amarilla' else 'rojas': 1
+        })
+        sancion = SancionJugador.registrar_tarjeta(nueva_tarjeta, partido)
         db.session.commit()
         
+        LiveFeed.publish(partido.id_partido, 'tarjeta', {
+            'id_tarjeta': nueva_tarjeta.id_tarjeta,
+            'id_jugador': jugador.id_jugador,
+            'jugador': f"{jugador.nombre} {jugador.apellido}",
+            'id_equipo': jugador.id_equipo,
+            'minuto': minuto,
+            'tipo': nueva_tarjeta.tipo
+        })
+        
         return jsonify({
             'mensaje': 'Tarjeta registrada exitosamente',
-            'tarjeta': nueva_tarjeta.to_dict()
+            'tarjeta': nueva_tarjeta.to_dict(),
+            'sancion': sancion.to_dict()
         }), 201
         
-    except ValueError:
-        return jsonify({'error': 'El minuto debe ser un número válido'}), 400
     except Exception as e:
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
@@ -75,21 +74,85 @@ def obtener_tarjetas():
         id_jugador = request.args.get('id_jugador')
         tipo = request.args.get('tipo')
         
-        query = Tarjeta.query
+        query = tarjeta_serializer.select()
         
         if id_partido:
-            query = query.filter_by(id_partido=int(id_partido))
+            query = query.where(Tarjeta.id_partido == int(id_partido))
         
         if id_jugador:
-            query = query.filter_by(id_jugador=int(id_jugador))
+            query = query.where(Tarjeta.id_jugador == int(id_jugador))
         
         if tipo:
-            query = query.filter_by(tipo=tipo)
+            query = query.where(Tarjeta.tipo == tipo)
+        
+        tarjetas = ReadOnlyQuery.dump_all(tarjeta_serializer, query.order_by(Tarjeta.minuto.asc()))
+        
+        return jsonify({
+            'tarjetas': tarjetas
+        }), 200
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@tarjeta_bp.route('/suspendidos', methods=['GET'])
+def obtener_suspendidos():
+    """Jugadores suspendidos de un campeonato (desde el estado precalculado)"""
+    try:
+        id_campeonato = request.args.get('id_campeonato', type=int)
+        if not id_campeonato:
+            return jsonify({'error': 'El campeonato es requerido'}), 400
         
-        tarjetas = query.order_by(Tarjeta.minuto.asc()).all()
+        suspendidos = SancionJugador.suspendidos(id_campeonato)
         
         return jsonify({
-            'tarjetas': [t.to_dict() for t in tarjetas]
+            'id_campeonato': id_campeonato,
+            'total': len(suspendidos),
+            'suspendidos': suspendidos
+        }), 200
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@tarjeta_bp.route('/elegibilidad', methods=['GET'])
+def verificar_elegibilidad():
+    """
+    Elegibilidad de varios jugadores en una sola petición
+    
+    Query: ?id_campeonato=1&jugadores=4,8,15 (o id_partido en lugar de id_campeonato)
+    """
+    try:
+        id_campeonato = request.args.get('id_campeonato', type=int)
+        id_partido = request.args.get('id_partido', type=int)
+        
+        if not id_campeonato and id_partido:
+            partido = db.session.get(Partido, id_partido)
+            if not partido:
+                return jsonify({'error': 'Partido no encontrado'}), 404
+            id_campeonato = partido.id_campeonato
+        
+        if not id_campeonato:
+            return jsonify({'error': 'Se requiere id_campeonato o id_partido'}), 400
+        
+        try:
+            ids = [int(i) for i in request.args.get('jugadores', '').split(',') if i.strip()]
+        except ValueError:
+            return jsonify({'error': 'jugadores debe ser una lista de ids separados por coma'}), 400
+        
+        if not ids:
+            return jsonify({'error': 'Se requiere al menos un jugador'}), 400
+        
+        if len(ids) > 200:
+            return jsonify({'error': 'Máximo 200 jugadores por consulta'}), 400
+        
+        pendientes = SancionJugador.elegibilidad(id_campeonato, ids)
+        
+        return jsonify({
+            'id_campeonato': id_campeonato,
+            'jugadores': {
+                str(id_jugador): {'elegible': n == 0, 'partidos_pendientes': n}
+                for id_jugador, n in pendientes.items()
+            },
+            'suspendidos': sorted(id_jugador for id_jugador, n in pendientes.items() if n > 0)
         }), 200
         
     except Exception as e:
@@ -120,9 +183,16 @@ def eliminar_tarjeta(id_tarjeta):
         if not tarjeta:
             return jsonify({'error': 'Tarjeta no encontrada'}), 404
         
+        Partido.ajustar_contadores(tarjeta.id_partido, total_tarjetas=-1, **{
+            'amarillas' if tarjeta.tipo == 'amarilla' else 'rojas': -1
+        })
+        id_partido = tarjeta.id_partido
+        SancionJugador.registrar_tarjeta(tarjeta, tarjeta.partido, signo=-1)
         db.session.delete(tarjeta)
         db.session.commit()
         
+        LiveFeed.publish(id_partido, 'tarjeta_eliminada', {'id_tarjeta': id_tarjeta})
+        
         return jsonify({
             'mensaje': 'Tarjeta eliminada exitosamente'
         }), 200
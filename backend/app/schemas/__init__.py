@@ -0,0 +1,39 @@
+from app.schemas.base import BaseSchema
+from app.schemas.campeonato import (
+    CampeonatoCreateSchema, CampeonatoEstadoSchema, CampeonatoUpdateSchema, GenerarPartidosSchema
+)
+from app.schemas.equipo import EquipoCreateSchema, EquipoEstadoSchema, EquiposEstadoSchema, EquipoUpdateSchema
+from app.schemas.gol import GolCreateSchema
+from app.schemas.jugador import JugadorActivoSchema, JugadorCreateSchema, JugadorUpdateSchema
+from app.schemas.partido import (
+    EventoEnVivoSchema, EventosPartidoSchema, PartidoCreateSchema, PartidoEstadoSchema, PartidoUpdateSchema,
+    ResultadoSchema
+)
+from app.schemas.tarjeta import TarjetaCreateSchema
+
+__all__ = [
+    'BaseSchema',
+    # Campeonatos
+    'CampeonatoCreateSchema',
+    'CampeonatoUpdateSchema',
+    'CampeonatoEstadoSchema',
+    'GenerarPartidosSchema',
+    # Equipos
+    'EquipoCreateSchema',
+    'EquipoUpdateSchema',
+    'EquipoEstadoSchema',
+    'EquiposEstadoSchema',
+    # Jugadores
+    'JugadorCreateSchema',
+    'JugadorUpdateSchema',
+    'JugadorActivoSchema',
+    # Partidos y eventos
+    'PartidoCreateSchema',
+    'PartidoUpdateSchema',
+    'PartidoEstadoSchema',
+    'ResultadoSchema',
+    'EventoEnVivoSchema',
+    'EventosPartidoSchema',
+    'GolCreateSchema',
+    'TarjetaCreateSchema',
+]
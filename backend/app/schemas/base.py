@@ -0,0 +1,146 @@
+from datetime import datetime
+
+from marshmallow import EXCLUDE, Schema, fields, validate
+
+# Mensajes genéricos en español (los de marshmallow vienen en inglés)
+MENSAJES = {
+    'required': 'El campo es requerido',
+    'null': 'El campo no puede ser nulo',
+}
+MENSAJES_INVALIDO = (
+    (fields.Boolean, 'Debe ser verdadero o falso'),
+    (fields.Integer, 'Debe ser un número entero'),
+    (fields.Number, 'Debe ser un número'),
+    (fields.String, 'Debe ser un texto'),
+    (fields.List, 'Debe ser una lista'),
+    (fields.Dict, 'Debe ser un objeto'),
+)
+
+
+class FechaHora(fields.DateTime):
+    """Fecha y hora ISO con datetime.fromisoformat (acepta 'YYYY-MM-DD' como medianoche)"""
+
+    default_error_messages = {'invalid': 'Formato de fecha inválido. Use formato ISO: YYYY-MM-DDTHH:MM:SS'}
+
+    def _deserialize(self, value, attr, data, **kwargs):
+        try:
+            return datetime.fromisoformat(value)
+        except (TypeError, ValueError):
+            raise self.make_error('invalid')
+
+
+class Fecha(fields.Date):
+    """Fecha ISO (YYYY-MM-DD); si trae hora se descarta"""
+
+    default_error_messages = {'invalid': 'Formato de fecha inválido. Use YYYY-MM-DD'}
+
+    def _deserialize(self, value, attr, data, **kwargs):
+        try:
+            return datetime.fromisoformat(value).date()
+        except (TypeError, ValueError):
+            raise self.make_error('invalid')
+
+
+class Hora(fields.Time):
+    """Hora HH:MM"""
+
+    default_error_messages = {'invalid': 'Formato de hora inválido. Use HH:MM'}
+
+    def _deserialize(self, value, attr, data, **kwargs):
+        try:
+            return datetime.strptime(value, '%H:%M').time()
+        except (TypeError, ValueError):
+            raise self.make_error('invalid')
+
+
+class Texto(fields.String):
+    """String sin espacios al inicio ni al final"""
+
+    def _deserialize(self, value, attr, data, **kwargs):
+        return super()._deserialize(value, attr, data, **kwargs).strip()
+
+
+class Opcion(fields.String):
+    """Texto sin espacios ni mayúsculas, validado contra una lista de opciones"""
+
+    def __init__(self, opciones, **kwargs):
+        kwargs.setdefault('validate', validate.OneOf(
+            opciones, error=f'Valor no válido. Debe ser uno de: {", ".join(opciones)}'
+        ))
+        super().__init__(**kwargs)
+
+    def _deserialize(self, value, attr, data, **kwargs):
+        return super()._deserialize(value, attr, data, **kwargs).strip().lower()
+
+
+def requerido(campo, mensaje=None, **kwargs):
+    """Campo obligatorio: sin él, nulo o vacío responde `mensaje`"""
+    mensaje = mensaje or f'El campo {campo} es requerido'
+    kwargs['required'] = True
+    kwargs['error_messages'] = {'required': mensaje, 'null': mensaje, **kwargs.get('error_messages', {})}
+    return kwargs
+
+
+def texto(campo, largo, mensaje=None, obligatorio=True, minimo=1, **kwargs):
+    """
+    String recortado de hasta `largo` caracteres
+
+    Con obligatorio=True falta si no viene, es nulo o queda vacío; con
+    obligatorio=False y minimo=1 puede omitirse pero no venir vacío.
+    """
+    mensaje = mensaje or f'El campo {campo} es requerido'
+    validadores = [validate.Length(max=largo, error=f'No puede superar {largo} caracteres')]
+    if minimo:
+        validadores.insert(0, validate.Length(
+            min=minimo, error=mensaje if minimo == 1 else f'Debe tener al menos {minimo} caracteres'
+        ))
+    if obligatorio:
+        kwargs = requerido(campo, mensaje, **kwargs)
+    return Texto(validate=validadores, **kwargs)
+
+
+def rango(minimo=None, maximo=None, mensaje=None):
+    if mensaje is None:
+        if maximo is None:
+            mensaje = f'Debe ser mayor o igual a {minimo}'
+        else:
+            mensaje = f'Debe estar entre {minimo} y {maximo}'
+    return validate.Range(min=minimo, max=maximo, error=mensaje)
+
+
+class BaseSchema(Schema):
+    """
+    Base de los schemas de entrada de la API
+
+    - Los campos que no están en el schema se ignoran (como hasta ahora)
+    - Los mensajes genéricos de marshmallow se reemplazan por los de MENSAJES
+      al instanciar el schema (una vez, al importar la ruta); los mensajes
+      propios de cada campo se respetan
+    """
+
+    class Meta:
+        unknown = EXCLUDE
+
+    # Body (o elemento de una lista/Nested) que no es un objeto
+    error_messages = {'type': 'Debe ser un objeto'}
+
+    def on_bind_field(self, field_name, field_obj):
+        self._traducir(field_obj)
+        if isinstance(field_obj, fields.List):
+            self._traducir(field_obj.inner)
+
+    @staticmethod
+    def _traducir(field_obj):
+        por_defecto = {}
+        for clase in reversed(type(field_obj).__mro__):
+            por_defecto.update(getattr(clase, 'default_error_messages', {}))
+
+        traducidos = dict(MENSAJES)
+        for clase, mensaje in MENSAJES_INVALIDO:
+            if isinstance(field_obj, clase):
+                traducidos['invalid'] = mensaje
+                break
+        for clave, mensaje in traducidos.items():
+            # Solo si el campo conserva el mensaje en inglés de marshmallow
+            if clave in field_obj.error_messages and field_obj.error_messages[clave] == por_defecto.get(clave):
+                field_obj.error_messages[clave] = mensaje
@@ -0,0 +1,42 @@
+from datetime import time
+
+from marshmallow import fields
+
+from app.schemas.base import BaseSchema, Fecha, Hora, Opcion, Texto, rango, requerido, texto
+
+ESTADOS_CAMPEONATO = ('planificacion', 'en_curso', 'finalizado')
+
+
+class CampeonatoCreateSchema(BaseSchema):
+    """POST /api/campeonato"""
+
+    nombre = texto('nombre', 100, 'El nombre es obligatorio')
+    descripcion = Texto(allow_none=True)
+    fecha_inicio = Fecha(**requerido('fecha_inicio', 'La fecha de inicio es obligatoria'))
+    fecha_fin = Fecha(allow_none=True)
+
+
+class CampeonatoUpdateSchema(BaseSchema):
+    """PUT /api/campeonato/<id> (solo los campos enviados)"""
+
+    nombre = texto('nombre', 100, obligatorio=False)
+    descripcion = Texto(allow_none=True)
+    fecha_inicio = Fecha()
+    fecha_fin = Fecha(allow_none=True)
+    max_equipos = fields.Integer(validate=rango(2, mensaje='El campeonato debe tener al menos 2 equipos'))
+
+
+class CampeonatoEstadoSchema(BaseSchema):
+    """PATCH /api/campeonato/<id>/estado"""
+
+    estado = Opcion(ESTADOS_CAMPEONATO, **requerido('estado'))
+
+
+class GenerarPartidosSchema(BaseSchema):
+    """POST /api/campeonato/<id>/generar-partidos"""
+
+    fecha_inicio = Fecha(**requerido('fecha_inicio', 'La fecha de inicio es obligatoria'))
+    dias_entre_jornadas = fields.Integer(load_default=7, validate=rango(1))
+    hora_inicio = Hora(load_default=time(15, 0))
+    hora_segundo_partido = Hora(load_default=time(17, 0))
+    incluir_vuelta = fields.Boolean(load_default=True)
@@ -0,0 +1,40 @@
+from marshmallow import fields, validate
+
+from app.schemas.base import BaseSchema, Opcion, Texto, requerido, texto
+
+ESTADOS_EQUIPO = ('pendiente', 'aprobado', 'rechazado')
+
+
+class EquipoCreateSchema(BaseSchema):
+    """POST /api/equipos"""
+
+    nombre = texto('nombre', 100, 'El nombre del equipo es obligatorio', minimo=3)
+    nombre_lider = texto('nombre_lider', 100, 'El nombre del líder es obligatorio')
+    estadio = texto('estadio', 150, 'El estadio es obligatorio')
+    logo_url = texto('logo_url', 255, obligatorio=False, minimo=0, allow_none=True)
+
+
+class EquipoUpdateSchema(BaseSchema):
+    """PUT /api/equipos/<id> (solo los campos enviados)"""
+
+    nombre = texto('nombre', 100, obligatorio=False, minimo=3)
+    estadio = texto('estadio', 150, obligatorio=False)
+    logo_url = texto('logo_url', 255, obligatorio=False, minimo=0, allow_none=True)
+
+
+class EquipoEstadoSchema(BaseSchema):
+    """PATCH /api/equipos/<id>/estado"""
+
+    estado = Opcion(ESTADOS_EQUIPO, **requerido('estado'))
+    observaciones = Texto(allow_none=True)
+
+
+class EquiposEstadoSchema(EquipoEstadoSchema):
+    """PATCH /api/equipos/estado (el máximo de ids lo valida la ruta: EQUIPOS_ESTADO_MAX_IDS)"""
+
+    ids = fields.List(
+        fields.Integer(strict=True, error_messages={'invalid': 'ids solo puede contener números'}),
+        **requerido('ids', 'ids debe ser una lista de equipos'),
+        validate=validate.Length(min=1, error='ids debe ser una lista de equipos')
+    )
+    notificar = fields.Boolean(load_default=False)
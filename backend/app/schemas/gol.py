@@ -0,0 +1,15 @@
+from marshmallow import fields
+
+from app.schemas.base import BaseSchema, Opcion, rango, requerido, texto
+
+TIPOS_GOL = ('normal', 'penal', 'autogol', 'tiro_libre')
+
+
+class GolCreateSchema(BaseSchema):
+    """POST /api/gol"""
+
+    id_partido = fields.Integer(**requerido('id_partido', 'El partido es requerido'))
+    nombre_jugador = texto('nombre_jugador', 200, 'El nombre del jugador es requerido')
+    minuto = fields.Integer(**requerido('minuto', 'El minuto es requerido'),
+                            validate=rango(1, 120, 'El minuto debe estar entre 1 y 120'))
+    tipo = Opcion(TIPOS_GOL, load_default='normal')
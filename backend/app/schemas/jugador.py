@@ -0,0 +1,35 @@
+from marshmallow import fields
+
+from app.schemas.base import BaseSchema, Fecha, Opcion, rango, requerido, texto
+
+POSICIONES = ('portero', 'defensa', 'mediocampista', 'delantero')
+
+
+class JugadorCreateSchema(BaseSchema):
+    """POST /api/jugadores"""
+
+    nombre_equipo = texto('nombre_equipo', 100, 'El nombre del equipo es obligatorio')
+    nombre = texto('nombre', 100, 'El nombre es obligatorio')
+    apellido = texto('apellido', 100, 'El apellido es obligatorio')
+    documento = texto('documento', 20, 'El documento es obligatorio')
+    dorsal = fields.Integer(**requerido('dorsal', 'El dorsal es obligatorio'),
+                            validate=rango(1, mensaje='El dorsal debe ser un número positivo'))
+    posicion = Opcion(POSICIONES, load_default='delantero')
+    fecha_nacimiento = Fecha(allow_none=True)
+
+
+class JugadorUpdateSchema(BaseSchema):
+    """PUT /api/jugadores/<id> (solo los campos enviados)"""
+
+    nombre = texto('nombre', 100, obligatorio=False)
+    apellido = texto('apellido', 100, obligatorio=False)
+    dorsal = fields.Integer(validate=rango(1, mensaje='El dorsal debe ser un número positivo'))
+    posicion = Opcion(POSICIONES)
+    fecha_nacimiento = Fecha(allow_none=True)
+    activo = fields.Boolean()
+
+
+class JugadorActivoSchema(BaseSchema):
+    """PATCH /api/jugadores/<id>/activar"""
+
+    activo = fields.Boolean(**requerido('activo', 'El campo activo es requerido'))
@@ -0,0 +1,134 @@
+from flask import current_app
+from marshmallow import ValidationError, fields, pre_load, validates_schema
+
+from app.schemas.base import BaseSchema, FechaHora, Opcion, Texto, rango, requerido, texto
+from app.schemas.gol import TIPOS_GOL
+from app.schemas.tarjeta import TIPOS_TARJETA
+
+ESTADOS_PARTIDO = ('programado', 'en_juego', 'finalizado', 'cancelado')
+ESTADOS_EVENTOS = ('en_juego', 'finalizado')
+TIPOS_EVENTO_EN_VIVO = ('cambio',)
+
+
+class PartidoCreateSchema(BaseSchema):
+    """POST /api/partido"""
+
+    id_campeonato = fields.Integer(**requerido('id_campeonato', 'El campeonato es obligatorio'))
+    id_equipo_local = fields.Integer(**requerido('id_equipo_local', 'El equipo local es obligatorio'))
+    id_equipo_visitante = fields.Integer(**requerido('id_equipo_visitante', 'El equipo visitante es obligatorio'))
+    fecha_partido = FechaHora(**requerido('fecha_partido', 'La fecha del partido es obligatoria'))
+    lugar = texto('lugar', 100, obligatorio=False, minimo=0, allow_none=True)
+    jornada = fields.Integer(load_default=1, validate=rango(1))
+
+    @validates_schema
+    def equipos_distintos(self, data, **kwargs):
+        if data.get('id_equipo_local') and data.get('id_equipo_local') == data.get('id_equipo_visitante'):
+            raise ValidationError('Los equipos deben ser diferentes', 'id_equipo_visitante')
+
+
+class PartidoUpdateSchema(BaseSchema):
+    """PUT /api/partido/<id> (solo los campos enviados)"""
+
+    fecha_partido = FechaHora()
+    lugar = texto('lugar', 100, obligatorio=False, minimo=0, allow_none=True)
+    jornada = fields.Integer(validate=rango(1))
+    observaciones = Texto(allow_none=True)
+
+
+class PartidoEstadoSchema(BaseSchema):
+    """PATCH /api/partido/<id>/estado"""
+
+    estado = Opcion(ESTADOS_PARTIDO, **requerido('estado'))
+
+
+class ResultadoSchema(BaseSchema):
+    """PATCH /api/partido/<id>/resultado"""
+
+    goles_local = fields.Integer(**requerido('goles_local', 'Se requieren goles_local y goles_visitante'),
+                                 validate=rango(0))
+    goles_visitante = fields.Integer(**requerido('goles_visitante', 'Se requieren goles_local y goles_visitante'),
+                                     validate=rango(0))
+
+
+class JugadorCambioSchema(BaseSchema):
+    """Jugador que sale o entra (nombre y dorsal se toman de la BD, no del body)"""
+
+    id_jugador = fields.Integer(**requerido('id_jugador', 'El jugador es requerido'))
+
+
+class EventoEnVivoSchema(BaseSchema):
+    """POST /api/partido/<id>/live/eventos (cambios del servicio de alineaciones)"""
+
+    tipo = Opcion(TIPOS_EVENTO_EN_VIVO, **requerido('tipo', 'El tipo es requerido'))
+    id_equipo = fields.Integer(**requerido('id_equipo', 'El equipo es requerido'))
+    minuto = fields.Integer(**requerido('minuto', 'El minuto es requerido'),
+                            validate=rango(1, 120, 'El minuto debe estar entre 1 y 120'))
+    sale = fields.Nested(JugadorCambioSchema, **requerido('sale', 'El jugador que sale es requerido'))
+    entra = fields.Nested(JugadorCambioSchema, **requerido('entra', 'El jugador que entra es requerido'))
+
+    @validates_schema
+    def jugadores_distintos(self, data, **kwargs):
+        if data.get('sale') and data.get('entra') and data['sale']['id_jugador'] == data['entra']['id_jugador']:
+            raise ValidationError('El jugador que entra debe ser distinto del que sale', 'entra')
+
+
+class EquipoPartido(fields.Field):
+    """'local', 'visitante' o el id de uno de los equipos del partido (se comprueba en la ruta)"""
+
+    default_error_messages = {'invalid': 'Equipo inválido (use "local", "visitante" o el id del equipo)'}
+
+    def _deserialize(self, value, attr, data, **kwargs):
+        if isinstance(value, str) and value.strip().lower() in ('local', 'visitante'):
+            return value.strip().lower()
+        if isinstance(value, bool):
+            raise self.make_error('invalid')
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            raise self.make_error('invalid')
+
+
+class EventoJugadorSchema(BaseSchema):
+    """Evento de un jugador: id_jugador, dorsal + equipo o nombre completo (jugador)"""
+
+    id_jugador = fields.Integer(allow_none=True)
+    dorsal = fields.Integer(allow_none=True)
+    equipo = EquipoPartido(allow_none=True)
+    jugador = texto('jugador', 200, obligatorio=False, minimo=0, allow_none=True)
+    minuto = fields.Integer(**requerido('minuto', 'El minuto es requerido'),
+                            validate=rango(1, 120, 'El minuto debe estar entre 1 y 120'))
+
+    @validates_schema
+    def jugador_indicado(self, data, **kwargs):
+        if data.get('id_jugador') is None and data.get('dorsal') is None and not data.get('jugador'):
+            raise ValidationError('El jugador es requerido (id_jugador, dorsal + equipo o jugador)', 'jugador')
+        if data.get('id_jugador') is None and data.get('dorsal') is not None and data.get('equipo') is None:
+            raise ValidationError('Con dorsal hay que indicar el equipo ("local" o "visitante")', 'equipo')
+
+
+class GolEventoSchema(EventoJugadorSchema):
+    tipo = Opcion(TIPOS_GOL, load_default='normal')
+
+
+class TarjetaEventoSchema(EventoJugadorSchema):
+    tipo = Opcion(TIPOS_TARJETA, **requerido('tipo', 'El tipo es requerido'))
+    motivo = texto('motivo', 255, obligatorio=False, minimo=0, allow_none=True)
+
+
+class EventosPartidoSchema(BaseSchema):
+    """POST /api/partido/<id>/eventos"""
+
+    goles = fields.List(fields.Nested(GolEventoSchema), load_default=list)
+    tarjetas = fields.List(fields.Nested(TarjetaEventoSchema), load_default=list)
+    estado = Opcion(ESTADOS_EVENTOS, load_default='finalizado')
+    goles_local = fields.Integer(validate=rango(0))
+    goles_visitante = fields.Integer(validate=rango(0))
+
+    @pre_load
+    def limitar_eventos(self, data, **kwargs):
+        """Antes de validar cada evento: un body enorme se rechaza sin recorrerlo"""
+        maximo = current_app.config.get('PARTIDO_EVENTOS_MAX', 500)
+        cantidad = sum(len(data[lista]) for lista in ('goles', 'tarjetas') if isinstance(data.get(lista), list))
+        if cantidad > maximo:
+            raise ValidationError(f'Máximo {maximo} eventos por petición')
+        return data
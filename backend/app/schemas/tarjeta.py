@@ -0,0 +1,16 @@
+from marshmallow import fields
+
+from app.schemas.base import BaseSchema, Opcion, rango, requerido, texto
+
+TIPOS_TARJETA = ('amarilla', 'roja')
+
+
+class TarjetaCreateSchema(BaseSchema):
+    """POST /api/tarjetas"""
+
+    id_partido = fields.Integer(**requerido('id_partido', 'El partido es requerido'))
+    id_jugador = fields.Integer(**requerido('id_jugador', 'El jugador es requerido'))
+    minuto = fields.Integer(**requerido('minuto', 'El minuto es requerido'),
+                            validate=rango(1, 120, 'El minuto debe estar entre 1 y 120'))
+    tipo = Opcion(TIPOS_TARJETA, **requerido('tipo', 'El tipo es requerido'))
+    motivo = texto('motivo', 255, obligatorio=False, minimo=0, allow_none=True)
@@ -10,6 +10,7 @@ class EmailService:
     Funcionalidades:
     - Enviar email de verificación (registro)
     - Enviar código de desbloqueo (seguridad)
+    - Enviar notificaciones masivas (lo usa EmailQueue)
     """
     
     @staticmethod
@@ -438,4 +439,45 @@ class EmailService:
             
         except Exception as e:
             print(f"❌ Error enviando email de bienvenida: {str(e)}")
-            return False
\ No newline at end of file
+            return False
+    
+    
+    @staticmethod
+    def send_bulk_notification(destinatarios: list, subject: str, mensaje: str) -> int:
+        """
+        Envía el mismo aviso a varios destinatarios con una sola conexión SMTP
+        
+        Args:
+            destinatarios: Lista de (email, nombre)
+            subject: Asunto
+            mensaje: Texto de la notificación
+        
+        Returns:
+            int: Emails enviados
+        """
+        enviados = 0
+        try:
+            with mail.connect() as conn:
+                for email, nombre in destinatarios:
+                    text_body = f"""
+            Hola {nombre},
+            
+            {mensaje}
+            
+            ---
+            Sistema de Gestión de Campeonatos Barriales
+            """
+                    try:
+                        conn.send(Message(subject=subject, recipients=[email], body=text_body))
+                        enviados += 1
+                    except Exception as e:
+                        print(f"❌ Error enviando notificación a {email}: {str(e)}")
+            
+            if enviados < len(destinatarios):
+                print(f"⚠️ Notificación enviada por email a {enviados}/{len(destinatarios)} destinatarios")
+            
+        except Exception as e:
+            print(f"❌ Error conectando al servidor de correo: {str(e)}")
+        
+        return enviados
+
@@ -44,9 +44,12 @@ class RateLimiter:
             window_start = now - timedelta(minutes=window_minutes)
             
             # Buscar registro existente en la ventana actual
+            # (el rango sobre window_start limita la búsqueda a las
+            # particiones recientes si la tabla está particionada)
             rate_limit = RateLimit.query.filter(
                 RateLimit.identifier == identifier,
                 RateLimit.endpoint == endpoint,
+                RateLimit.window_start >= window_start,
                 RateLimit.window_end > now
             ).first()
             
@@ -150,13 +153,13 @@ class RateLimiter:
             days: Días de antigüedad para eliminar (default: 7)
         """
         try:
-            cutoff_date = datetime.utcnow() - timedelta(days=days)
+            from app.utils.maintenance import MaintenanceRunner
             
-            deleted = RateLimit.query.filter(
-                RateLimit.window_end < cutoff_date
-            ).delete()
+            cutoff_date = datetime.utcnow() - timedelta(days=days)
             
-            db.session.commit()
+            deleted = MaintenanceRunner.delete_in_chunks(
+                RateLimit, RateLimit.window_end < cutoff_date
+            )['filas']
             
             if deleted > 0:
                 print(f"🗑️ Rate limiting: {deleted} registros antiguos eliminados")
@@ -210,9 +213,11 @@ class RateLimiter:
         """
         try:
             now = datetime.utcnow()
+            window_minutes = current_app.config.get('RATE_LIMIT_WINDOW_MINUTES', 15)
             
             records = RateLimit.query.filter(
                 RateLimit.identifier == identifier,
+                RateLimit.window_start >= now - timedelta(minutes=window_minutes),
                 RateLimit.window_end > now
             ).all()
             
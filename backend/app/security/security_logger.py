@@ -212,8 +212,14 @@ class SecurityLogger:
             list: Lista de logs
         """
         try:
+            from flask import current_app
+            
+            # Solo dentro de la retención: con la tabla particionada no se
+            # leen particiones vencidas que aún no se eliminaron
+            days = current_app.config.get('SECURITY_LOG_RETENTION_DAYS', 90)
             logs = SecurityLog.query.filter(
-                SecurityLog.user_id == user_id
+                SecurityLog.user_id == user_id,
+                SecurityLog.created_at >= datetime.utcnow() - timedelta(days=days)
             ).order_by(
                 SecurityLog.created_at.desc()
             ).limit(limit).all()
@@ -277,17 +283,16 @@ class SecurityLogger:
         """
         try:
             from flask import current_app
+            from app.utils.maintenance import MaintenanceRunner
             
             if days is None:
                 days = current_app.config.get('SECURITY_LOG_RETENTION_DAYS', 90)
             
             cutoff_date = datetime.utcnow() - timedelta(days=days)
             
-            deleted = SecurityLog.query.filter(
-                SecurityLog.created_at < cutoff_date
-            ).delete()
-            
-            db.session.commit()
+            deleted = MaintenanceRunner.delete_in_chunks(
+                SecurityLog, SecurityLog.created_at < cutoff_date
+            )['filas']
             
             if deleted > 0:
                 print(f"🗑️ Security logs: {deleted} registros antiguos eliminados (> {days} días)")
@@ -314,19 +319,16 @@ class SecurityLogger:
         try:
             time_window = datetime.utcnow() - timedelta(days=days)
             
-            logs = SecurityLog.query.filter(
-                SecurityLog.created_at >= time_window
-            ).all()
-            
-            stats = {}
-            for log in logs:
-                if log.event_type not in stats:
-                    stats[log.event_type] = 0
-                stats[log.event_type] += 1
+            # Conteo en la BD (GROUP BY) sobre las particiones del periodo
+            stats = dict(db.session.execute(
+                db.select(SecurityLog.event_type, db.func.count())
+                .where(SecurityLog.created_at >= time_window)
+                .group_by(SecurityLog.event_type)
+            ).all())
             
             return {
                 'period_days': days,
-                'total_events': len(logs),
+                'total_events': sum(stats.values()),
                 'events_by_type': stats
             }
             
@@ -1,9 +1,12 @@
+from flask import current_app
 from flask_jwt_extended import create_access_token, get_jwt, get_jwt_identity
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from app.extensions import db
 from app.models.token_blacklist import TokenBlacklist
 from app.models.refresh_token import RefreshToken
 from app.models.security_log import SecurityLog
+from app.utils.read_replica import ReadReplicaRouter
+from app.utils.ttl_cache import TTLCache
 
 class TokenManager:
     """
@@ -20,15 +23,34 @@ class TokenManager:
     1. Login → genera access + refresh token
     2. Cada petición usa access token
     3. Access token expira (15 min) → usa refresh token para obtener nuevo access
+       (y un refresh token nuevo: el usado queda revocado, rotación)
     4. Refresh token expira (30 días) → usuario debe hacer login de nuevo
+    
+    usuarios.sesiones_activas cuenta los refresh tokens no revocados del
+    usuario (se actualiza en la misma transacción que el token). Puede
+    quedar por encima del valor real (tokens que expiran o que borra el
+    mantenimiento), nunca por debajo: si vale 0 no hay sesiones que revocar.
+    
+    Revocación sin consultar la blacklist en cada petición:
+    - Cada access token lleva el claim 'tv' (usuarios.token_version al
+      emitirlo). Cerrar todas las sesiones suma 1 a token_version (un
+      UPDATE): los tokens con una versión menor quedan revocados
+    - Solo se busca el jti en token_blacklist si el token se emitió antes
+      de la última revocación individual (logout) del usuario
+    - token_version y la última revocación de cada usuario se guardan en
+      una cache LRU del proceso por TOKEN_STATE_CACHE_TTL_SECONDS: en otros
+      procesos una revocación tarda como mucho ese tiempo en aplicarse
     """
     
     # Configuración de tiempos de expiración
     ACCESS_TOKEN_EXPIRES = timedelta(minutes=15)
     REFRESH_TOKEN_EXPIRES = timedelta(days=30)
     
+    # id_usuario -> (token_version, timestamp de la última revocación individual)
+    _estado_usuarios = TTLCache(maxsize=10000)
+    
     @staticmethod
-    def create_tokens(user_id, email, nombre, rol, ip_address=None, user_agent=None):
+    def create_tokens(user_id, email, nombre, rol, ip_address=None, user_agent=None, token_version=None):
         """
         Crea un par de tokens (access + refresh) para el usuario
         
@@ -39,6 +61,7 @@ class TokenManager:
             rol: Rol (admin, lider, espectador)
             ip_address: IP desde donde se creó
             user_agent: Navegador/dispositivo
+            token_version: usuarios.token_version (se lee si no se pasa)
         
         Returns:
             dict: {
@@ -49,26 +72,29 @@ class TokenManager:
         
         ¿Qué contiene el access token?
         - identity: user_id (para identificar al usuario)
-        - claims adicionales: email, nombre, rol
+        - claims adicionales: email, nombre, rol, tv (versión de tokens del usuario)
         - exp: cuándo expira
         - iat: cuándo se creó
         - jti: ID único del token
         """
         
         # 1. Crear access token
+        if token_version is None:
+            token_version = TokenManager.user_token_state(user_id)[0]
         access_token = create_access_token(
             identity=str(user_id),
             additional_claims={
                 'email': email,
                 'nombre': nombre,
                 'rol': rol,
-                'type': 'access'
+                'type': 'access',
+                'tv': token_version
             },
             expires_delta=TokenManager.ACCESS_TOKEN_EXPIRES
         )
         
-        # 2. Crear refresh token en la BD
-        refresh_token_obj = RefreshToken.create_refresh_token(
+        # 2. Crear refresh token en la BD (en la BD solo queda su hash)
+        refresh_token_obj, refresh_token_str = RefreshToken.create_refresh_token(
             user_id=user_id,
             ip_address=ip_address,
             user_agent=user_agent,
@@ -76,6 +102,7 @@ class TokenManager:
         )
         
         db.session.add(refresh_token_obj)
+        TokenManager._ajustar_sesiones(user_id, 1)
         db.session.commit()
         
         # 3. Log del evento
@@ -93,11 +120,143 @@ class TokenManager:
         
         return {
             'access_token': access_token,
-            'refresh_token': refresh_token_obj.token,
+            'refresh_token': refresh_token_str,
             'expires_in': int(TokenManager.ACCESS_TOKEN_EXPIRES.total_seconds()),
             'refresh_expires_in': int(TokenManager.REFRESH_TOKEN_EXPIRES.total_seconds())
         }
     
+    @staticmethod
+    def _ajustar_sesiones(user_id, delta):
+        """Suma/resta al contador de sesiones activas con un UPDATE atómico (nunca baja de 0)"""
+        from app.models.usuario import Usuario
+        
+        if not delta:
+            return
+        columna = Usuario.sesiones_activas
+        valor = columna + delta if delta > 0 else db.case((columna + delta >= 0, columna + delta), else_=0)
+        db.session.execute(
+            db.update(Usuario)
+            .where(Usuario.id_usuario == user_id)
+            # Sin tocar fecha_actualizacion (onupdate): no es un cambio de perfil
+            .values(sesiones_activas=valor, fecha_actualizacion=Usuario.fecha_actualizacion)
+            .execution_options(synchronize_session=False)
+        )
+    
+    @staticmethod
+    def active_sessions(user_id) -> int:
+        """Sesiones activas del usuario (lee una sola columna de usuarios)"""
+        from app.models.usuario import Usuario
+        
+        return db.session.execute(
+            db.select(Usuario.sesiones_activas).where(Usuario.id_usuario == user_id)
+        ).scalar() or 0
+    
+    @staticmethod
+    def recalcular_sesiones() -> int:
+        """
+        Recalcula el contador de sesiones activas de los usuarios desalineados
+        
+        Returns:
+            int: Usuarios corregidos
+        """
+        from app.models.usuario import Usuario
+        
+        reales = db.select(db.func.count()).where(
+            RefreshToken.user_id == Usuario.id_usuario,
+            RefreshToken.is_revoked == db.false(),
+            RefreshToken.expires_at > datetime.utcnow()
+        ).scalar_subquery()
+        
+        resultado = db.session.execute(
+            db.update(Usuario)
+            .where(Usuario.sesiones_activas != reales)
+            .values(sesiones_activas=reales, fecha_actualizacion=Usuario.fecha_actualizacion)
+            .execution_options(synchronize_session=False)
+        )
+        db.session.commit()
+        return resultado.rowcount
+    
+    @staticmethod
+    def revoke_refresh_token(refresh_token_str, user_id) -> bool:
+        """
+        Revoca un refresh token del usuario (logout)
+        
+        Returns:
+            bool: True si estaba activo
+        """
+        refresh_token = RefreshToken.find_by_token(refresh_token_str, user_id=user_id)
+        if not refresh_token:
+            return False
+        
+        resultado = db.session.execute(
+            db.update(RefreshToken)
+            .where(RefreshToken.id == refresh_token.id, RefreshToken.is_revoked == db.false())
+            .values(is_revoked=True)
+            .execution_options(synchronize_session=False)
+        )
+        if resultado.rowcount:
+            TokenManager._ajustar_sesiones(user_id, -1)
+        db.session.commit()
+        return bool(resultado.rowcount)
+    
+    @staticmethod
+    def user_token_state(user_id) -> tuple:
+        """
+        (token_version, timestamp de la última revocación individual o None)
+        
+        Una consulta por usuario cada TOKEN_STATE_CACHE_TTL_SECONDS como mucho.
+        """
+        estado = TokenManager._estado_usuarios.get(user_id)
+        if estado is not None:
+            return estado
+        
+        from app.models.usuario import Usuario
+        
+        ultima = db.select(db.func.max(TokenBlacklist.revoked_at)).where(
+            TokenBlacklist.user_id == Usuario.id_usuario,
+            TokenBlacklist.expires_at > datetime.utcnow()
+        ).scalar_subquery()
+        fila = db.session.execute(
+            db.select(Usuario.token_version, ultima).where(Usuario.id_usuario == user_id)
+        ).first()
+        
+        version, revocado = (fila[0] or 0, fila[1]) if fila else (0, None)
+        estado = (version, revocado.replace(tzinfo=timezone.utc).timestamp() if revocado else None)
+        TokenManager._estado_usuarios.set(
+            user_id, estado, current_app.config.get('TOKEN_STATE_CACHE_TTL_SECONDS', 30)
+        )
+        return estado
+    
+    @staticmethod
+    def is_payload_revoked(jwt_payload) -> bool:
+        """
+        Verifica si un JWT está revocado (token_in_blocklist_loader)
+        
+        1. Versión del token menor que usuarios.token_version → revocado
+        2. Emitido después de la última revocación individual → válido,
+           sin consultar token_blacklist (el caso normal)
+        3. Si no, se busca el jti en la blacklist
+        
+        Siempre consulta la primaria: en los blueprints que leen de una
+        réplica, un logout no puede tardar lo que tarde la replicación.
+        """
+        with ReadReplicaRouter.primary():
+            try:
+                user_id = int(jwt_payload['sub'])
+            except (KeyError, TypeError, ValueError):
+                return TokenManager.is_token_revoked(jwt_payload.get('jti'))
+            
+            version, ultima_revocacion = TokenManager.user_token_state(user_id)
+            if jwt_payload.get('tv', 0) < version:
+                return True
+            if ultima_revocacion is None or jwt_payload.get('iat', 0) > ultima_revocacion:
+                return False
+            return TokenManager.is_token_revoked(jwt_payload.get('jti'))
+    
+    @staticmethod
+    def cache_status() -> dict:
+        return TokenManager._estado_usuarios.status()
+    
     @staticmethod
     def is_token_revoked(jti):
         """
@@ -161,6 +320,7 @@ class TokenManager:
         
         db.session.add(blacklisted_token)
         db.session.commit()
+        TokenManager._estado_usuarios.invalidate(user_id)
         
         # Log del evento
         SecurityLog.log_event(
@@ -191,31 +351,49 @@ class TokenManager:
         - Admin quiere cerrar todas las sesiones de un usuario
         
         Esto cierra TODAS las sesiones en TODOS los dispositivos
+        
+        Los access tokens se invalidan sumando 1 a usuarios.token_version
+        (sin agregar cada jti a la blacklist). Los refresh tokens, con un solo
+        UPDATE por el índice (user_id, is_revoked), sin cargarlos; si el
+        contador de sesiones activas vale 0 ni siquiera eso.
         """
+        from app.models.usuario import Usuario
         
-        # 1. Revocar todos los refresh tokens activos
-        refresh_tokens = RefreshToken.query.filter_by(
-            user_id=user_id,
-            is_revoked=False
-        ).all()
+        # 1. Invalidar todos los access tokens emitidos hasta ahora
+        db.session.execute(
+            db.update(Usuario)
+            .where(Usuario.id_usuario == user_id)
+            .values(token_version=Usuario.token_version + 1, fecha_actualizacion=Usuario.fecha_actualizacion)
+            .execution_options(synchronize_session=False)
+        )
         
-        for rt in refresh_tokens:
-            rt.is_revoked = True
+        # 2. Revocar todos los refresh tokens activos
+        revoked = 0
+        if TokenManager.active_sessions(user_id):
+            revoked = db.session.execute(
+                db.update(RefreshToken)
+                .where(RefreshToken.user_id == user_id, RefreshToken.is_revoked == db.false())
+                .values(is_revoked=True)
+                .execution_options(synchronize_session=False)
+            ).rowcount
+            TokenManager._ajustar_sesiones(user_id, -revoked)
+        db.session.commit()
+        TokenManager._estado_usuarios.invalidate(user_id)
         
-        # 2. Log del evento
+        # 3. Log del evento
         SecurityLog.log_event(
             event_type='token_revoked',
             user_id=user_id,
             details={
                 'reason': reason,
-                'tokens_revoked': len(refresh_tokens),
+                'tokens_revoked': revoked,
                 'action': 'revoke_all'
             }
         )
         
         db.session.commit()
         
-        return len(refresh_tokens)
+        return revoked
     
     @staticmethod
     def refresh_access_token(refresh_token_str, ip_address=None, user_agent=None):
@@ -230,6 +408,7 @@ class TokenManager:
         Returns:
             dict o None: {
                 'access_token': 'nuevo_token...',
+                'refresh_token': 'nuevo refresh token (el enviado queda revocado)',
                 'expires_in': 900
             }
         
@@ -237,26 +416,38 @@ class TokenManager:
         1. Cliente detecta que access token expiró (401)
         2. Cliente envía refresh token a endpoint /auth/refresh
         3. Backend verifica refresh token
-        4. Si es válido, genera nuevo access token
-        5. Cliente usa nuevo access token
+        4. Si es válido, genera nuevo access token y rota el refresh token
+        5. Cliente usa nuevo access token y guarda el nuevo refresh token
         
         Flujo de seguridad:
-        - Verifica que el refresh token exista en BD
-        - Verifica que no esté revocado
+        - Verifica que el refresh token exista en BD (selector + hash)
+        - Verifica que no esté revocado (si ya se rotó, se registra como
+          reutilización sospechosa)
         - Verifica que no haya expirado
         - (Opcional) Verifica que la IP/User-Agent coincidan
         """
         
-        # 1. Buscar refresh token en BD
-        refresh_token = RefreshToken.query.filter_by(
-            token=refresh_token_str
-        ).first()
+        # 1. Buscar refresh token en BD (índice UNIQUE de selector)
+        refresh_token = RefreshToken.find_by_token(refresh_token_str)
         
         if not refresh_token:
             return None
         
         # 2. Verificar que sea válido
-        if not refresh_token.is_valid():
+        if refresh_token.is_revoked:
+            SecurityLog.log_event(
+                event_type='suspicious_activity',
+                user_id=refresh_token.user_id,
+                ip_address=ip_address,
+                user_agent=user_agent,
+                details={
+                    'reason': 'refresh_token_reused',
+                    'refresh_token_id': refresh_token.id
+                }
+            )
+            return None
+        
+        if refresh_token.is_expired():
             return None
         
         # 3. (Opcional) Verificar IP/User-Agent para detectar robo
@@ -292,12 +483,36 @@ class TokenManager:
                 'email': usuario.email,
                 'nombre': usuario.nombre,
                 'rol': usuario.rol,
-                'type': 'access'
+                'type': 'access',
+                'tv': usuario.token_version or 0
             },
             expires_delta=TokenManager.ACCESS_TOKEN_EXPIRES
         )
         
-        # 6. Log del evento
+        # 6. Rotar: revocar el usado y crear uno nuevo en una sola transacción
+        #    (UPDATE + INSERT). El UPDATE solo afecta si seguía activo: de dos
+        #    renovaciones simultáneas con el mismo token, solo una rota.
+        #    El nuevo conserva la expiración del original (la sesión no se alarga).
+        rotated = db.session.execute(
+            db.update(RefreshToken)
+            .where(RefreshToken.id == refresh_token.id, RefreshToken.is_revoked == db.false())
+            .values(is_revoked=True)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        if not rotated:
+            db.session.rollback()
+            return None
+        
+        new_refresh_token, new_refresh_token_str = RefreshToken.create_refresh_token(
+            user_id=usuario.id_usuario,
+            ip_address=ip_address,
+            user_agent=user_agent
+        )
+        new_refresh_token.expires_at = refresh_token.expires_at
+        db.session.add(new_refresh_token)
+        db.session.commit()
+        
+        # 7. Log del evento
         SecurityLog.log_event(
             event_type='login_success',
             user_id=usuario.id_usuario,
@@ -306,13 +521,16 @@ class TokenManager:
             user_agent=user_agent,
             details={
                 'action': 'token_refreshed',
-                'refresh_token_id': refresh_token.id
+                'refresh_token_id': new_refresh_token.id,
+                'rotated_from': refresh_token.id
             }
         )
         
         return {
             'access_token': access_token,
-            'expires_in': int(TokenManager.ACCESS_TOKEN_EXPIRES.total_seconds())
+            'refresh_token': new_refresh_token_str,
+            'expires_in': int(TokenManager.ACCESS_TOKEN_EXPIRES.total_seconds()),
+            'refresh_expires_in': max(0, int((new_refresh_token.expires_at - datetime.utcnow()).total_seconds()))
         }
     
     @staticmethod
@@ -329,23 +547,24 @@ class TokenManager:
         - Tarea programada (cron): cada día/semana
         - O antes de cada verificación (con cache)
         
-        Ejemplo cron:
+        Ejemplo cron (con lock y registro en maintenance_runs):
             # Ejecutar todos los días a las 3 AM
-            0 3 * * * cd /ruta/backend && python -c "from app.security.token_manager import TokenManager; TokenManager.cleanup_expired_tokens()"
-        """
+            0 3 * * * cd /ruta/backend && flask mantenimiento --tarea token_blacklist --tarea refresh_tokens
         
-        # Eliminar tokens de blacklist que ya expiraron
-        deleted = TokenBlacklist.query.filter(
-            TokenBlacklist.expires_at < datetime.utcnow()
-        ).delete()
+        Borra en lotes (MaintenanceRunner.delete_in_chunks) para no
+        bloquear las tablas durante un DELETE largo.
+        """
+        from app.utils.maintenance import MaintenanceRunner
         
-        # Eliminar refresh tokens expirados y revocados
-        deleted_refresh = RefreshToken.query.filter(
-            RefreshToken.expires_at < datetime.utcnow(),
-            RefreshToken.is_revoked == True
-        ).delete()
+        # Tokens de blacklist que ya expiraron
+        deleted = MaintenanceRunner.delete_in_chunks(
+            *MaintenanceRunner.job_filter('token_blacklist')
+        )['filas']
         
-        db.session.commit()
+        # Refresh tokens expirados (revocados o no, ya no sirven)
+        deleted_refresh = MaintenanceRunner.delete_in_chunks(
+            *MaintenanceRunner.job_filter('refresh_tokens')
+        )['filas']
         
         return {
             'blacklist_cleaned': deleted,
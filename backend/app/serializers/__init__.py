@@ -0,0 +1,20 @@
+from app.serializers.base import Calculado, Expresion, Relacion, RowSerializer
+from app.serializers.equipo import equipo_serializer
+from app.serializers.gol import gol_serializer
+from app.serializers.jugador import jugador_serializer
+from app.serializers.notificacion import notificacion_serializer
+from app.serializers.partido import partido_serializer
+from app.serializers.tarjeta import tarjeta_serializer
+
+__all__ = [
+    'RowSerializer',
+    'Relacion',
+    'Calculado',
+    'Expresion',
+    'equipo_serializer',
+    'gol_serializer',
+    'jugador_serializer',
+    'notificacion_serializer',
+    'partido_serializer',
+    'tarjeta_serializer',
+]
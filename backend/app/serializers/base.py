@@ -0,0 +1,171 @@
+import threading
+
+from sqlalchemy import inspect, select
+from sqlalchemy.orm import aliased, configure_mappers
+
+
+class Relacion:
+    """Columna de un modelo relacionado: Relacion('equipo', 'equipo.nombre')"""
+
+    def __init__(self, clave, ruta):
+        self.clave = clave
+        self.relacion, _, self.columna = ruta.partition('.')
+
+
+class Calculado:
+    """
+    Valor armado en Python a partir de otras columnas de la fila
+
+    Calculado('nombre_completo', lambda n, a: f'{n} {a}', 'nombre', 'apellido')
+    Las dependencias pueden ser columnas del modelo o rutas 'relacion.columna';
+    si no están entre las claves de salida se seleccionan igual.
+    """
+
+    def __init__(self, clave, funcion, *dependencias):
+        self.clave = clave
+        self.funcion = funcion
+        self.dependencias = dependencias
+
+
+class Expresion:
+    """Expresión SQL arbitraria (p. ej. un COUNT correlacionado), como fábrica sin argumentos"""
+
+    def __init__(self, clave, fabrica):
+        self.clave = clave
+        self.fabrica = fabrica
+
+
+class RowSerializer:
+    """
+    Serializador de filas generado a partir de la metadata del modelo
+
+    ¿Cómo funciona?
+    1. Los campos se declaran en el orden de salida: nombres de columnas
+       del modelo, Relacion (columna de un modelo relacionado, vía JOIN),
+       Calculado (valor armado en Python) o Expresion (SQL)
+    2. select() devuelve un SELECT solo de esas columnas, con un LEFT JOIN
+       (aliased) por relación: sin objetos ORM, identity map ni lazy loads
+    3. La primera vez se genera una función con un dict literal que lee
+       la fila por posición (r[0], r[1], ...): funciona con Row o tuplas
+    4. Se compila la primera vez que se usa, cuando los mappers (y los
+       backrefs) ya están configurados
+
+    Uso:
+        filas = db.session.execute(jugador_serializer.select().where(...)).all()
+        jugadores = jugador_serializer.dump_all(filas)
+    """
+
+    def __init__(self, model, campos=None, excluir=()):
+        self.model = model
+        self._campos = campos
+        self._excluir = set(excluir)
+        self._lock = threading.Lock()
+        self._compilado = None
+
+    # ------------------------------------------------------------------
+    # Compilación
+    # ------------------------------------------------------------------
+    def _columnas_modelo(self):
+        """Columnas mapeadas del modelo, en el orden en que se declararon"""
+        return [
+            atributo.key for atributo in inspect(self.model).column_attrs
+            if atributo.key not in self._excluir
+        ]
+
+    def _compilar(self):
+        configure_mappers()
+        mapper = inspect(self.model)
+        campos = self._campos if self._campos is not None else self._columnas_modelo()
+
+        columnas = []  # expresiones del SELECT
+        posiciones = {}  # nombre/ruta -> índice en la fila
+        joins = {}  # relación -> alias
+
+        def alias_de(relacion):
+            if relacion not in joins:
+                if relacion not in mapper.relationships:
+                    raise ValueError(f'{self.model.__name__} no tiene la relación {relacion!r}')
+                destino = mapper.relationships[relacion].mapper.class_
+                joins[relacion] = aliased(destino, name=f'{relacion}_rel')
+            return joins[relacion]
+
+        def posicion(ruta):
+            if ruta not in posiciones:
+                relacion, _, columna = ruta.rpartition('.')
+                if relacion:
+                    expresion = getattr(alias_de(relacion), columna)
+                elif columna in mapper.column_attrs:
+                    expresion = getattr(self.model, columna)
+                else:
+                    raise ValueError(f'{self.model.__name__} no tiene la columna {columna!r}')
+                posiciones[ruta] = len(columnas)
+                columnas.append(expresion.label(ruta.replace('.', '__')))
+            return posiciones[ruta]
+
+        salida = []  # (clave, código Python del valor)
+        funciones = {}
+        for campo in campos:
+            if isinstance(campo, str):
+                salida.append((campo, f'r[{posicion(campo)}]'))
+            elif isinstance(campo, Relacion):
+                salida.append((campo.clave, f'r[{posicion(f"{campo.relacion}.{campo.columna}")}]'))
+            elif isinstance(campo, Expresion):
+                posiciones[campo.clave] = len(columnas)
+                columnas.append(campo.fabrica().label(campo.clave))
+                salida.append((campo.clave, f'r[{posiciones[campo.clave]}]'))
+            elif isinstance(campo, Calculado):
+                nombre = f'_f{len(funciones)}'
+                funciones[nombre] = campo.funcion
+                argumentos = ', '.join(f'r[{posicion(d)}]' for d in campo.dependencias)
+                salida.append((campo.clave, f'{nombre}({argumentos})'))
+            else:
+                raise TypeError(f'Campo no soportado: {campo!r}')
+
+        consulta = select(*columnas).select_from(self.model)
+        for relacion, alias in joins.items():
+            consulta = consulta.outerjoin(getattr(self.model, relacion).of_type(alias))
+
+        cuerpo = ', '.join(f'{clave!r}: {codigo}' for clave, codigo in salida)
+        codigo = f'def fila_a_dict(r):\n    return {{{cuerpo}}}\n'
+        espacio = dict(funciones)
+        exec(compile(codigo, f'<serializer {self.model.__name__}>', 'exec'), espacio)
+
+        return {
+            'select': consulta,
+            'fila_a_dict': espacio['fila_a_dict'],
+            'claves': tuple(clave for clave, _ in salida),
+            'posiciones': posiciones,
+        }
+
+    def _datos(self):
+        if self._compilado is None:
+            with self._lock:
+                if self._compilado is None:
+                    self._compilado = self._compilar()
+        return self._compilado
+
+    # ------------------------------------------------------------------
+    # Uso
+    # ------------------------------------------------------------------
+    def select(self):
+        """SELECT de las columnas del serializador (se le agregan where/order_by/limit)"""
+        return self._datos()['select']
+
+    def column(self, ruta):
+        """Columna seleccionada (p. ej. para ordenar por 'equipo.nombre')"""
+        return self._datos()['select'].selected_columns[self._datos()['posiciones'][ruta]]
+
+    @property
+    def keys(self) -> tuple:
+        return self._datos()['claves']
+
+    def dump(self, fila) -> dict:
+        """Fila (Row o tupla en el orden de select()) -> diccionario"""
+        return self._datos()['fila_a_dict'](fila)
+
+    def dump_all(self, filas) -> list:
+        fila_a_dict = self._datos()['fila_a_dict']
+        return [fila_a_dict(fila) for fila in filas]
+
+    def __repr__(self):
+        return f'<RowSerializer {self.model.__name__}>'
@@ -0,0 +1,33 @@
+from sqlalchemy import func, select
+
+from app.models.equipo import Equipo
+from app.models.jugador import Jugador
+from app.serializers.base import Calculado, Expresion, Relacion, RowSerializer
+from app.utils.logo_storage import LogoStorage
+
+
+def _total_jugadores():
+    return (
+        select(func.count(Jugador.id_jugador))
+        .where(Jugador.id_equipo == Equipo.id_equipo)
+        .correlate(Equipo)
+        .scalar_subquery()
+    )
+
+
+# Mismas claves que Equipo.to_dict (sin include_jugadores); el total de
+# jugadores es un COUNT correlacionado en la misma consulta
+equipo_serializer = RowSerializer(Equipo, [
+    'id_equipo',
+    'nombre',
+    'logo_url',
+    Calculado('logo_miniatura', LogoStorage.miniatura_url, 'logo_hash', 'logo_url'),
+    'id_lider',
+    Relacion('nombre_lider', 'lider.nombre'),
+    'fecha_registro',
+    'fecha_aprobacion',
+    'estado',
+    'observaciones',
+    Expresion('total_jugadores', _total_jugadores),
+    'estadio',
+])
@@ -0,0 +1,13 @@
+from app.models.gol import Gol
+from app.serializers.base import Relacion, RowSerializer
+
+# Mismas claves que Gol.to_dict
+gol_serializer = RowSerializer(Gol, [
+    'id_gol',
+    'id_partido',
+    'id_jugador',
+    Relacion('jugador', 'jugador.nombre'),
+    'minuto',
+    'tipo',
+    'fecha_registro',
+])
@@ -0,0 +1,24 @@
+from app.models.jugador import Jugador
+from app.serializers.base import Calculado, Relacion, RowSerializer
+
+
+def _documento_url(id_jugador, documento_pdf):
+    return f'/api/jugadores/{id_jugador}/documento' if documento_pdf else None
+
+
+# Mismas claves que Jugador.to_dict
+jugador_serializer = RowSerializer(Jugador, [
+    'id_jugador',
+    'id_equipo',
+    'nombre',
+    'apellido',
+    Calculado('nombre_completo', lambda nombre, apellido: f'{nombre} {apellido}', 'nombre', 'apellido'),
+    'documento',
+    'dorsal',
+    'documento_pdf',
+    Calculado('documento_url', _documento_url, 'id_jugador', 'documento_pdf'),
+    'posicion',
+    'fecha_nacimiento',
+    'activo',
+    Relacion('equipo', 'equipo.nombre'),
+])
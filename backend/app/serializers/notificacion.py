@@ -0,0 +1,14 @@
+from app.models.notificacion import Notificacion
+from app.serializers.base import Relacion, RowSerializer
+
+# Mismas claves que Notificacion.to_dict
+notificacion_serializer = RowSerializer(Notificacion, [
+    'id_notificacion',
+    'id_usuario',
+    Relacion('usuario', 'usuario.nombre'),
+    'titulo',
+    'mensaje',
+    'tipo',
+    'leida',
+    'fecha_envio',
+])
@@ -0,0 +1,25 @@
+from app.models.partido import Partido
+from app.serializers.base import Relacion, RowSerializer
+
+# Mismas claves que Partido.to_dict (un alias de equipos por relación)
+partido_serializer = RowSerializer(Partido, [
+    'id_partido',
+    'id_campeonato',
+    Relacion('campeonato', 'campeonato.nombre'),
+    'id_equipo_local',
+    Relacion('equipo_local', 'equipo_local.nombre'),
+    'id_equipo_visitante',
+    Relacion('equipo_visitante', 'equipo_visitante.nombre'),
+    'fecha_partido',
+    'lugar',
+    'jornada',
+    'goles_local',
+    'goles_visitante',
+    'estado',
+    'observaciones',
+    'fecha_creacion',
+    'total_goles',
+    'total_tarjetas',
+    'amarillas',
+    'rojas',
+])
@@ -0,0 +1,14 @@
+from app.models.tarjeta import Tarjeta
+from app.serializers.base import Relacion, RowSerializer
+
+# Mismas claves que Tarjeta.to_dict
+tarjeta_serializer = RowSerializer(Tarjeta, [
+    'id_tarjeta',
+    'id_partido',
+    'id_jugador',
+    Relacion('jugador', 'jugador.nombre'),
+    'tipo',
+    'minuto',
+    'motivo',
+    'fecha_registro',
+])
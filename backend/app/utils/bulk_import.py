@@ -0,0 +1,196 @@
+import codecs
+import csv
+import json
+import os
+
+
+class BulkReader:
+    """
+    Lee registros de un cuerpo CSV o JSON sin cargarlo entero en memoria
+
+    Formatos (por Content-Type):
+    - text/csv: primera línea con los nombres de columna, separador ',' o ';'
+    - application/json: un array de objetos [{...}, {...}]
+    - multipart/form-data: archivo 'archivo' (.csv o .json)
+
+    Cada registro se entrega como (fila, dict): fila es la línea del CSV
+    (la cabecera es la 1) o la posición en el array (desde 1), para poder
+    devolver un reporte de errores por fila.
+    """
+
+    CHUNK_BYTES = 64 * 1024
+    CSV_MIMETYPES = ('text/csv', 'application/csv', 'application/vnd.ms-excel', 'text/plain')
+    JSON_MIMETYPES = ('application/json',)
+
+    @staticmethod
+    def records(req):
+        """
+        Iterador de (fila, dict) según el Content-Type de la petición
+
+        Raises:
+            ValueError: Formato no soportado o cuerpo mal formado
+        """
+        mimetype = req.mimetype or ''
+
+        if mimetype == 'multipart/form-data':
+            archivo = req.files.get('archivo')
+            if not archivo or not archivo.filename:
+                raise ValueError("Falta el archivo 'archivo' (.csv o .json)")
+            extension = os.path.splitext(archivo.filename)[1].lower()
+            if extension == '.json' or archivo.mimetype in BulkReader.JSON_MIMETYPES:
+                return BulkReader.iter_json_array(archivo.stream)
+            if extension == '.csv' or archivo.mimetype in BulkReader.CSV_MIMETYPES:
+                return BulkReader.iter_csv(archivo.stream)
+            raise ValueError('El archivo debe ser .csv o .json')
+
+        if mimetype in BulkReader.JSON_MIMETYPES:
+            return BulkReader.iter_json_array(req.stream)
+        if mimetype in BulkReader.CSV_MIMETYPES:
+            return BulkReader.iter_csv(req.stream)
+        raise ValueError('Content-Type no soportado. Use text/csv, application/json o multipart/form-data')
+
+    @staticmethod
+    def _iter_texto(stream):
+        """Bloques de texto UTF-8 (sin BOM) leídos del stream binario"""
+        decoder = codecs.getincrementaldecoder('utf-8-sig')(errors='strict')
+        while True:
+            bloque = stream.read(BulkReader.CHUNK_BYTES)
+            if not bloque:
+                resto = decoder.decode(b'', final=True)
+                if resto:
+                    yield resto
+                return
+            texto = decoder.decode(bloque)
+            if texto:
+                yield texto
+
+    @staticmethod
+    def _iter_lineas(stream):
+        pendiente = ''
+        for texto in BulkReader._iter_texto(stream):
+            lineas = (pendiente + texto).splitlines(keepends=True)
+            # La última puede estar cortada a mitad: se completa con el siguiente bloque
+            pendiente = lineas.pop() if lineas and not lineas[-1].endswith(('\n', '\r')) else ''
+            yield from lineas
+        if pendiente:
+            yield pendiente
+
+    @staticmethod
+    def iter_csv(stream):
+        """
+        Registros de un CSV con cabecera
+
+        Las columnas se normalizan a minúsculas sin espacios ('Nombre Equipo'
+        -> 'nombre_equipo'); las celdas vacías se entregan como None.
+        """
+        lineas = BulkReader._iter_lineas(stream)
+        try:
+            cabecera = next(lineas)
+        except StopIteration:
+            return
+        except UnicodeDecodeError:
+            raise ValueError('El CSV debe estar en UTF-8')
+
+        separador = ';' if cabecera.count(';') > cabecera.count(',') else ','
+        columnas = [
+            (c or '').strip().lower().replace(' ', '_')
+            for c in next(csv.reader([cabecera], delimiter=separador))
+        ]
+
+        lector = csv.reader(lineas, delimiter=separador)
+        siguiente = 2
+        try:
+            for valores in lector:
+                # Línea donde empieza el registro (un campo entre comillas puede ocupar varias)
+                fila, siguiente = siguiente, lector.line_num + 2
+                if not any(v.strip() for v in valores):
+                    continue
+                yield fila, {
+                    columna: (valor.strip() or None)
+                    for columna, valor in zip(columnas, valores) if columna
+                }
+        except UnicodeDecodeError:
+            raise ValueError('El CSV debe estar en UTF-8')
+        except csv.Error as e:
+            raise ValueError(f'CSV mal formado (línea {lector.line_num + 1}): {e}')
+
+    @staticmethod
+    def iter_json_array(stream):
+        """
+        Elementos de un array JSON, decodificados uno a uno
+
+        El buffer solo guarda el elemento que se está leyendo (no el
+        array completo). Los elementos que no son objetos se entregan tal
+        cual: quien los consume los reporta como error de su fila.
+        """
+        decoder = json.JSONDecoder()
+        bloques = BulkReader._iter_texto(stream)
+        buffer, pos, fin = '', 0, False
+        fila = 0
+        estado = 'inicio'  # inicio -> elemento <-> separador -> terminado
+
+        def leer_mas():
+            nonlocal buffer, pos, fin
+            try:
+                buffer = buffer[pos:] + next(bloques)
+                pos = 0
+            except StopIteration:
+                fin = True
+            except UnicodeDecodeError:
+                raise ValueError('El JSON debe estar en UTF-8')
+
+        while True:
+            while pos < len(buffer) and buffer[pos] in ' \t\r\n':
+                pos += 1
+            if pos >= len(buffer):
+                if fin:
+                    if estado != 'terminado':
+                        raise ValueError('JSON incompleto: se esperaba el cierre del array')
+                    return
+                leer_mas()
+                continue
+
+            caracter = buffer[pos]
+            if estado == 'inicio':
+                if caracter != '[':
+                    raise ValueError('Se esperaba un array JSON: [{...}, {...}]')
+                pos += 1
+                estado = 'primero'
+            elif estado in ('primero', 'separador') and caracter == ']':
+                pos += 1
+                estado = 'terminado'
+            elif estado == 'separador':
+                if caracter != ',':
+                    raise ValueError(f'JSON mal formado después del elemento {fila}')
+                pos += 1
+                estado = 'elemento'
+            elif estado in ('primero', 'elemento'):
+                try:
+                    valor, siguiente = decoder.raw_decode(buffer, pos)
+                except json.JSONDecodeError as e:
+                    if fin:
+                        raise ValueError(f'JSON mal formado en el elemento {fila + 1}: {e.msg}')
+                    leer_mas()
+                    continue
+                if siguiente >= len(buffer) and not fin:
+                    # Un número al final del buffer podría seguir en el próximo bloque
+                    leer_mas()
+                    continue
+                pos = siguiente
+                fila += 1
+                estado = 'separador'
+                yield fila, valor
+            else:
+                raise ValueError('Contenido después del cierre del array JSON')
+
+    @staticmethod
+    def chunks(registros, size):
+        """Agrupa un iterador en listas de hasta `size` elementos"""
+        bloque = []
+        for registro in registros:
+            bloque.append(registro)
+            if len(bloque) >= size:
+                yield bloque
+                bloque = []
+        if bloque:
+            yield bloque
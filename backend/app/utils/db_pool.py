@@ -0,0 +1,226 @@
+import threading
+import time
+from collections import deque
+
+from flask import current_app, g, has_app_context, request, has_request_context
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+
+from app.utils.query_monitor import QueryMonitor
+
+
+class PoolMetrics:
+    """
+    Métricas de un pool de conexiones
+
+    - Tiempo de espera al pedir una conexión (checkout)
+    - Timeouts del pool (no hubo conexión libre en pool_timeout segundos)
+    - Fugas detectadas (conexiones no devueltas al terminar la petición)
+    """
+
+    def __init__(self, max_muestras=2000):
+        self._lock = threading.Lock()
+        self._esperas = deque(maxlen=max_muestras)
+        self.checkouts = 0
+        self.espera_total_ms = 0.0
+        self.espera_max_ms = 0.0
+        self.timeouts = 0
+        self.fugas = 0
+        self.sin_confirmar = 0
+
+    def record_wait(self, ms):
+        with self._lock:
+            self.checkouts += 1
+            self.espera_total_ms += ms
+            self.espera_max_ms = max(self.espera_max_ms, ms)
+            self._esperas.append(ms)
+
+    def record_timeout(self):
+        with self._lock:
+            self.timeouts += 1
+
+    def record_leak(self):
+        with self._lock:
+            self.fugas += 1
+
+    def record_uncommitted(self):
+        with self._lock:
+            self.sin_confirmar += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            esperas = sorted(self._esperas)
+        p95 = esperas[int((len(esperas) - 1) * 0.95)] if esperas else 0.0
+        return {
+            'checkouts': self.checkouts,
+            'espera_media_ms': round(self.espera_total_ms / self.checkouts, 3) if self.checkouts else 0.0,
+            'espera_p95_ms': round(p95, 3),
+            'espera_max_ms': round(self.espera_max_ms, 3),
+            'timeouts': self.timeouts,
+            'fugas': self.fugas,
+            'sin_confirmar': self.sin_confirmar,
+        }
+
+    def reset(self):
+        with self._lock:
+            self._esperas.clear()
+            self.checkouts = 0
+            self.espera_total_ms = 0.0
+            self.espera_max_ms = 0.0
+            self.timeouts = 0
+            self.fugas = 0
+            self.sin_confirmar = 0
+
+
+class TimedQueuePool(QueuePool):
+    """QueuePool que mide cuánto espera cada checkout por una conexión libre"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+    def _do_get(self):
+        inicio = time.perf_counter()
+        try:
+            conexion = super()._do_get()
+        except PoolTimeoutError:
+            self.metrics.record_timeout()
+            raise
+        self.metrics.record_wait((time.perf_counter() - inicio) * 1000)
+        return conexion
+
+    def recreate(self):
+        # engine.dispose() crea un pool nuevo: se conservan las métricas
+        nuevo = super().recreate()
+        nuevo.metrics = self.metrics
+        return nuevo
+
+
+class DbPool:
+    """
+    Capa de configuración y diagnóstico del pool de conexiones
+
+    - Usa TimedQueuePool (con las opciones de SQLALCHEMY_ENGINE_OPTIONS)
+    - Detector de fugas: cada checkout hecho dentro de un contexto de la app
+      se anota en `g`; si al cerrar el contexto (después de que
+      Flask-SQLAlchemy liberó la sesión) queda alguna conexión sin devolver,
+      se avisa con el stack donde se pidió
+    - También avisa cuando una petición termina con cambios en la sesión
+      sin confirmar (se descartan en silencio al cerrar la sesión)
+    """
+
+    _listeners_registrados = False
+    _fugas = deque(maxlen=200)
+
+    @staticmethod
+    def apply_engine_options(app):
+        """Agrega TimedQueuePool a las opciones del engine (salvo SQLite en memoria)"""
+        uri = app.config.get('SQLALCHEMY_DATABASE_URI') or ''
+        opciones = dict(app.config.get('SQLALCHEMY_ENGINE_OPTIONS') or {})
+
+        if not app.config.get('DB_POOL_METRICS_ENABLED', True) or 'poolclass' in opciones:
+            return
+        if uri.startswith('sqlite') and (':memory:' in uri or uri.rstrip('/') == 'sqlite:'):
+            return
+
+        opciones['poolclass'] = TimedQueuePool
+        app.config['SQLALCHEMY_ENGINE_OPTIONS'] = opciones
+
+    @staticmethod
+    def _on_checkout(dbapi_conn, record, proxy):
+        if not has_app_context() or not current_app.config.get('DB_LEAK_DETECTOR_ENABLED', False):
+            return
+        propias = g.setdefault('_db_checkouts', {})
+        propias[id(record)] = {
+            'ruta': f'{request.method} {request.path}' if has_request_context() else 'contexto sin petición',
+            'stack': [frame for frame in QueryMonitor.sample_stack(limit=10) if '/db_pool.py' not in frame],
+        }
+        record.info['_db_owner'] = propias
+
+    @staticmethod
+    def _on_checkin(dbapi_conn, record):
+        propias = record.info.pop('_db_owner', None)
+        if propias is not None:
+            propias.pop(id(record), None)
+
+    @staticmethod
+    def register_listeners():
+        """Los listeners se registran una vez por proceso, a nivel de clase"""
+        if DbPool._listeners_registrados:
+            return
+        event.listen(TimedQueuePool, 'checkout', DbPool._on_checkout)
+        event.listen(TimedQueuePool, 'checkin', DbPool._on_checkin)
+        DbPool._listeners_registrados = True
+
+    @staticmethod
+    def report_leaks(app, db, pendientes: dict):
+        metrics = getattr(db.engine.pool, 'metrics', None)
+
+        for fuga in pendientes.values():
+            if metrics:
+                metrics.record_leak()
+            DbPool._fugas.append(dict(fuga, fecha=time.time()))
+            print(f"⚠️ Conexión de BD no devuelta al pool al terminar: {fuga['ruta']}")
+            for frame in fuga['stack']:
+                print(f'     ↳ {frame}')
+
+    @staticmethod
+    def get_leaks() -> list:
+        return list(DbPool._fugas)
+
+    @staticmethod
+    def status(engine) -> dict:
+        """
+        Estado del pool para /health
+
+        Returns:
+            dict: tamaño, conexiones en uso, overflow y métricas de espera
+                  (None si el pool no es de tipo cola, ej: SQLite en memoria)
+        """
+        pool = engine.pool
+        if not hasattr(pool, 'checkedout'):
+            return None
+
+        estado = {
+            'tamano': pool.size(),
+            'en_uso': pool.checkedout(),
+            'overflow': pool.overflow(),
+        }
+        metrics = getattr(pool, 'metrics', None)
+        if metrics:
+            estado.update(metrics.snapshot())
+        return estado
+
+
+def register_db_pool(app, db):
+    """
+    Configura el pool de conexiones de la app
+
+    Debe llamarse ANTES de db.init_app:
+    - Las opciones del engine se leen al crearlo en init_app
+    - Flask ejecuta los teardown en orden inverso, así el detector de fugas
+      corre después de que Flask-SQLAlchemy cierra la sesión
+    """
+    DbPool.apply_engine_options(app)
+    DbPool.register_listeners()
+
+    @app.after_request
+    def _db_pool_check_session(response):
+        if not app.config.get('DB_LEAK_DETECTOR_ENABLED', False):
+            return response
+        if db.session.registry.has():
+            sesion = db.session()
+            if sesion.new or sesion.dirty or sesion.deleted:
+                metrics = getattr(db.engine.pool, 'metrics', None)
+                if metrics:
+                    metrics.record_uncommitted()
+                print(f'⚠️ La petición {request.method} {request.path} terminó con cambios sin confirmar '
+                      f'({len(sesion.new)} nuevos, {len(sesion.dirty)} modificados, {len(sesion.deleted)} eliminados)')
+        return response
+
+    @app.teardown_appcontext
+    def _db_pool_check_leaks(exception=None):
+        pendientes = g.pop('_db_checkouts', None)
+        if pendientes:
+            DbPool.report_leaks(app, db, pendientes)
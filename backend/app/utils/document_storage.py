@@ -0,0 +1,396 @@
+import glob
+import hashlib
+import json
+import os
+import re
+import secrets
+import shutil
+import tempfile
+import threading
+import time
+
+from flask import current_app
+from werkzeug.security import safe_join
+
+
+class DocumentStorage:
+    """
+    Documentos PDF de jugadores (jugadores.documento_pdf) guardados por
+    contenido en uploads/documentos/<ab>/<cd>/<sha256>.pdf
+
+    Dos formas de subirlos, ninguna carga el archivo en memoria:
+    1. De una vez (PUT con el PDF como cuerpo): se copia el stream por
+       partes a un temporal mientras se calcula el SHA-256 y se controla
+       el tamaño (DOCUMENTO_MAX_BYTES)
+    2. Por partes, reanudable: se abre una subida con el tamaño total y el
+       servidor fija DOCUMENTO_CHUNK_BYTES; cada parte se envía con su
+       índice y se escribe directamente en su posición del archivo. Cada
+       parte recibida deja una marca en disco, así tras un corte el
+       cliente pregunta qué índices faltan y envía solo esos (en cualquier
+       orden, en paralelo o desde otro worker si la carpeta es compartida)
+
+    Al completar se calcula el SHA-256 del archivo, se verifica la firma
+    %PDF- y se mueve a su carpeta de dos niveles (256 x 256 carpetas: pocas
+    entradas por directorio aunque haya miles de documentos). El mismo PDF
+    subido dos veces es un solo archivo.
+
+    Como un archivo puede ser de varios jugadores, las rutas nunca lo
+    borran: limpiar_huerfanos (tarea 'documentos' del mantenimiento) borra
+    los que ningún jugador usa y no se tocaron en las últimas
+    DOCUMENTO_HUERFANO_GRACIA_HORAS. Reutilizar un archivo existente
+    actualiza su fecha de modificación, así una subida repetida que todavía
+    no confirmó no pierde su archivo.
+    """
+
+    FIRMA = b'%PDF-'
+    RELATIVA = re.compile(r'^[0-9a-f]{2}/[0-9a-f]{2}/(?P<hash>[0-9a-f]{64})\.pdf$')
+    SUBIDA = re.compile(r'^[0-9a-f]{32}$')
+    CARPETA_SUBIDAS = '.subidas'
+    CHUNK_BYTES = 64 * 1024
+    LIMPIEZA_CADA_SECONDS = 600
+
+    _lock = threading.Lock()
+    _ultima_limpieza = 0.0
+    _guardados = 0
+    _repetidos = 0
+    _partes = 0
+    _bytes_recibidos = 0
+
+    @staticmethod
+    def carpeta() -> str:
+        return os.path.join(current_app.config['UPLOAD_FOLDER'], 'documentos')
+
+    @staticmethod
+    def relativa(documento_hash) -> str:
+        return f'{documento_hash[:2]}/{documento_hash[2:4]}/{documento_hash}.pdf'
+
+    @staticmethod
+    def ruta(documento_pdf):
+        """
+        Ruta absoluta de jugadores.documento_pdf (o None si sale de la carpeta)
+
+        Acepta los valores por contenido (ab/cd/<sha256>.pdf) y los nombres
+        de archivo anteriores guardados directamente en uploads/documentos.
+        """
+        if not documento_pdf:
+            return None
+        return safe_join(DocumentStorage.carpeta(), documento_pdf)
+
+    @staticmethod
+    def etag(documento_pdf):
+        partes = DocumentStorage.RELATIVA.match(documento_pdf or '')
+        return partes.group('hash') if partes else None
+
+    @staticmethod
+    def _copiar(stream, destino, maximo, sha, mensaje_maximo):
+        """Copia el stream por bloques; devuelve (bytes, primeros bytes)"""
+        tamano = 0
+        cabecera = b''
+        while True:
+            bloque = stream.read(DocumentStorage.CHUNK_BYTES)
+            if not bloque:
+                break
+            tamano += len(bloque)
+            if tamano > maximo:
+                raise ValueError(mensaje_maximo)
+            if len(cabecera) < len(DocumentStorage.FIRMA):
+                cabecera += bloque[:len(DocumentStorage.FIRMA) - len(cabecera)]
+            sha.update(bloque)
+            destino.write(bloque)
+        with DocumentStorage._lock:
+            DocumentStorage._bytes_recibidos += tamano
+        return tamano, cabecera
+
+    @staticmethod
+    def _publicar(temporal, documento_hash) -> tuple:
+        """Mueve el temporal a su carpeta; (relativa, nuevo)"""
+        relativa = DocumentStorage.relativa(documento_hash)
+        final = os.path.join(DocumentStorage.carpeta(), relativa)
+        nuevo = not os.path.exists(final)
+        if nuevo:
+            os.makedirs(os.path.dirname(final), exist_ok=True)
+            os.replace(temporal, final)
+        else:
+            os.remove(temporal)
+            # En uso desde ahora: el mantenimiento no lo borra durante el margen de gracia
+            os.utime(final)
+        with DocumentStorage._lock:
+            if nuevo:
+                DocumentStorage._guardados += 1
+            else:
+                DocumentStorage._repetidos += 1
+        return relativa, nuevo
+
+    @staticmethod
+    def guardar(stream) -> tuple:
+        """
+        Guarda un PDF leyendo el stream por partes
+
+        Returns:
+            tuple: (sha256, ruta relativa, nuevo) - nuevo=False si ya existía
+
+        Raises:
+            ValueError: Vacío, demasiado grande o no es un PDF
+        """
+        maximo = current_app.config.get('DOCUMENTO_MAX_BYTES', 10 * 1024 * 1024)
+        carpeta = DocumentStorage.carpeta()
+        os.makedirs(carpeta, exist_ok=True)
+
+        sha = hashlib.sha256()
+        descriptor, temporal = tempfile.mkstemp(dir=carpeta, suffix='.subida')
+        try:
+            with os.fdopen(descriptor, 'wb') as destino:
+                tamano, cabecera = DocumentStorage._copiar(
+                    stream, destino, maximo, sha, f'El documento no puede superar {maximo // (1024 * 1024)} MB'
+                )
+            if not tamano:
+                raise ValueError('El archivo está vacío')
+            if cabecera != DocumentStorage.FIRMA:
+                raise ValueError('El documento debe ser un archivo PDF')
+
+            documento_hash = sha.hexdigest()
+            relativa, nuevo = DocumentStorage._publicar(temporal, documento_hash)
+            temporal = None
+            return documento_hash, relativa, nuevo
+        finally:
+            if temporal and os.path.exists(temporal):
+                os.remove(temporal)
+
+    # --- Subidas por partes ---
+
+    @staticmethod
+    def _carpeta_subida(id_subida) -> str:
+        return os.path.join(DocumentStorage.carpeta(), DocumentStorage.CARPETA_SUBIDAS, id_subida)
+
+    @staticmethod
+    def crear_subida(id_jugador, id_usuario, tamano, sha256=None) -> dict:
+        """
+        Abre una subida por partes: reserva el archivo y fija el tamaño de parte
+
+        Raises:
+            ValueError: Tamaño fuera de rango o sha256 con formato inválido
+        """
+        config = current_app.config
+        maximo = config.get('DOCUMENTO_MAX_BYTES', 10 * 1024 * 1024)
+        try:
+            tamano = int(tamano)
+        except (TypeError, ValueError):
+            raise ValueError('El tamaño (bytes) es requerido y debe ser un número')
+        if tamano <= 0:
+            raise ValueError('El tamaño debe ser mayor que 0')
+        if tamano > maximo:
+            raise ValueError(f'El documento no puede superar {maximo // (1024 * 1024)} MB')
+        if sha256 is not None:
+            sha256 = str(sha256).strip().lower()
+            if not re.fullmatch(r'[0-9a-f]{64}', sha256):
+                raise ValueError('sha256 debe tener 64 caracteres hexadecimales')
+
+        DocumentStorage.limpiar_subidas()
+
+        chunk_bytes = max(DocumentStorage.CHUNK_BYTES, config.get('DOCUMENTO_CHUNK_BYTES', 1024 * 1024))
+        subida = {
+            'id_subida': secrets.token_hex(16),
+            'id_jugador': id_jugador,
+            'id_usuario': id_usuario,
+            'tamano': tamano,
+            'chunk_bytes': chunk_bytes,
+            'total_partes': -(-tamano // chunk_bytes),
+            'sha256': sha256,
+            'creada': time.time(),
+        }
+        carpeta = DocumentStorage._carpeta_subida(subida['id_subida'])
+        os.makedirs(carpeta)
+        # Archivo disperso del tamaño final: cada parte se escribe en su posición
+        with open(os.path.join(carpeta, 'datos'), 'wb') as datos:
+            datos.truncate(tamano)
+        with open(os.path.join(carpeta, 'subida.json'), 'w') as archivo:
+            json.dump(subida, archivo)
+        return subida
+
+    @staticmethod
+    def obtener_subida(id_subida):
+        """Datos de la subida (o None si no existe o expiró)"""
+        if not DocumentStorage.SUBIDA.match(id_subida or ''):
+            return None
+        try:
+            with open(os.path.join(DocumentStorage._carpeta_subida(id_subida), 'subida.json')) as archivo:
+                return json.load(archivo)
+        except (OSError, ValueError):
+            return None
+
+    @staticmethod
+    def partes_recibidas(subida) -> list:
+        carpeta = DocumentStorage._carpeta_subida(subida['id_subida'])
+        try:
+            nombres = os.listdir(carpeta)
+        except OSError:
+            return []
+        return sorted(int(n[:-3]) for n in nombres if n.endswith('.ok') and n[:-3].isdigit())
+
+    @staticmethod
+    def estado_subida(subida) -> dict:
+        recibidas = DocumentStorage.partes_recibidas(subida)
+        recibidas_set = set(recibidas)
+        return {
+            'id_subida': subida['id_subida'],
+            'tamano': subida['tamano'],
+            'chunk_bytes': subida['chunk_bytes'],
+            'total_partes': subida['total_partes'],
+            'recibidas': len(recibidas),
+            'faltantes': [i for i in range(subida['total_partes']) if i not in recibidas_set],
+        }
+
+    @staticmethod
+    def escribir_parte(subida, indice, stream, sha256=None) -> str:
+        """
+        Escribe la parte `indice` en su posición del archivo y la marca como recibida
+
+        Una parte repetida (reintento) se vuelve a escribir. Si el tamaño o el
+        SHA-256 enviado no coinciden, la parte no se marca y hay que reenviarla.
+
+        Returns:
+            str: SHA-256 de la parte
+
+        Raises:
+            ValueError: Índice fuera de rango, tamaño incorrecto, hash distinto
+                o la primera parte no es de un PDF
+        """
+        if indice < 0 or indice >= subida['total_partes']:
+            raise ValueError(f'Índice fuera de rango (0 - {subida["total_partes"] - 1})')
+        inicio = indice * subida['chunk_bytes']
+        esperado = min(subida['chunk_bytes'], subida['tamano'] - inicio)
+
+        carpeta = DocumentStorage._carpeta_subida(subida['id_subida'])
+        sha = hashlib.sha256()
+        with open(os.path.join(carpeta, 'datos'), 'r+b') as destino:
+            destino.seek(inicio)
+            tamano, cabecera = DocumentStorage._copiar(
+                stream, destino, esperado, sha, f'La parte {indice} debe tener {esperado} bytes'
+            )
+        if tamano != esperado:
+            raise ValueError(f'La parte {indice} debe tener {esperado} bytes (se recibieron {tamano})')
+        if indice == 0 and cabecera != DocumentStorage.FIRMA:
+            raise ValueError('El documento debe ser un archivo PDF')
+
+        parte_hash = sha.hexdigest()
+        if sha256 and sha256.strip().lower() != parte_hash:
+            raise ValueError(f'El SHA-256 de la parte {indice} no coincide')
+
+        marca = os.path.join(carpeta, f'{indice}.ok')
+        with open(f'{marca}.{threading.get_ident()}.tmp', 'w') as archivo:
+            archivo.write(parte_hash)
+        os.replace(f'{marca}.{threading.get_ident()}.tmp', marca)
+        with DocumentStorage._lock:
+            DocumentStorage._partes += 1
+        return parte_hash
+
+    @staticmethod
+    def completar_subida(subida) -> tuple:
+        """
+        Verifica que estén todas las partes, calcula el SHA-256 y publica el archivo
+
+        Returns:
+            tuple: (sha256, ruta relativa, nuevo)
+
+        Raises:
+            ValueError: Faltan partes o el SHA-256 no coincide con el anunciado
+        """
+        faltantes = DocumentStorage.estado_subida(subida)['faltantes']
+        if faltantes:
+            raise ValueError(f'Faltan {len(faltantes)} partes: {faltantes[:20]}')
+
+        carpeta = DocumentStorage._carpeta_subida(subida['id_subida'])
+        datos = os.path.join(carpeta, 'datos')
+        sha = hashlib.sha256()
+        with open(datos, 'rb') as archivo:
+            while True:
+                bloque = archivo.read(1024 * 1024)
+                if not bloque:
+                    break
+                sha.update(bloque)
+
+        documento_hash = sha.hexdigest()
+        if subida.get('sha256') and subida['sha256'] != documento_hash:
+            raise ValueError('El SHA-256 del documento no coincide con el anunciado al crear la subida')
+
+        relativa, nuevo = DocumentStorage._publicar(datos, documento_hash)
+        DocumentStorage.cancelar_subida(subida['id_subida'])
+        return documento_hash, relativa, nuevo
+
+    @staticmethod
+    def cancelar_subida(id_subida):
+        if DocumentStorage.SUBIDA.match(id_subida or ''):
+            shutil.rmtree(DocumentStorage._carpeta_subida(id_subida), ignore_errors=True)
+
+    @staticmethod
+    def limpiar_subidas(forzar=False) -> int:
+        """
+        Borra las subidas sin completar más antiguas que DOCUMENTO_SUBIDA_EXPIRA_HORAS
+        (como mucho una vez cada LIMPIEZA_CADA_SECONDS por proceso)
+
+        Returns:
+            int: Subidas borradas
+        """
+        ahora = time.time()
+        with DocumentStorage._lock:
+            if not forzar and ahora - DocumentStorage._ultima_limpieza < DocumentStorage.LIMPIEZA_CADA_SECONDS:
+                return 0
+            DocumentStorage._ultima_limpieza = ahora
+
+        limite = ahora - current_app.config.get('DOCUMENTO_SUBIDA_EXPIRA_HORAS', 24) * 3600
+        carpeta = os.path.join(DocumentStorage.carpeta(), DocumentStorage.CARPETA_SUBIDAS)
+        borradas = 0
+        try:
+            entradas = list(os.scandir(carpeta))
+        except OSError:
+            return 0
+        for entrada in entradas:
+            try:
+                if entrada.is_dir() and entrada.stat().st_mtime < limite:
+                    shutil.rmtree(entrada.path, ignore_errors=True)
+                    borradas += 1
+            except OSError:
+                continue
+        if borradas:
+            print(f'🧹 {borradas} subidas de documentos expiradas eliminadas')
+        return borradas
+
+    @staticmethod
+    def limpiar_huerfanos(en_uso, gracia_horas=None) -> int:
+        """
+        Borra los documentos que ningún jugador usa, pasado el margen de gracia
+
+        Args:
+            en_uso: Valores de jugadores.documento_pdf (leídos ANTES de recorrer la carpeta)
+            gracia_horas: Antigüedad mínima (DOCUMENTO_HUERFANO_GRACIA_HORAS)
+
+        Returns:
+            int: Documentos borrados
+        """
+        if gracia_horas is None:
+            gracia_horas = current_app.config.get('DOCUMENTO_HUERFANO_GRACIA_HORAS', 24)
+        limite = time.time() - gracia_horas * 3600
+        en_uso = set(en_uso)
+        carpeta = DocumentStorage.carpeta()
+        borrados = 0
+        for ruta in glob.iglob(os.path.join(carpeta, '[0-9a-f][0-9a-f]', '[0-9a-f][0-9a-f]', '*.pdf')):
+            relativa = os.path.relpath(ruta, carpeta).replace(os.sep, '/')
+            if not DocumentStorage.RELATIVA.match(relativa) or relativa in en_uso:
+                continue
+            try:
+                if os.stat(ruta).st_mtime < limite:
+                    os.remove(ruta)
+                    borrados += 1
+            except OSError:
+                continue
+        return borrados
+
+    @staticmethod
+    def status() -> dict:
+        with DocumentStorage._lock:
+            return {
+                'guardados': DocumentStorage._guardados,
+                'repetidos': DocumentStorage._repetidos,
+                'partes_recibidas': DocumentStorage._partes,
+                'bytes_recibidos': DocumentStorage._bytes_recibidos,
+            }
@@ -0,0 +1,102 @@
+import queue
+import threading
+import time
+
+
+class EmailQueue:
+    """
+    Cola en segundo plano para emails masivos
+
+    ¿Cómo funciona?
+    1. La petición encola los destinatarios y responde sin esperar al SMTP
+    2. Un hilo del proceso (se inicia con el primer envío) toma los
+       trabajos y los envía en lotes de EMAIL_QUEUE_BATCH_SIZE reutilizando
+       una conexión SMTP por lote
+    3. Si la cola está llena (EMAIL_QUEUE_MAX_SIZE destinatarios
+       pendientes) no se encola y se informa al que llama
+
+    Los emails pendientes viven en memoria: se pierden si el proceso se
+    reinicia (las notificaciones en la BD no, solo el aviso por correo).
+    """
+
+    _lock = threading.Lock()
+    _cola = queue.Queue()
+    _hilo = None
+    _pendientes = 0
+    _enviados = 0
+    _fallidos = 0
+
+    @staticmethod
+    def enqueue(app, destinatarios, asunto, mensaje) -> bool:
+        """
+        Encola un email para cada destinatario
+
+        Args:
+            app: App de Flask (el hilo necesita su contexto)
+            destinatarios: Lista de (email, nombre)
+            asunto: Asunto del email
+            mensaje: Texto del email
+
+        Returns:
+            bool: False si la cola está llena
+        """
+        destinatarios = [d for d in destinatarios if d[0]]
+        if not destinatarios:
+            return True
+
+        maximo = app.config.get('EMAIL_QUEUE_MAX_SIZE', 50000)
+        with EmailQueue._lock:
+            if EmailQueue._pendientes + len(destinatarios) > maximo:
+                return False
+            EmailQueue._pendientes += len(destinatarios)
+            EmailQueue._iniciar(app)
+
+        lote = max(1, app.config.get('EMAIL_QUEUE_BATCH_SIZE', 50))
+        for i in range(0, len(destinatarios), lote):
+            EmailQueue._cola.put((app, destinatarios[i:i + lote], asunto, mensaje))
+        return True
+
+    @staticmethod
+    def _iniciar(app):
+        """Arranca el hilo consumidor si no está corriendo (con _lock tomado)"""
+        if EmailQueue._hilo is None or not EmailQueue._hilo.is_alive():
+            EmailQueue._hilo = threading.Thread(target=EmailQueue._worker, name='email-queue', daemon=True)
+            EmailQueue._hilo.start()
+
+    @staticmethod
+    def _worker():
+        from app.security.email_service import EmailService
+
+        while True:
+            app, destinatarios, asunto, mensaje = EmailQueue._cola.get()
+            enviados = 0
+            try:
+                with app.app_context():
+                    enviados = EmailService.send_bulk_notification(destinatarios, asunto, mensaje)
+            except Exception as e:
+                print(f"❌ Error en la cola de emails: {str(e)}")
+            finally:
+                with EmailQueue._lock:
+                    EmailQueue._pendientes -= len(destinatarios)
+                    EmailQueue._enviados += enviados
+                    EmailQueue._fallidos += len(destinatarios) - enviados
+                EmailQueue._cola.task_done()
+
+    @staticmethod
+    def wait(timeout=None) -> bool:
+        """Espera a que se vacíe la cola (útil en scripts y pruebas)"""
+        limite = time.monotonic() + timeout if timeout else None
+        while EmailQueue._pendientes:
+            if limite and time.monotonic() >= limite:
+                return False
+            time.sleep(0.05)
+        return True
+
+    @staticmethod
+    def status() -> dict:
+        with EmailQueue._lock:
+            return {
+                'pendientes': EmailQueue._pendientes,
+                'enviados': EmailQueue._enviados,
+                'fallidos': EmailQueue._fallidos,
+            }
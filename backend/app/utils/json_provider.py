@@ -0,0 +1,105 @@
+import dataclasses
+import decimal
+import enum
+import json
+import uuid
+from datetime import date, datetime, time
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # orjson es opcional: sin él se usa el json de la stdlib
+    orjson = None
+
+
+def _default(obj):
+    """
+    Tipos que no son JSON nativo
+
+    Fechas en ISO 8601 (como los antiguos isoformat() de los to_dict, no
+    el formato RFC 822 de Flask), Enums por su valor y Rows de SQLAlchemy
+    como diccionarios. orjson ya resuelve fechas, Enums, UUID y dataclasses
+    por su cuenta: solo llega aquí con el resto.
+    """
+    if isinstance(obj, (datetime, date, time)):
+        return obj.isoformat()
+    if isinstance(obj, enum.Enum):
+        return obj.value
+    if isinstance(obj, (decimal.Decimal, uuid.UUID)):
+        return str(obj)
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    if hasattr(obj, '_mapping'):
+        return dict(obj._mapping)
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return dataclasses.asdict(obj)
+    if hasattr(obj, '__html__'):
+        return str(obj.__html__())
+    raise TypeError(f'Object of type {type(obj).__name__} is not JSON serializable')
+
+
+def _opciones(sort_keys=False, indent=False):
+    opciones = orjson.OPT_NON_STR_KEYS
+    if sort_keys:
+        opciones |= orjson.OPT_SORT_KEYS
+    if indent:
+        opciones |= orjson.OPT_INDENT_2
+    return opciones
+
+
+def dumps(obj, sort_keys=False) -> str:
+    """JSON compacto (sin app context: para SSE y otros usos fuera de jsonify)"""
+    if orjson is not None:
+        return orjson.dumps(obj, default=_default, option=_opciones(sort_keys)).decode('utf-8')
+    return json.dumps(obj, default=_default, ensure_ascii=False, separators=(',', ':'), sort_keys=sort_keys)
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """
+    Proveedor JSON de la app (jsonify, request.get_json, test client)
+
+    - Con orjson instalado serializa con orjson (directo a bytes); si no,
+      con el json de la stdlib y el mismo `default`
+    - datetime/date/time salen en ISO 8601 y los Enums (TipoGol) por su
+      valor, así los to_dict devuelven los objetos tal cual
+    - Compacto también en modo debug (JSON_COMPACT=False para indentar) y
+      sin ordenar las claves (JSON_SORT_KEYS=True para ordenarlas)
+    """
+
+    default = staticmethod(_default)
+    ensure_ascii = False
+    sort_keys = False
+    compact = True
+
+    def dumps(self, obj, **kwargs) -> str:
+        if orjson is None or set(kwargs) - {'indent', 'separators'}:
+            return super().dumps(obj, **kwargs)
+        return orjson.dumps(
+            obj, default=_default, option=_opciones(self.sort_keys, kwargs.get('indent'))
+        ).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        if orjson is None or kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        if orjson is None:
+            return super().response(*args, **kwargs)
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = self.compact is False or (self.compact is None and self._app.debug)
+        return self._app.response_class(
+            orjson.dumps(obj, default=_default, option=_opciones(self.sort_keys, indent)),
+            mimetype=self.mimetype
+        )
+
+
+def register_json_provider(app):
+    """Reemplaza el proveedor JSON de Flask por FastJSONProvider"""
+    provider = FastJSONProvider(app)
+    provider.sort_keys = app.config.get('JSON_SORT_KEYS', False)
+    provider.compact = app.config.get('JSON_COMPACT', True)
+    app.json = provider
+    if orjson is None:
+        print('⚠️ orjson no está instalado: las respuestas JSON usan el json de la stdlib')
@@ -0,0 +1,260 @@
+import threading
+import time
+import uuid
+from collections import deque
+from datetime import datetime
+
+from app.utils.json_provider import dumps
+
+
+class _Canal:
+    """Eventos recientes de un partido y la condición donde esperan sus suscriptores"""
+
+    def __init__(self, max_eventos):
+        self.eventos = deque(maxlen=max_eventos)
+        self.condicion = threading.Condition()
+        self.secuencia = 0
+        self.suscriptores = 0
+        self.ultimo_uso = time.monotonic()
+
+
+class LiveFeed:
+    """
+    Pub/sub en proceso para seguir partidos en vivo (Server-Sent Events)
+
+    ¿Cómo funciona?
+    1. Las rutas publican un evento (gol, tarjeta, cambio, estado) después
+       de confirmar la transacción
+    2. Cada partido tiene un buffer circular con sus últimos eventos y una
+       Condition: publicar es O(1) + notify_all, sin importar cuántos
+       espectadores haya
+    3. Cada conexión SSE guarda solo el id del último evento que envió y
+       lee del buffer lo que le falta (no hay una cola por conexión)
+    4. Un cliente que se reconecta con Last-Event-ID recibe los eventos
+       perdidos; si ya no están en el buffer (o el proceso se reinició)
+       recibe un snapshot completo
+
+    Los ids tienen la forma "<instancia>-<secuencia del partido>": un id de
+    otra instancia del proceso se trata como desconocido.
+
+    Limitación: el pub/sub vive en la memoria del proceso. Para miles de
+    conexiones se usa un solo proceso con workers de gevent (ver
+    wsgi_gevent.py); con varios procesos cada uno vería solo sus eventos.
+
+    Los buffers de partidos sin espectadores ni eventos recientes se
+    liberan con purge(): al crear un canal (como mucho cada
+    PURGA_CADA_SEGUNDOS) y desde el hilo de mantenimiento.
+    """
+
+    _lock = threading.Lock()
+    _canales = {}
+    _instancia = uuid.uuid4().hex[:8]
+    _conexiones = 0
+    _ultima_purga = time.monotonic()
+
+    MAX_EVENTOS = 200
+    PURGA_CADA_SEGUNDOS = 600
+
+    @staticmethod
+    def _canal(id_partido) -> _Canal:
+        if id_partido not in LiveFeed._canales:
+            ahora = time.monotonic()
+            if ahora - LiveFeed._ultima_purga >= LiveFeed.PURGA_CADA_SEGUNDOS:
+                LiveFeed._ultima_purga = ahora
+                LiveFeed.purge()
+        with LiveFeed._lock:
+            canal = LiveFeed._canales.get(id_partido)
+            if canal is None:
+                canal = LiveFeed._canales[id_partido] = _Canal(LiveFeed.MAX_EVENTOS)
+            canal.ultimo_uso = time.monotonic()
+            return canal
+
+    @staticmethod
+    def _numero(event_id):
+        """Secuencia de un id de evento de esta instancia (None si no es válido)"""
+        if not event_id:
+            return None
+        instancia, _, numero = str(event_id).partition('-')
+        if instancia != LiveFeed._instancia or not numero.isdigit():
+            return None
+        return int(numero)
+
+    @staticmethod
+    def ultimo_id(id_partido):
+        """
+        Id del último evento publicado en el partido (o el id "cero" de la instancia)
+
+        Solo lee: no crea el canal si el partido todavía no tiene eventos.
+        """
+        with LiveFeed._lock:
+            canal = LiveFeed._canales.get(id_partido)
+        if canal is not None:
+            with canal.condicion:
+                if canal.eventos:
+                    return canal.eventos[-1]['id']
+        return f'{LiveFeed._instancia}-0'
+
+    @staticmethod
+    def publish(id_partido, tipo, data) -> dict:
+        """
+        Publica un evento del partido y despierta a sus suscriptores
+
+        Args:
+            id_partido: Partido
+            tipo: 'gol', 'gol_eliminado', 'tarjeta', 'tarjeta_eliminada', 'cambio', 'estado'
+            data: Payload (serializable a JSON)
+        """
+        canal = LiveFeed._canal(id_partido)
+        with canal.condicion:
+            canal.secuencia += 1
+            evento = {
+                'id': f'{LiveFeed._instancia}-{canal.secuencia}',
+                'tipo': tipo,
+                'data': dict(data, id_partido=id_partido, fecha=datetime.utcnow().isoformat()),
+            }
+            canal.eventos.append(evento)
+            canal.condicion.notify_all()
+        return evento
+
+    @staticmethod
+    def events_since(id_partido, last_event_id):
+        """
+        Eventos posteriores a last_event_id
+
+        Returns:
+            list | None: None si no se puede reanudar desde ese id
+                         (id desconocido o ya fuera del buffer)
+        """
+        numero = LiveFeed._numero(last_event_id)
+        if numero is None:
+            return None
+
+        canal = LiveFeed._canal(id_partido)
+        with canal.condicion:
+            eventos = list(canal.eventos)
+            secuencia = canal.secuencia
+        if numero > secuencia:
+            # Id de un buffer que ya se liberó
+            return None
+        if eventos and LiveFeed._numero(eventos[0]['id']) > numero + 1:
+            # Hay un hueco: algunos eventos ya salieron del buffer
+            return None
+        return [e for e in eventos if LiveFeed._numero(e['id']) > numero]
+
+    @staticmethod
+    def wait(id_partido, last_event_id, timeout):
+        """
+        Espera eventos posteriores a last_event_id hasta `timeout` segundos
+
+        Returns:
+            list | None: eventos nuevos ([] si venció el tiempo),
+                         None si el suscriptor quedó demasiado atrás
+        """
+        canal = LiveFeed._canal(id_partido)
+        numero = LiveFeed._numero(last_event_id) or 0
+        with canal.condicion:
+            canal.condicion.wait_for(
+                lambda: canal.eventos and LiveFeed._numero(canal.eventos[-1]['id']) > numero,
+                timeout=timeout
+            )
+        return LiveFeed.events_since(id_partido, last_event_id)
+
+    @staticmethod
+    def connect(id_partido, max_conexiones) -> bool:
+        """Registra una conexión SSE (False si se alcanzó el máximo del proceso)"""
+        with LiveFeed._lock:
+            if max_conexiones and LiveFeed._conexiones >= max_conexiones:
+                return False
+            LiveFeed._conexiones += 1
+        canal = LiveFeed._canal(id_partido)
+        with canal.condicion:
+            canal.suscriptores += 1
+        return True
+
+    @staticmethod
+    def disconnect(id_partido):
+        with LiveFeed._lock:
+            LiveFeed._conexiones = max(0, LiveFeed._conexiones - 1)
+        canal = LiveFeed._canal(id_partido)
+        with canal.condicion:
+            canal.suscriptores = max(0, canal.suscriptores - 1)
+
+    @staticmethod
+    def purge(max_inactividad=6 * 3600) -> int:
+        """Libera los buffers de partidos sin suscriptores ni eventos recientes"""
+        limite = time.monotonic() - max_inactividad
+        with LiveFeed._lock:
+            viejos = [id_partido for id_partido, canal in LiveFeed._canales.items()
+                      if canal.suscriptores == 0 and canal.ultimo_uso < limite]
+            for id_partido in viejos:
+                del LiveFeed._canales[id_partido]
+        return len(viejos)
+
+    @staticmethod
+    def status() -> dict:
+        with LiveFeed._lock:
+            canales = list(LiveFeed._canales.values())
+            conexiones = LiveFeed._conexiones
+        return {
+            'conexiones': conexiones,
+            'partidos': len(canales),
+            'partidos_con_espectadores': sum(1 for c in canales if c.suscriptores),
+        }
+
+    @staticmethod
+    def format_sse(evento=None, tipo=None, data=None, event_id=None, retry=None) -> str:
+        """Serializa un evento en formato text/event-stream"""
+        if evento is not None:
+            tipo, data, event_id = evento['tipo'], evento['data'], evento['id']
+        lineas = []
+        if retry:
+            lineas.append(f'retry: {retry}')
+        if event_id:
+            lineas.append(f'id: {event_id}')
+        if tipo:
+            lineas.append(f'event: {tipo}')
+        lineas.append('data: ' + dumps(data))
+        return '\n'.join(lineas) + '\n\n'
+
+    @staticmethod
+    def stream(id_partido, snapshot, snapshot_id, last_event_id=None, heartbeat=15, duracion_max=None):
+        """
+        Generador de la respuesta SSE
+
+        - Reanuda desde last_event_id si es posible; si no, envía el snapshot
+        - Envía un comentario ": heartbeat" cada `heartbeat` segundos sin
+          eventos (mantiene vivos proxies y balanceadores)
+        - Termina cuando el partido finaliza o se cancela, o tras duracion_max
+
+        No usa la BD: el snapshot se arma antes de empezar a transmitir.
+        snapshot_id es el último evento publicado ANTES de leer el snapshot,
+        así los eventos que llegan mientras se lee también se envían.
+        La conexión se libera con LiveFeed.disconnect al cerrar la respuesta.
+        """
+        inicio = time.monotonic()
+        pendientes = LiveFeed.events_since(id_partido, last_event_id)
+        if pendientes is None:
+            cursor = snapshot_id
+            yield LiveFeed.format_sse(tipo='snapshot', data=snapshot, event_id=cursor, retry=3000)
+            pendientes = LiveFeed.events_since(id_partido, cursor) or []
+        else:
+            cursor = last_event_id
+            yield 'retry: 3000\n\n'
+
+        while True:
+            for evento in pendientes:
+                cursor = evento['id']
+                yield LiveFeed.format_sse(evento)
+                if evento['tipo'] == 'estado' and evento['data'].get('estado') in ('finalizado', 'cancelado'):
+                    return
+
+            if duracion_max is not None and time.monotonic() - inicio >= duracion_max:
+                return
+
+            pendientes = LiveFeed.wait(id_partido, cursor, heartbeat)
+            if pendientes is None:
+                # Quedó atrás del buffer: el cliente se reconecta y recibe un snapshot
+                yield LiveFeed.format_sse(tipo='reset', data={'motivo': 'eventos perdidos'})
+                return
+            if not pendientes:
+                yield ': heartbeat\n\n'
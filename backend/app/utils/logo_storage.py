@@ -0,0 +1,239 @@
+import glob
+import hashlib
+import os
+import re
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from flask import current_app
+
+try:
+    from PIL import Image
+except ImportError:  # Pillow es opcional: sin él no se generan miniaturas
+    Image = None
+
+
+class LogoStorage:
+    """
+    Logos de equipos guardados por contenido (SHA-256)
+
+    ¿Cómo funciona?
+    1. El archivo subido se escribe por partes a un temporal mientras se
+       calcula su SHA-256 y se controla el tamaño (LOGO_MAX_BYTES)
+    2. Se guarda como logos/<ab>/<sha256>.<ext> (ab = 2 primeros caracteres):
+       el mismo logo subido dos veces es un solo archivo
+    3. Un pool de hilos (LOGO_THUMBNAIL_WORKERS) genera con Pillow las
+       miniaturas de LOGO_THUMBNAIL_SIZES px: logos/<ab>/<sha256>_<px>.png
+    4. Como el nombre depende del contenido, la URL nunca cambia de
+       contenido: se sirve con Cache-Control immutable y ETag = hash
+
+    Sin Pillow instalado se guarda solo el original y las miniaturas
+    apuntan a él.
+    """
+
+    FIRMAS = (
+        (b'\x89PNG\r\n\x1a\n', 'png'),
+        (b'\xff\xd8\xff', 'jpg'),
+        (b'GIF87a', 'gif'),
+        (b'GIF89a', 'gif'),
+    )
+    NOMBRE = re.compile(r'^(?P<hash>[0-9a-f]{64})(?:_(?P<px>\d{1,4}))?\.(?P<ext>png|jpg|gif|webp)$')
+    CHUNK_BYTES = 64 * 1024
+
+    _lock = threading.Lock()
+    _pool = None
+    _pendientes = 0
+    _generadas = 0
+    _fallidas = 0
+    _aviso_pillow = False
+
+    @staticmethod
+    def carpeta() -> str:
+        return os.path.join(current_app.config['UPLOAD_FOLDER'], 'logos')
+
+    @staticmethod
+    def ruta(nombre, carpeta=None) -> str:
+        return os.path.join(carpeta or LogoStorage.carpeta(), nombre[:2], nombre)
+
+    @staticmethod
+    def url(nombre) -> str:
+        return f'/api/equipos/logos/{nombre}'
+
+    @staticmethod
+    def hash_de_url(logo_url):
+        """Hash del logo si logo_url apunta a un original subido aquí (si no, None: logo externo)"""
+        prefijo = LogoStorage.url('')
+        if not logo_url or not logo_url.startswith(prefijo):
+            return None
+        nombre = LogoStorage.NOMBRE.match(logo_url[len(prefijo):])
+        if not nombre or nombre.group('px') or not LogoStorage.original(nombre.group('hash')):
+            return None
+        return nombre.group('hash')
+
+    @staticmethod
+    def nombre_miniatura(logo_hash, px) -> str:
+        return f'{logo_hash}_{px}.png'
+
+    @staticmethod
+    def miniatura_url(logo_hash, logo_url=None, px=None):
+        """URL de la miniatura para listados (o logo_url si el logo no se subió aquí)"""
+        if not logo_hash:
+            return logo_url
+        px = px or current_app.config.get('LOGO_LIST_SIZE', 64)
+        return LogoStorage.url(LogoStorage.nombre_miniatura(logo_hash, px))
+
+    @staticmethod
+    def _extension(cabecera):
+        for firma, extension in LogoStorage.FIRMAS:
+            if cabecera.startswith(firma):
+                return extension
+        if cabecera[:4] == b'RIFF' and cabecera[8:12] == b'WEBP':
+            return 'webp'
+        return None
+
+    @staticmethod
+    def guardar(stream) -> tuple:
+        """
+        Guarda el logo leyendo el stream por partes
+
+        Returns:
+            tuple: (sha256, extensión, nuevo) - nuevo=False si ya existía
+
+        Raises:
+            ValueError: Vacío, demasiado grande o no es PNG/JPG/GIF/WEBP
+        """
+        maximo = current_app.config.get('LOGO_MAX_BYTES', 2 * 1024 * 1024)
+        carpeta = LogoStorage.carpeta()
+        os.makedirs(carpeta, exist_ok=True)
+
+        sha = hashlib.sha256()
+        tamano = 0
+        cabecera = b''
+        descriptor, temporal = tempfile.mkstemp(dir=carpeta, suffix='.subida')
+        try:
+            with os.fdopen(descriptor, 'wb') as destino:
+                while True:
+                    bloque = stream.read(LogoStorage.CHUNK_BYTES)
+                    if not bloque:
+                        break
+                    tamano += len(bloque)
+                    if tamano > maximo:
+                        raise ValueError(f'El logo no puede superar {maximo // 1024} KB')
+                    if len(cabecera) < 16:
+                        cabecera += bloque[:16 - len(cabecera)]
+                    sha.update(bloque)
+                    destino.write(bloque)
+
+            if not tamano:
+                raise ValueError('El archivo está vacío')
+            extension = LogoStorage._extension(cabecera)
+            if not extension:
+                raise ValueError('El logo debe ser una imagen PNG, JPG, GIF o WEBP')
+            if Image is not None:
+                try:
+                    with Image.open(temporal) as imagen:
+                        imagen.verify()
+                except Exception:
+                    raise ValueError('La imagen está dañada o no se puede leer')
+
+            logo_hash = sha.hexdigest()
+            final = LogoStorage.ruta(f'{logo_hash}.{extension}', carpeta)
+            if os.path.exists(final):
+                return logo_hash, extension, False
+            os.makedirs(os.path.dirname(final), exist_ok=True)
+            os.replace(temporal, final)
+            temporal = None
+            return logo_hash, extension, True
+        finally:
+            if temporal and os.path.exists(temporal):
+                os.remove(temporal)
+
+    @staticmethod
+    def original(logo_hash, carpeta=None):
+        """Ruta del archivo original de un hash (o None)"""
+        encontrados = glob.glob(LogoStorage.ruta(f'{logo_hash}.*', carpeta))
+        encontrados = [r for r in encontrados if LogoStorage.NOMBRE.match(os.path.basename(r))]
+        return encontrados[0] if encontrados else None
+
+    @staticmethod
+    def generar_miniaturas(logo_hash, carpeta, tamanos) -> int:
+        """
+        Genera las miniaturas que falten (PNG, conservando transparencia)
+
+        Returns:
+            int: Miniaturas creadas
+        """
+        if Image is None:
+            return 0
+        original = LogoStorage.original(logo_hash, carpeta)
+        if not original:
+            return 0
+
+        creadas = 0
+        with Image.open(original) as imagen:
+            imagen.load()
+            if imagen.mode not in ('RGB', 'RGBA'):
+                imagen = imagen.convert('RGBA')
+            for px in tamanos:
+                destino = LogoStorage.ruta(LogoStorage.nombre_miniatura(logo_hash, px), carpeta)
+                if os.path.exists(destino):
+                    continue
+                miniatura = imagen.copy()
+                miniatura.thumbnail((px, px), Image.LANCZOS)
+                temporal = f'{destino}.{threading.get_ident()}.tmp'
+                miniatura.save(temporal, format='PNG', optimize=True)
+                os.replace(temporal, destino)
+                creadas += 1
+        return creadas
+
+    @staticmethod
+    def programar_miniaturas(logo_hash) -> bool:
+        """
+        Encola la generación de miniaturas en el pool de hilos
+
+        Returns:
+            bool: False si Pillow no está instalado
+        """
+        if Image is None:
+            if not LogoStorage._aviso_pillow:
+                LogoStorage._aviso_pillow = True
+                print('⚠️ Pillow no está instalado: los logos se sirven sin miniaturas')
+            return False
+
+        config = current_app.config
+        carpeta = LogoStorage.carpeta()
+        tamanos = tuple(config.get('LOGO_THUMBNAIL_SIZES', (32, 64, 128)))
+        with LogoStorage._lock:
+            if LogoStorage._pool is None:
+                LogoStorage._pool = ThreadPoolExecutor(
+                    max_workers=max(1, config.get('LOGO_THUMBNAIL_WORKERS', 2)),
+                    thread_name_prefix='logos'
+                )
+            LogoStorage._pendientes += 1
+        LogoStorage._pool.submit(LogoStorage._trabajo, logo_hash, carpeta, tamanos)
+        return True
+
+    @staticmethod
+    def _trabajo(logo_hash, carpeta, tamanos):
+        try:
+            creadas = LogoStorage.generar_miniaturas(logo_hash, carpeta, tamanos)
+            with LogoStorage._lock:
+                LogoStorage._generadas += creadas
+        except Exception as e:
+            with LogoStorage._lock:
+                LogoStorage._fallidas += 1
+            print(f"❌ Error generando miniaturas del logo {logo_hash[:12]}: {str(e)}")
+        finally:
+            with LogoStorage._lock:
+                LogoStorage._pendientes -= 1
+
+    @staticmethod
+    def status() -> dict:
+        with LogoStorage._lock:
+            return {
+                'pillow': Image is not None,
+                'pendientes': LogoStorage._pendientes,
+                'miniaturas_generadas': LogoStorage._generadas,
+                'fallidas': LogoStorage._fallidas,
+            }
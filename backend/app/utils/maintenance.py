@@ -0,0 +1,271 @@
+import os
+import socket
+import threading
+import time
+import zlib
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+from flask import current_app
+
+from app.extensions import db
+from app.utils.live_feed import LiveFeed
+from app.utils.partitions import PartitionManager
+
+
+class MaintenanceRunner:
+    """
+    Limpieza periódica de las tablas que solo crecen
+
+    Tareas (JOBS):
+    - token_blacklist: tokens revocados que ya expiraron
+    - refresh_tokens: refresh tokens expirados
+    - rate_limits: ventanas de rate limiting viejas (RATE_LIMIT_RETENTION_DAYS)
+    - login_attempts: intentos de login viejos (LOGIN_ATTEMPT_RETENTION_DAYS)
+    - security_logs: auditoría fuera de la retención (SECURITY_LOG_RETENTION_DAYS)
+    - maintenance_runs: el propio historial (MAINTENANCE_RUN_RETENTION_DAYS)
+    - documentos: PDFs de jugadores que ningún jugador usa (pasadas
+      DOCUMENTO_HUERFANO_GRACIA_HORAS) y subidas por partes vencidas;
+      aquí "filas" son archivos
+
+    ¿Cómo funciona?
+    1. Cada tarea toma un lock de la BD (GET_LOCK en MySQL): si otro
+       worker ya la está corriendo, se registra como 'locked' y se omite
+    2. Borra en lotes de MAINTENANCE_BATCH_SIZE filas por clave primaria,
+       con un commit por lote y una pausa entre lotes: cada DELETE bloquea
+       pocas filas y por poco tiempo
+    3. Guarda duración y filas eliminadas en maintenance_runs
+
+    Si la tabla está particionada por fecha (MySQL, migración 006), la
+    retención se hace con DROP PARTITION y se crean las particiones
+    futuras (PartitionManager) en vez de borrar filas.
+
+    Se ejecuta con `flask mantenimiento` (cron) o con el hilo del proceso
+    si MAINTENANCE_SCHEDULER_ENABLED=True. El hilo además libera los
+    buffers en memoria del feed en vivo (LiveFeed.purge), que un comando
+    en otro proceso no puede ver.
+    """
+
+    JOBS = ('token_blacklist', 'refresh_tokens', 'rate_limits', 'login_attempts', 'security_logs', 'maintenance_runs',
+            'documentos')
+
+    _lock = threading.Lock()
+    _locks_locales = {}
+    _hilo = None
+
+    @staticmethod
+    def job_filter(job):
+        """(modelo, condición WHERE) de las filas que elimina la tarea"""
+        from app.models.login_attempt import LoginAttempt
+        from app.models.maintenance_run import MaintenanceRun
+        from app.models.rate_limit import RateLimit
+        from app.models.refresh_token import RefreshToken
+        from app.models.security_log import SecurityLog
+        from app.models.token_blacklist import TokenBlacklist
+
+        config = current_app.config
+        ahora = datetime.utcnow()
+
+        def hace(dias):
+            return ahora - timedelta(days=dias)
+
+        if job == 'token_blacklist':
+            return TokenBlacklist, TokenBlacklist.expires_at < ahora
+        if job == 'refresh_tokens':
+            return RefreshToken, RefreshToken.expires_at < ahora
+        if job == 'rate_limits':
+            return RateLimit, RateLimit.window_end < hace(config.get('RATE_LIMIT_RETENTION_DAYS', 7))
+        if job == 'login_attempts':
+            return LoginAttempt, LoginAttempt.attempted_at < hace(config.get('LOGIN_ATTEMPT_RETENTION_DAYS', 30))
+        if job == 'security_logs':
+            return SecurityLog, SecurityLog.created_at < hace(config.get('SECURITY_LOG_RETENTION_DAYS', 90))
+        if job == 'maintenance_runs':
+            return MaintenanceRun, MaintenanceRun.started_at < hace(config.get('MAINTENANCE_RUN_RETENTION_DAYS', 90))
+        raise ValueError(f'Tarea de mantenimiento desconocida: {job}')
+
+    @staticmethod
+    def delete_orphan_documents() -> dict:
+        """
+        Borra los PDFs de jugadores sin uso y las subidas por partes vencidas
+
+        Las rutas en uso se leen antes de recorrer la carpeta: un archivo que
+        se reutilice después tiene la fecha de modificación al día y queda
+        dentro del margen de gracia.
+        """
+        from app.models.jugador import Jugador
+        from app.utils.document_storage import DocumentStorage
+
+        en_uso = db.session.execute(
+            db.select(Jugador.documento_pdf).where(Jugador.documento_pdf.isnot(None)).distinct()
+        ).scalars().all()
+        db.session.commit()
+        borrados = DocumentStorage.limpiar_huerfanos(en_uso)
+        borrados += DocumentStorage.limpiar_subidas(forzar=True)
+        return {'filas': borrados, 'lotes': 1}
+
+    @staticmethod
+    def delete_in_chunks(model, condicion, batch_size=None, pausa=None) -> dict:
+        """
+        Elimina las filas que cumplen la condición, en lotes
+
+        Cada lote lee hasta batch_size claves primarias (por índice) y las
+        borra con DELETE ... WHERE id IN (...), en su propia transacción.
+
+        Args:
+            model: Modelo de la tabla
+            condicion: Expresión WHERE
+            batch_size: Filas por lote (MAINTENANCE_BATCH_SIZE)
+            pausa: Segundos entre lotes (MAINTENANCE_BATCH_PAUSE_SECONDS)
+
+        Returns:
+            dict: {'filas': eliminadas, 'lotes': lotes ejecutados}
+        """
+        config = current_app.config
+        batch_size = max(1, batch_size or config.get('MAINTENANCE_BATCH_SIZE', 1000))
+        if pausa is None:
+            pausa = config.get('MAINTENANCE_BATCH_PAUSE_SECONDS', 0.1)
+
+        pk = model.__mapper__.primary_key[0]
+        filas = lotes = 0
+        while True:
+            ids = db.session.execute(
+                db.select(pk).where(condicion).order_by(pk).limit(batch_size)
+            ).scalars().all()
+            if not ids:
+                break
+
+            resultado = db.session.execute(
+                db.delete(model).where(pk.in_(ids)).execution_options(synchronize_session=False)
+            )
+            db.session.commit()
+            filas += resultado.rowcount
+            lotes += 1
+
+            if len(ids) < batch_size:
+                break
+            if pausa:
+                time.sleep(pausa)
+
+        return {'filas': filas, 'lotes': lotes}
+
+    @staticmethod
+    @contextmanager
+    def advisory_lock(nombre):
+        """
+        Lock con nombre en la BD, sin espera (produce True si se obtuvo)
+
+        - MySQL: GET_LOCK/RELEASE_LOCK en una conexión propia (el lock vive
+          mientras esa conexión siga abierta)
+        - PostgreSQL: pg_try_advisory_lock
+        - Otras (SQLite): lock del proceso; SQLite no se comparte entre servidores
+        """
+        engine = db.engine
+        dialecto = engine.dialect.name
+
+        if dialecto not in ('mysql', 'mariadb', 'postgresql'):
+            with MaintenanceRunner._lock:
+                lock = MaintenanceRunner._locks_locales.setdefault(nombre, threading.Lock())
+            obtenido = lock.acquire(blocking=False)
+            try:
+                yield obtenido
+            finally:
+                if obtenido:
+                    lock.release()
+            return
+
+        with engine.connect() as conexion:
+            if dialecto == 'postgresql':
+                clave = zlib.crc32(nombre.encode('utf-8'))
+                obtenido = bool(conexion.execute(db.text('SELECT pg_try_advisory_lock(:k)'), {'k': clave}).scalar())
+                liberar = db.text('SELECT pg_advisory_unlock(:k)'), {'k': clave}
+            else:
+                obtenido = conexion.execute(db.text('SELECT GET_LOCK(:n, 0)'), {'n': nombre}).scalar() == 1
+                liberar = db.text('SELECT RELEASE_LOCK(:n)'), {'n': nombre}
+            try:
+                yield obtenido
+            finally:
+                if obtenido:
+                    conexion.execute(*liberar)
+                conexion.commit()
+
+    @staticmethod
+    def run(job, batch_size=None, pausa=None):
+        """
+        Ejecuta una tarea con su lock y registra el resultado
+
+        Returns:
+            MaintenanceRun: Registro de la ejecución
+        """
+        from app.models.maintenance_run import MaintenanceRun
+
+        if job not in MaintenanceRunner.JOBS:
+            raise ValueError(f'Tarea de mantenimiento desconocida: {job}')
+        registro = MaintenanceRun(
+            job=job, started_at=datetime.utcnow(), rows_deleted=0, batches=0,
+            worker=f'{socket.gethostname()}:{os.getpid()}'
+        )
+        inicio = time.perf_counter()
+
+        with MaintenanceRunner.advisory_lock(f'campeonato:mantenimiento:{job}') as obtenido:
+            if not obtenido:
+                registro.status = 'locked'
+            else:
+                try:
+                    if job == 'documentos':
+                        resultado = MaintenanceRunner.delete_orphan_documents()
+                    elif job in PartitionManager.TABLES and PartitionManager.is_partitioned(job):
+                        resultado = PartitionManager.maintain(job)
+                    else:
+                        model, condicion = MaintenanceRunner.job_filter(job)
+                        resultado = MaintenanceRunner.delete_in_chunks(model, condicion, batch_size, pausa)
+                    registro.status = 'ok'
+                    registro.rows_deleted = resultado['filas']
+                    registro.batches = resultado['lotes']
+                except Exception as e:
+                    db.session.rollback()
+                    registro.status = 'error'
+                    registro.error = str(e)
+                    print(f"❌ Error en mantenimiento ({job}): {str(e)}")
+
+        registro.finished_at = datetime.utcnow()
+        registro.duration_ms = int((time.perf_counter() - inicio) * 1000)
+        db.session.add(registro)
+        db.session.commit()
+        return registro
+
+    @staticmethod
+    def run_all(jobs=None, batch_size=None, pausa=None) -> list:
+        return [MaintenanceRunner.run(job, batch_size, pausa) for job in (jobs or MaintenanceRunner.JOBS)]
+
+    @staticmethod
+    def start_scheduler(app) -> bool:
+        """
+        Arranca el hilo que ejecuta todas las tareas cada
+        MAINTENANCE_INTERVAL_MINUTES (una vez por proceso)
+
+        Con varios workers cada uno tiene su hilo; el lock de la BD hace
+        que cada tarea corra en uno solo a la vez.
+        """
+        with MaintenanceRunner._lock:
+            if MaintenanceRunner._hilo is not None and MaintenanceRunner._hilo.is_alive():
+                return False
+            MaintenanceRunner._hilo = threading.Thread(
+                target=MaintenanceRunner._scheduler, args=(app,), name='maintenance', daemon=True
+            )
+            MaintenanceRunner._hilo.start()
+        return True
+
+    @staticmethod
+    def _scheduler(app):
+        intervalo = max(1, app.config.get('MAINTENANCE_INTERVAL_MINUTES', 60)) * 60
+        while True:
+            time.sleep(intervalo)
+            try:
+                with app.app_context():
+                    MaintenanceRunner.run_all()
+                    db.session.remove()
+                liberados = LiveFeed.purge()
+                if liberados:
+                    print(f"🧹 Feed en vivo: {liberados} partidos inactivos liberados")
+            except Exception as e:
+                print(f"❌ Error en el hilo de mantenimiento: {str(e)}")
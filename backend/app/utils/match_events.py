@@ -0,0 +1,186 @@
+from datetime import datetime
+
+from app.enums.gol_enum import TipoGol
+from app.extensions import db
+from app.models.gol import Gol
+from app.models.jugador import Jugador
+from app.models.partido import Partido
+from app.models.sancion_jugador import SancionJugador
+from app.models.tarjeta import Tarjeta
+from app.utils.validators import normalizar_nombre
+
+
+class MatchEvents:
+    """
+    Carga de todos los eventos de un partido en una sola petición
+    (POST /api/partido/<id>/eventos)
+
+    1. Una consulta trae las plantillas de los dos equipos; cada evento
+       identifica al jugador por id_jugador, por dorsal + equipo o por
+       nombre completo, y se resuelve en memoria
+    2. La forma de cada evento (minuto, tipo, motivo) ya viene validada
+       por EventosPartidoSchema; aquí se resuelven los jugadores en
+       memoria: si algún evento tiene errores no se guarda nada y se
+       devuelven todos los errores
+    3. Un INSERT de varias filas para los goles y otro para las tarjetas,
+       un UPDATE de los contadores del partido y el estado disciplinario
+       de todos los amonestados; el partido se finaliza en la misma
+       transacción
+    """
+
+    TIPOS_GOL = {
+        'normal': TipoGol.NORMAL,
+        'penal': TipoGol.PENAL,
+        'autogol': TipoGol.AUTOGOL,
+        'tiro_libre': TipoGol.TIRO_LIBRE,
+    }
+
+    @staticmethod
+    def plantillas(partido) -> dict:
+        """Jugadores de los dos equipos (una consulta), indexados por id, dorsal y nombre"""
+        filas = db.session.execute(
+            db.select(Jugador.id_jugador, Jugador.id_equipo, Jugador.nombre, Jugador.apellido, Jugador.dorsal)
+            .where(Jugador.id_equipo.in_([partido.id_equipo_local, partido.id_equipo_visitante]))
+        ).all()
+
+        plantillas = {'por_id': {}, 'por_dorsal': {}, 'por_nombre': {}}
+        for fila in filas:
+            plantillas['por_id'][fila.id_jugador] = fila
+            plantillas['por_dorsal'][(fila.id_equipo, fila.dorsal)] = fila
+            plantillas['por_nombre'].setdefault(
+                normalizar_nombre(f'{fila.nombre} {fila.apellido}'), []
+            ).append(fila)
+        return plantillas
+
+    @staticmethod
+    def _equipo(partido, valor):
+        """'local' / 'visitante' / id_equipo -> id_equipo del partido (o None)"""
+        if valor in ('local', 'visitante'):
+            return partido.id_equipo_local if valor == 'local' else partido.id_equipo_visitante
+        return valor if valor in (partido.id_equipo_local, partido.id_equipo_visitante) else None
+
+    @staticmethod
+    def _jugador(partido, plantillas, evento, errores):
+        if evento.get('id_jugador') is not None:
+            jugador = plantillas['por_id'].get(evento['id_jugador'])
+            if not jugador:
+                errores.append('El jugador no pertenece a ninguno de los equipos del partido')
+            return jugador
+
+        id_equipo = MatchEvents._equipo(partido, evento.get('equipo'))
+        if evento.get('equipo') is not None and id_equipo is None:
+            errores.append(f'El equipo {evento["equipo"]} no juega este partido')
+            return None
+
+        if evento.get('dorsal') is not None:
+            jugador = plantillas['por_dorsal'].get((id_equipo, evento['dorsal']))
+            if not jugador:
+                errores.append(f'Ningún jugador del equipo tiene el dorsal {evento["dorsal"]}')
+            return jugador
+
+        nombre = normalizar_nombre(evento['jugador'])
+        candidatos = [j for j in plantillas['por_nombre'].get(nombre, [])
+                      if id_equipo is None or j.id_equipo == id_equipo]
+        if not candidatos:
+            errores.append(f'No hay un jugador "{evento["jugador"]}" en los equipos del partido')
+            return None
+        if len(candidatos) > 1:
+            errores.append(f'Hay {len(candidatos)} jugadores "{evento["jugador"]}": indique el dorsal y el equipo')
+            return None
+        return candidatos[0]
+
+    @staticmethod
+    def validar(partido, data) -> tuple:
+        """
+        Resuelve los jugadores de todos los eventos en memoria
+
+        Args:
+            partido: Partido (bloqueado)
+            data: Body ya validado por EventosPartidoSchema
+
+        Returns:
+            tuple: (goles, tarjetas, errores); errores es una lista de
+            {'evento': 'goles[0]', 'errores': [...]}
+        """
+        plantillas = MatchEvents.plantillas(partido)
+        goles, tarjetas, errores = [], [], []
+
+        for nombre_lista, destino in (('goles', goles), ('tarjetas', tarjetas)):
+            for i, evento in enumerate(data.get(nombre_lista) or []):
+                mensajes = []
+                jugador = MatchEvents._jugador(partido, plantillas, evento, mensajes)
+                if mensajes:
+                    errores.append({'evento': f'{nombre_lista}[{i}]', 'errores': mensajes})
+                    continue
+
+                resuelto = {'jugador': jugador, 'minuto': evento['minuto'], 'tipo': evento['tipo']}
+                if nombre_lista == 'tarjetas':
+                    resuelto['motivo'] = evento.get('motivo')
+                destino.append(resuelto)
+
+        return goles, tarjetas, errores
+
+    @staticmethod
+    def marcador(partido, goles) -> dict:
+        """Deltas de los contadores del partido para los goles (el autogol suma al rival)"""
+        deltas = {'goles_local': 0, 'goles_visitante': 0, 'total_goles': len(goles)}
+        for gol in goles:
+            es_local = gol['jugador'].id_equipo == partido.id_equipo_local
+            if gol['tipo'] == 'autogol':
+                es_local = not es_local
+            deltas['goles_local' if es_local else 'goles_visitante'] += 1
+        return deltas
+
+    @staticmethod
+    def registrar(partido, goles, tarjetas, estado='finalizado') -> dict:
+        """
+        Guarda los eventos ya validados y actualiza el partido (sin commit)
+
+        Returns:
+            dict: Contadores aplicados y jugadores que cumplieron sanción
+        """
+        ahora = datetime.utcnow()
+        goles = sorted(goles, key=lambda g: g['minuto'])
+        tarjetas = sorted(tarjetas, key=lambda t: t['minuto'])
+
+        # Como en SancionJugador.recalcular: primero se cumple el partido y
+        # después cuentan las tarjetas recibidas en él
+        cumplieron = 0
+        if estado == 'finalizado' and partido.estado != 'finalizado':
+            cumplieron = SancionJugador.cumplir_partido(partido)
+
+        if goles:
+            db.session.execute(db.insert(Gol.__table__), [{
+                'id_partido': partido.id_partido,
+                'id_jugador': gol['jugador'].id_jugador,
+                'minuto': gol['minuto'],
+                'tipo': MatchEvents.TIPOS_GOL[gol['tipo']],
+                'fecha_registro': ahora,
+            } for gol in goles])
+
+        if tarjetas:
+            db.session.execute(db.insert(Tarjeta.__table__), [{
+                'id_partido': partido.id_partido,
+                'id_jugador': tarjeta['jugador'].id_jugador,
+                'tipo': tarjeta['tipo'],
+                'minuto': tarjeta['minuto'],
+                'motivo': tarjeta['motivo'],
+                'fecha_registro': ahora,
+            } for tarjeta in tarjetas])
+            SancionJugador.registrar_tarjetas(
+                [{'id_jugador': t['jugador'].id_jugador, 'tipo': t['tipo']} for t in tarjetas], partido
+            )
+
+        deltas = MatchEvents.marcador(partido, goles)
+        deltas['total_tarjetas'] = len(tarjetas)
+        deltas['amarillas'] = sum(1 for t in tarjetas if t['tipo'] == 'amarilla')
+        deltas['rojas'] = len(tarjetas) - deltas['amarillas']
+        Partido.ajustar_contadores(partido.id_partido, **deltas)
+
+        db.session.execute(
+            db.update(Partido)
+            .where(Partido.id_partido == partido.id_partido)
+            .values(estado=estado)
+            .execution_options(synchronize_session=False)
+        )
+        return {'contadores': deltas, 'sanciones_cumplidas': cumplieron}
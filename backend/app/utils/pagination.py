@@ -0,0 +1,37 @@
+import base64
+from datetime import datetime
+
+
+def page_limit(valor, default=20, maximo=100) -> int:
+    """Tamaño de página pedido por el cliente, acotado a [1, maximo]"""
+    try:
+        limite = int(valor) if valor is not None else default
+    except (TypeError, ValueError):
+        limite = default
+    return max(1, min(limite, maximo))
+
+
+def encode_cursor(fecha, id_registro) -> str:
+    """
+    Cursor opaco para paginar por (fecha DESC, id DESC)
+
+    El cliente lo devuelve tal cual en ?cursor= para pedir la página siguiente.
+    """
+    crudo = f"{fecha.isoformat() if fecha else ''}|{id_registro}"
+    return base64.urlsafe_b64encode(crudo.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor) -> tuple:
+    """
+    Returns:
+        tuple: (fecha, id_registro)
+
+    Raises:
+        ValueError: Si el cursor no es válido
+    """
+    try:
+        crudo = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode('utf-8')
+        fecha, _, id_registro = crudo.partition('|')
+        return (datetime.fromisoformat(fecha) if fecha else None), int(id_registro)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise ValueError('Cursor inválido') from e
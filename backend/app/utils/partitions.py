@@ -0,0 +1,173 @@
+from datetime import datetime, timedelta
+
+from flask import current_app
+
+from app.extensions import db
+
+
+class PartitionManager:
+    """
+    Particiones por rango de fecha (MySQL) de las tablas de seguridad
+
+    Las tablas se convierten con la migración 006 (PARTITION BY RANGE COLUMNS)
+    y quedan con una sola partición pmax (VALUES LESS THAN MAXVALUE).
+    A partir de ahí el mantenimiento:
+    1. Crea por adelantado las particiones de los próximos PARTITION_PREMAKE
+       periodos partiendo pmax (vacía, así el ALTER no copia filas)
+    2. Aplica la retención con DROP PARTITION: una partición se elimina
+       cuando todas sus filas son más viejas que la retención (instantáneo,
+       sin DELETE fila por fila)
+
+    Cada partición se llama p<AAAAMMDD> por su límite superior (exclusivo).
+    Las consultas filtran siempre por la columna de partición con un rango
+    (ej: attempted_at >= hace 30 minutos) para que MySQL lea solo las
+    particiones recientes.
+
+    Con SQLite (o tablas sin particionar) todo esto se omite y la
+    retención se hace con DELETE por lotes (MaintenanceRunner).
+    """
+
+    # tabla -> (columna de partición, clave de retención en config, días por defecto)
+    TABLES = {
+        'login_attempts': ('attempted_at', 'LOGIN_ATTEMPT_RETENTION_DAYS', 30),
+        'security_logs': ('created_at', 'SECURITY_LOG_RETENTION_DAYS', 90),
+        'rate_limits': ('window_start', 'RATE_LIMIT_RETENTION_DAYS', 7),
+    }
+
+    @staticmethod
+    def _soportado() -> bool:
+        return db.engine.dialect.name in ('mysql', 'mariadb')
+
+    @staticmethod
+    def partitions(tabla) -> list:
+        """
+        Particiones de la tabla en orden
+
+        Returns:
+            list: dicts {'nombre', 'limite' (datetime o None para MAXVALUE), 'filas' (estimadas)}
+        """
+        if not PartitionManager._soportado():
+            return []
+
+        filas = db.session.execute(db.text(
+            """
+            SELECT PARTITION_NAME AS nombre, PARTITION_DESCRIPTION AS limite, TABLE_ROWS AS filas
+            FROM information_schema.PARTITIONS
+            WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :tabla AND PARTITION_NAME IS NOT NULL
+            ORDER BY PARTITION_ORDINAL_POSITION
+            """
+        ), {'tabla': tabla}).all()
+
+        return [{
+            'nombre': fila.nombre,
+            'limite': PartitionManager._parse_limite(fila.limite),
+            'filas': fila.filas or 0,
+        } for fila in filas]
+
+    @staticmethod
+    def _parse_limite(descripcion):
+        """'2026-11-01 00:00:00' (con comillas) -> datetime; MAXVALUE -> None"""
+        valor = (descripcion or '').strip().strip("'")
+        if not valor or valor.upper() == 'MAXVALUE':
+            return None
+        return datetime.strptime(valor[:10], '%Y-%m-%d')
+
+    @staticmethod
+    def is_partitioned(tabla) -> bool:
+        return bool(PartitionManager.partitions(tabla))
+
+    @staticmethod
+    def _granularidad(tabla) -> str:
+        return (current_app.config.get('PARTITION_GRANULARITY') or {}).get(tabla, 'month')
+
+    @staticmethod
+    def _inicio_periodo(fecha, granularidad):
+        if granularidad == 'day':
+            return datetime(fecha.year, fecha.month, fecha.day)
+        return datetime(fecha.year, fecha.month, 1)
+
+    @staticmethod
+    def _siguiente(limite, granularidad):
+        if granularidad == 'day':
+            return limite + timedelta(days=1)
+        return datetime(limite.year + limite.month // 12, limite.month % 12 + 1, 1)
+
+    @staticmethod
+    def _nombre(limite) -> str:
+        return f'p{limite:%Y%m%d}'
+
+    @staticmethod
+    def ensure_future(tabla, ahora=None) -> list:
+        """
+        Crea las particiones que faltan hasta PARTITION_PREMAKE periodos adelante
+
+        Returns:
+            list: Nombres de las particiones creadas
+        """
+        particiones = PartitionManager.partitions(tabla)
+        if not particiones or particiones[-1]['limite'] is not None:
+            # Sin particionar, o sin pmax donde crear particiones nuevas
+            return []
+
+        granularidad = PartitionManager._granularidad(tabla)
+        ahora = ahora or datetime.utcnow()
+        limites = [p['limite'] for p in particiones if p['limite'] is not None]
+
+        # Primer límite: el siguiente al último existente, o el inicio del
+        # próximo periodo (todo lo anterior queda en la primera partición)
+        limite = (PartitionManager._siguiente(limites[-1], granularidad) if limites
+                  else PartitionManager._siguiente(PartitionManager._inicio_periodo(ahora, granularidad), granularidad))
+
+        hasta = PartitionManager._inicio_periodo(ahora, granularidad)
+        for _ in range(max(1, current_app.config.get('PARTITION_PREMAKE', 3)) + 1):
+            hasta = PartitionManager._siguiente(hasta, granularidad)
+
+        nuevas = []
+        while limite <= hasta:
+            nuevas.append(limite)
+            limite = PartitionManager._siguiente(limite, granularidad)
+        if not nuevas:
+            return []
+
+        definiciones = ', '.join(
+            f"PARTITION {PartitionManager._nombre(limite)} VALUES LESS THAN ('{limite:%Y-%m-%d}')"
+            for limite in nuevas
+        )
+        db.session.execute(db.text(
+            f'ALTER TABLE {tabla} REORGANIZE PARTITION {particiones[-1]["nombre"]} '
+            f'INTO ({definiciones}, PARTITION pmax VALUES LESS THAN (MAXVALUE))'
+        ))
+        db.session.commit()
+        return [PartitionManager._nombre(limite) for limite in nuevas]
+
+    @staticmethod
+    def drop_expired(tabla, ahora=None) -> dict:
+        """
+        Elimina las particiones cuyas filas están todas fuera de la retención
+
+        Returns:
+            dict: {'particiones': eliminadas, 'filas': filas estimadas eliminadas}
+        """
+        _, clave, dias = PartitionManager.TABLES[tabla]
+        corte = (ahora or datetime.utcnow()) - timedelta(days=current_app.config.get(clave, dias))
+
+        vencidas = [p for p in PartitionManager.partitions(tabla)
+                    if p['limite'] is not None and p['limite'] <= corte]
+        if vencidas:
+            db.session.execute(db.text(
+                f'ALTER TABLE {tabla} DROP PARTITION {", ".join(p["nombre"] for p in vencidas)}'
+            ))
+            db.session.commit()
+        return {'particiones': len(vencidas), 'filas': sum(p['filas'] for p in vencidas)}
+
+    @staticmethod
+    def maintain(tabla) -> dict:
+        """
+        Retención + particiones futuras de una tabla particionada
+
+        Returns:
+            dict: {'filas': estimadas, 'lotes': particiones eliminadas, 'creadas': [...]}
+        """
+        resultado = PartitionManager.drop_expired(tabla)
+        creadas = PartitionManager.ensure_future(tabla)
+        return {'filas': resultado['filas'], 'lotes': resultado['particiones'], 'creadas': creadas}
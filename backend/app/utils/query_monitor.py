@@ -0,0 +1,385 @@
+import json
+import os
+import random
+import re
+import threading
+import time
+import traceback
+from collections import Counter, deque
+from contextlib import contextmanager
+from datetime import datetime
+from hashlib import sha1
+
+import click
+from flask import g, request, has_request_context
+from sqlalchemy import event
+
+
+class QueryBudgetExceeded(AssertionError):
+    """Se lanza cuando un bloque supera el presupuesto de consultas"""
+
+
+class QueryMonitor:
+    """
+    Detector de consultas lentas y patrones N+1
+
+    ¿Cómo funciona?
+    1. Escucha los eventos before/after_cursor_execute de cada engine
+    2. Por cada petición cuenta las consultas y agrupa las sentencias
+       por su "huella" (fingerprint: SQL sin literales)
+    3. Al terminar la petición marca como sospechosa la ruta si:
+       - Ejecutó más de QUERY_MONITOR_MAX_QUERIES consultas
+       - Repitió la misma sentencia más de QUERY_MONITOR_MAX_REPEATS veces (N+1)
+       - Alguna consulta tardó más de QUERY_MONITOR_SLOW_MS milisegundos
+    4. Guarda la ruta, la huella y una muestra del stack en un archivo JSONL
+
+    Seguro para producción:
+    - Solo se analiza una fracción de peticiones (QUERY_MONITOR_SAMPLE_RATE)
+    - El stack se captura una sola vez por huella sospechosa, no por consulta
+    - El buffer en memoria está acotado
+    """
+
+    # Últimas detecciones del proceso (acotado para no crecer sin límite)
+    _offenses = deque(maxlen=500)
+    _lock = threading.Lock()
+
+    # Presupuestos activos (query_budget) por hilo
+    _local = threading.local()
+
+    _RE_STRING = re.compile(r"'(?:[^']|'')*'")
+    _RE_NUMBER = re.compile(r'\b\d+(?:\.\d+)?\b')
+    _RE_IN_LIST = re.compile(r'\bIN\s*\((?:\s*(?:\?|%s|:\w+|__\[POSTCOMPILE_\w+\])\s*,?)+\)', re.IGNORECASE)
+    _RE_SPACES = re.compile(r'\s+')
+
+    @staticmethod
+    def fingerprint(statement: str) -> str:
+        """
+        Normaliza una sentencia SQL para agrupar consultas equivalentes
+
+        Ejemplo:
+            "SELECT * FROM equipos WHERE id_equipo = 5"
+            "SELECT * FROM equipos WHERE id_equipo = 7"
+            → "SELECT * FROM equipos WHERE id_equipo = ?"
+        """
+        sql = QueryMonitor._RE_STRING.sub('?', statement)
+        sql = QueryMonitor._RE_NUMBER.sub('?', sql)
+        sql = QueryMonitor._RE_IN_LIST.sub('IN (?)', sql)
+        return QueryMonitor._RE_SPACES.sub(' ', sql).strip()
+
+    @staticmethod
+    def fingerprint_id(fingerprint: str) -> str:
+        """Identificador corto de una huella (para reportes)"""
+        return sha1(fingerprint.encode('utf-8')).hexdigest()[:12]
+
+    @staticmethod
+    def sample_stack(limit: int = 8) -> list:
+        """
+        Captura el stack actual filtrado a los archivos de la aplicación
+
+        Returns:
+            list: ["app/models/partido.py:58 in to_dict", ...]
+        """
+        frames = []
+        for frame in traceback.extract_stack()[:-1]:
+            filename = frame.filename.replace('\\', '/')
+            if '/app/' not in filename or filename.endswith('/query_monitor.py'):
+                continue
+            short = filename[filename.rfind('/app/') + 1:]
+            frames.append(f'{short}:{frame.lineno} in {frame.name}')
+        return frames[-limit:]
+
+    # ============================================
+    # ESTADO POR PETICIÓN / PRESUPUESTO
+    # ============================================
+
+    @staticmethod
+    def _new_stats() -> dict:
+        return {
+            'count': 0,
+            'total_ms': 0.0,
+            'fingerprints': Counter(),
+            'stacks': {},
+            'slow': []
+        }
+
+    @staticmethod
+    def _active_stats() -> list:
+        """Contadores que deben registrar la consulta actual"""
+        targets = list(getattr(QueryMonitor._local, 'budgets', []))
+        if has_request_context():
+            stats = g.get('_query_monitor')
+            if stats is not None:
+                targets.append(stats)
+        return targets
+
+    @staticmethod
+    def _record(app, statement: str, elapsed_ms: float):
+        targets = QueryMonitor._active_stats()
+        if not targets:
+            return
+
+        fp = QueryMonitor.fingerprint(statement)
+        max_repeats = app.config.get('QUERY_MONITOR_MAX_REPEATS', 5)
+        slow_ms = app.config.get('QUERY_MONITOR_SLOW_MS', 200)
+
+        for stats in targets:
+            stats['count'] += 1
+            stats['total_ms'] += elapsed_ms
+            stats['fingerprints'][fp] += 1
+
+            # Muestreo del stack: solo cuando la huella se vuelve sospechosa
+            if stats['fingerprints'][fp] == max_repeats + 1 and fp not in stats['stacks']:
+                stats['stacks'][fp] = QueryMonitor.sample_stack()
+
+            if elapsed_ms >= slow_ms:
+                stats['slow'].append({
+                    'fingerprint': fp,
+                    'ms': round(elapsed_ms, 2),
+                    'stack': QueryMonitor.sample_stack()
+                })
+
+    # ============================================
+    # REGISTRO EN LA APP
+    # ============================================
+
+    @staticmethod
+    def attach_engine(app, engine):
+        """Registra los listeners de SQLAlchemy en un engine"""
+
+        @event.listens_for(engine, 'before_cursor_execute')
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            conn.info.setdefault('query_monitor_start', []).append(time.perf_counter())
+
+        @event.listens_for(engine, 'after_cursor_execute')
+        def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            starts = conn.info.get('query_monitor_start')
+            if not starts:
+                return
+            elapsed_ms = (time.perf_counter() - starts.pop()) * 1000
+            QueryMonitor._record(app, statement, elapsed_ms)
+
+    @staticmethod
+    def analyze(app, stats: dict) -> dict:
+        """
+        Evalúa los contadores de una petición
+
+        Returns:
+            dict o None: Detalle de la detección si la petición es sospechosa
+        """
+        max_queries = app.config.get('QUERY_MONITOR_MAX_QUERIES', 30)
+        max_repeats = app.config.get('QUERY_MONITOR_MAX_REPEATS', 5)
+
+        repetidas = [
+            {
+                'fingerprint': fp,
+                'fingerprint_id': QueryMonitor.fingerprint_id(fp),
+                'veces': veces,
+                'stack': stats['stacks'].get(fp, [])
+            }
+            for fp, veces in stats['fingerprints'].most_common()
+            if veces > max_repeats
+        ]
+
+        if stats['count'] <= max_queries and not repetidas and not stats['slow']:
+            return None
+
+        motivos = []
+        if stats['count'] > max_queries:
+            motivos.append('demasiadas_consultas')
+        if repetidas:
+            motivos.append('n_mas_1')
+        if stats['slow']:
+            motivos.append('consulta_lenta')
+
+        return {
+            'fecha': datetime.utcnow().isoformat(),
+            'metodo': request.method,
+            'ruta': request.url_rule.rule if request.url_rule else request.path,
+            'endpoint': request.endpoint,
+            'motivos': motivos,
+            'total_consultas': stats['count'],
+            'tiempo_sql_ms': round(stats['total_ms'], 2),
+            'repetidas': repetidas,
+            'lentas': stats['slow'][:10]
+        }
+
+    @staticmethod
+    def store_offense(app, offense: dict):
+        """Guarda la detección en memoria y en el archivo JSONL"""
+        with QueryMonitor._lock:
+            QueryMonitor._offenses.append(offense)
+
+            log_file = app.config.get('QUERY_MONITOR_LOG_FILE')
+            if log_file:
+                try:
+                    os.makedirs(os.path.dirname(log_file) or '.', exist_ok=True)
+                    with open(log_file, 'a', encoding='utf-8') as fh:
+                        fh.write(json.dumps(offense, ensure_ascii=False) + '\n')
+                except OSError as e:
+                    app.logger.warning(f'QueryMonitor: no se pudo escribir {log_file}: {e}')
+
+        app.logger.warning(
+            f"⚠️ QueryMonitor: {offense['metodo']} {offense['ruta']} → "
+            f"{offense['total_consultas']} consultas ({', '.join(offense['motivos'])})"
+        )
+
+    @staticmethod
+    def get_offenses() -> list:
+        """Detecciones en memoria del proceso actual"""
+        with QueryMonitor._lock:
+            return list(QueryMonitor._offenses)
+
+    @staticmethod
+    def load_offenses(log_file: str) -> list:
+        """Lee las detecciones guardadas en el archivo JSONL"""
+        if not log_file or not os.path.exists(log_file):
+            return []
+        offenses = []
+        with open(log_file, encoding='utf-8') as fh:
+            for line in fh:
+                line = line.strip()
+                if line:
+                    try:
+                        offenses.append(json.loads(line))
+                    except ValueError:
+                        continue
+        return offenses
+
+    @staticmethod
+    def build_report(offenses: list) -> list:
+        """
+        Agrupa las detecciones por (ruta, huella)
+
+        Returns:
+            list: Ordenada por número de apariciones
+        """
+        grupos = {}
+        for offense in offenses:
+            ruta = f"{offense.get('metodo')} {offense.get('ruta')}"
+            items = offense.get('repetidas') or [{'fingerprint': None, 'fingerprint_id': None, 'veces': 0, 'stack': []}]
+            for item in items:
+                key = (ruta, item.get('fingerprint_id'))
+                grupo = grupos.setdefault(key, {
+                    'ruta': ruta,
+                    'fingerprint_id': item.get('fingerprint_id'),
+                    'fingerprint': item.get('fingerprint'),
+                    'apariciones': 0,
+                    'max_consultas': 0,
+                    'max_repeticiones': 0,
+                    'motivos': set(),
+                    'stack': item.get('stack') or []
+                })
+                grupo['apariciones'] += 1
+                grupo['max_consultas'] = max(grupo['max_consultas'], offense.get('total_consultas', 0))
+                grupo['max_repeticiones'] = max(grupo['max_repeticiones'], item.get('veces', 0))
+                grupo['motivos'].update(offense.get('motivos', []))
+
+        reporte = sorted(grupos.values(), key=lambda x: (x['apariciones'], x['max_consultas']), reverse=True)
+        for grupo in reporte:
+            grupo['motivos'] = sorted(grupo['motivos'])
+        return reporte
+
+
+@contextmanager
+def query_budget(max_queries: int, max_repeats: int = None):
+    """
+    Falla si el bloque ejecuta más consultas de las permitidas
+
+    Uso (en tests):
+        with query_budget(5):
+            client.get('/api/partido')
+
+    Args:
+        max_queries: Consultas máximas permitidas
+        max_repeats: Repeticiones máximas de una misma sentencia (opcional)
+
+    Raises:
+        QueryBudgetExceeded: Si se supera el presupuesto
+    """
+    stats = QueryMonitor._new_stats()
+    budgets = QueryMonitor._local.__dict__.setdefault('budgets', [])
+    budgets.append(stats)
+    try:
+        yield stats
+    finally:
+        budgets.remove(stats)
+
+    if stats['count'] > max_queries:
+        detalle = '\n'.join(f'  {veces}x {fp}' for fp, veces in stats['fingerprints'].most_common(5))
+        raise QueryBudgetExceeded(
+            f'Se ejecutaron {stats["count"]} consultas (máximo {max_queries}):\n{detalle}'
+        )
+
+    if max_repeats is not None:
+        for fp, veces in stats['fingerprints'].items():
+            if veces > max_repeats:
+                raise QueryBudgetExceeded(
+                    f'La sentencia se repitió {veces} veces (máximo {max_repeats}): {fp}'
+                )
+
+
+def register_query_monitor(app, db):
+    """
+    Activa el detector de consultas en la app
+
+    - Listeners en cada engine configurado
+    - before_request/after_request para analizar cada petición
+    - Comando CLI: flask query-report
+    """
+    with app.app_context():
+        for engine in db.engines.values():
+            QueryMonitor.attach_engine(app, engine)
+
+    @app.before_request
+    def _query_monitor_start():
+        if not app.config.get('QUERY_MONITOR_ENABLED', False):
+            return
+        if random.random() > app.config.get('QUERY_MONITOR_SAMPLE_RATE', 1.0):
+            return
+        g._query_monitor = QueryMonitor._new_stats()
+
+    @app.after_request
+    def _query_monitor_check(response):
+        stats = g.pop('_query_monitor', None)
+        if stats is None:
+            return response
+
+        offense = QueryMonitor.analyze(app, stats)
+        if offense:
+            offense['status'] = response.status_code
+            QueryMonitor.store_offense(app, offense)
+
+        if app.config.get('QUERY_MONITOR_HEADERS', False):
+            response.headers['X-Query-Count'] = str(stats['count'])
+            response.headers['X-Query-Time-Ms'] = f"{stats['total_ms']:.2f}"
+
+        return response
+
+    @app.cli.command('query-report')
+    @click.option('--limit', default=20, help='Cantidad de grupos a mostrar')
+    @click.option('--clear', is_flag=True, help='Vaciar el archivo después de mostrarlo')
+    def query_report(limit, clear):
+        """Muestra las rutas con consultas lentas o patrones N+1"""
+        log_file = app.config.get('QUERY_MONITOR_LOG_FILE')
+        offenses = QueryMonitor.load_offenses(log_file) or QueryMonitor.get_offenses()
+
+        if not offenses:
+            click.echo('✅ No hay detecciones registradas')
+            return
+
+        reporte = QueryMonitor.build_report(offenses)
+        click.echo(f'📊 {len(offenses)} peticiones sospechosas, {len(reporte)} grupos\n')
+
+        for grupo in reporte[:limit]:
+            click.echo(f"🔎 {grupo['ruta']}  [{', '.join(grupo['motivos'])}]")
+            click.echo(f"   apariciones: {grupo['apariciones']} | máx. consultas: {grupo['max_consultas']}"
+                       f" | máx. repeticiones: {grupo['max_repeticiones']}")
+            if grupo['fingerprint']:
+                click.echo(f"   huella [{grupo['fingerprint_id']}]: {grupo['fingerprint'][:200]}")
+            for frame in grupo['stack']:
+                click.echo(f'     ↳ {frame}')
+            click.echo('')
+
+        if clear and log_file and os.path.exists(log_file):
+            open(log_file, 'w').close()
+            click.echo('🗑️ Archivo de detecciones vaciado')
@@ -0,0 +1,78 @@
+from flask import current_app, g, request
+
+from app.extensions import db
+
+
+class ReadOnlyQuery:
+    """
+    Modo de solo lectura para los listados públicos
+
+    ¿Cómo funciona?
+    1. Antes de cada GET/HEAD a un blueprint de READ_ONLY_BLUEPRINTS se
+       apaga el autoflush de la sesión de la petición (y se restaura al
+       terminar): una lectura nunca dispara un flush
+    2. Los listados seleccionan solo sus columnas (app/serializers) y las
+       recorren con rows(): sin objetos ORM, identity map ni seguimiento
+       de cambios
+    3. rows() ejecuta con yield_per (READ_ONLY_YIELD_PER): las filas se
+       traen del cursor por bloques (con MySQL, cursor del lado del
+       servidor) y se convierten a dict a medida que llegan, en vez de
+       tener a la vez la lista completa de filas y la de diccionarios
+    """
+
+    @staticmethod
+    def should_apply(app) -> bool:
+        if not app.config.get('READ_ONLY_ENABLED', True):
+            return False
+        if request.method not in ('GET', 'HEAD'):
+            return False
+        return request.blueprint in app.config.get('READ_ONLY_BLUEPRINTS', [])
+
+    @staticmethod
+    def rows(statement, params=None, yield_per=None):
+        """
+        Itera las filas de un SELECT (Core, de columnas o text()) por bloques
+
+        Args:
+            statement: SELECT a ejecutar
+            params: Parámetros (para text())
+            yield_per: Filas por bloque (READ_ONLY_YIELD_PER por defecto)
+
+        Yields:
+            Row: Filas en el orden del SELECT
+        """
+        yield_per = yield_per or current_app.config.get('READ_ONLY_YIELD_PER', 1000)
+        with db.session.no_autoflush:
+            resultado = db.session.execute(statement.execution_options(yield_per=yield_per), params)
+        try:
+            for bloque in resultado.partitions():
+                yield from bloque
+        finally:
+            resultado.close()
+
+    @staticmethod
+    def dump_all(serializer, statement, yield_per=None) -> list:
+        """Filas de `statement` (un select() del serializer) ya convertidas a dict"""
+        return serializer.dump_all(ReadOnlyQuery.rows(statement, yield_per=yield_per))
+
+
+def register_read_only(app, db):
+    """
+    Activa el modo de solo lectura en los GET de READ_ONLY_BLUEPRINTS
+
+    - before_request: apaga el autoflush de la sesión de la petición
+    - teardown_request: lo restaura (la sesión puede compartirse con un
+      app context externo, p. ej. en scripts y benchmarks)
+    """
+
+    @app.before_request
+    def _read_only_begin():
+        if ReadOnlyQuery.should_apply(app):
+            g._read_only_autoflush = db.session.autoflush
+            db.session.autoflush = False
+
+    @app.teardown_request
+    def _read_only_end(exc=None):
+        previo = g.pop('_read_only_autoflush', None)
+        if previo is not None:
+            db.session.autoflush = previo
@@ -0,0 +1,195 @@
+import hashlib
+import itertools
+import threading
+import time
+from contextlib import contextmanager
+
+from flask import g, has_app_context, request
+from flask_sqlalchemy.session import Session
+from itsdangerous import BadSignature, Signer
+
+
+class ReadReplicaRouter:
+    """
+    Separación de lecturas y escrituras entre la BD primaria y réplicas
+
+    ¿Cómo funciona?
+    1. Las réplicas se declaran como binds (SQLALCHEMY_BINDS) y se listan
+       en READ_REPLICA_BINDS
+    2. Antes de cada petición GET/HEAD a un blueprint de solo lectura
+       (READ_REPLICA_BLUEPRINTS) se marca la petición para usar una réplica
+    3. RoutingSession envía las consultas de esa petición a una réplica
+       (round-robin); todo lo demás (y cualquier flush) va a la primaria
+    4. Read-your-writes: cuando un cliente escribe con éxito, sus lecturas
+       van a la primaria durante READ_REPLICA_STICKY_SECONDS, para que no
+       vea datos viejos mientras la réplica se pone al día
+
+    La marca de "escribió hace poco" se guarda en dos lugares:
+    - En el cliente: la respuesta de la escritura trae el instante firmado
+      (cookie STICKY_COOKIE y header STICKY_HEADER). El navegador devuelve
+      la cookie solo; otros clientes pueden reenviar el header. Así vale
+      para cualquier worker o servidor que atienda la lectura
+    - En memoria del proceso, por token (Authorization): cubre a los
+      clientes que no devuelven ni la cookie ni el header, pero solo si la
+      lectura llega al mismo worker que atendió la escritura. No se usa la
+      IP: detrás de un proxy o un NAT todos los clientes comparten
+      remote_addr y una sola escritura mandaría a todos a la primaria
+
+    Las consultas del estado de los tokens (logout, revocaciones) van
+    siempre a la primaria (ver primary()).
+    """
+
+    _lock = threading.Lock()
+    _escrituras = {}  # clave de cliente -> instante de la última escritura
+    _ciclos = {}      # app -> itertools.cycle de binds de réplica
+    _MAX_CLIENTES = 10000
+
+    STICKY_COOKIE = 'db_escritura'
+    STICKY_HEADER = 'X-DB-Sticky'
+
+    @staticmethod
+    def client_keys() -> list:
+        """Claves que identifican al cliente actual (su token; vacía si no envía Authorization)"""
+        auth = request.headers.get('Authorization')
+        if not auth:
+            return []
+        return ['tk:' + hashlib.sha1(auth.encode('utf-8')).hexdigest()]
+
+    @staticmethod
+    def mark_write(claves: list, ahora: float = None):
+        ahora = ahora or time.monotonic()
+        with ReadReplicaRouter._lock:
+            if len(ReadReplicaRouter._escrituras) >= ReadReplicaRouter._MAX_CLIENTES:
+                ReadReplicaRouter._escrituras.clear()
+            for clave in claves:
+                ReadReplicaRouter._escrituras[clave] = ahora
+
+    @staticmethod
+    def wrote_recently(claves: list, ventana: float, ahora: float = None) -> bool:
+        ahora = ahora or time.monotonic()
+        with ReadReplicaRouter._lock:
+            for clave in claves:
+                instante = ReadReplicaRouter._escrituras.get(clave)
+                if instante is None:
+                    continue
+                if ahora - instante <= ventana:
+                    return True
+                del ReadReplicaRouter._escrituras[clave]
+        return False
+
+    @staticmethod
+    def _signer(app) -> Signer:
+        clave = app.config.get('SECRET_KEY') or app.config['JWT_SECRET_KEY']
+        return Signer(clave, salt='read-replica-sticky')
+
+    @staticmethod
+    def sticky_token(app, ahora: float = None) -> str:
+        """Instante de la escritura, firmado (para la cookie y el header)"""
+        ahora = ahora or time.time()
+        return ReadReplicaRouter._signer(app).sign(f'{ahora:.3f}').decode('utf-8')
+
+    @staticmethod
+    def sticky_token_valid(app, ventana: float, ahora: float = None) -> bool:
+        """¿La petición trae una marca de escritura válida de hace menos de `ventana` segundos?"""
+        token = (request.cookies.get(ReadReplicaRouter.STICKY_COOKIE)
+                 or request.headers.get(ReadReplicaRouter.STICKY_HEADER))
+        if not token:
+            return False
+        try:
+            instante = float(ReadReplicaRouter._signer(app).unsign(token))
+        except (BadSignature, ValueError):
+            return False
+        return 0 <= (ahora or time.time()) - instante <= ventana
+
+    @staticmethod
+    def next_replica(app):
+        """Siguiente bind de réplica (round-robin) o None si no hay réplicas"""
+        binds = app.config.get('READ_REPLICA_BINDS') or []
+        if not binds:
+            return None
+        with ReadReplicaRouter._lock:
+            ciclo = ReadReplicaRouter._ciclos.get(app)
+            if ciclo is None:
+                ciclo = ReadReplicaRouter._ciclos[app] = itertools.cycle(binds)
+            return next(ciclo)
+
+    @staticmethod
+    def should_use_replica(app) -> bool:
+        if not app.config.get('READ_REPLICA_ENABLED', False):
+            return False
+        if request.method not in ('GET', 'HEAD'):
+            return False
+        if request.blueprint not in (app.config.get('READ_REPLICA_BLUEPRINTS') or []):
+            return False
+        ventana = app.config.get('READ_REPLICA_STICKY_SECONDS', 5)
+        if ReadReplicaRouter.sticky_token_valid(app, ventana):
+            return False
+        return not ReadReplicaRouter.wrote_recently(ReadReplicaRouter.client_keys(), ventana)
+
+    @staticmethod
+    @contextmanager
+    def primary():
+        """
+        Las consultas del bloque van a la primaria aunque la petición lea de una réplica
+
+        Para lo que no puede ir atrasado (p. ej. tokens revocados):
+            with ReadReplicaRouter.primary():
+                fila = db.session.execute(...).first()
+        """
+        replica = g.pop('_db_replica', None) if has_app_context() else None
+        try:
+            yield
+        finally:
+            if replica is not None:
+                g._db_replica = replica
+
+    @staticmethod
+    def reset():
+        with ReadReplicaRouter._lock:
+            ReadReplicaRouter._escrituras.clear()
+            ReadReplicaRouter._ciclos.clear()
+
+
+class RoutingSession(Session):
+    """Sesión que manda las lecturas marcadas a la réplica elegida para la petición"""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and not self._flushing and has_app_context():
+            replica = g.get('_db_replica')
+            if replica is not None:
+                return self._db.engines[replica]
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+def register_read_replicas(app):
+    """
+    Activa el enrutamiento a réplicas (si READ_REPLICA_ENABLED y hay binds)
+
+    - before_request: elige réplica para lecturas de blueprints de solo lectura
+    - after_request: marca al cliente tras una escritura exitosa (en
+      memoria y con la cookie/header firmados)
+    """
+
+    @app.before_request
+    def _read_replica_select():
+        if ReadReplicaRouter.should_use_replica(app):
+            g._db_replica = ReadReplicaRouter.next_replica(app)
+
+    @app.after_request
+    def _read_replica_track_write(response):
+        if not app.config.get('READ_REPLICA_ENABLED', False):
+            return response
+        if request.method in ('POST', 'PUT', 'PATCH', 'DELETE') and response.status_code < 400:
+            claves = ReadReplicaRouter.client_keys()
+            if claves:
+                ReadReplicaRouter.mark_write(claves)
+            ventana = app.config.get('READ_REPLICA_STICKY_SECONDS', 5)
+            token = ReadReplicaRouter.sticky_token(app)
+            response.set_cookie(
+                ReadReplicaRouter.STICKY_COOKIE, token, max_age=max(1, int(ventana + 0.999)),
+                httponly=True, samesite='Lax', secure=request.is_secure
+            )
+            response.headers[ReadReplicaRouter.STICKY_HEADER] = token
+        if g.get('_db_replica') and (app.debug or app.testing):
+            response.headers['X-DB-Route'] = g._db_replica
+        return response
@@ -0,0 +1,234 @@
+from datetime import datetime
+
+from sqlalchemy.exc import IntegrityError
+
+from app.extensions import db
+from app.models.equipo import Equipo
+from app.models.jugador import Jugador
+from app.utils.bulk_import import BulkReader
+
+
+class RosterImporter:
+    """
+    Importación masiva de jugadores (POST /api/jugadores/import)
+
+    Procesa los registros por bloques de chunk_size filas. Por bloque:
+    1. Valida cada fila en memoria (campos obligatorios, dorsal, posición, fecha)
+    2. Resuelve los equipos nuevos del bloque con una consulta (por id o por
+       nombre exacto, sin distinguir mayúsculas); quedan en memoria
+    3. Una consulta para los documentos ya registrados y otra para los
+       dorsales ocupados de los equipos que aparecen por primera vez
+    4. Detecta duplicados dentro del propio archivo (documento, y dorsal
+       dentro del equipo): gana la primera fila
+    5. Inserta las filas válidas con un INSERT de varias filas y hace commit
+
+    Las filas con errores no se insertan y quedan en el reporte (hasta
+    max_errores con detalle). Si otra petición registra el mismo documento
+    o dorsal mientras tanto, el bloque se reintenta fila por fila para
+    reportar solo las filas en conflicto.
+    """
+
+    CAMPOS_TEXTO = {'nombre': 100, 'apellido': 100, 'documento': 20}
+
+    def __init__(self, id_equipo_defecto=None, chunk_size=1000, max_errores=1000):
+        self.id_equipo_defecto = id_equipo_defecto
+        self.chunk_size = max(1, chunk_size)
+        self.max_errores = max_errores
+        self.posiciones = Jugador.__table__.c.posicion.type.enums
+
+        self.equipos_por_id = {}
+        self.equipos_por_nombre = {}
+        self.nombres_sin_equipo = set()
+        self.dorsales = {}  # id_equipo -> set de dorsales ocupados
+        self.documentos = {}  # documento -> fila del archivo que lo registró
+
+        self.total = 0
+        self.insertados = 0
+        self.rechazados = 0
+        self.errores = []
+
+    def run(self, registros) -> dict:
+        """
+        Importa los registros (iterador de (fila, dict))
+
+        Returns:
+            dict: Resumen con total, insertados, rechazados y errores por fila
+        """
+        for bloque in BulkReader.chunks(registros, self.chunk_size):
+            self._procesar_bloque(bloque)
+
+        return {
+            'total': self.total,
+            'insertados': self.insertados,
+            'rechazados': self.rechazados,
+            'errores': self.errores,
+            'errores_omitidos': max(0, self.rechazados - len(self.errores)),
+        }
+
+    def _error(self, fila, datos, mensajes):
+        self.rechazados += 1
+        if len(self.errores) < self.max_errores:
+            self.errores.append({
+                'fila': fila,
+                'documento': datos.get('documento') if isinstance(datos, dict) else None,
+                'errores': mensajes,
+            })
+
+    def _normalizar(self, datos):
+        """(jugador, referencia al equipo, errores) de una fila, validada en memoria"""
+        if not isinstance(datos, dict):
+            return None, None, ['La fila debe ser un objeto con los datos del jugador']
+
+        errores = []
+        jugador = {}
+
+        for campo, largo in self.CAMPOS_TEXTO.items():
+            valor = datos.get(campo)
+            valor = str(valor).strip() if valor is not None else ''
+            if not valor:
+                errores.append(f'El {campo} es obligatorio')
+            elif len(valor) > largo:
+                errores.append(f'El {campo} no puede superar {largo} caracteres')
+            jugador[campo] = valor
+
+        dorsal = datos.get('dorsal')
+        try:
+            jugador['dorsal'] = int(str(dorsal).strip())
+            if jugador['dorsal'] <= 0:
+                errores.append('El dorsal debe ser un número positivo')
+        except (TypeError, ValueError):
+            errores.append('El dorsal es obligatorio y debe ser un número' if dorsal in (None, '')
+                           else f'Dorsal inválido: {dorsal}')
+
+        posicion = str(datos.get('posicion') or 'delantero').strip().lower()
+        if posicion not in self.posiciones:
+            errores.append(f'Posición no válida. Debe ser: {", ".join(self.posiciones)}')
+        jugador['posicion'] = posicion
+
+        fecha = datos.get('fecha_nacimiento')
+        jugador['fecha_nacimiento'] = None
+        if fecha:
+            try:
+                jugador['fecha_nacimiento'] = datetime.fromisoformat(str(fecha).strip()).date()
+            except ValueError:
+                errores.append('Formato de fecha inválido. Use YYYY-MM-DD')
+
+        # Equipo: id_equipo, nombre_equipo o el equipo de la petición (?id_equipo=)
+        referencia = None
+        if datos.get('id_equipo') not in (None, ''):
+            try:
+                referencia = int(str(datos['id_equipo']).strip())
+            except ValueError:
+                errores.append(f'id_equipo inválido: {datos["id_equipo"]}')
+        elif datos.get('nombre_equipo'):
+            referencia = str(datos['nombre_equipo']).strip().lower()
+        elif self.id_equipo_defecto is not None:
+            referencia = self.id_equipo_defecto
+        else:
+            errores.append('El equipo es obligatorio (id_equipo o nombre_equipo)')
+
+        return jugador, referencia, errores
+
+    def _cargar_equipos(self, referencias):
+        """Resuelve con una consulta los equipos que aún no están en memoria"""
+        ids = {r for r in referencias if isinstance(r, int) and r not in self.equipos_por_id}
+        nombres = {r for r in referencias if isinstance(r, str)
+                   and r not in self.equipos_por_nombre and r not in self.nombres_sin_equipo}
+        if not ids and not nombres:
+            return
+
+        condiciones = []
+        if ids:
+            condiciones.append(Equipo.id_equipo.in_(ids))
+        if nombres:
+            condiciones.append(db.func.lower(Equipo.nombre).in_(nombres))
+
+        for equipo in db.session.execute(
+            db.select(Equipo.id_equipo, Equipo.nombre, Equipo.estado).where(db.or_(*condiciones))
+        ).all():
+            self.equipos_por_id[equipo.id_equipo] = equipo
+            self.equipos_por_nombre[equipo.nombre.lower()] = equipo
+        self.nombres_sin_equipo.update(nombres - self.equipos_por_nombre.keys())
+
+    def _cargar_dorsales(self, ids_equipos):
+        """Dorsales ocupados de los equipos nuevos del bloque, en una consulta"""
+        nuevos = [i for i in ids_equipos if i not in self.dorsales]
+        if not nuevos:
+            return
+        for id_equipo in nuevos:
+            self.dorsales[id_equipo] = set()
+        for id_equipo, dorsal in db.session.execute(
+            db.select(Jugador.id_equipo, Jugador.dorsal).where(Jugador.id_equipo.in_(nuevos))
+        ).all():
+            self.dorsales[id_equipo].add(dorsal)
+
+    def _equipo(self, referencia):
+        if isinstance(referencia, int):
+            return self.equipos_por_id.get(referencia)
+        return self.equipos_por_nombre.get(referencia)
+
+    def _procesar_bloque(self, bloque):
+        self.total += len(bloque)
+        filas = []
+        for fila, datos in bloque:
+            jugador, referencia, errores = self._normalizar(datos)
+            filas.append((fila, datos, jugador, referencia, errores))
+
+        self._cargar_equipos({f[3] for f in filas if f[3] is not None and not f[4]})
+        validas = [f for f in filas if not f[4]]
+
+        documentos = {f[2]['documento'] for f in validas}
+        registrados = set(db.session.execute(
+            db.select(Jugador.documento).where(Jugador.documento.in_(documentos))
+        ).scalars()) if documentos else set()
+
+        equipos = {self._equipo(f[3]) for f in validas}
+        self._cargar_dorsales({e.id_equipo for e in equipos if e is not None and e.estado == 'aprobado'})
+
+        nuevos = []
+        for fila, datos, jugador, referencia, errores in filas:
+            if not errores:
+                equipo = self._equipo(referencia)
+                if equipo is None:
+                    errores.append(f'Equipo no encontrado: {datos.get("nombre_equipo") or referencia}')
+                elif equipo.estado != 'aprobado':
+                    errores.append(f'El equipo {equipo.nombre} debe estar aprobado para agregar jugadores')
+                else:
+                    jugador['id_equipo'] = equipo.id_equipo
+                    documento = jugador['documento']
+                    if documento in self.documentos:
+                        errores.append(f'Documento duplicado en el archivo (fila {self.documentos[documento]})')
+                    elif documento in registrados:
+                        errores.append('Ya existe un jugador con este documento')
+                    if jugador['dorsal'] in self.dorsales[equipo.id_equipo]:
+                        errores.append(f'El dorsal {jugador["dorsal"]} ya está ocupado en {equipo.nombre}')
+
+            if errores:
+                self._error(fila, datos, errores)
+                continue
+
+            self.documentos[jugador['documento']] = fila
+            self.dorsales[jugador['id_equipo']].add(jugador['dorsal'])
+            nuevos.append((fila, datos, jugador))
+
+        if nuevos:
+            self._insertar(nuevos)
+
+    def _insertar(self, nuevos):
+        try:
+            db.session.execute(db.insert(Jugador.__table__), [jugador for _, _, jugador in nuevos])
+            db.session.commit()
+            self.insertados += len(nuevos)
+            return
+        except IntegrityError:
+            db.session.rollback()
+
+        # Conflicto con una inserción concurrente: fila por fila con SAVEPOINT
+        for fila, datos, jugador in nuevos:
+            try:
+                with db.session.begin_nested():
+                    db.session.execute(db.insert(Jugador.__table__), [jugador])
+                self.insertados += 1
+            except IntegrityError:
+                self._error(fila, datos, ['El documento o el dorsal se registró mientras se importaba el archivo'])
+        db.session.commit()
@@ -1,8 +1,14 @@
-import re
 import html
-from functools import wraps
+from functools import partial, wraps
 from flask import request, jsonify
 
+# Tablas de str.translate armadas una vez al importar el módulo
+# Caracteres de control (C0, DEL y C1): se eliminan en una sola pasada
+_CONTROL = dict.fromkeys([*range(0x00, 0x20), *range(0x7F, 0xA0)])
+# Caracteres que se quitan de los emails
+_EMAIL_PELIGROSOS = dict.fromkeys(map(ord, '<>"\'\\/'))
+
+
 class InputSanitizer:
     """
     Sanitiza entradas para prevenir XSS, SQL Injection y otros ataques
@@ -10,6 +16,9 @@ class InputSanitizer:
     OWASP A03: Injection
     """
     
+    # Reglas ya compiladas por sanitize_dict, indexadas por sus pares (campo, regla)
+    _reglas_compiladas = {}
+    
     @staticmethod
     def sanitize_string(text: str, max_length: int = None) -> str:
         """
@@ -28,11 +37,18 @@ class InputSanitizer:
         # 1. Escapar HTML para prevenir XSS
         text = html.escape(text)
         
-        # 2. Remover caracteres de control
-        text = re.sub(r'[\x00-\x1F\x7F-\x9F]', '', text)
-        
-        # 3. Limpiar espacios múltiples
-        text = re.sub(r'\s+', ' ', text).strip()
+        if text.isprintable():
+            # Camino rápido (nombres, documentos, emails... en ASCII o con
+            # tildes): sin caracteres de control y el único espacio posible es
+            # ' ', así que solo hay que colapsarlo si está repetido
+            if '  ' in text or text[0] == ' ' or text[-1] == ' ':
+                text = ' '.join(text.split())
+        else:
+            # 2. Remover caracteres de control
+            text = text.translate(_CONTROL)
+            
+            # 3. Limpiar espacios múltiples (split() usa los mismos espacios que \s del regex)
+            text = ' '.join(text.split())
         
         # 4. Truncar si excede longitud máxima
         if max_length and len(text) > max_length:
@@ -59,13 +75,74 @@ class InputSanitizer:
         email = email.lower().strip()
         
         # Remover caracteres peligrosos
-        email = re.sub(r'[<>"\'\\/]', '', email)
+        email = email.translate(_EMAIL_PELIGROSOS)
         
         return email
     
     
     @staticmethod
-    def sanitize_dict(data: dict, rules: dict = None) -> dict:
+    def _a_numero(tipo, value):
+        try:
+            return tipo(value)
+        except Exception:
+            return None
+    
+    
+    @staticmethod
+    def compile_rules(rules: dict = None) -> dict:
+        """
+        Convierte las reglas de un endpoint en una función por campo
+        
+        Se hace una sola vez por juego de reglas (al decorar la ruta con
+        sanitize_input); sanitize_dict ya no vuelve a interpretar las reglas
+        en cada campo de cada petición.
+        
+        Args:
+            rules: {'nombre': 100, 'email': 'email', 'edad': 'int'}
+        
+        Returns:
+            dict: {campo: función(valor) -> valor sanitizado}
+        """
+        compiladas = {}
+        for key, rule in (rules or {}).items():
+            # Regla: email
+            if rule == 'email':
+                compiladas[key] = InputSanitizer.sanitize_email
+            
+            # Regla: int (longitud máxima)
+            elif isinstance(rule, int):
+                compiladas[key] = partial(InputSanitizer.sanitize_string, max_length=rule)
+            
+            # Regla: tipo de dato
+            elif rule == 'int':
+                compiladas[key] = partial(InputSanitizer._a_numero, int)
+            
+            elif rule == 'float':
+                compiladas[key] = partial(InputSanitizer._a_numero, float)
+            
+            elif rule == 'bool':
+                compiladas[key] = bool
+            
+            else:
+                compiladas[key] = InputSanitizer.sanitize_string
+        return compiladas
+    
+    
+    @staticmethod
+    def _reglas(rules):
+        """Reglas compiladas (cacheadas) para las llamadas directas a sanitize_dict"""
+        try:
+            clave = frozenset(rules.items())
+        except TypeError:
+            return InputSanitizer.compile_rules(rules)
+        compiladas = InputSanitizer._reglas_compiladas.get(clave)
+        if compiladas is None:
+            compiladas = InputSanitizer._reglas_compiladas[clave] = InputSanitizer.compile_rules(rules)
+        return compiladas
+    
+    
+    @staticmethod
+    def sanitize_dict(data: dict, rules: dict = None, compiled: dict = None) -> dict:
         """
         Sanitiza un diccionario completo
         
@@ -73,6 +150,7 @@ class InputSanitizer:
             data: Diccionario con datos a sanitizar
             rules: Reglas específicas por campo
                    Ejemplo: {'nombre': 100, 'email': 'email', 'edad': 'int'}
+            compiled: Reglas ya compiladas con compile_rules (en vez de rules)
         
         Returns:
             dict: Diccionario sanitizado
@@ -80,43 +158,22 @@ class InputSanitizer:
         if not data or not isinstance(data, dict):
             return data
         
+        if compiled is None:
+            compiled = InputSanitizer._reglas(rules) if rules else {}
+        sanitize_string = InputSanitizer.sanitize_string
+        
         sanitized = {}
         
         for key, value in data.items():
+            regla = compiled.get(key)
+            
             # Si hay reglas específicas
-            if rules and key in rules:
-                rule = rules[key]
-                
-                # Regla: email
-                if rule == 'email':
-                    sanitized[key] = InputSanitizer.sanitize_email(value)
-                
-                # Regla: int (longitud máxima)
-                elif isinstance(rule, int):
-                    sanitized[key] = InputSanitizer.sanitize_string(value, max_length=rule)
-                
-                # Regla: tipo de dato
-                elif rule == 'int':
-                    try:
-                        sanitized[key] = int(value)
-                    except:
-                        sanitized[key] = None
-                
-                elif rule == 'float':
-                    try:
-                        sanitized[key] = float(value)
-                    except:
-                        sanitized[key] = None
-                
-                elif rule == 'bool':
-                    sanitized[key] = bool(value)
-                
-                else:
-                    sanitized[key] = InputSanitizer.sanitize_string(value)
+            if regla is not None:
+                sanitized[key] = regla(value)
             
             # Sin reglas específicas, sanitizar strings
             elif isinstance(value, str):
-                sanitized[key] = InputSanitizer.sanitize_string(value)
+                sanitized[key] = sanitize_string(value)
             
             else:
                 sanitized[key] = value
@@ -140,6 +197,9 @@ def sanitize_input(rules: dict = None):
     Returns:
         function: Decorador
     """
+    # Las reglas se compilan una vez, al decorar la ruta
+    compiladas = InputSanitizer.compile_rules(rules)
+    
     def decorator(f):
         @wraps(f)
         def wrapper(*args, **kwargs):
@@ -149,7 +209,7 @@ def sanitize_input(rules: dict = None):
                     original_data = request.get_json()
                     
                     # Sanitizar datos
-                    sanitized_data = InputSanitizer.sanitize_dict(original_data, rules)
+                    sanitized_data = InputSanitizer.sanitize_dict(original_data, compiled=compiladas)
                     
                     # Reemplazar request.get_json() con datos sanitizados
                     request._cached_data = sanitized_data
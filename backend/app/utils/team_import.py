@@ -0,0 +1,219 @@
+from sqlalchemy.exc import IntegrityError
+
+from app.extensions import db
+from app.models.equipo import Equipo
+from app.models.notificacion import Notificacion
+from app.models.solicitud_equipo import SolicitudEquipo
+from app.models.usuario import Usuario
+from app.utils.bulk_import import BulkReader
+
+
+class TeamImporter:
+    """
+    Registro masivo de equipos (POST /api/equipos/import)
+
+    Procesa los registros por bloques de chunk_size filas. Por bloque:
+    1. Valida cada fila en memoria (nombre, estadio, líder)
+    2. Resuelve los líderes con una consulta: por id_lider, email_lider o
+       nombre_lider (usuarios.nombre_normalizado, búsqueda exacta por índice
+       en vez de ILIKE '%...%'). Un nombre que coincide con varios usuarios
+       se rechaza: hay que indicar el email
+    3. Una consulta para los nombres de equipo ya registrados; los
+       duplicados dentro del archivo se detectan en memoria
+    4. INSERT de varias filas de equipos (estado 'pendiente'), otro de sus
+       solicitudes pendientes y, si notificar=True, otro de notificaciones
+       para los líderes; un commit por bloque
+
+    Las filas con errores no se insertan y quedan en el reporte.
+    """
+
+    CAMPOS_TEXTO = {'nombre': 100, 'estadio': 150, 'logo_url': 255}
+
+    def __init__(self, notificar=False, chunk_size=1000, max_errores=1000):
+        self.notificar = notificar
+        self.chunk_size = max(1, chunk_size)
+        self.max_errores = max_errores
+
+        self.nombres = {}  # nombre en minúsculas -> fila del archivo que lo registró
+        self.total = 0
+        self.insertados = 0
+        self.rechazados = 0
+        self.errores = []
+        self.equipos = []
+
+    def run(self, registros) -> dict:
+        """
+        Registra los equipos (iterador de (fila, dict))
+
+        Returns:
+            dict: Resumen con total, insertados, rechazados, errores por fila y equipos creados
+        """
+        for bloque in BulkReader.chunks(registros, self.chunk_size):
+            self._procesar_bloque(bloque)
+
+        return {
+            'total': self.total,
+            'insertados': self.insertados,
+            'rechazados': self.rechazados,
+            'errores': self.errores,
+            'errores_omitidos': max(0, self.rechazados - len(self.errores)),
+            'equipos': self.equipos,
+        }
+
+    def _error(self, fila, datos, mensajes):
+        self.rechazados += 1
+        if len(self.errores) < self.max_errores:
+            self.errores.append({
+                'fila': fila,
+                'nombre': datos.get('nombre') if isinstance(datos, dict) else None,
+                'errores': mensajes,
+            })
+
+    def _normalizar(self, datos):
+        """(equipo, referencia al líder, errores) de una fila, validada en memoria"""
+        if not isinstance(datos, dict):
+            return None, None, ['La fila debe ser un objeto con los datos del equipo']
+
+        errores = []
+        equipo = {}
+        for campo, largo in self.CAMPOS_TEXTO.items():
+            valor = datos.get(campo)
+            valor = str(valor).strip() if valor is not None else ''
+            if len(valor) > largo:
+                errores.append(f'El {campo} no puede superar {largo} caracteres')
+            equipo[campo] = valor or None
+
+        if not equipo['nombre']:
+            errores.append('El nombre del equipo es obligatorio')
+        elif len(equipo['nombre']) < 3:
+            errores.append('El nombre debe tener al menos 3 caracteres')
+        if not equipo['estadio']:
+            errores.append('El estadio es obligatorio')
+
+        # Líder: ('id', 5), ('email', 'x@y.com') o ('nombre', 'juan perez')
+        referencia = None
+        if datos.get('id_lider') not in (None, ''):
+            try:
+                referencia = ('id', int(str(datos['id_lider']).strip()))
+            except ValueError:
+                errores.append(f'id_lider inválido: {datos["id_lider"]}')
+        elif datos.get('email_lider'):
+            referencia = ('email', str(datos['email_lider']).strip().lower())
+        elif Usuario.normalizar_nombre(datos.get('nombre_lider')):
+            referencia = ('nombre', Usuario.normalizar_nombre(datos['nombre_lider']))
+        else:
+            errores.append('El líder es obligatorio (nombre_lider, email_lider o id_lider)')
+
+        return equipo, referencia, errores
+
+    def _cargar_lideres(self, referencias):
+        """Usuarios de las referencias del bloque en una consulta: {referencia: [usuarios]}"""
+        por_tipo = {'id': set(), 'email': set(), 'nombre': set()}
+        for tipo, valor in referencias:
+            por_tipo[tipo].add(valor)
+
+        condiciones = []
+        if por_tipo['id']:
+            condiciones.append(Usuario.id_usuario.in_(por_tipo['id']))
+        if por_tipo['email']:
+            condiciones.append(Usuario.email.in_(por_tipo['email']))
+        if por_tipo['nombre']:
+            condiciones.append(Usuario.nombre_normalizado.in_(por_tipo['nombre']))
+        if not condiciones:
+            return {}
+
+        lideres = {}
+        for usuario in db.session.execute(
+            db.select(Usuario.id_usuario, Usuario.nombre, Usuario.email, Usuario.nombre_normalizado, Usuario.rol)
+            .where(db.or_(*condiciones))
+        ).all():
+            for referencia in (('id', usuario.id_usuario), ('email', usuario.email.lower()),
+                               ('nombre', usuario.nombre_normalizado)):
+                if referencia in referencias:
+                    lideres.setdefault(referencia, []).append(usuario)
+        return lideres
+
+    def _procesar_bloque(self, bloque):
+        self.total += len(bloque)
+        filas = []
+        for fila, datos in bloque:
+            equipo, referencia, errores = self._normalizar(datos)
+            filas.append((fila, datos, equipo, referencia, errores))
+
+        validas = [f for f in filas if not f[4]]
+        lideres = self._cargar_lideres({f[3] for f in validas})
+
+        nombres = {f[2]['nombre'].lower() for f in validas}
+        registrados = set(db.session.execute(
+            db.select(db.func.lower(Equipo.nombre)).where(db.func.lower(Equipo.nombre).in_(nombres))
+        ).scalars()) if nombres else set()
+
+        nuevos = []
+        for fila, datos, equipo, referencia, errores in filas:
+            if not errores:
+                candidatos = lideres.get(referencia, [])
+                if not candidatos:
+                    errores.append(f'Líder no encontrado: {referencia[1]}')
+                elif len(candidatos) > 1:
+                    errores.append(f'Hay {len(candidatos)} usuarios llamados "{referencia[1]}": use email_lider')
+                elif candidatos[0].rol not in ('lider', 'admin'):
+                    errores.append('El usuario debe tener rol de líder o admin')
+                else:
+                    equipo['id_lider'] = candidatos[0].id_usuario
+
+                clave = equipo['nombre'].lower()
+                if clave in self.nombres:
+                    errores.append(f'Equipo duplicado en el archivo (fila {self.nombres[clave]})')
+                elif clave in registrados:
+                    errores.append('Ya existe un equipo con este nombre')
+
+            if errores:
+                self._error(fila, datos, errores)
+                continue
+
+            self.nombres[equipo['nombre'].lower()] = fila
+            nuevos.append((fila, datos, equipo))
+
+        if nuevos:
+            self._insertar(nuevos)
+
+    def _insertar(self, nuevos):
+        try:
+            db.session.execute(db.insert(Equipo.__table__), [
+                {**equipo, 'estado': 'pendiente'} for _, _, equipo in nuevos
+            ])
+        except IntegrityError:
+            db.session.rollback()
+            # Otra petición registró el mismo nombre: fila por fila con SAVEPOINT
+            insertados = []
+            for fila, datos, equipo in nuevos:
+                try:
+                    with db.session.begin_nested():
+                        db.session.execute(db.insert(Equipo.__table__), [{**equipo, 'estado': 'pendiente'}])
+                    insertados.append((fila, datos, equipo))
+                except IntegrityError:
+                    self._error(fila, datos, ['El nombre se registró mientras se importaba el archivo'])
+            nuevos = insertados
+            if not nuevos:
+                db.session.commit()
+                return
+
+        # MySQL no tiene RETURNING: los ids se leen por el índice UNIQUE de nombre
+        creados = db.session.execute(
+            db.select(Equipo.id_equipo, Equipo.nombre, Equipo.id_lider)
+            .where(Equipo.nombre.in_([equipo['nombre'] for _, _, equipo in nuevos]))
+        ).all()
+
+        db.session.execute(db.insert(SolicitudEquipo.__table__), [
+            {'id_equipo': e.id_equipo, 'id_lider': e.id_lider, 'estado': 'pendiente'} for e in creados
+        ])
+        if self.notificar:
+            Notificacion.crear_varias([{
+                'id_usuario': e.id_lider,
+                'titulo': 'Equipo registrado',
+                'mensaje': f'Tu equipo {e.nombre} fue registrado y está pendiente de aprobación',
+            } for e in creados], chunk_size=self.chunk_size)
+        db.session.commit()
+
+        self.insertados += len(creados)
+        self.equipos.extend({'id_equipo': e.id_equipo, 'nombre': e.nombre, 'id_lider': e.id_lider} for e in creados)
@@ -0,0 +1,66 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class TTLCache:
+    """
+    Cache LRU en memoria del proceso, con expiración por entrada
+
+    - get/set en O(1) (OrderedDict): al superar maxsize se descarta la
+      entrada usada hace más tiempo
+    - Cada entrada vence a los `ttl` segundos: lo que cambia en otro
+      proceso se ve, como mucho, `ttl` segundos después
+    - Thread-safe (un lock por cache)
+    """
+
+    _SIN_VALOR = object()
+
+    def __init__(self, maxsize=10000):
+        self.maxsize = maxsize
+        self._datos = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, clave, default=None):
+        ahora = time.monotonic()
+        with self._lock:
+            entrada = self._datos.get(clave, self._SIN_VALOR)
+            if entrada is not self._SIN_VALOR:
+                valor, expira = entrada
+                if expira > ahora:
+                    self._datos.move_to_end(clave)
+                    self.hits += 1
+                    return valor
+                del self._datos[clave]
+            self.misses += 1
+            return default
+
+    def set(self, clave, valor, ttl):
+        if ttl <= 0:
+            return
+        with self._lock:
+            self._datos[clave] = (valor, time.monotonic() + ttl)
+            self._datos.move_to_end(clave)
+            while len(self._datos) > self.maxsize:
+                self._datos.popitem(last=False)
+
+    def invalidate(self, clave):
+        with self._lock:
+            self._datos.pop(clave, None)
+
+    def clear(self):
+        with self._lock:
+            self._datos.clear()
+            self.hits = self.misses = 0
+
+    def status(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'entradas': len(self._datos),
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / total, 3) if total else None,
+            }
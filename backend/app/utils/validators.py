@@ -1,9 +1,19 @@
 import re
+import unicodedata
 
 def validar_email(email):
     patron = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
     return re.match(patron, email) is not None
 
+def normalizar_nombre(nombre):
+    """'  José  PÉREZ ' -> 'jose perez' (None si queda vacío)"""
+    if not nombre:
+        return None
+    sin_tildes = ''.join(
+        c for c in unicodedata.normalize('NFKD', str(nombre)) if not unicodedata.combining(c)
+    )
+    return re.sub(r'\s+', ' ', sin_tildes).strip().lower() or None
+
 def validar_equipo(data):
     errores = []
     if 'nombre' not in data or not data['nombre'].strip():
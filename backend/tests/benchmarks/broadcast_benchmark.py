@@ -0,0 +1,136 @@
+"""
+Benchmark de notificaciones masivas
+
+Siembra un campeonato con N equipos aprobados (cada uno con su líder) y
+mide POST /api/notificaciones/broadcast: resolución de la audiencia,
+INSERT por bloques y actualización de los contadores de no leídas.
+
+Uso (desde backend/):
+    python -m tests.benchmarks.broadcast_benchmark
+    python -m tests.benchmarks.broadcast_benchmark --destinatarios 10000 --chunks 100,500,1000,5000
+    python -m tests.benchmarks.broadcast_benchmark --email   # incluye la cola de emails (envío suprimido)
+"""
+import argparse
+import os
+import time
+from datetime import date, datetime, timedelta
+
+import bcrypt
+from sqlalchemy import select
+
+from tests.benchmarks.common import build_app, metadata, write_results
+from tests.benchmarks.seed import ADMIN_EMAIL, ADMIN_PASSWORD, _bulk_insert
+
+
+def sembrar_audiencia(db, destinatarios):
+    """Campeonato sin partidos generados + N equipos aprobados con líder propio"""
+    from app.models import Campeonato, Equipo, Usuario
+
+    ahora = datetime.utcnow()
+    password_hash = bcrypt.hashpw(ADMIN_PASSWORD.encode('utf-8'), bcrypt.gensalt(4)).decode('utf-8')
+
+    admin = Usuario(nombre='Admin Benchmark', email=ADMIN_EMAIL, rol='admin',
+                    activo=True, email_verified=True, contrasena=password_hash)
+    db.session.add(admin)
+    db.session.flush()
+
+    _bulk_insert(db, Usuario, [{
+        'nombre': f'Lider {i}', 'email': f'lider.broadcast.{i}@gmail.com', 'rol': 'lider',
+        'activo': True, 'email_verified': True, 'contrasena': password_hash,
+        'fecha_registro': ahora, 'fecha_actualizacion': ahora,
+    } for i in range(destinatarios)])
+    lideres = db.session.execute(
+        select(Usuario.id_usuario).where(Usuario.email.like('lider.broadcast.%')).order_by(Usuario.id_usuario)
+    ).scalars().all()
+
+    _bulk_insert(db, Equipo, [{
+        'nombre': f'Equipo broadcast {i:05d}', 'id_lider': id_lider, 'estado': 'aprobado',
+        'fecha_registro': ahora, 'fecha_aprobacion': ahora, 'aprobado_por': admin.id_usuario,
+    } for i, id_lider in enumerate(lideres)])
+
+    campeonato = Campeonato(
+        nombre='Liga Broadcast', descripcion='Campeonato sintético para notificaciones masivas',
+        fecha_inicio=date.today(), fecha_fin=date.today() + timedelta(days=180),
+        estado='planificacion', creado_por=admin.id_usuario, partidos_generados=False,
+    )
+    db.session.add(campeonato)
+    db.session.commit()
+    return campeonato.id_campeonato
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark de notificaciones masivas')
+    parser.add_argument('--database-url', help='URL de la BD (por defecto SQLite temporal)')
+    parser.add_argument('--destinatarios', type=int, default=10000)
+    parser.add_argument('--chunks', default='1000', help='Tamaños de bloque del INSERT a comparar')
+    parser.add_argument('--repeticiones', type=int, default=3)
+    parser.add_argument('--email', action='store_true', help='Encolar también los emails (envío suprimido)')
+    parser.add_argument('--output', help='Archivo JSON de salida')
+    args = parser.parse_args(argv)
+
+    # Flask-Mail lee el remitente al iniciar; el envío queda suprimido (TESTING)
+    os.environ.setdefault('MAIL_DEFAULT_SENDER', 'benchmark@localhost')
+    app = build_app(args.database_url, MAIL_SUPPRESS_SEND=True)
+    from app.extensions import db
+    from app.models import Notificacion
+    from app.utils.email_queue import EmailQueue
+
+    with app.app_context():
+        inicio = time.perf_counter()
+        id_campeonato = sembrar_audiencia(db, args.destinatarios)
+        print(f'🌱 {args.destinatarios} líderes sembrados en {time.perf_counter() - inicio:.1f}s')
+        dialecto = db.engine.dialect.name
+
+    client = app.test_client()
+    login = client.post('/api/auth/login', json={'email': ADMIN_EMAIL, 'contrasena': ADMIN_PASSWORD})
+    auth = {'Authorization': f"Bearer {login.get_json()['access_token']}"}
+
+    resultados = {}
+    for chunk in [int(c) for c in args.chunks.split(',') if c.strip()]:
+        app.config['BROADCAST_CHUNK_SIZE'] = chunk
+        tiempos, emails_s = [], []
+        for n in range(args.repeticiones):
+            inicio = time.perf_counter()
+            response = client.post('/api/notificaciones/broadcast', headers=auth, json={
+                'id_campeonato': id_campeonato,
+                'titulo': f'Fixture publicado ({n})',
+                'mensaje': 'Ya puedes ver los partidos de la primera jornada',
+                'enviar_email': args.email,
+            })
+            tiempos.append((time.perf_counter() - inicio) * 1000)
+            if response.status_code != 201:
+                raise SystemExit(f'❌ {response.status_code} {response.get_json()}')
+            if args.email:
+                EmailQueue.wait(timeout=300)
+                emails_s.append(time.perf_counter() - inicio)
+
+        resultados[str(chunk)] = {
+            'destinatarios': response.get_json()['destinatarios'],
+            'ms': [round(t, 1) for t in tiempos],
+            'mejor_ms': round(min(tiempos), 1),
+            'filas_por_s': round(args.destinatarios / (min(tiempos) / 1000)),
+        }
+        if emails_s:
+            resultados[str(chunk)]['emails_hasta_vaciar_cola_s'] = round(min(emails_s), 2)
+        print(f"📣 chunk={chunk:5d}  mejor={min(tiempos):8.1f}ms  "
+              f"{resultados[str(chunk)]['filas_por_s']:8d} notificaciones/s"
+              + (f"  cola de emails vacía en {min(emails_s):.1f}s" if emails_s else ''))
+
+    with app.app_context():
+        total = db.session.execute(select(db.func.count()).select_from(Notificacion)).scalar()
+        reparados = Notificacion.recalcular_no_leidas()
+    print(f'🔔 {total} notificaciones creadas; contadores de no leídas correctos: {"✅" if not reparados else "❌"}')
+
+    data = {
+        'meta': metadata(benchmark='broadcast', dialecto=dialecto, destinatarios=args.destinatarios,
+                         repeticiones=args.repeticiones, email=args.email),
+        'resultados': resultados,
+        'email_queue': EmailQueue.status(),
+    }
+    path = write_results('broadcast', data, args.output)
+    print(f'💾 Resultados guardados en {path}')
+    return data
+
+
+if __name__ == '__main__':
+    main()
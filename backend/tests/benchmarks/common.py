@@ -0,0 +1,152 @@
+"""
+Utilidades compartidas por los benchmarks
+
+- Construcción de la app contra SQLite (archivo) o MySQL local
+- Estadísticas de latencia (percentiles) y throughput
+- Escritura de resultados en JSON para comparar entre commits
+"""
+import json
+import os
+import platform
+import subprocess
+import tempfile
+import time
+from datetime import datetime
+
+from sqlalchemy import event
+
+from app import create_app
+from app.config import TestingConfig, config_by_name
+
+RESULTADOS_DIR = os.path.join(os.path.dirname(__file__), 'resultados')
+
+
+def default_database_url():
+    """SQLite en un archivo temporal (la BD en memoria no sirve con varios hilos)"""
+    fd, path = tempfile.mkstemp(prefix='bench_campeonato_', suffix='.db')
+    os.close(fd)
+    return f'sqlite:///{path}'
+
+
+def build_app(database_url=None, **overrides):
+    """
+    Crea la app con una configuración de benchmark
+
+    Args:
+        database_url: URL de la BD (SQLite temporal si no se pasa)
+        overrides: Valores de configuración adicionales
+
+    Returns:
+        Flask: App lista, con las tablas creadas
+    """
+    attrs = {
+        'SQLALCHEMY_DATABASE_URI': database_url or default_database_url(),
+        'QUERY_MONITOR_ENABLED': False,
+        'QUERY_MONITOR_LOG_FILE': None,
+        'DB_LEAK_DETECTOR_ENABLED': False,
+    }
+    attrs.update(overrides)
+    config_by_name['benchmark'] = type('BenchmarkConfig', (TestingConfig,), attrs)
+
+    app = create_app('benchmark')
+    # create_app fija estos valores a mano, se sobrescriben después
+    app.config['RATE_LIMIT_ENABLED'] = False
+    app.config['SEND_LOCKOUT_EMAIL'] = False
+
+    from app.extensions import db
+    with app.app_context():
+        for engine in db.engines.values():
+            if engine.dialect.name == 'sqlite':
+                _sqlite_mysql_functions(engine)
+        db.create_all()
+
+    return app
+
+
+def _sqlite_mysql_functions(engine):
+    """SQLite < 3.44 no tiene CONCAT(); se registra para imitar a MySQL"""
+
+    @event.listens_for(engine, 'connect')
+    def _register(dbapi_conn, connection_record):
+        dbapi_conn.create_function('concat', -1, lambda *args: ''.join('' if a is None else str(a) for a in args))
+
+    # Las conexiones ya abiertas no pasan por el evento
+    engine.dispose()
+
+
+def percentile(valores_ordenados, p):
+    """Percentil con interpolación lineal (valores ya ordenados)"""
+    if not valores_ordenados:
+        return None
+    k = (len(valores_ordenados) - 1) * p / 100
+    f = int(k)
+    c = min(f + 1, len(valores_ordenados) - 1)
+    return valores_ordenados[f] + (valores_ordenados[c] - valores_ordenados[f]) * (k - f)
+
+
+def summarize(latencias_ms, errores, duracion_s):
+    """
+    Resume las mediciones de un endpoint
+
+    Returns:
+        dict: Throughput, latencias (p50/p90/p95/p99) y errores
+    """
+    ordenadas = sorted(latencias_ms)
+    total = len(ordenadas)
+    return {
+        'peticiones': total,
+        'errores': errores,
+        'throughput_rps': round(total / duracion_s, 2) if duracion_s else None,
+        'latencia_ms': {
+            'media': round(sum(ordenadas) / total, 3) if total else None,
+            'p50': round(percentile(ordenadas, 50), 3) if total else None,
+            'p90': round(percentile(ordenadas, 90), 3) if total else None,
+            'p95': round(percentile(ordenadas, 95), 3) if total else None,
+            'p99': round(percentile(ordenadas, 99), 3) if total else None,
+            'max': round(ordenadas[-1], 3) if total else None,
+        }
+    }
+
+
+def git_commit():
+    """Commit actual (para comparar resultados entre versiones)"""
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            cwd=os.path.dirname(__file__), stderr=subprocess.DEVNULL
+        ).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'desconocido'
+
+
+def metadata(**extra):
+    meta = {
+        'fecha': datetime.utcnow().isoformat(),
+        'commit': git_commit(),
+        'python': platform.python_version(),
+        'plataforma': platform.platform(),
+    }
+    meta.update(extra)
+    return meta
+
+
+def write_results(nombre, data, output=None):
+    """
+    Guarda los resultados en JSON
+
+    Args:
+        nombre: Prefijo del archivo (ej: 'api')
+        data: Resultados
+        output: Ruta explícita (opcional)
+
+    Returns:
+        str: Ruta del archivo escrito
+    """
+    if not output:
+        os.makedirs(RESULTADOS_DIR, exist_ok=True)
+        stamp = time.strftime('%Y%m%d_%H%M%S')
+        output = os.path.join(RESULTADOS_DIR, f"{nombre}_{data['meta']['commit']}_{stamp}.json")
+
+    with open(output, 'w', encoding='utf-8') as fh:
+        json.dump(data, fh, indent=2, ensure_ascii=False)
+    return output
@@ -0,0 +1,86 @@
+"""
+Compara dos archivos de resultados de benchmark
+
+Uso (desde backend/):
+    python -m tests.benchmarks.compare resultados/api_abc123_....json resultados/api_def456_....json
+
+Muestra por endpoint p50, p95 y throughput de ambos y la variación porcentual.
+Con --umbral N termina con código 1 si algún p95 empeora más de N %.
+"""
+import argparse
+import json
+import sys
+
+
+def _cargar(path):
+    with open(path, encoding='utf-8') as fh:
+        return json.load(fh)
+
+
+def _delta(antes, despues):
+    if not antes or despues is None:
+        return None
+    return (despues - antes) / antes * 100
+
+
+def _fmt_delta(valor):
+    return '     -' if valor is None else f'{valor:+6.1f}%'
+
+
+def comparar(base, nuevo):
+    """
+    Returns:
+        list: Filas (endpoint, métricas base, métricas nuevas, deltas)
+    """
+    filas = []
+    for nombre in sorted(set(base['resultados']) | set(nuevo['resultados'])):
+        a = base['resultados'].get(nombre)
+        b = nuevo['resultados'].get(nombre)
+        if not a or not b:
+            filas.append({'endpoint': nombre, 'solo_en': 'base' if a else 'nuevo'})
+            continue
+        filas.append({
+            'endpoint': nombre,
+            'p50': (a['latencia_ms']['p50'], b['latencia_ms']['p50'],
+                    _delta(a['latencia_ms']['p50'], b['latencia_ms']['p50'])),
+            'p95': (a['latencia_ms']['p95'], b['latencia_ms']['p95'],
+                    _delta(a['latencia_ms']['p95'], b['latencia_ms']['p95'])),
+            'rps': (a['throughput_rps'], b['throughput_rps'],
+                    _delta(a['throughput_rps'], b['throughput_rps'])),
+            'errores': (a['errores'], b['errores']),
+        })
+    return filas
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Compara dos resultados de benchmark')
+    parser.add_argument('base')
+    parser.add_argument('nuevo')
+    parser.add_argument('--umbral', type=float, help='Regresión máxima permitida en p95 (%%)')
+    args = parser.parse_args(argv)
+
+    base, nuevo = _cargar(args.base), _cargar(args.nuevo)
+    print(f"📊 {base['meta'].get('commit')} → {nuevo['meta'].get('commit')}")
+    print(f"{'endpoint':22s} {'p50 base':>10s} {'p50 nuevo':>10s} {'Δ':>7s}  "
+          f"{'p95 base':>10s} {'p95 nuevo':>10s} {'Δ':>7s}  {'rps Δ':>7s}  errores")
+
+    regresiones = []
+    for fila in comparar(base, nuevo):
+        if 'solo_en' in fila:
+            print(f"{fila['endpoint']:22s} (solo en {fila['solo_en']})")
+            continue
+        p50, p95, rps = fila['p50'], fila['p95'], fila['rps']
+        print(f"{fila['endpoint']:22s} {p50[0]:10.2f} {p50[1]:10.2f} {_fmt_delta(p50[2])}  "
+              f"{p95[0]:10.2f} {p95[1]:10.2f} {_fmt_delta(p95[2])}  {_fmt_delta(rps[2])}  "
+              f"{fila['errores'][0]}→{fila['errores'][1]}")
+        if args.umbral is not None and p95[2] is not None and p95[2] > args.umbral:
+            regresiones.append(fila['endpoint'])
+
+    if regresiones:
+        print(f"⚠️ Regresión de p95 > {args.umbral}% en: {', '.join(regresiones)}")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,152 @@
+"""
+Benchmark de la importación masiva de jugadores
+
+Siembra N equipos aprobados sin jugadores y compara:
+- POST /api/jugadores/import con un CSV y con un array JSON de
+  --jugadores filas (repartidas entre los equipos)
+- POST /api/jugadores (una petición por jugador) con una muestra,
+  extrapolada al mismo total
+
+Uso (desde backend/):
+    python -m tests.benchmarks.import_benchmark
+    python -m tests.benchmarks.import_benchmark --jugadores 10000 --equipos 40 --chunks 250,1000,5000
+    python -m tests.benchmarks.import_benchmark --errores 0.05   # 5% de filas inválidas
+"""
+import argparse
+import csv
+import io
+import json
+import random
+import time
+
+from sqlalchemy import select
+
+from tests.benchmarks.common import build_app, metadata, write_results
+from tests.benchmarks.seed import seed_league
+
+
+def generar_filas(equipos, total, prefijo, errores, rng):
+    """Jugadores sintéticos; una fracción `errores` con documento repetido o dorsal inválido"""
+    filas = []
+    for i in range(total):
+        equipo = equipos[i % len(equipos)]
+        fila = {
+            'nombre_equipo': equipo,
+            'nombre': f'Jugador{i}',
+            'apellido': f'Import{i}',
+            'documento': f'{prefijo}{i:07d}',
+            'dorsal': i // len(equipos) + 1,
+            'posicion': rng.choice(('portero', 'defensa', 'mediocampista', 'delantero')),
+            'fecha_nacimiento': f'{rng.randint(1985, 2008)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}',
+        }
+        if errores and rng.random() < errores:
+            if i and rng.random() < 0.5:
+                fila['documento'] = filas[-1]['documento']
+            else:
+                fila['dorsal'] = 'x'
+        filas.append(fila)
+    return filas
+
+
+def como_csv(filas):
+    salida = io.StringIO()
+    escritor = csv.DictWriter(salida, fieldnames=list(filas[0].keys()))
+    escritor.writeheader()
+    escritor.writerows(filas)
+    return salida.getvalue().encode('utf-8')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark de la importación masiva de jugadores')
+    parser.add_argument('--database-url', help='URL de la BD (por defecto SQLite temporal)')
+    parser.add_argument('--equipos', type=int, default=40)
+    parser.add_argument('--jugadores', type=int, default=10000)
+    parser.add_argument('--chunks', default='1000', help='Tamaños de bloque a comparar')
+    parser.add_argument('--muestra', type=int, default=200, help='Jugadores creados uno a uno (POST /api/jugadores)')
+    parser.add_argument('--errores', type=float, default=0.0, help='Fracción de filas inválidas')
+    parser.add_argument('--semilla', type=int, default=42)
+    parser.add_argument('--output', help='Archivo JSON de salida')
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.semilla)
+    app = build_app(args.database_url)
+    from app.extensions import db
+    from app.models import Equipo, Jugador
+
+    with app.app_context():
+        liga = seed_league(db, equipos=args.equipos, jugadores=0, ida_vuelta=False, jugadas=0, semilla=args.semilla)
+        equipos = db.session.execute(select(Equipo.nombre).order_by(Equipo.id_equipo)).scalars().all()
+        dialecto = db.engine.dialect.name
+
+    client = app.test_client()
+    login = client.post('/api/auth/login', json={'email': liga['admin_email'], 'contrasena': liga['admin_password']})
+    auth = {'Authorization': f"Bearer {login.get_json()['access_token']}"}
+
+    def borrar_jugadores():
+        with app.app_context():
+            db.session.execute(db.delete(Jugador))
+            db.session.commit()
+
+    resultados = {}
+
+    # 1. Uno por uno (muestra), extrapolado
+    filas = generar_filas(equipos, args.muestra, 'U', 0, rng)
+    inicio = time.perf_counter()
+    for fila in filas:
+        response = client.post('/api/jugadores', headers=auth, json=fila)
+        if response.status_code != 201:
+            raise SystemExit(f'❌ {response.status_code} {response.get_json()}')
+    duracion = time.perf_counter() - inicio
+    resultados['uno_por_uno'] = {
+        'muestra': args.muestra,
+        'ms': round(duracion * 1000, 1),
+        'filas_por_s': round(args.muestra / duracion),
+        'estimado_total_s': round(duracion / args.muestra * args.jugadores, 1),
+    }
+    print(f"🐢 uno por uno: {resultados['uno_por_uno']['filas_por_s']} jugadores/s "
+          f"(~{resultados['uno_por_uno']['estimado_total_s']}s para {args.jugadores})")
+    borrar_jugadores()
+
+    # 2. Importación masiva: CSV y JSON por tamaño de bloque
+    for chunk in [int(c) for c in args.chunks.split(',') if c.strip()]:
+        app.config['JUGADORES_IMPORT_CHUNK_SIZE'] = chunk
+        for formato in ('csv', 'json'):
+            filas = generar_filas(equipos, args.jugadores, f'{formato[0].upper()}{chunk}-', args.errores, rng)
+            if formato == 'csv':
+                cuerpo, content_type = como_csv(filas), 'text/csv'
+            else:
+                cuerpo, content_type = json.dumps(filas).encode('utf-8'), 'application/json'
+
+            inicio = time.perf_counter()
+            response = client.post('/api/jugadores/import', headers={**auth, 'Content-Type': content_type}, data=cuerpo)
+            duracion = time.perf_counter() - inicio
+            if response.status_code != 201:
+                raise SystemExit(f'❌ {response.status_code} {response.get_json()}')
+            data = response.get_json()
+
+            clave = f'{formato}_{chunk}'
+            resultados[clave] = {
+                'filas': data['total'],
+                'insertados': data['insertados'],
+                'rechazados': data['rechazados'],
+                'bytes': len(cuerpo),
+                'ms': round(duracion * 1000, 1),
+                'filas_por_s': round(data['total'] / duracion),
+            }
+            print(f"📥 {formato:4s} chunk={chunk:5d}  {duracion * 1000:8.1f}ms  "
+                  f"{resultados[clave]['filas_por_s']:7d} filas/s  "
+                  f"insertados={data['insertados']} rechazados={data['rechazados']}")
+            borrar_jugadores()
+
+    data = {
+        'meta': metadata(benchmark='import_jugadores', dialecto=dialecto, equipos=args.equipos,
+                         jugadores=args.jugadores, errores=args.errores),
+        'resultados': resultados,
+    }
+    path = write_results('import_jugadores', data, args.output)
+    print(f'💾 Resultados guardados en {path}')
+    return data
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,205 @@
+"""
+Microbenchmark de las respuestas JSON grandes
+
+Compara, para listas grandes armadas como en las rutas:
+- anterior: isoformat()/.value por fila (lo que hacía cada to_dict) +
+  DefaultJSONProvider de Flask (json de la stdlib, claves ordenadas,
+  ensure_ascii)
+- stdlib: to_dict sin isoformat + FastJSONProvider sin orjson
+- orjson: to_dict sin isoformat + FastJSONProvider con orjson
+
+Casos:
+- partidos: GET /api/partido con --partidos partidos (Partido.to_dict)
+- goles: goles con TipoGol y fecha de registro (Gol.to_dict)
+- posiciones: tabla de posiciones de --equipos equipos
+
+Antes de medir verifica que las tres variantes producen el mismo JSON
+(mismo contenido una vez parseado).
+
+Uso (desde backend/):
+    python -m tests.benchmarks.json_benchmark
+    python -m tests.benchmarks.json_benchmark --partidos 5000 --equipos 500 --repeticiones 5
+"""
+import argparse
+import enum
+import json
+import random
+import time
+from datetime import date, datetime, timedelta
+
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+
+from app.enums.gol_enum import TipoGol
+from app.utils import json_provider
+from app.utils.json_provider import FastJSONProvider
+from tests.benchmarks.common import metadata, write_results
+
+ESTADOS = ('programado', 'en_juego', 'finalizado', 'cancelado')
+
+
+def como_antes(filas):
+    """Lo que hacían los to_dict: fechas a isoformat() y Enums a .value"""
+    return [{
+        clave: valor.isoformat() if isinstance(valor, date) else valor.value if isinstance(valor, enum.Enum) else valor
+        for clave, valor in fila.items()
+    } for fila in filas]
+
+
+def partidos(total, rng):
+    """Diccionarios con las mismas claves y tipos que Partido.to_dict"""
+    inicio = datetime(2026, 1, 10, 15, 0)
+    filas = []
+    for i in range(total):
+        fecha = inicio + timedelta(days=i // 10, hours=rng.randint(0, 5))
+        creado = datetime(2025, 12, 1, 9, 30, 12, rng.randint(0, 999999))
+        filas.append({
+            'id_partido': i + 1,
+            'id_campeonato': 1,
+            'campeonato': 'Liga Pro Ñandú',
+            'id_equipo_local': i % 20 + 1,
+            'equipo_local': f'Equipo Local {i % 20}',
+            'id_equipo_visitante': (i + 7) % 20 + 1,
+            'equipo_visitante': f'Club Atlético {(i + 7) % 20}',
+            'fecha_partido': fecha,
+            'lugar': f'Estadio {i % 15}',
+            'jornada': i // 10 + 1,
+            'goles_local': rng.randint(0, 4),
+            'goles_visitante': rng.randint(0, 4),
+            'estado': rng.choice(ESTADOS),
+            'observaciones': None,
+            'fecha_creacion': creado,
+            'total_goles': rng.randint(0, 8),
+            'total_tarjetas': rng.randint(0, 6),
+            'amarillas': rng.randint(0, 5),
+            'rojas': rng.randint(0, 1),
+        })
+    return filas
+
+
+def goles(total, rng):
+    """Diccionarios con las mismas claves y tipos que Gol.to_dict"""
+    tipos = list(TipoGol)
+    filas = []
+    for i in range(total):
+        tipo = rng.choice(tipos)
+        registro = datetime(2026, 3, 1, 16, 0) + timedelta(minutes=i)
+        filas.append({
+            'id_gol': i + 1,
+            'id_partido': i // 3 + 1,
+            'id_jugador': rng.randint(1, 500),
+            'jugador': f'Jugador {i % 500}',
+            'minuto': rng.randint(1, 90),
+            'tipo': tipo,
+            'fecha_registro': registro,
+        })
+    return filas
+
+
+def posiciones(total, rng):
+    """Filas de la tabla de posiciones (sin fechas: mide solo la serialización)"""
+    tabla = []
+    for i in range(total):
+        ganados, empatados, perdidos = rng.randint(0, 20), rng.randint(0, 10), rng.randint(0, 20)
+        favor, contra = rng.randint(0, 60), rng.randint(0, 60)
+        tabla.append({
+            'id_equipo': i + 1,
+            'equipo': f'Equipo {i}',
+            'logo_url': f'/api/equipos/logos/{i:064x}_64.png',
+            'partidos_jugados': ganados + empatados + perdidos,
+            'ganados': ganados,
+            'empatados': empatados,
+            'perdidos': perdidos,
+            'goles_favor': favor,
+            'goles_contra': contra,
+            'diferencia_goles': favor - contra,
+            'puntos': ganados * 3 + empatados,
+            'posicion': i + 1,
+        })
+    return tabla
+
+
+def medir(funcion, repeticiones):
+    """Mejor tiempo (s) de `repeticiones` ejecuciones"""
+    mejor = None
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        duracion = time.perf_counter() - inicio
+        mejor = duracion if mejor is None else min(mejor, duracion)
+    return mejor
+
+
+def _respuesta(app, provider, clave, filas, convertir=False):
+    with app.app_context():
+        return provider.response({clave: como_antes(filas) if convertir else filas}).get_data()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Microbenchmark de las respuestas JSON grandes')
+    parser.add_argument('--partidos', type=int, default=5000)
+    parser.add_argument('--equipos', type=int, default=500)
+    parser.add_argument('--repeticiones', type=int, default=5)
+    parser.add_argument('--semilla', type=int, default=42)
+    parser.add_argument('--output', help='Archivo JSON de salida')
+    args = parser.parse_args(argv)
+
+    if json_provider.orjson is None:
+        print('⚠️ orjson no está instalado: solo se mide la variante stdlib')
+    orjson = json_provider.orjson
+
+    app = Flask(__name__)
+    anterior = DefaultJSONProvider(app)
+    actual = FastJSONProvider(app)
+
+    rng = random.Random(args.semilla)
+    casos = {
+        'partidos': ('partidos', partidos(args.partidos, rng)),
+        'goles': ('goles', goles(args.partidos, rng)),
+        'posiciones': ('tabla_posiciones', posiciones(args.equipos, rng)),
+    }
+
+    resultados = {}
+    try:
+        for nombre, (clave, filas) in casos.items():
+            variantes = {
+                'anterior': lambda: _respuesta(app, anterior, clave, filas, convertir=True),
+                'stdlib': lambda: _respuesta(app, actual, clave, filas),
+            }
+            if orjson is not None:
+                variantes['orjson'] = variantes['stdlib']
+
+            resultado = {}
+            esperado = None
+            for variante, funcion in variantes.items():
+                json_provider.orjson = None if variante == 'stdlib' else orjson
+                cuerpo = funcion()
+                # 1. Mismo contenido
+                if esperado is None:
+                    esperado = json.loads(cuerpo)
+                elif json.loads(cuerpo) != esperado:
+                    raise SystemExit(f'❌ {nombre}: la variante {variante} produce otro JSON')
+                # 2. Tiempo y tamaño
+                segundos = medir(funcion, args.repeticiones)
+                resultado[variante] = {'ms': round(segundos * 1000, 3), 'bytes': len(cuerpo)}
+            for variante in resultado:
+                resultado[variante]['speedup'] = round(resultado['anterior']['ms'] / resultado[variante]['ms'], 2)
+            resultados[nombre] = resultado
+            print(f'📦 {nombre:10s} ' + '  '.join(
+                f"{v} {r['ms']:8.2f}ms ({r['bytes'] // 1024} KB) x{r['speedup']}" for v, r in resultado.items()
+            ))
+    finally:
+        json_provider.orjson = orjson
+
+    data = {
+        'meta': metadata(benchmark='json', partidos=args.partidos, equipos=args.equipos,
+                         repeticiones=args.repeticiones, orjson=orjson is not None),
+        'resultados': resultados,
+    }
+    path = write_results('json', data, args.output)
+    print(f'💾 Resultados guardados en {path}')
+    return data
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,154 @@
+"""
+Benchmark de los listados públicos de solo lectura (~10.000 filas)
+
+Compara, para GET /api/partido y GET /api/jugadores sin filtros:
+- anterior: Query ORM .all() + to_dict() por objeto (identity map,
+  seguimiento de cambios y lazy loads de campeonato/equipos)
+- columnas: SELECT de solo las columnas del serializer + .all()
+- solo_lectura: lo mismo con ReadOnlyQuery (yield_per y sin autoflush),
+  como quedan las rutas
+
+Mide por variante: mejor tiempo, consultas ejecutadas y memoria
+(tracemalloc: pico y bloques vivos al terminar, en una corrida aparte
+porque tracemalloc hace más lento todo). Cada corrida usa una sesión
+nueva, como una petición. Antes de medir verifica que las tres
+variantes devuelven lo mismo.
+
+Uso (desde backend/):
+    python -m tests.benchmarks.listing_benchmark
+    python -m tests.benchmarks.listing_benchmark --equipos 101 --jugadores 100 --repeticiones 5
+"""
+import argparse
+import time
+import tracemalloc
+
+from sqlalchemy import event
+
+from tests.benchmarks.common import build_app, metadata, write_results
+from tests.benchmarks.seed import seed_league
+
+
+def medir(funcion, repeticiones):
+    """Mejor tiempo (s) de `repeticiones` ejecuciones"""
+    mejor = None
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        duracion = time.perf_counter() - inicio
+        mejor = duracion if mejor is None else min(mejor, duracion)
+    return mejor
+
+
+def memoria(funcion):
+    """(pico KB, KB retenidos por el resultado) de una ejecución"""
+    tracemalloc.start()
+    try:
+        resultado = funcion()
+        retenido, pico = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del resultado
+    return round(pico / 1024, 1), round(retenido / 1024, 1)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark de los listados de solo lectura')
+    parser.add_argument('--database-url', help='URL de la BD (por defecto SQLite temporal)')
+    parser.add_argument('--equipos', type=int, default=101, help='Con ida y vuelta: equipos * (equipos - 1) partidos')
+    parser.add_argument('--jugadores', type=int, default=100, help='Jugadores por equipo')
+    parser.add_argument('--repeticiones', type=int, default=5)
+    parser.add_argument('--yield-per', type=int, default=1000)
+    parser.add_argument('--semilla', type=int, default=42)
+    parser.add_argument('--output', help='Archivo JSON de salida')
+    args = parser.parse_args(argv)
+
+    app = build_app(args.database_url, READ_ONLY_YIELD_PER=args.yield_per)
+    from app.extensions import db
+    from app.models.jugador import Jugador
+    from app.routes.partido_routes import query_partidos
+    from app.serializers import jugador_serializer, partido_serializer
+    from app.models.partido import Partido
+    from app.utils.read_only import ReadOnlyQuery
+
+    with app.app_context():
+        print(f'🌱 Sembrando {args.equipos} equipos x {args.jugadores} jugadores (ida y vuelta)...')
+        seed_league(db, equipos=args.equipos, jugadores=args.jugadores, ida_vuelta=True, jugadas=0.2,
+                    semilla=args.semilla)
+
+        consultas = {'total': 0}
+
+        @event.listens_for(db.engine, 'before_cursor_execute')
+        def _contar(*_):
+            consultas['total'] += 1
+
+        def por_peticion(funcion):
+            """Sesión nueva por ejecución, como en una petición"""
+            def ejecutar():
+                try:
+                    return funcion()
+                finally:
+                    db.session.remove()
+            return ejecutar
+
+        casos = {
+            'partidos': {
+                'anterior': lambda: [p.to_dict() for p in Partido.query.order_by(Partido.fecha_partido.desc()).all()],
+                'columnas': lambda: partido_serializer.dump_all(db.session.execute(query_partidos()).all()),
+                'solo_lectura': lambda: ReadOnlyQuery.dump_all(partido_serializer, query_partidos()),
+            },
+            'jugadores': {
+                'anterior': lambda: [j.to_dict() for j in Jugador.query.order_by(Jugador.apellido, Jugador.nombre).all()],
+                'columnas': lambda: jugador_serializer.dump_all(db.session.execute(
+                    jugador_serializer.select().order_by(Jugador.apellido, Jugador.nombre)
+                ).all()),
+                'solo_lectura': lambda: ReadOnlyQuery.dump_all(
+                    jugador_serializer, jugador_serializer.select().order_by(Jugador.apellido, Jugador.nombre)
+                ),
+            },
+        }
+
+        resultados = {}
+        for nombre, variantes in casos.items():
+            resultado = {}
+            esperado = None
+            for variante, funcion in variantes.items():
+                funcion = por_peticion(funcion)
+                # 1. Mismo resultado (como conjunto: el orden entre empates puede variar)
+                consultas['total'] = 0
+                filas = funcion()
+                ejecutadas = consultas['total']
+                claves = sorted(tuple(sorted((k, str(v)) for k, v in fila.items())) for fila in filas)
+                if esperado is None:
+                    esperado = claves
+                elif claves != esperado:
+                    raise SystemExit(f'❌ {nombre}: la variante {variante} devuelve otras filas')
+
+                # 2. Tiempo y memoria
+                segundos = medir(funcion, args.repeticiones)
+                pico_kb, retenido_kb = memoria(funcion)
+                resultado[variante] = {
+                    'filas': len(filas),
+                    'ms': round(segundos * 1000, 2),
+                    'consultas': ejecutadas,
+                    'pico_kb': pico_kb,
+                    'retenido_kb': retenido_kb,
+                }
+            for variante in resultado:
+                resultado[variante]['speedup'] = round(resultado['anterior']['ms'] / resultado[variante]['ms'], 2)
+            resultados[nombre] = resultado
+            for variante, r in resultado.items():
+                print(f"📋 {nombre:10s} {variante:13s} {r['filas']:6d} filas {r['ms']:9.2f}ms "
+                      f"x{r['speedup']:<5} {r['consultas']:5d} consultas  pico {r['pico_kb']:9.1f} KB")
+
+    data = {
+        'meta': metadata(benchmark='listing', equipos=args.equipos, jugadores=args.jugadores,
+                         repeticiones=args.repeticiones, yield_per=args.yield_per),
+        'resultados': resultados,
+    }
+    path = write_results('listing', data, args.output)
+    print(f'💾 Resultados guardados en {path}')
+    return data
+
+
+if __name__ == '__main__':
+    main()
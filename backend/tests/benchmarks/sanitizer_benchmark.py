@@ -0,0 +1,224 @@
+"""
+Microbenchmark de InputSanitizer
+
+Compara la implementación anterior (regex compiladas en cada llamada y
+reglas interpretadas campo por campo, copiada aquí como referencia) con la
+actual (tablas de translate, camino rápido para texto sin caracteres de
+control y reglas compiladas) sobre:
+- cuerpos de registro (POST /api/auth/register)
+- filas de una importación masiva de jugadores (sanitize_dict por fila)
+- strings sueltos: ASCII, con tildes, con HTML y caracteres de control
+
+Antes de medir verifica que ambas producen exactamente el mismo resultado
+(payloads y una batería de strings aleatorios).
+
+Uso (desde backend/):
+    python -m tests.benchmarks.sanitizer_benchmark
+    python -m tests.benchmarks.sanitizer_benchmark --filas 10000 --repeticiones 5
+"""
+import argparse
+import html
+import random
+import re
+import time
+
+from app.utils.sanitizer import InputSanitizer
+from tests.benchmarks.common import metadata, write_results
+
+REGLAS_REGISTRO = {'nombre': 100, 'email': 'email'}
+REGLAS_IMPORTACION = {'nombre': 100, 'apellido': 100, 'documento': 20, 'dorsal': 'int', 'nombre_equipo': 100}
+
+NOMBRES = ('Lionel', 'José', 'María', 'Ángel', 'Cristian', 'Iñaki', 'Juan Pablo', 'Luis', 'Müller', 'Pedro')
+APELLIDOS = ('Pérez', 'Gómez', 'Rodríguez', 'Smith', 'Muñoz', 'Vera', 'Castillo', 'Ñañez', 'Torres', 'Ruiz')
+
+
+class LegacySanitizer:
+    """Implementación anterior, solo como referencia de resultados y tiempos"""
+
+    @staticmethod
+    def sanitize_string(text, max_length=None):
+        if not text or not isinstance(text, str):
+            return text
+        text = html.escape(text)
+        text = re.sub(r'[\x00-\x1F\x7F-\x9F]', '', text)
+        text = re.sub(r'\s+', ' ', text).strip()
+        if max_length and len(text) > max_length:
+            text = text[:max_length]
+        return text
+
+    @staticmethod
+    def sanitize_email(email):
+        if not email:
+            return email
+        email = email.lower().strip()
+        email = re.sub(r'[<>"\'\\/]', '', email)
+        return email
+
+    @staticmethod
+    def sanitize_dict(data, rules=None):
+        if not data or not isinstance(data, dict):
+            return data
+        sanitized = {}
+        for key, value in data.items():
+            if rules and key in rules:
+                rule = rules[key]
+                if rule == 'email':
+                    sanitized[key] = LegacySanitizer.sanitize_email(value)
+                elif isinstance(rule, int):
+                    sanitized[key] = LegacySanitizer.sanitize_string(value, max_length=rule)
+                elif rule == 'int':
+                    try:
+                        sanitized[key] = int(value)
+                    except Exception:
+                        sanitized[key] = None
+                elif rule == 'float':
+                    try:
+                        sanitized[key] = float(value)
+                    except Exception:
+                        sanitized[key] = None
+                elif rule == 'bool':
+                    sanitized[key] = bool(value)
+                else:
+                    sanitized[key] = LegacySanitizer.sanitize_string(value)
+            elif isinstance(value, str):
+                sanitized[key] = LegacySanitizer.sanitize_string(value)
+            else:
+                sanitized[key] = value
+        return sanitized
+
+
+def payloads_registro(total, rng):
+    return [{
+        'nombre': f'{rng.choice(NOMBRES)} {rng.choice(APELLIDOS)}',
+        'email': f'Usuario{i}@Ejemplo.com ',
+        'contrasena': f'Clave{i}!Segura',
+        'rol': 'lider' if i % 5 == 0 else 'espectador',
+    } for i in range(total)]
+
+
+def filas_importacion(total, rng):
+    filas = []
+    for i in range(total):
+        fila = {
+            'nombre_equipo': f'Equipo {i % 40}',
+            'nombre': rng.choice(NOMBRES),
+            'apellido': rng.choice(APELLIDOS),
+            'documento': f'{1000000000 + i}',
+            'dorsal': str(i % 30 + 1),
+            'posicion': rng.choice(('portero', 'defensa', 'mediocampista', 'delantero')),
+            'fecha_nacimiento': f'{rng.randint(1985, 2008)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}',
+        }
+        # Una fracción con espacios de sobra, HTML o caracteres de control (copiado de Excel)
+        azar = rng.random()
+        if azar < 0.05:
+            fila['nombre'] = f"  {fila['nombre']}   de  la\tCruz "
+        elif azar < 0.07:
+            fila['apellido'] = f"<b>{fila['apellido']}</b> & Cía"
+        elif azar < 0.09:
+            fila['documento'] = f"{fila['documento']}\r\n"
+        filas.append(fila)
+    return filas
+
+
+def strings_aleatorios(total, rng):
+    alfabeto = 'abcXYZ 019&<>"\'\t\n\r\x00\x1f\x7f\x85\x9f\xa0áéñÑ 　​€'
+    return [''.join(rng.choice(alfabeto) for _ in range(rng.randint(0, 40))) for _ in range(total)]
+
+
+def medir(funcion, repeticiones):
+    """Mejor tiempo (s) de `repeticiones` ejecuciones"""
+    mejor = None
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        duracion = time.perf_counter() - inicio
+        mejor = duracion if mejor is None else min(mejor, duracion)
+    return mejor
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Microbenchmark de InputSanitizer')
+    parser.add_argument('--filas', type=int, default=10000, help='Filas de importación y cuerpos de registro')
+    parser.add_argument('--repeticiones', type=int, default=5)
+    parser.add_argument('--semilla', type=int, default=42)
+    parser.add_argument('--output', help='Archivo JSON de salida')
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.semilla)
+    registros = payloads_registro(args.filas, rng)
+    filas = filas_importacion(args.filas, rng)
+    aleatorios = strings_aleatorios(args.filas, rng)
+    ascii_ = [f['documento'].strip() for f in filas]
+    tildes = [f"{f['nombre']} {f['apellido']}" for f in filas if not f['apellido'].isascii()]
+
+    # 1. Mismos resultados
+    for texto in aleatorios + ascii_ + tildes:
+        for largo in (None, 10):
+            esperado = LegacySanitizer.sanitize_string(texto, largo)
+            obtenido = InputSanitizer.sanitize_string(texto, largo)
+            if esperado != obtenido:
+                raise SystemExit(f'❌ Resultado distinto para {texto!r}: {esperado!r} != {obtenido!r}')
+    for texto in aleatorios:
+        if LegacySanitizer.sanitize_email(texto) != InputSanitizer.sanitize_email(texto):
+            raise SystemExit(f'❌ Email distinto para {texto!r}')
+    for datos, reglas in [(r, REGLAS_REGISTRO) for r in registros] + [(f, REGLAS_IMPORTACION) for f in filas]:
+        if LegacySanitizer.sanitize_dict(datos, reglas) != InputSanitizer.sanitize_dict(datos, reglas):
+            raise SystemExit(f'❌ Diccionario distinto para {datos!r}')
+    print(f'✅ Resultados idénticos ({len(aleatorios) + len(ascii_) + len(tildes)} strings, '
+          f'{len(registros) + len(filas)} diccionarios)')
+
+    # 2. Tiempos
+    registro_compilado = InputSanitizer.compile_rules(REGLAS_REGISTRO)
+    importacion_compilada = InputSanitizer.compile_rules(REGLAS_IMPORTACION)
+    casos = {
+        'registro': (
+            lambda: [LegacySanitizer.sanitize_dict(r, REGLAS_REGISTRO) for r in registros],
+            lambda: [InputSanitizer.sanitize_dict(r, compiled=registro_compilado) for r in registros],
+            len(registros),
+        ),
+        'importacion': (
+            lambda: [LegacySanitizer.sanitize_dict(f, REGLAS_IMPORTACION) for f in filas],
+            lambda: [InputSanitizer.sanitize_dict(f, compiled=importacion_compilada) for f in filas],
+            len(filas),
+        ),
+        'string_ascii': (
+            lambda: [LegacySanitizer.sanitize_string(t, 20) for t in ascii_],
+            lambda: [InputSanitizer.sanitize_string(t, 20) for t in ascii_],
+            len(ascii_),
+        ),
+        'string_tildes': (
+            lambda: [LegacySanitizer.sanitize_string(t, 100) for t in tildes],
+            lambda: [InputSanitizer.sanitize_string(t, 100) for t in tildes],
+            len(tildes),
+        ),
+        'string_control': (
+            lambda: [LegacySanitizer.sanitize_string(t) for t in aleatorios],
+            lambda: [InputSanitizer.sanitize_string(t) for t in aleatorios],
+            len(aleatorios),
+        ),
+    }
+
+    resultados = {}
+    for nombre, (anterior, actual, operaciones) in casos.items():
+        t_anterior = medir(anterior, args.repeticiones)
+        t_actual = medir(actual, args.repeticiones)
+        resultados[nombre] = {
+            'operaciones': operaciones,
+            'anterior_us': round(t_anterior / operaciones * 1e6, 3),
+            'actual_us': round(t_actual / operaciones * 1e6, 3),
+            'speedup': round(t_anterior / t_actual, 2),
+        }
+        print(f"🧼 {nombre:15s} anterior {resultados[nombre]['anterior_us']:7.2f}µs  "
+              f"actual {resultados[nombre]['actual_us']:7.2f}µs  x{resultados[nombre]['speedup']}")
+
+    data = {
+        'meta': metadata(benchmark='sanitizer', filas=args.filas, repeticiones=args.repeticiones),
+        'resultados': resultados,
+    }
+    path = write_results('sanitizer', data, args.output)
+    print(f'💾 Resultados guardados en {path}')
+    return data
+
+
+if __name__ == '__main__':
+    main()
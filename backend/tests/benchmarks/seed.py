@@ -0,0 +1,295 @@
+"""
+Generador de un campeonato sintético para benchmarks
+
+Crea en la BD configurada:
+- 1 administrador + 1 líder por equipo
+- N equipos aprobados con M jugadores cada uno
+- Calendario todos contra todos (ida y vuelta opcional)
+- Goles y tarjetas con distribuciones realistas en las jornadas jugadas
+
+Uso:
+    from tests.benchmarks.seed import seed_league
+    info = seed_league(db, equipos=16, jugadores=20)
+"""
+import math
+import random
+from datetime import date, datetime, timedelta
+
+import bcrypt
+from sqlalchemy import insert, select
+
+from app.enums.gol_enum import TipoGol
+from app.models import Campeonato, Equipo, Gol, Jugador, Partido, SancionJugador, Tarjeta, Usuario
+
+ADMIN_EMAIL = 'admin.bench@gmail.com'
+ADMIN_PASSWORD = 'Benchmark123'
+
+POSICIONES = ['portero', 'defensa', 'mediocampista', 'delantero']
+
+# Probabilidad de anotar según la posición
+PESO_GOL = {'portero': 0.2, 'defensa': 1, 'mediocampista': 3, 'delantero': 6}
+
+TIPOS_GOL = [
+    (TipoGol.NORMAL, 0.80),
+    (TipoGol.PENAL, 0.10),
+    (TipoGol.TIRO_LIBRE, 0.07),
+    (TipoGol.AUTOGOL, 0.03),
+]
+
+CHUNK = 1000
+
+
+def _poisson(rng, lam):
+    """Muestra de una distribución de Poisson (algoritmo de Knuth)"""
+    limite = math.exp(-lam)
+    k, p = 0, 1.0
+    while True:
+        p *= rng.random()
+        if p <= limite:
+            return k
+        k += 1
+
+
+def _minuto(rng):
+    """Minuto de juego, con algo de tiempo añadido"""
+    if rng.random() < 0.05:
+        return rng.randint(91, 95)
+    return rng.randint(1, 90)
+
+
+def _tipo_gol(rng):
+    r = rng.random()
+    acumulado = 0
+    for tipo, prob in TIPOS_GOL:
+        acumulado += prob
+        if r <= acumulado:
+            return tipo
+    return TipoGol.NORMAL
+
+
+def round_robin(ids_equipos):
+    """
+    Calendario todos contra todos (método del círculo)
+
+    Returns:
+        list: Jornadas, cada una lista de tuplas (local, visitante)
+    """
+    equipos = list(ids_equipos)
+    if len(equipos) % 2:
+        equipos.append(None)  # descanso
+
+    n = len(equipos)
+    jornadas = []
+    for ronda in range(n - 1):
+        partidos = []
+        for i in range(n // 2):
+            a, b = equipos[i], equipos[n - 1 - i]
+            if a is None or b is None:
+                continue
+            # Alternar localía para que no siempre juegue de local el mismo
+            partidos.append((a, b) if (ronda + i) % 2 == 0 else (b, a))
+        jornadas.append(partidos)
+        equipos = [equipos[0]] + [equipos[-1]] + equipos[1:-1]
+    return jornadas
+
+
+def _bulk_insert(db, model, rows):
+    for i in range(0, len(rows), CHUNK):
+        db.session.execute(insert(model), rows[i:i + CHUNK])
+
+
+def seed_league(db, equipos=16, jugadores=20, ida_vuelta=True, jugadas=0.75, semilla=42,
+                nombre_campeonato=None):
+    """
+    Siembra un campeonato sintético
+
+    Args:
+        db: Instancia de SQLAlchemy (dentro de un app_context)
+        equipos: Cantidad de equipos
+        jugadores: Jugadores por equipo
+        ida_vuelta: Genera también la segunda vuelta
+        jugadas: Fracción de jornadas ya finalizadas (con goles y tarjetas)
+        semilla: Semilla para resultados reproducibles
+        nombre_campeonato: Nombre del campeonato (se genera si no se pasa)
+
+    Returns:
+        dict: Resumen con ids útiles para los benchmarks
+    """
+    rng = random.Random(semilla)
+    ahora = datetime.utcnow()
+
+    # Un solo hash bcrypt para todos (hashear miles de contraseñas es lento)
+    password_hash = bcrypt.hashpw(ADMIN_PASSWORD.encode('utf-8'), bcrypt.gensalt(4)).decode('utf-8')
+
+    # 1. Usuarios
+    admin = Usuario.query.filter_by(email=ADMIN_EMAIL).first()
+    if not admin:
+        admin = Usuario(
+            nombre='Admin Benchmark', email=ADMIN_EMAIL, rol='admin',
+            activo=True, email_verified=True, contrasena=password_hash
+        )
+        db.session.add(admin)
+        db.session.flush()
+
+    sufijo = rng.randrange(10 ** 6)
+    _bulk_insert(db, Usuario, [{
+        'nombre': f'Lider {sufijo}-{i}',
+        'email': f'lider.{sufijo}.{i}@gmail.com',
+        'rol': 'lider',
+        'activo': True,
+        'email_verified': True,
+        'contrasena': password_hash,
+        'fecha_registro': ahora,
+        'fecha_actualizacion': ahora,
+    } for i in range(equipos)])
+    lideres = db.session.execute(
+        select(Usuario.id_usuario).where(Usuario.email.like(f'lider.{sufijo}.%')).order_by(Usuario.id_usuario)
+    ).scalars().all()
+
+    # 2. Campeonato
+    inicio = date.today() - timedelta(days=180)
+    campeonato = Campeonato(
+        nombre=nombre_campeonato or f'Liga Benchmark {sufijo}',
+        descripcion='Campeonato sintético para benchmarks',
+        fecha_inicio=inicio,
+        fecha_fin=inicio + timedelta(days=365),
+        estado='en_curso',
+        creado_por=admin.id_usuario,
+        partidos_generados=True,
+        fecha_generacion_partidos=ahora,
+    )
+    db.session.add(campeonato)
+    db.session.flush()
+
+    # 3. Equipos
+    _bulk_insert(db, Equipo, [{
+        'nombre': f'Equipo {sufijo}-{i:03d}',
+        'id_lider': lideres[i],
+        'estado': 'aprobado',
+        'estadio': f'Estadio {i:03d}',
+        'fecha_registro': ahora,
+        'fecha_aprobacion': ahora,
+        'aprobado_por': admin.id_usuario,
+    } for i in range(equipos)])
+    ids_equipos = db.session.execute(
+        select(Equipo.id_equipo).where(Equipo.nombre.like(f'Equipo {sufijo}-%')).order_by(Equipo.id_equipo)
+    ).scalars().all()
+
+    # 4. Jugadores
+    filas = []
+    for idx, id_equipo in enumerate(ids_equipos):
+        for n in range(jugadores):
+            filas.append({
+                'id_equipo': id_equipo,
+                'nombre': f'J{sufijo}x{idx:03d}x{n:02d}',
+                'apellido': f'Apellido{idx:03d}{n:02d}',
+                'documento': f'{sufijo:06d}{idx:04d}{n:03d}',
+                'dorsal': n + 1,
+                'posicion': 'portero' if n == 0 else POSICIONES[1 + n % 3],
+                'activo': True,
+                'fecha_registro': ahora,
+            })
+    _bulk_insert(db, Jugador, filas)
+
+    plantillas = {}
+    for id_jugador, id_equipo, posicion in db.session.execute(
+        select(Jugador.id_jugador, Jugador.id_equipo, Jugador.posicion).where(Jugador.id_equipo.in_(ids_equipos))
+    ):
+        plantillas.setdefault(id_equipo, []).append((id_jugador, posicion))
+
+    # 5. Calendario
+    jornadas = round_robin(ids_equipos)
+    if ida_vuelta:
+        jornadas += [[(v, l) for l, v in partidos] for partidos in jornadas]
+
+    jornadas_jugadas = int(len(jornadas) * jugadas)
+    filas_partidos = []
+    for num, partidos in enumerate(jornadas, start=1):
+        fecha = datetime.combine(inicio + timedelta(days=7 * (num - 1)), datetime.min.time()) + timedelta(hours=15)
+        for local, visitante in partidos:
+            filas_partidos.append({
+                'id_campeonato': campeonato.id_campeonato,
+                'id_equipo_local': local,
+                'id_equipo_visitante': visitante,
+                'fecha_partido': fecha,
+                'lugar': f'Estadio local {local}',
+                'jornada': num,
+                'goles_local': 0,
+                'goles_visitante': 0,
+                'estado': 'finalizado' if num <= jornadas_jugadas else 'programado',
+                'fecha_creacion': ahora,
+            })
+    _bulk_insert(db, Partido, filas_partidos)
+
+    partidos = db.session.execute(
+        select(Partido.id_partido, Partido.id_equipo_local, Partido.id_equipo_visitante, Partido.estado)
+        .where(Partido.id_campeonato == campeonato.id_campeonato)
+        .order_by(Partido.id_partido)
+    ).all()
+
+    # 6. Goles y tarjetas de los partidos jugados
+    goles, tarjetas, marcadores = [], [], []
+    for id_partido, local, visitante, estado in partidos:
+        if estado != 'finalizado':
+            continue
+
+        marcador = {local: 0, visitante: 0}
+        contadores = {'total_goles': 0, 'total_tarjetas': 0, 'amarillas': 0, 'rojas': 0}
+        for equipo, rival, lam in ((local, visitante, 1.5), (visitante, local, 1.1)):
+            for _ in range(_poisson(rng, lam)):
+                tipo = _tipo_gol(rng)
+                # Un autogol lo marca un jugador del equipo rival
+                plantel = plantillas[rival] if tipo == TipoGol.AUTOGOL else plantillas[equipo]
+                pesos = [PESO_GOL[pos] for _, pos in plantel]
+                id_jugador = rng.choices(plantel, weights=pesos)[0][0]
+                goles.append({
+                    'id_partido': id_partido, 'id_jugador': id_jugador,
+                    'minuto': _minuto(rng), 'tipo': tipo, 'fecha_registro': ahora,
+                })
+                marcador[equipo] += 1
+                contadores['total_goles'] += 1
+
+        for tipo, lam in (('amarilla', 3.5), ('roja', 0.15)):
+            for _ in range(_poisson(rng, lam)):
+                equipo = rng.choice((local, visitante))
+                tarjetas.append({
+                    'id_partido': id_partido,
+                    'id_jugador': rng.choice(plantillas[equipo])[0],
+                    'tipo': tipo, 'minuto': _minuto(rng),
+                    'motivo': 'Falta', 'fecha_registro': ahora,
+                })
+                contadores['total_tarjetas'] += 1
+                contadores['amarillas' if tipo == 'amarilla' else 'rojas'] += 1
+
+        marcadores.append(dict(contadores, id_partido=id_partido, goles_local=marcador[local],
+                               goles_visitante=marcador[visitante]))
+
+    _bulk_insert(db, Gol, goles)
+    _bulk_insert(db, Tarjeta, tarjetas)
+
+    for marcador in marcadores:
+        db.session.execute(
+            Partido.__table__.update()
+            .where(Partido.id_partido == marcador['id_partido'])
+            .values(**{k: v for k, v in marcador.items() if k != 'id_partido'})
+        )
+
+    db.session.commit()
+    # Estado disciplinario de las tarjetas insertadas en bloque
+    SancionJugador.recalcular(campeonato.id_campeonato)
+
+    return {
+        'id_campeonato': campeonato.id_campeonato,
+        'admin_email': ADMIN_EMAIL,
+        'admin_password': ADMIN_PASSWORD,
+        'equipos': len(ids_equipos),
+        'jugadores': len(filas),
+        'partidos': len(partidos),
+        'jornadas': len(jornadas),
+        'goles': len(goles),
+        'tarjetas': len(tarjetas),
+        'partidos_programados': [p.id_partido for p in partidos if p.estado == 'programado'],
+        'partidos_finalizados': [p.id_partido for p in partidos if p.estado == 'finalizado'],
+        'plantillas': {id_equipo: [j for j, _ in jugadores_equipo] for id_equipo, jugadores_equipo in plantillas.items()},
+        'partidos_equipos': {p.id_partido: (p.id_equipo_local, p.id_equipo_visitante) for p in partidos},
+    }
@@ -0,0 +1,218 @@
+"""
+Microbenchmark de la validación de entradas
+
+Compara la validación a mano de las rutas (cadenas de `if not data.get(...)`
+más las conversiones int()/fromisoformat(), copiadas aquí como referencia)
+con los schemas de marshmallow de app/schemas, compilados una sola vez:
+- schema.load() contra las validaciones a mano, por payload
+- una petición completa a través de @validate_json contra
+  request.get_json() + validaciones a mano (sin BD ni JWT)
+
+Los payloads se miden válidos e inválidos: los manuales cortan en el primer
+error, los schemas los reportan todos.
+
+Uso (desde backend/):
+    python -m tests.benchmarks.validation_benchmark
+    python -m tests.benchmarks.validation_benchmark --payloads 20000 --repeticiones 5
+"""
+import argparse
+import random
+import time
+from datetime import datetime
+
+from flask import Flask, jsonify, request
+
+from app.middlewares.validation_middleware import validate_json
+from app.schemas import JugadorCreateSchema, PartidoCreateSchema
+from tests.benchmarks.common import metadata, write_results
+
+POSICIONES = ('portero', 'defensa', 'mediocampista', 'delantero')
+
+
+def partido_anterior(data):
+    """Validaciones de POST /api/partido antes de los schemas"""
+    if not data.get('id_campeonato'):
+        return {'error': 'El campeonato es obligatorio'}, 400
+    if not data.get('id_equipo_local'):
+        return {'error': 'El equipo local es obligatorio'}, 400
+    if not data.get('id_equipo_visitante'):
+        return {'error': 'El equipo visitante es obligatorio'}, 400
+    if not data.get('fecha_partido'):
+        return {'error': 'La fecha del partido es obligatoria'}, 400
+    if data['id_equipo_local'] == data['id_equipo_visitante']:
+        return {'error': 'Los equipos deben ser diferentes'}, 400
+    try:
+        fecha_partido = datetime.fromisoformat(data['fecha_partido'])
+    except ValueError:
+        return {'error': 'Formato de fecha inválido'}, 400
+    return {
+        'id_campeonato': data['id_campeonato'],
+        'id_equipo_local': data['id_equipo_local'],
+        'id_equipo_visitante': data['id_equipo_visitante'],
+        'fecha_partido': fecha_partido,
+        'lugar': data.get('lugar'),
+        'jornada': data.get('jornada', 1),
+    }, 200
+
+
+def jugador_anterior(data):
+    """Validaciones de POST /api/jugadores antes de los schemas"""
+    if not data.get('nombre_equipo'):
+        return {'error': 'El nombre del equipo es obligatorio'}, 400
+    if not data.get('nombre'):
+        return {'error': 'El nombre es obligatorio'}, 400
+    if not data.get('apellido'):
+        return {'error': 'El apellido es obligatorio'}, 400
+    if not data.get('documento'):
+        return {'error': 'El documento es obligatorio'}, 400
+    if not data.get('dorsal'):
+        return {'error': 'El dorsal es obligatorio'}, 400
+    try:
+        return {
+            'nombre_equipo': data['nombre_equipo'],
+            'nombre': data['nombre'],
+            'apellido': data['apellido'],
+            'documento': data['documento'],
+            'dorsal': int(data['dorsal']),
+            'posicion': data.get('posicion', 'delantero'),
+            'fecha_nacimiento': (datetime.fromisoformat(data['fecha_nacimiento']).date()
+                                 if data.get('fecha_nacimiento') else None),
+        }, 200
+    except ValueError:
+        return {'error': 'Formato de fecha inválido. Usa YYYY-MM-DD'}, 400
+
+
+def payloads_partido(total, rng, validos=True):
+    payloads = []
+    for i in range(total):
+        local = rng.randint(1, 20)
+        payload = {
+            'id_campeonato': 1,
+            'id_equipo_local': local,
+            'id_equipo_visitante': local % 20 + 1,
+            'fecha_partido': f'2026-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}T{rng.randint(10, 20)}:00:00',
+            'lugar': f'Estadio {i % 15}',
+            'jornada': i % 19 + 1,
+        }
+        if not validos:
+            payload.pop(rng.choice(('id_campeonato', 'fecha_partido')))
+        payloads.append(payload)
+    return payloads
+
+
+def payloads_jugador(total, rng, validos=True):
+    payloads = []
+    for i in range(total):
+        payload = {
+            'nombre_equipo': f'Equipo {i % 40}',
+            'nombre': rng.choice(('Lionel', 'José', 'María', 'Ángel', 'Luis')),
+            'apellido': rng.choice(('Pérez', 'Gómez', 'Smith', 'Muñoz', 'Vera')),
+            'documento': f'{1000000000 + i}',
+            'dorsal': str(i % 30 + 1),
+            'posicion': rng.choice(POSICIONES),
+            'fecha_nacimiento': f'{rng.randint(1985, 2008)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}',
+        }
+        if not validos:
+            payload['apellido'] = ''
+        payloads.append(payload)
+    return payloads
+
+
+def medir(funcion, repeticiones):
+    """Mejor tiempo (s) de `repeticiones` ejecuciones"""
+    mejor = None
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        duracion = time.perf_counter() - inicio
+        mejor = duracion if mejor is None else min(mejor, duracion)
+    return mejor
+
+
+def por_peticion(app, payloads, vista):
+    """Ejecuta `vista` dentro de un request context por payload (lo que ve la ruta)"""
+    def ejecutar():
+        for payload in payloads:
+            with app.test_request_context('/', method='POST', json=payload):
+                vista()
+    return ejecutar
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Microbenchmark de la validación de entradas')
+    parser.add_argument('--payloads', type=int, default=10000, help='Payloads por caso')
+    parser.add_argument('--repeticiones', type=int, default=5)
+    parser.add_argument('--semilla', type=int, default=42)
+    parser.add_argument('--output', help='Archivo JSON de salida')
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.semilla)
+    partido_schema = PartidoCreateSchema()
+    jugador_schema = JugadorCreateSchema()
+
+    def load(schema):
+        def validar(data):
+            try:
+                return schema.load(data)
+            except Exception as e:
+                return e
+        return validar
+
+    casos = {}
+    for nombre, anterior, schema, generador in (
+        ('partido', partido_anterior, partido_schema, payloads_partido),
+        ('jugador', jugador_anterior, jugador_schema, payloads_jugador),
+    ):
+        for validos in (True, False):
+            payloads = generador(args.payloads, rng, validos)
+            actual = load(schema)
+            casos[f"{nombre}_{'valido' if validos else 'invalido'}"] = (
+                lambda p=payloads, f=anterior: [f(d) for d in p],
+                lambda p=payloads, f=actual: [f(d) for d in p],
+                len(payloads),
+            )
+
+    # Petición completa: request.get_json() + validación + respuesta de error
+    app = Flask(__name__)
+
+    def vista_anterior():
+        resultado, status = partido_anterior(request.get_json())
+        return (jsonify(resultado), status) if status != 200 else resultado
+
+    @validate_json(PartidoCreateSchema)
+    def vista_actual(data):
+        return data
+
+    for validos in (True, False):
+        payloads = payloads_partido(args.payloads // 5, rng, validos)
+        casos[f"peticion_{'valido' if validos else 'invalido'}"] = (
+            por_peticion(app, payloads, vista_anterior),
+            por_peticion(app, payloads, vista_actual),
+            len(payloads),
+        )
+
+    resultados = {}
+    for nombre, (anterior, actual, operaciones) in casos.items():
+        t_anterior = medir(anterior, args.repeticiones)
+        t_actual = medir(actual, args.repeticiones)
+        resultados[nombre] = {
+            'operaciones': operaciones,
+            'anterior_us': round(t_anterior / operaciones * 1e6, 3),
+            'actual_us': round(t_actual / operaciones * 1e6, 3),
+            'sobrecosto_us': round((t_actual - t_anterior) / operaciones * 1e6, 3),
+        }
+        print(f"🧾 {nombre:18s} a mano {resultados[nombre]['anterior_us']:7.2f}µs  "
+              f"schema {resultados[nombre]['actual_us']:7.2f}µs  "
+              f"(+{resultados[nombre]['sobrecosto_us']:.2f}µs)")
+
+    data = {
+        'meta': metadata(benchmark='validation', payloads=args.payloads, repeticiones=args.repeticiones),
+        'resultados': resultados,
+    }
+    path = write_results('validation', data, args.output)
+    print(f'💾 Resultados guardados en {path}')
+    return data
+
+
+if __name__ == '__main__':
+    main()
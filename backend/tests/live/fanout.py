@@ -0,0 +1,240 @@
+"""
+Prueba de fan-out del feed en vivo (SSE)
+
+Abre muchas conexiones a /api/partido/<id>/live que quedan inactivas,
+publica eventos y mide cuánto tarda cada evento en llegar a todas ellas.
+También verifica los heartbeats y la reanudación con Last-Event-ID.
+
+Los eventos son cambios entre los dos primeros jugadores del equipo
+local: el partido debe estar en juego y el usuario ser admin.
+
+Uso (desde backend/, con el backend corriendo; para miles de conexiones
+usar el servidor de gevent):
+    python wsgi_gevent.py
+    python -m tests.live.fanout --id-partido 12 --conexiones 2000 --eventos 20
+"""
+import argparse
+import asyncio
+import json
+import time
+from urllib.parse import urlsplit
+
+from tests.benchmarks.common import metadata, summarize, write_results
+from tests.load.client import AsyncHttpClient
+
+
+class Espectador:
+    """Una conexión SSE: guarda los eventos recibidos y su latencia"""
+
+    def __init__(self, backend, id_partido, last_event_id=None):
+        partes = urlsplit(backend)
+        self.host, self.port = partes.hostname, partes.port or 80
+        self.id_partido = id_partido
+        self.last_event_id = last_event_id
+        self.eventos = {}
+        self.recibidos = {}  # id de evento -> instante de llegada
+        self.heartbeats = 0
+        self.snapshot = False
+        self.conectado = asyncio.Event()
+        self.error = None
+
+    async def _lineas(self, reader, chunked):
+        """Líneas del cuerpo (decodifica Transfer-Encoding: chunked)"""
+        pendiente = b''
+        while True:
+            if chunked:
+                tamano = int((await reader.readline()).split(b';')[0].strip() or b'0', 16)
+                if tamano == 0:
+                    return
+                datos = await reader.readexactly(tamano)
+                await reader.readline()
+            else:
+                datos = await reader.read(4096)
+                if not datos:
+                    return
+            pendiente += datos
+            *lineas, pendiente = pendiente.split(b'\n')
+            for linea in lineas:
+                yield linea.rstrip(b'\r').decode('utf-8')
+
+    async def escuchar(self):
+        try:
+            reader, writer = await asyncio.open_connection(self.host, self.port)
+            cabeceras = f'Host: {self.host}:{self.port}\r\nAccept: text/event-stream\r\n'
+            if self.last_event_id:
+                cabeceras += f'Last-Event-ID: {self.last_event_id}\r\n'
+            writer.write(f'GET /api/partido/{self.id_partido}/live HTTP/1.1\r\n{cabeceras}\r\n'.encode('latin-1'))
+            await writer.drain()
+
+            status = (await reader.readline()).split(b' ')[1]
+            chunked = False
+            while True:
+                linea = await reader.readline()
+                if linea in (b'\r\n', b'\n', b''):
+                    break
+                if linea.lower().startswith(b'transfer-encoding:') and b'chunked' in linea.lower():
+                    chunked = True
+            if status != b'200':
+                raise RuntimeError(f'HTTP {status.decode()}')
+            self.conectado.set()
+
+            evento = {}
+            async for linea in self._lineas(reader, chunked):
+                if linea.startswith(':'):
+                    self.heartbeats += 1
+                elif linea == '':
+                    self._recibir(evento)
+                    evento = {}
+                else:
+                    campo, _, valor = linea.partition(':')
+                    evento[campo] = valor.lstrip(' ')
+            writer.close()
+        except asyncio.CancelledError:
+            writer.close()
+            raise
+        except Exception as e:
+            self.error = str(e) or e.__class__.__name__
+            self.conectado.set()
+
+    def _recibir(self, evento):
+        if 'data' not in evento:
+            return
+        if evento.get('event') == 'snapshot':
+            self.snapshot = True
+        json.loads(evento['data'])
+        if 'id' in evento:
+            self.last_event_id = evento['id']
+            self.eventos[evento['id']] = evento.get('event')
+            self.recibidos.setdefault(evento['id'], time.time())
+
+
+async def preparar_cambio(client, backend, id_partido):
+    """(id_equipo, [id_jugador, id_jugador]) del equipo local para publicar cambios"""
+    respuesta = await client.request('GET', f'{backend}/api/partido/{id_partido}')
+    if respuesta.status != 200:
+        raise SystemExit(f'❌ Partido {id_partido}: {respuesta.json()}')
+    partido = respuesta.json()['partido']
+    if partido['estado'] != 'en_juego':
+        raise SystemExit(f"❌ El partido {id_partido} está {partido['estado']}: los cambios solo se publican en juego")
+    id_equipo = partido['id_equipo_local']
+    respuesta = await client.request('GET', f'{backend}/api/jugadores?id_equipo={id_equipo}')
+    jugadores = [j['id_jugador'] for j in respuesta.json().get('jugadores', [])[:2]]
+    if len(jugadores) < 2:
+        raise SystemExit(f'❌ El equipo {id_equipo} necesita al menos dos jugadores')
+    return id_equipo, jugadores
+
+
+async def publicar(client, backend, token, id_partido, cambio, n):
+    """Publica un cambio; devuelve (id del evento, instante de envío)"""
+    id_equipo, (a, b) = cambio
+    sale, entra = (a, b) if n % 2 == 0 else (b, a)
+    enviado = time.time()
+    respuesta = await client.request(
+        'POST', f'{backend}/api/partido/{id_partido}/live/eventos',
+        json_body={'tipo': 'cambio', 'id_equipo': id_equipo, 'minuto': n % 120 + 1,
+                   'sale': {'id_jugador': sale}, 'entra': {'id_jugador': entra}},
+        headers={'Authorization': f'Bearer {token}'}
+    )
+    if respuesta.status != 202:
+        raise SystemExit(f'❌ No se pudo publicar: {respuesta.status} {respuesta.json()}')
+    return respuesta.json()['id_evento'], enviado
+
+
+async def ejecutar(args):
+    client = AsyncHttpClient(timeout=args.timeout)
+    login = await client.request('POST', f'{args.backend}/api/auth/login',
+                                 json_body={'email': args.email, 'contrasena': args.password})
+    if login.status != 200:
+        raise SystemExit(f'❌ Login fallido: {login.json()}')
+    token = login.json()['access_token']
+    cambio = await preparar_cambio(client, args.backend, args.id_partido)
+
+    # 1. Conectar a todos los espectadores (por tandas para no saturar el accept)
+    espectadores = [Espectador(args.backend, args.id_partido) for _ in range(args.conexiones)]
+    inicio = time.perf_counter()
+    tareas = []
+    for i in range(0, len(espectadores), args.tanda):
+        tanda = espectadores[i:i + args.tanda]
+        tareas += [asyncio.create_task(e.escuchar()) for e in tanda]
+        await asyncio.wait_for(asyncio.gather(*(e.conectado.wait() for e in tanda)), args.timeout)
+    conexion_s = time.perf_counter() - inicio
+    fallidas = [e for e in espectadores if e.error]
+    print(f'🔌 {len(espectadores) - len(fallidas)} conexiones abiertas en {conexion_s:.1f}s '
+          f'({len(fallidas)} fallidas)')
+
+    # 2. Publicar eventos
+    enviados = {}
+    for n in range(args.eventos):
+        id_evento, instante = await publicar(client, args.backend, token, args.id_partido, cambio, n)
+        enviados[id_evento] = instante
+        await asyncio.sleep(args.pausa)
+    ids = list(enviados)
+
+    # 3. Esperar la entrega y, opcionalmente, heartbeats
+    await asyncio.sleep(args.espera)
+
+    # 4. Reanudación: un cliente que se "perdió" la mitad de los eventos
+    mitad = ids[len(ids) // 2 - 1] if len(ids) >= 2 else None
+    reanudado = Espectador(args.backend, args.id_partido, last_event_id=mitad)
+    tarea = asyncio.create_task(reanudado.escuchar())
+    await asyncio.sleep(1)
+    tarea.cancel()
+
+    for t in tareas:
+        t.cancel()
+    await asyncio.gather(*tareas, tarea, return_exceptions=True)
+    await client.close()
+
+    activos = [e for e in espectadores if not e.error]
+    latencias = [(e.recibidos[i] - enviados[i]) * 1000 for e in activos for i in ids if i in e.recibidos]
+    perdidos = sum(1 for e in activos for id_evento in ids if id_evento not in e.eventos)
+    esperados_reanudacion = ids[len(ids) // 2:] if mitad else []
+    return {
+        'conexiones': len(activos),
+        'conexiones_fallidas': len(fallidas),
+        'errores': sorted({e.error for e in fallidas})[:5],
+        'conexion_s': round(conexion_s, 3),
+        'eventos_publicados': len(ids),
+        'entregas': len(latencias),
+        'entregas_perdidas': perdidos,
+        'heartbeats': sum(e.heartbeats for e in activos),
+        'entrega': summarize(latencias, perdidos, args.eventos * args.pausa + args.espera),
+        'reanudacion_ok': bool(mitad) and not reanudado.snapshot
+                          and all(i in reanudado.eventos for i in esperados_reanudacion),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Fan-out del feed en vivo (SSE)')
+    parser.add_argument('--backend', default='http://localhost:5000')
+    parser.add_argument('--email', default='admin@gmail.com')
+    parser.add_argument('--password', default='Admin123')
+    parser.add_argument('--id-partido', type=int, required=True)
+    parser.add_argument('--conexiones', type=int, default=500)
+    parser.add_argument('--tanda', type=int, default=100, help='Conexiones abiertas a la vez')
+    parser.add_argument('--eventos', type=int, default=10)
+    parser.add_argument('--pausa', type=float, default=0.5, help='Segundos entre eventos')
+    parser.add_argument('--espera', type=float, default=3, help='Espera final (usar > heartbeat para verlo)')
+    parser.add_argument('--timeout', type=float, default=60)
+    parser.add_argument('--output', help='Archivo JSON de salida')
+    args = parser.parse_args(argv)
+
+    resultado = asyncio.run(ejecutar(args))
+    lat = resultado['entrega']['latencia_ms']
+    print(f"📡 {resultado['entregas']} entregas de {resultado['eventos_publicados']} eventos: "
+          f"p50={lat['p50'] or 0:.1f}ms  p95={lat['p95'] or 0:.1f}ms  max={lat['max'] or 0:.1f}ms  "
+          f"perdidas={resultado['entregas_perdidas']}  heartbeats={resultado['heartbeats']}")
+    print(f"🔁 Reanudación con Last-Event-ID: {'✅' if resultado['reanudacion_ok'] else '❌'}")
+
+    data = {
+        'meta': metadata(benchmark='live_fanout', backend=args.backend, id_partido=args.id_partido,
+                         conexiones=args.conexiones, eventos=args.eventos),
+        'resultados': resultado,
+    }
+    path = write_results('live', data, args.output)
+    print(f'💾 Resultados guardados en {path}')
+    return data
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,150 @@
+"""
+Cliente HTTP/1.1 mínimo sobre asyncio (solo librería estándar)
+
+Cada usuario virtual tiene su propio cliente con una conexión keep-alive
+por host; si el servidor la cierra (el servidor de desarrollo de Flask
+responde con HTTP/1.0) se reabre en la siguiente petición.
+"""
+import asyncio
+import json
+import time
+from urllib.parse import urlencode, urlsplit
+
+
+class HttpError(Exception):
+    """Error de red (conexión rechazada, timeout, respuesta malformada)"""
+
+
+class Response:
+    __slots__ = ('status', 'headers', 'body', 'elapsed_ms')
+
+    def __init__(self, status, headers, body, elapsed_ms):
+        self.status = status
+        self.headers = headers
+        self.body = body
+        self.elapsed_ms = elapsed_ms
+
+    def json(self):
+        try:
+            return json.loads(self.body or b'null')
+        except ValueError:
+            return None
+
+
+class AsyncHttpClient:
+
+    def __init__(self, timeout=30, user_agent='campeonato-load/1.0'):
+        self.timeout = timeout
+        self.user_agent = user_agent
+        self._conexiones = {}
+
+    async def request(self, method, url, json_body=None, params=None, headers=None):
+        """
+        Ejecuta una petición y devuelve la respuesta completa
+
+        Raises:
+            HttpError: Si la conexión falla o se agota el timeout
+        """
+        partes = urlsplit(url)
+        host, port = partes.hostname, partes.port or 80
+        path = partes.path or '/'
+        if partes.query:
+            path += '?' + partes.query
+        if params:
+            path += ('&' if '?' in path else '?') + urlencode(params)
+
+        body = b''
+        cabeceras = {
+            'Host': f'{host}:{port}',
+            'User-Agent': self.user_agent,
+            'Accept': 'application/json',
+            'Connection': 'keep-alive',
+        }
+        if json_body is not None:
+            body = json.dumps(json_body).encode('utf-8')
+            cabeceras['Content-Type'] = 'application/json'
+        cabeceras['Content-Length'] = str(len(body))
+        cabeceras.update(headers or {})
+
+        raw = f'{method} {path} HTTP/1.1\r\n'.encode('latin-1')
+        raw += ''.join(f'{k}: {v}\r\n' for k, v in cabeceras.items()).encode('latin-1')
+        raw += b'\r\n' + body
+
+        inicio = time.perf_counter()
+        try:
+            return await asyncio.wait_for(self._enviar((host, port), raw, method, inicio), self.timeout)
+        except asyncio.TimeoutError:
+            self._cerrar((host, port))
+            raise HttpError('timeout')
+        except (OSError, asyncio.IncompleteReadError, ValueError) as e:
+            self._cerrar((host, port))
+            raise HttpError(str(e) or e.__class__.__name__)
+
+    async def _enviar(self, destino, raw, method, inicio):
+        reutilizada = destino in self._conexiones
+        reader, writer = await self._conexion(destino)
+        try:
+            writer.write(raw)
+            await writer.drain()
+            linea = await reader.readline()
+            if not linea and reutilizada:
+                # El servidor cerró la conexión keep-alive: reintentar una vez
+                raise ConnectionResetError
+        except (ConnectionResetError, BrokenPipeError):
+            if not reutilizada:
+                raise
+            self._cerrar(destino)
+            reader, writer = await self._conexion(destino)
+            writer.write(raw)
+            await writer.drain()
+            linea = await reader.readline()
+
+        version, status = linea.decode('latin-1').split(' ', 2)[:2]
+        headers = {}
+        while True:
+            linea = await reader.readline()
+            if linea in (b'\r\n', b'\n', b''):
+                break
+            nombre, _, valor = linea.decode('latin-1').partition(':')
+            headers[nombre.strip().lower()] = valor.strip()
+
+        if method == 'HEAD' or status in ('204', '304'):
+            body = b''
+        elif 'content-length' in headers:
+            body = await reader.readexactly(int(headers['content-length']))
+        elif headers.get('transfer-encoding', '').lower() == 'chunked':
+            body = await self._leer_chunked(reader)
+        else:
+            body = await reader.read()
+            headers['connection'] = 'close'
+
+        elapsed_ms = (time.perf_counter() - inicio) * 1000
+        if version == 'HTTP/1.0' or headers.get('connection', '').lower() == 'close':
+            self._cerrar(destino)
+
+        return Response(int(status), headers, body, elapsed_ms)
+
+    @staticmethod
+    async def _leer_chunked(reader):
+        partes = []
+        while True:
+            tamano = int((await reader.readline()).split(b';')[0].strip(), 16)
+            if tamano == 0:
+                await reader.readline()
+                return b''.join(partes)
+            partes.append(await reader.readexactly(tamano))
+            await reader.readline()
+
+    async def _conexion(self, destino):
+        if destino not in self._conexiones:
+            self._conexiones[destino] = await asyncio.open_connection(*destino)
+        return self._conexiones[destino]
+
+    def _cerrar(self, destino):
+        conexion = self._conexiones.pop(destino, None)
+        if conexion:
+            conexion[1].close()
+
+    async def close(self):
+        for destino in list(self._conexiones):
+            self._cerrar(destino)
@@ -0,0 +1,31 @@
+"""
+Servidor con gevent para el feed en vivo (miles de conexiones SSE abiertas)
+
+Cada conexión a /api/partido/<id>/live queda esperando en una
+threading.Condition; con monkey.patch_all esas esperas son greenlets y
+no bloquean el proceso.
+
+El pub/sub vive en memoria: usar UN solo proceso.
+
+Uso (desde backend/):
+    python wsgi_gevent.py
+    gunicorn -k gevent -w 1 --worker-connections 10000 wsgi_gevent:app
+"""
+from gevent import monkey
+monkey.patch_all()
+
+import os
+
+from dotenv import load_dotenv
+from gevent.pywsgi import WSGIServer
+
+from app import create_app
+
+load_dotenv()
+
+app = create_app(os.getenv('FLASK_ENV', 'production'))
+
+if __name__ == '__main__':
+    puerto = int(os.getenv('PORT', 5000))
+    print(f'🚀 Servidor gevent en 0.0.0.0:{puerto}')
+    WSGIServer(('0.0.0.0', puerto), app, log=None).serve_forever()
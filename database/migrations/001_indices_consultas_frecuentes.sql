@@ -0,0 +1,59 @@
+-- =============================================================
+-- 001 - Índices para las consultas más frecuentes
+-- =============================================================
+-- Aplicar:  mysql -u root -p gestion_campeonato < database/migrations/001_indices_consultas_frecuentes.sql
+-- Revertir: mysql -u root -p gestion_campeonato < database/migrations/001_indices_consultas_frecuentes_down.sql
+--
+-- Cada índice sale de la forma de una consulta real:
+--   partidos       GET /api/partido?id_campeonato&estado&jornada  ORDER BY fecha_partido
+--                  GET /api/partido?id_equipo  (UNION ALL local / visitante)
+--   goles          goleadores: GROUP BY id_jugador + JOIN partidos (tipo != autogol)
+--   login_attempts intentos fallidos recientes de un email
+--   refresh_tokens limpieza de tokens revocados/expirados, sesiones de un usuario
+--
+-- Los índices de una sola columna que quedan cubiertos por el prefijo de
+-- un compuesto se eliminan (las FK siguen teniendo índice que las respalde).
+-- =============================================================
+
+-- ---------- partidos ----------
+CREATE INDEX idx_partidos_campeonato_estado_jornada
+    ON partidos (id_campeonato, estado, jornada, fecha_partido);
+CREATE INDEX idx_partidos_local_fecha
+    ON partidos (id_equipo_local, fecha_partido);
+CREATE INDEX idx_partidos_visitante_fecha
+    ON partidos (id_equipo_visitante, fecha_partido);
+
+ALTER TABLE partidos
+    DROP INDEX id_campeonato,
+    DROP INDEX id_equipo_local,
+    DROP INDEX id_equipo_visitante;
+
+-- ---------- goles ----------
+CREATE INDEX idx_goles_jugador_partido_tipo
+    ON goles (id_jugador, id_partido, tipo);
+CREATE INDEX idx_goles_partido_jugador
+    ON goles (id_partido, id_jugador);
+
+ALTER TABLE goles
+    DROP INDEX idx_jugador,
+    DROP INDEX idx_partido;
+
+-- ---------- login_attempts ----------
+CREATE INDEX idx_login_attempts_email_success_fecha
+    ON login_attempts (email, success, attempted_at);
+
+ALTER TABLE login_attempts
+    DROP INDEX idx_email;
+
+-- ---------- refresh_tokens ----------
+CREATE INDEX idx_refresh_tokens_revoked_expires
+    ON refresh_tokens (is_revoked, expires_at);
+CREATE INDEX idx_refresh_tokens_user_revoked
+    ON refresh_tokens (user_id, is_revoked);
+
+ALTER TABLE refresh_tokens
+    DROP INDEX idx_user,
+    DROP INDEX idx_token;  -- duplicado del UNIQUE KEY `token`
+
+-- Estadísticas actualizadas para que el optimizador use los índices nuevos
+ANALYZE TABLE partidos, goles, login_attempts, refresh_tokens;
@@ -0,0 +1,37 @@
+-- =============================================================
+-- 001 (revertir) - Vuelve a los índices originales
+-- =============================================================
+-- Primero se recrean los índices simples (las FK los necesitan) y luego
+-- se eliminan los compuestos.
+
+-- ---------- partidos ----------
+CREATE INDEX id_campeonato ON partidos (id_campeonato);
+CREATE INDEX id_equipo_local ON partidos (id_equipo_local);
+CREATE INDEX id_equipo_visitante ON partidos (id_equipo_visitante);
+
+ALTER TABLE partidos
+    DROP INDEX idx_partidos_campeonato_estado_jornada,
+    DROP INDEX idx_partidos_local_fecha,
+    DROP INDEX idx_partidos_visitante_fecha;
+
+-- ---------- goles ----------
+CREATE INDEX idx_jugador ON goles (id_jugador);
+CREATE INDEX idx_partido ON goles (id_partido);
+
+ALTER TABLE goles
+    DROP INDEX idx_goles_jugador_partido_tipo,
+    DROP INDEX idx_goles_partido_jugador;
+
+-- ---------- login_attempts ----------
+CREATE INDEX idx_email ON login_attempts (email);
+
+ALTER TABLE login_attempts
+    DROP INDEX idx_login_attempts_email_success_fecha;
+
+-- ---------- refresh_tokens ----------
+CREATE INDEX idx_user ON refresh_tokens (user_id);
+CREATE INDEX idx_token ON refresh_tokens (token);
+
+ALTER TABLE refresh_tokens
+    DROP INDEX idx_refresh_tokens_revoked_expires,
+    DROP INDEX idx_refresh_tokens_user_revoked;
@@ -0,0 +1,33 @@
+-- =============================================================
+-- 002 - Contadores desnormalizados de eventos por partido
+-- =============================================================
+-- Partido.to_dict ya no cuenta goles/tarjetas con COUNT: usa estas
+-- columnas, que mantienen crear/eliminar gol y tarjeta en la misma
+-- transacción. Si se desincronizan: flask reparar-contadores
+-- =============================================================
+
+ALTER TABLE partidos
+    ADD COLUMN total_goles INT NOT NULL DEFAULT 0 AFTER goles_visitante,
+    ADD COLUMN total_tarjetas INT NOT NULL DEFAULT 0 AFTER total_goles,
+    ADD COLUMN amarillas INT NOT NULL DEFAULT 0 AFTER total_tarjetas,
+    ADD COLUMN rojas INT NOT NULL DEFAULT 0 AFTER amarillas;
+
+-- Carga inicial desde los datos existentes
+UPDATE partidos p
+LEFT JOIN (
+    SELECT id_partido, COUNT(*) AS total
+    FROM goles
+    GROUP BY id_partido
+) g ON g.id_partido = p.id_partido
+LEFT JOIN (
+    SELECT id_partido,
+           COUNT(*) AS total,
+           SUM(tipo = 'amarilla') AS amarillas,
+           SUM(tipo = 'roja') AS rojas
+    FROM tarjetas
+    GROUP BY id_partido
+) t ON t.id_partido = p.id_partido
+SET p.total_goles = COALESCE(g.total, 0),
+    p.total_tarjetas = COALESCE(t.total, 0),
+    p.amarillas = COALESCE(t.amarillas, 0),
+    p.rojas = COALESCE(t.rojas, 0);
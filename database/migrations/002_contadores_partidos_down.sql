@@ -0,0 +1,9 @@
+-- =============================================================
+-- 002 (revertir) - Elimina los contadores desnormalizados
+-- =============================================================
+
+ALTER TABLE partidos
+    DROP COLUMN total_goles,
+    DROP COLUMN total_tarjetas,
+    DROP COLUMN amarillas,
+    DROP COLUMN rojas;
@@ -0,0 +1,24 @@
+-- =============================================================
+-- 003 - Estado disciplinario acumulado por jugador y campeonato
+-- =============================================================
+-- Lo mantienen crear/eliminar tarjeta y la finalización de partidos.
+-- Después de aplicar la migración, cargar el estado inicial con:
+--     flask recalcular-sanciones
+-- =============================================================
+
+CREATE TABLE IF NOT EXISTS sanciones_jugadores (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    id_campeonato INT NOT NULL,
+    id_jugador INT NOT NULL,
+    amarillas INT NOT NULL DEFAULT 0,
+    rojas INT NOT NULL DEFAULT 0,
+    partidos_cumplidos INT NOT NULL DEFAULT 0,
+    partidos_pendientes INT NOT NULL DEFAULT 0,
+    fecha_partido_sancion DATETIME NULL,
+    fecha_actualizacion DATETIME DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    CONSTRAINT unique_sancion_campeonato_jugador UNIQUE (id_campeonato, id_jugador),
+    FOREIGN KEY (id_campeonato) REFERENCES campeonatos(id_campeonato) ON DELETE CASCADE,
+    FOREIGN KEY (id_jugador) REFERENCES jugadores(id_jugador) ON DELETE CASCADE,
+    INDEX idx_sanciones_campeonato_pendientes (id_campeonato, partidos_pendientes),
+    INDEX ix_sanciones_jugadores_id_jugador (id_jugador)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
@@ -0,0 +1,5 @@
+-- =============================================================
+-- 003 (revertir) - Elimina el estado disciplinario
+-- =============================================================
+
+DROP TABLE IF EXISTS sanciones_jugadores;
@@ -0,0 +1,31 @@
+-- =============================================================
+-- 004 - Bandeja de notificaciones: contador de no leídas e índices
+-- =============================================================
+--   usuarios.notificaciones_no_leidas  GET /api/notificaciones/unread-count
+--   (id_usuario, leida, fecha_envio)   bandeja filtrada, paginada con cursor
+--   (id_usuario, fecha_envio)          bandeja completa, paginada con cursor
+--
+-- idx_usuario_leida queda cubierto por el prefijo del nuevo índice.
+-- =============================================================
+
+ALTER TABLE usuarios
+    ADD COLUMN notificaciones_no_leidas INT NOT NULL DEFAULT 0 AFTER last_login_ip;
+
+-- Carga inicial
+UPDATE usuarios u
+JOIN (
+    SELECT id_usuario, COUNT(*) AS total
+    FROM notificaciones
+    WHERE leida = 0
+    GROUP BY id_usuario
+) n ON n.id_usuario = u.id_usuario
+SET u.notificaciones_no_leidas = n.total,
+    u.fecha_actualizacion = u.fecha_actualizacion;
+
+CREATE INDEX idx_notificaciones_usuario_leida_fecha
+    ON notificaciones (id_usuario, leida, fecha_envio);
+CREATE INDEX idx_notificaciones_usuario_fecha
+    ON notificaciones (id_usuario, fecha_envio);
+
+ALTER TABLE notificaciones
+    DROP INDEX idx_usuario_leida;
@@ -0,0 +1,13 @@
+-- =============================================================
+-- 004 (revertir) - Bandeja de notificaciones
+-- =============================================================
+
+CREATE INDEX idx_usuario_leida
+    ON notificaciones (id_usuario, leida);
+
+ALTER TABLE notificaciones
+    DROP INDEX idx_notificaciones_usuario_leida_fecha,
+    DROP INDEX idx_notificaciones_usuario_fecha;
+
+ALTER TABLE usuarios
+    DROP COLUMN notificaciones_no_leidas;
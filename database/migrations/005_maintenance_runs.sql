@@ -0,0 +1,21 @@
+-- =============================================================
+-- 005 - Historial de las tareas de mantenimiento
+-- =============================================================
+-- Una fila por ejecución de `flask mantenimiento` (o del hilo del
+-- proceso): duración, filas eliminadas y estado (ok/error/locked).
+-- La propia tarea maintenance_runs limpia las filas viejas.
+-- =============================================================
+
+CREATE TABLE IF NOT EXISTS maintenance_runs (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    job VARCHAR(50) NOT NULL,
+    status ENUM('ok', 'error', 'locked') NOT NULL,
+    started_at DATETIME NOT NULL,
+    finished_at DATETIME NULL,
+    duration_ms INT NOT NULL DEFAULT 0,
+    rows_deleted INT NOT NULL DEFAULT 0,
+    batches INT NOT NULL DEFAULT 0,
+    worker VARCHAR(100) NULL,
+    error TEXT NULL,
+    INDEX idx_maintenance_runs_job_started (job, started_at)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
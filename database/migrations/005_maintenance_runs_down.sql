@@ -0,0 +1,5 @@
+-- =============================================================
+-- 005 (revertir) - Elimina el historial de mantenimiento
+-- =============================================================
+
+DROP TABLE IF EXISTS maintenance_runs;
@@ -0,0 +1,63 @@
+-- =============================================================
+-- 006 - Particiones por fecha: login_attempts, security_logs, rate_limits
+-- =============================================================
+-- Las tres tablas solo reciben INSERTs y se consultan por ventanas de
+-- tiempo recientes. Particionadas por rango de fecha:
+--   - MySQL lee solo las particiones del rango consultado (pruning)
+--   - la retención es un DROP PARTITION en vez de DELETE fila por fila
+--
+-- Requisitos de MySQL para particionar:
+--   - La columna de partición debe estar en la PK y en cada UNIQUE:
+--     la PK pasa a (id, columna)
+--   - RANGE COLUMNS no admite TIMESTAMP: la columna pasa a DATETIME
+--     (los valores mostrados no cambian)
+--   - Las tablas particionadas no admiten claves foráneas: se elimina
+--     security_logs -> usuarios (user_id queda como índice)
+--
+-- Las tablas quedan con una sola partición pmax. Justo después, crear
+-- las particiones por periodo con:
+--     flask particiones
+-- (la primera vez reorganiza las filas existentes; luego el
+-- mantenimiento crea las futuras sobre pmax vacía y elimina las vencidas)
+--
+-- Cada ALTER copia la tabla: en tablas grandes aplicar en una ventana
+-- de mantenimiento.
+-- =============================================================
+
+-- login_attempts: por mes sobre attempted_at
+ALTER TABLE login_attempts
+    MODIFY attempted_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    DROP PRIMARY KEY,
+    ADD PRIMARY KEY (id, attempted_at);
+
+ALTER TABLE login_attempts
+    PARTITION BY RANGE COLUMNS (attempted_at) (
+        PARTITION pmax VALUES LESS THAN (MAXVALUE)
+    );
+
+-- security_logs: por mes sobre created_at
+ALTER TABLE security_logs
+    DROP FOREIGN KEY security_logs_ibfk_1;
+
+ALTER TABLE security_logs
+    MODIFY created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    DROP PRIMARY KEY,
+    ADD PRIMARY KEY (id, created_at);
+
+ALTER TABLE security_logs
+    PARTITION BY RANGE COLUMNS (created_at) (
+        PARTITION pmax VALUES LESS THAN (MAXVALUE)
+    );
+
+-- rate_limits: por día sobre window_start (ya es parte de unique_rate_limit)
+ALTER TABLE rate_limits
+    MODIFY window_start DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    MODIFY window_end DATETIME NOT NULL,
+    MODIFY blocked_until DATETIME NULL DEFAULT NULL,
+    DROP PRIMARY KEY,
+    ADD PRIMARY KEY (id, window_start);
+
+ALTER TABLE rate_limits
+    PARTITION BY RANGE COLUMNS (window_start) (
+        PARTITION pmax VALUES LESS THAN (MAXVALUE)
+    );
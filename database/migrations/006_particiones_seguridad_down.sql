@@ -0,0 +1,26 @@
+-- =============================================================
+-- 006 (revertir) - Quita las particiones de las tablas de seguridad
+-- =============================================================
+
+ALTER TABLE rate_limits REMOVE PARTITIONING;
+ALTER TABLE rate_limits
+    DROP PRIMARY KEY,
+    ADD PRIMARY KEY (id),
+    MODIFY window_start TIMESTAMP NULL DEFAULT CURRENT_TIMESTAMP,
+    MODIFY window_end TIMESTAMP NOT NULL,
+    MODIFY blocked_until TIMESTAMP NULL DEFAULT NULL;
+
+ALTER TABLE security_logs REMOVE PARTITIONING;
+ALTER TABLE security_logs
+    DROP PRIMARY KEY,
+    ADD PRIMARY KEY (id),
+    MODIFY created_at TIMESTAMP NULL DEFAULT CURRENT_TIMESTAMP;
+ALTER TABLE security_logs
+    ADD CONSTRAINT security_logs_ibfk_1 FOREIGN KEY (user_id)
+        REFERENCES usuarios (id_usuario) ON DELETE SET NULL;
+
+ALTER TABLE login_attempts REMOVE PARTITIONING;
+ALTER TABLE login_attempts
+    DROP PRIMARY KEY,
+    ADD PRIMARY KEY (id),
+    MODIFY attempted_at TIMESTAMP NULL DEFAULT CURRENT_TIMESTAMP;
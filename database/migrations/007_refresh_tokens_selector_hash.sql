@@ -0,0 +1,46 @@
+-- =============================================================
+-- 007 - Refresh tokens: selector + SHA-256 del verificador, sesiones activas
+-- =============================================================
+--   refresh_tokens.selector    CHAR(16), UNIQUE: búsqueda de ancho fijo
+--   refresh_tokens.token_hash  BINARY(32): SHA-256 del resto del token
+--   usuarios.sesiones_activas  refresh tokens no revocados del usuario
+--
+-- Los tokens existentes siguen siendo válidos: el selector son sus
+-- primeros 16 caracteres y el hash se calcula sobre el resto (el mismo
+-- corte que hace RefreshToken.split_token). Después se elimina la
+-- columna token (VARCHAR(500) con el token en texto plano).
+--
+-- La limpieza ahora borra todos los expirados: idx_expires pasa a
+-- llamarse idx_refresh_tokens_expires y sobra (is_revoked, expires_at).
+-- =============================================================
+
+ALTER TABLE refresh_tokens
+    ADD COLUMN selector CHAR(16) NULL AFTER user_id,
+    ADD COLUMN token_hash BINARY(32) NULL AFTER selector;
+
+UPDATE refresh_tokens
+SET selector = LEFT(token, 16),
+    token_hash = UNHEX(SHA2(SUBSTRING(token, 17), 256));
+
+ALTER TABLE refresh_tokens
+    MODIFY selector CHAR(16) NOT NULL,
+    MODIFY token_hash BINARY(32) NOT NULL,
+    ADD UNIQUE KEY selector (selector),
+    DROP INDEX token,
+    DROP COLUMN token,
+    DROP INDEX idx_refresh_tokens_revoked_expires,
+    RENAME INDEX idx_expires TO idx_refresh_tokens_expires;
+
+ALTER TABLE usuarios
+    ADD COLUMN sesiones_activas INT NOT NULL DEFAULT 0 AFTER notificaciones_no_leidas;
+
+-- Carga inicial
+UPDATE usuarios u
+JOIN (
+    SELECT user_id, COUNT(*) AS total
+    FROM refresh_tokens
+    WHERE is_revoked = 0 AND expires_at > UTC_TIMESTAMP()
+    GROUP BY user_id
+) r ON r.user_id = u.id_usuario
+SET u.sesiones_activas = r.total,
+    u.fecha_actualizacion = u.fecha_actualizacion;
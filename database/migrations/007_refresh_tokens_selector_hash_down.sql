@@ -0,0 +1,25 @@
+-- =============================================================
+-- 007 (revertir) - Refresh tokens en texto plano
+-- =============================================================
+-- El token original no se puede reconstruir desde su hash: al revertir
+-- se revocan todos los refresh tokens (los usuarios vuelven a iniciar sesión).
+-- =============================================================
+
+ALTER TABLE usuarios
+    DROP COLUMN sesiones_activas;
+
+ALTER TABLE refresh_tokens
+    ADD COLUMN token VARCHAR(500) NULL AFTER user_id;
+
+UPDATE refresh_tokens
+SET token = CONCAT('revocado-', id),
+    is_revoked = 1;
+
+ALTER TABLE refresh_tokens
+    MODIFY token VARCHAR(500) NOT NULL,
+    ADD UNIQUE KEY token (token),
+    DROP INDEX selector,
+    DROP COLUMN selector,
+    DROP COLUMN token_hash,
+    RENAME INDEX idx_refresh_tokens_expires TO idx_expires,
+    ADD INDEX idx_refresh_tokens_revoked_expires (is_revoked, expires_at);
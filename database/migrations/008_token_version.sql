@@ -0,0 +1,21 @@
+-- =============================================================
+-- 008 - Revocación por versión de tokens
+-- =============================================================
+--   usuarios.token_version               claim 'tv' de los access tokens;
+--                                        +1 = cerrar todas las sesiones
+--   token_blacklist (user_id, revoked_at) última revocación individual
+--                                        de un usuario
+--
+-- Los tokens emitidos antes de la migración no tienen 'tv' y se toman
+-- como versión 0 (siguen siendo válidos).
+-- idx_user queda cubierto por el prefijo del nuevo índice.
+-- =============================================================
+
+ALTER TABLE usuarios
+    ADD COLUMN token_version INT NOT NULL DEFAULT 0 AFTER sesiones_activas;
+
+CREATE INDEX idx_token_blacklist_user_revoked
+    ON token_blacklist (user_id, revoked_at);
+
+ALTER TABLE token_blacklist
+    DROP INDEX idx_user;
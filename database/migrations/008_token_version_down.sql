@@ -0,0 +1,12 @@
+-- =============================================================
+-- 008 (revertir) - Revocación por versión de tokens
+-- =============================================================
+
+CREATE INDEX idx_user
+    ON token_blacklist (user_id);
+
+ALTER TABLE token_blacklist
+    DROP INDEX idx_token_blacklist_user_revoked;
+
+ALTER TABLE usuarios
+    DROP COLUMN token_version;
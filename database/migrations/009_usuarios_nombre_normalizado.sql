@@ -0,0 +1,27 @@
+-- =============================================================
+-- 009 - Nombre normalizado de usuarios y solicitudes en bloque
+-- =============================================================
+--   usuarios.nombre_normalizado  nombre en minúsculas, sin tildes ni
+--                                espacios repetidos; el registro masivo
+--                                de equipos busca al líder con IN sobre
+--                                este índice (en vez de ILIKE '%...%')
+--
+-- El relleno de abajo cubre las tildes más comunes; después ejecutar
+-- `flask reparar-contadores`, que recalcula el valor exacto desde la app.
+-- =============================================================
+
+ALTER TABLE usuarios
+    ADD COLUMN nombre_normalizado VARCHAR(100) NULL AFTER nombre;
+
+UPDATE usuarios
+SET nombre_normalizado =
+    REPLACE(REPLACE(REPLACE(REPLACE(REPLACE(REPLACE(REPLACE(
+        LOWER(TRIM(nombre)),
+        'á', 'a'), 'é', 'e'), 'í', 'i'), 'ó', 'o'), 'ú', 'u'), 'ü', 'u'), 'ñ', 'n');
+
+CREATE INDEX idx_usuarios_nombre_normalizado
+    ON usuarios (nombre_normalizado);
+
+-- Aprobación masiva: solicitudes pendientes de un conjunto de equipos
+CREATE INDEX idx_solicitudes_equipo_estado
+    ON solicitudes_equipo (id_equipo, estado);
@@ -0,0 +1,10 @@
+-- =============================================================
+-- 009 (revertir) - Nombre normalizado de usuarios
+-- =============================================================
+
+DROP INDEX idx_solicitudes_equipo_estado ON solicitudes_equipo;
+
+DROP INDEX idx_usuarios_nombre_normalizado ON usuarios;
+
+ALTER TABLE usuarios
+    DROP COLUMN nombre_normalizado;
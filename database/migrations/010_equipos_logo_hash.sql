@@ -0,0 +1,11 @@
+-- =============================================================
+-- 010 - Logos de equipos por contenido
+-- =============================================================
+--   equipos.logo_hash   SHA-256 del logo subido con
+--                       POST /api/equipos/<id>/logo; con él se arma la
+--                       URL de la miniatura (tabla de posiciones,
+--                       goleadores). NULL = logo_url externo
+-- =============================================================
+
+ALTER TABLE equipos
+    ADD COLUMN logo_hash CHAR(64) NULL AFTER logo_url;
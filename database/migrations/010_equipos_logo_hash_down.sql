@@ -0,0 +1,6 @@
+-- =============================================================
+-- 010 (revertir) - Logos de equipos por contenido
+-- =============================================================
+
+ALTER TABLE equipos
+    DROP COLUMN logo_hash;